@@ -2,16 +2,47 @@
 European SMP/SML Client Service
 Integrates with European Commission's SMP/SML infrastructure for eHealth services
 Based on OpenNCP configuration from ehealth-2 project
+
+Country SMP URLs are resolved with a HEAD probe once and then cached for
+SMP_RESOLUTION_TTL seconds; failed probes are cached for SMP_NEGATIVE_TTL
+seconds. A per-country circuit breaker stops probing a country after
+SMP_CIRCUIT_FAILURE_THRESHOLD consecutive failures until
+SMP_CIRCUIT_COOLDOWN seconds have passed. All requests go through one
+pooled requests.Session.
 """
 
+import threading
+import time
 import requests
 import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
 from urllib.parse import urljoin
 from django.conf import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Defaults (overridable in settings)
+DEFAULT_RESOLUTION_TTL_SECONDS = 60 * 60
+DEFAULT_NEGATIVE_TTL_SECONDS = 5 * 60
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 3
+DEFAULT_CIRCUIT_COOLDOWN_SECONDS = 10 * 60
+DEFAULT_PROBE_TIMEOUT_SECONDS = 10
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 30
+DEFAULT_POOL_MAXSIZE = 10
+
+
+class _CountryEndpoint:
+    """Cached resolution and circuit breaker state for one country"""
+
+    __slots__ = ("smp_url", "expires_at", "failures", "open_until")
+
+    def __init__(self):
+        self.smp_url = None
+        self.expires_at = 0.0
+        self.failures = 0
+        self.open_until = 0.0
+
 
 class EuropeanSMPClient:
     """Client for European Commission SMP/SML services"""
@@ -52,37 +83,117 @@ class EuropeanSMPClient:
         "eu",
     ]
 
-    def __init__(self):
+    SMP_URL_TEMPLATE = "https://smp-{country_code}." + SML_DOMAIN
+    FALLBACK_SMP_URL_TEMPLATE = (
+        "https://smp-ehealth-trn-{country_code}.acc.edelivery.tech.ec.europa.eu"
+    )
+
+    def __init__(self, smp_url_template=None, fallback_smp_url_template=None):
+        self.smp_url_template = smp_url_template or self.SMP_URL_TEMPLATE
+        self.fallback_smp_url_template = (
+            fallback_smp_url_template or self.FALLBACK_SMP_URL_TEMPLATE
+        )
+
+        self.resolution_ttl = getattr(
+            settings, "SMP_RESOLUTION_TTL", DEFAULT_RESOLUTION_TTL_SECONDS
+        )
+        self.negative_ttl = getattr(
+            settings, "SMP_NEGATIVE_TTL", DEFAULT_NEGATIVE_TTL_SECONDS
+        )
+        self.failure_threshold = getattr(
+            settings, "SMP_CIRCUIT_FAILURE_THRESHOLD", DEFAULT_CIRCUIT_FAILURE_THRESHOLD
+        )
+        self.circuit_cooldown = getattr(
+            settings, "SMP_CIRCUIT_COOLDOWN", DEFAULT_CIRCUIT_COOLDOWN_SECONDS
+        )
+        self.probe_timeout = getattr(
+            settings, "SMP_PROBE_TIMEOUT", DEFAULT_PROBE_TIMEOUT_SECONDS
+        )
+        self.request_timeout = getattr(
+            settings, "SMP_REQUEST_TIMEOUT", DEFAULT_REQUEST_TIMEOUT_SECONDS
+        )
+
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
         self.session = requests.Session()
         self.session.verify = True  # Enable SSL verification
-        self.session.timeout = 30
+        # Keep-alive connection pool shared by all SMP hosts
+        pool_maxsize = getattr(settings, "SMP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)
+        adapter = HTTPAdapter(
+            pool_connections=len(self.EU_COUNTRIES), pool_maxsize=pool_maxsize
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def get_country_smp_url(self, country_code):
         """
         Get SMP URL for a specific country from SML
+
+        The HEAD probe only runs when the cached resolution has expired and
+        the country's circuit breaker is closed.
         """
-        try:
-            country_code = country_code.lower()
-            if country_code not in self.EU_COUNTRIES:
-                logger.warning(f"Country {country_code} not in supported EU countries")
+        country_code = country_code.lower()
+        if country_code not in self.EU_COUNTRIES:
+            logger.warning(f"Country {country_code} not in supported EU countries")
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            endpoint = self._endpoints.setdefault(country_code, _CountryEndpoint())
+            if now < endpoint.expires_at:
+                return endpoint.smp_url
+            if now < endpoint.open_until:
+                logger.debug(f"SMP circuit open for {country_code}, skipping probe")
                 return None
 
+        try:
             # Construct SMP URL based on SML domain pattern
-            smp_url = f"https://smp-{country_code}.{self.SML_DOMAIN}"
+            smp_url = self.smp_url_template.format(country_code=country_code)
 
             # Verify the SMP endpoint is accessible
-            response = self.session.head(smp_url, timeout=10)
-            if response.status_code == 200:
-                return smp_url
-            else:
+            response = self.session.head(smp_url, timeout=self.probe_timeout)
+            if response.status_code != 200:
                 # Fallback to training environment pattern
-                fallback_url = f"https://smp-ehealth-trn-{country_code}.acc.edelivery.tech.ec.europa.eu"
-                return fallback_url
+                smp_url = self.fallback_smp_url_template.format(
+                    country_code=country_code
+                )
 
         except Exception as e:
             logger.error(f"Error getting SMP URL for {country_code}: {e}")
+            self._record_failure(country_code)
             return None
 
+        with self._lock:
+            endpoint.smp_url = smp_url
+            endpoint.expires_at = time.monotonic() + self.resolution_ttl
+            endpoint.failures = 0
+            endpoint.open_until = 0.0
+        return smp_url
+
+    def _record_failure(self, country_code):
+        """Negatively cache a country's SMP and trip its breaker if needed"""
+        now = time.monotonic()
+        with self._lock:
+            endpoint = self._endpoints.setdefault(country_code, _CountryEndpoint())
+            endpoint.smp_url = None
+            endpoint.expires_at = now + self.negative_ttl
+            endpoint.failures += 1
+            if endpoint.failures >= self.failure_threshold:
+                endpoint.open_until = now + self.circuit_cooldown
+                logger.warning(
+                    f"SMP circuit opened for {country_code} after "
+                    f"{endpoint.failures} failures"
+                )
+
+    def _get(self, country_code, url):
+        """GET from a country's SMP; connection failures invalidate its resolution"""
+        try:
+            return self.session.get(url, timeout=self.request_timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            self._record_failure(country_code.lower())
+            raise
+
     def fetch_participant_list(self, country_code):
         """
         Fetch list of participants from country's SMP
@@ -95,7 +206,7 @@ class EuropeanSMPClient:
             # SMP API endpoint for participant list
             participants_url = urljoin(smp_url, "/participants")
 
-            response = self.session.get(participants_url)
+            response = self._get(country_code, participants_url)
             response.raise_for_status()
 
             # Parse XML response
@@ -126,7 +237,7 @@ class EuropeanSMPClient:
             # SMP API endpoint for service metadata
             metadata_url = urljoin(smp_url, f"/participants/{participant_id}/services")
 
-            response = self.session.get(metadata_url)
+            response = self._get(country_code, metadata_url)
             response.raise_for_status()
 
             # Parse XML response
@@ -169,11 +280,11 @@ class EuropeanSMPClient:
             # Look for ISM service in SMP
             ism_url = urljoin(smp_url, f"/ism/{country_code}")
 
-            response = self.session.get(ism_url)
+            response = self._get(country_code, ism_url)
             if response.status_code == 404:
                 # Try alternative ISM endpoint
                 ism_url = urljoin(smp_url, f"/services/ism/{country_code}")
-                response = self.session.get(ism_url)
+                response = self._get(country_code, ism_url)
 
             if response.status_code == 200:
                 return self._parse_ism_response(response.content, country_code)
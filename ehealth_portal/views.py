@@ -15,8 +15,12 @@ import logging
 import json
 import requests
 import os
+import time
 from datetime import datetime
 
+from patient_data.services import DemographicQuery, EUPatientSearchService
+from patient_data.services.cda_document_index import get_cda_indexer
+
 logger = logging.getLogger("ehealth")
 
 
@@ -632,10 +636,91 @@ def create_search_fields_from_ism(search_mask, ism_data):
         )
 
 
+# ISM field codes by the demographic they carry
+IDENTIFIER_FIELDS = (
+    "patient_id",
+    "national_id",
+    "national_identifier",
+    "pps_number",
+    "social_security",
+    "insurance_number",
+    "taj_number",
+)
+GIVEN_NAME_FIELDS = ("given_name", "given_names", "first_name", "forename")
+FAMILY_NAME_FIELDS = ("family_name", "surname", "last_name")
+
+
+def _first_field(search_fields, field_codes):
+    return next(
+        (search_fields[code] for code in field_codes if search_fields.get(code)), ""
+    )
+
+
+def search_patient_queries(country, search_fields):
+    """
+    Demographic queries for an ISM search, most specific first
+
+    One query per identifier field filled in, then one on the name and
+    birth date.
+    """
+    given_name = _first_field(search_fields, GIVEN_NAME_FIELDS)
+    family_name = _first_field(search_fields, FAMILY_NAME_FIELDS)
+    birth_date = search_fields.get("birth_date", "")
+    queries = [
+        DemographicQuery(
+            country_code=country.code,
+            patient_id=search_fields[code],
+            given_name=given_name,
+            family_name=family_name,
+            birth_date=birth_date,
+        )
+        for code in IDENTIFIER_FIELDS
+        if search_fields.get(code)
+    ]
+    queries.append(
+        DemographicQuery(
+            country_code=country.code,
+            given_name=given_name,
+            family_name=family_name,
+            birth_date=birth_date,
+        )
+    )
+    return queries
+
+
+def search_cda_index(country, search_fields):
+    """Patient in the local CDA index matching an ISM search, or None"""
+    queries = search_patient_queries(country, search_fields)
+    for records in EUPatientSearchService().find_patients(queries):
+        if records:
+            return records[0]
+    return None
+
+
+def cda_index_documents(record):
+    """Available documents for an indexed patient, as the portal lists them"""
+    indexer = get_cda_indexer()
+    documents = []
+    for document in indexer.find_patient_documents(record.patient_id, record.country_code):
+        documents.append(
+            {
+                "type": "PS_L3" if document.cda_type == "L3" else "PS",
+                "title": document.document_title or "Patient Summary",
+                "date": datetime.fromtimestamp(document.last_modified).date().isoformat(),
+                "available": True,
+                "format": f"CDA {document.cda_type}",
+            }
+        )
+    return documents
+
+
 def perform_patient_search(country, search_fields, user):
     """
     Perform patient search using NCP
     Returns PatientSearchResult object
+
+    Patients in the local CDA index are resolved through its normalized
+    demographic keys; other searches fall back to simulated NCP responses.
     """
     # Create search result record
     result = PatientSearchResult.objects.create(
@@ -646,6 +731,25 @@ def perform_patient_search(country, search_fields, user):
     )
 
     try:
+        started = time.perf_counter()
+        record = search_cda_index(country, search_fields)
+        if record is not None:
+            result.patient_found = True
+            result.patient_data = {
+                "id": record.patient_id,
+                "name": f"{record.given_name} {record.family_name}",
+                "birth_date": record.birth_date,
+                "country": country.code,
+                "last_updated": timezone.now().isoformat(),
+                "gender": record.gender,
+                "source": "CDA",
+            }
+            result.available_documents = cda_index_documents(record)
+            result.ncp_response_time = time.perf_counter() - started
+            result.ncp_status_code = "200"
+            result.save()
+            return result
+
         # In production, this would make actual NCP API calls
         # For demo, we'll simulate different responses based on search criteria
 
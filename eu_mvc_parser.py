@@ -5,7 +5,26 @@ Handles the specific structure of MVC 9.0.0 Excel files
 
 import pandas as pd
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from openpyxl import load_workbook
+
+# Column headers that mark the start of the concept table in MVC sheets
+HEADER_INDICATORS = (
+    "code system",
+    "concept code",
+    "description",
+    "language code",
+    "system id",
+    "code",
+    "display",
+)
+
+# Metadata rows are only expected in the first rows of each sheet
+METADATA_ROW_LIMIT = 10
+
+# Fallback data start row when no header row is found
+FALLBACK_DATA_START_ROW = 8
 
 
 class EUMVCParser:
@@ -36,9 +55,99 @@ class EUMVCParser:
         except Exception as e:
             return {"error": str(e), "sheet_name": sheet_name}
 
-    def _extract_value_set_info(self, df: pd.DataFrame, sheet_name: str) -> Dict:
-        """Extract value set metadata from the first few rows"""
-        info = {
+    def open_workbook(self, file_path: str):
+        """Open an MVC workbook once in read-only (streaming) mode
+
+        The returned workbook should be closed by the caller once all
+        required sheets have been parsed with parse_mvc_worksheet().
+        """
+        return load_workbook(file_path, read_only=True, data_only=True)
+
+    def parse_mvc_worksheet(self, workbook, sheet_name: str) -> Dict:
+        """Parse a sheet from an already opened workbook using a row iterator
+
+        Produces the same result structure as parse_mvc_sheet() without
+        re-opening the workbook or materialising the sheet as a DataFrame.
+        """
+        try:
+            rows = workbook[sheet_name].iter_rows(values_only=True)
+            value_set_info, concepts = self._parse_rows(rows, sheet_name)
+
+            return {
+                "value_set_info": value_set_info,
+                "concepts": concepts,
+                "total_concepts": len(concepts),
+                "sheet_name": sheet_name,
+            }
+
+        except Exception as e:
+            return {"error": str(e), "sheet_name": sheet_name}
+
+    def _parse_rows(
+        self, rows: Iterable[Sequence[Any]], sheet_name: str
+    ) -> Tuple[Dict, List[Dict]]:
+        """Stream sheet rows, extracting metadata and concepts in one pass
+
+        The first row is treated as the column header row, mirroring
+        pandas.read_excel. Rows before the concept table header are only
+        buffered until the header is found.
+        """
+        iter_rows = iter(rows)
+        header = next(iter_rows, None)
+        columns = list(header) if header else []
+        width = len(columns)
+
+        info = self._default_value_set_info(sheet_name)
+        if width > 1 and self._is_oid(columns[1]):
+            info["oid"] = columns[1]
+
+        concepts = []
+        pending_rows = []
+        data_started = False
+
+        for idx, raw_row in enumerate(iter_rows):
+            values = self._normalise_row(raw_row, width)
+
+            if idx < METADATA_ROW_LIMIT:
+                self._apply_metadata_row(info, values)
+
+            if data_started:
+                concept = self._parse_concept_values(values)
+                if concept:
+                    concepts.append(concept)
+            elif self._is_header_values(values):
+                data_started = True
+                pending_rows = []
+            else:
+                pending_rows.append(values)
+
+        if not data_started and len(pending_rows) > FALLBACK_DATA_START_ROW:
+            for values in pending_rows[FALLBACK_DATA_START_ROW:]:
+                concept = self._parse_concept_values(values)
+                if concept:
+                    concepts.append(concept)
+
+        return info, concepts
+
+    @staticmethod
+    def _normalise_row(raw_row: Sequence[Any], width: int) -> List[Any]:
+        """Pad a row to the header width and map empty cells to None"""
+        values = [
+            None if cell is None or cell == "" or cell != cell else cell
+            for cell in raw_row
+        ]
+        if len(values) < width:
+            values.extend([None] * (width - len(values)))
+        return values
+
+    @staticmethod
+    def _series_values(row: pd.Series) -> List[Any]:
+        """Convert a DataFrame row to a list with missing cells as None"""
+        return [cell if pd.notna(cell) else None for cell in row]
+
+    @staticmethod
+    def _default_value_set_info(sheet_name: str) -> Dict:
+        return {
             "name": sheet_name,
             "oid": None,
             "canonical_url": None,
@@ -46,6 +155,36 @@ class EUMVCParser:
             "version": "9.0.0",  # Default from MVC 9.0.0
         }
 
+    @staticmethod
+    def _apply_metadata_row(info: Dict, values: Sequence[Any]) -> None:
+        """Update value set metadata from a single header-area row"""
+        if not values or values[0] is None:
+            return
+
+        label = str(values[0])
+        value = values[1] if len(values) > 1 else None
+
+        # Check for value set name
+        if "Value Set Name" in label and value is not None:
+            info["name"] = str(value)
+
+        # Check for canonical URL
+        if "Canonical URL" in label and value is not None:
+            info["canonical_url"] = str(value)
+
+    @staticmethod
+    def _is_header_values(values: Sequence[Any]) -> bool:
+        """Check whether a row holds the concept table column headers"""
+        if len(values) < 3:  # Should have multiple columns
+            return False
+
+        row_str = " ".join(str(cell) for cell in values if cell is not None).lower()
+        return any(indicator in row_str for indicator in HEADER_INDICATORS)
+
+    def _extract_value_set_info(self, df: pd.DataFrame, sheet_name: str) -> Dict:
+        """Extract value set metadata from the first few rows"""
+        info = self._default_value_set_info(sheet_name)
+
         # Look for OID in column headers (usually second column)
         if len(df.columns) > 1:
             potential_oid = df.columns[1]
@@ -53,18 +192,8 @@ class EUMVCParser:
                 info["oid"] = potential_oid
 
         # Look for metadata in first few rows
-        for idx in range(min(10, len(df))):
-            row = df.iloc[idx]
-
-            # Check for value set name
-            if pd.notna(row.iloc[0]) and "Value Set Name" in str(row.iloc[0]):
-                if len(row) > 1 and pd.notna(row.iloc[1]):
-                    info["name"] = str(row.iloc[1])
-
-            # Check for canonical URL
-            if pd.notna(row.iloc[0]) and "Canonical URL" in str(row.iloc[0]):
-                if len(row) > 1 and pd.notna(row.iloc[1]):
-                    info["canonical_url"] = str(row.iloc[1])
+        for idx in range(min(METADATA_ROW_LIMIT, len(df))):
+            self._apply_metadata_row(info, self._series_values(df.iloc[idx]))
 
         return info
 
@@ -94,45 +223,31 @@ class EUMVCParser:
         # This is typically after the metadata section and an empty row
 
         for idx in range(len(df)):
-            row = df.iloc[idx]
-
             # Look for a row that contains column headers like "Code System ID", "Concept Code", etc.
-            if len(row) >= 3:  # Should have multiple columns
-                row_str = " ".join(
-                    [str(cell) for cell in row if pd.notna(cell)]
-                ).lower()
-
-                # Check for typical column headers in MVC files
-                header_indicators = [
-                    "code system",
-                    "concept code",
-                    "description",
-                    "language code",
-                    "system id",
-                    "code",
-                    "display",
-                ]
-
-                if any(indicator in row_str for indicator in header_indicators):
-                    # This is the header row, data starts on the next row
-                    return idx + 1
+            if self._is_header_values(self._series_values(df.iloc[idx])):
+                # This is the header row, data starts on the next row
+                return idx + 1
 
         # Fallback: if no clear header found, assume data starts after row 8 (common in MVC files)
-        if len(df) > 8:
-            return 8
+        if len(df) > FALLBACK_DATA_START_ROW:
+            return FALLBACK_DATA_START_ROW
 
         return None
 
     def _looks_like_concept_row(self, row: pd.Series) -> bool:
         """Check if a row looks like it contains concept data"""
-        non_null_count = row.notna().sum()
+        return self._looks_like_concept_values(self._series_values(row))
+
+    @staticmethod
+    def _looks_like_concept_values(values: Sequence[Any]) -> bool:
+        """Check if a list of cell values looks like concept data"""
+        non_null_count = sum(1 for cell in values if cell is not None)
 
         # Must have at least 2 non-null values
         if non_null_count < 2:
             return False
 
-        # Check if first column looks like a code
-        first_col = str(row.iloc[0]) if pd.notna(row.iloc[0]) else ""
+        first_col = str(values[0]) if values[0] is not None else ""
 
         # Skip obvious header rows
         if any(
@@ -150,26 +265,14 @@ class EUMVCParser:
 
         return True
 
-        # Look for patterns that suggest this is concept data
-        # Codes are often alphanumeric, sometimes with dots or dashes
-        if re.match(r"^[A-Za-z0-9][A-Za-z0-9\.\-_]*$", first_col.strip()):
-            return True
-
-        return False
-
     def _parse_concept_row(self, row: pd.Series, columns: List[str]) -> Optional[Dict]:
         """Parse a single concept row based on MVC structure"""
-        if not self._looks_like_concept_row(row):
-            return None
+        return self._parse_concept_values(self._series_values(row))
 
-        concept = {
-            "code_system_id": None,
-            "code_system_version": None,
-            "concept_code": None,
-            "description": None,
-            "language_code_1": None,
-            "language_code_2": None,
-        }
+    def _parse_concept_values(self, values: Sequence[Any]) -> Optional[Dict]:
+        """Parse concept cell values based on MVC structure"""
+        if not self._looks_like_concept_values(values):
+            return None
 
         # Based on the screenshot structure:
         # Column A: Code System ID
@@ -178,35 +281,25 @@ class EUMVCParser:
         # Column D: Description
         # Column E: <language code 1>
         # Column F: <language code 2>
-
-        try:
-            if len(row) >= 1 and pd.notna(row.iloc[0]):
-                concept["code_system_id"] = str(row.iloc[0]).strip()
-
-            if len(row) >= 2 and pd.notna(row.iloc[1]):
-                concept["code_system_version"] = str(row.iloc[1]).strip()
-
-            if len(row) >= 3 and pd.notna(row.iloc[2]):
-                concept["concept_code"] = str(row.iloc[2]).strip()
-
-            if len(row) >= 4 and pd.notna(row.iloc[3]):
-                concept["description"] = str(row.iloc[3]).strip()
-
-            if len(row) >= 5 and pd.notna(row.iloc[4]):
-                concept["language_code_1"] = str(row.iloc[4]).strip()
-
-            if len(row) >= 6 and pd.notna(row.iloc[5]):
-                concept["language_code_2"] = str(row.iloc[5]).strip()
-
-            # Only return if we have essential data
-            if concept["concept_code"] and (
-                concept["description"] or concept["language_code_1"]
-            ):
-                return concept
-
-        except Exception as e:
-            # If parsing fails, fall back to simple extraction
-            pass
+        fields = (
+            "code_system_id",
+            "code_system_version",
+            "concept_code",
+            "description",
+            "language_code_1",
+            "language_code_2",
+        )
+        concept = dict.fromkeys(fields)
+
+        for position, field in enumerate(fields):
+            if position < len(values) and values[position] is not None:
+                concept[field] = str(values[position]).strip()
+
+        # Only return if we have essential data
+        if concept["concept_code"] and (
+            concept["description"] or concept["language_code_1"]
+        ):
+            return concept
 
         return None
 
@@ -0,0 +1,69 @@
+"""
+Cache Generation Counters
+Invalidate a family of cached values by bumping one shared counter
+
+Callers tag what they cache with the current generation and bump it when
+the underlying rows change; values tagged with an older generation are
+never served again. The counter lives in the default cache, so a bump is
+only seen by the processes sharing that cache. With a process-local
+backend (LocMemCache, DummyCache) it reaches the bumping worker alone, and
+every other worker keeps serving what it has cached. For those backends
+max_age() caps how long a value may be kept (the *_LOCAL_CACHE_TIMEOUT
+setting of the counter), which bounds the staleness seen across workers.
+"""
+
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+# Defaults (overridable in settings)
+DEFAULT_LOCAL_CACHE_TIMEOUT = 60
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def cache_is_process_local() -> bool:
+    """Whether the default cache is private to this process"""
+    return isinstance(caches["default"], PROCESS_LOCAL_BACKENDS)
+
+
+class CacheGeneration:
+    """Invalidation counter stored in the default cache under ``key``"""
+
+    def __init__(self, key: str, local_timeout_setting: str):
+        self.key = key
+        self.local_timeout_setting = local_timeout_setting
+
+    def current(self) -> int:
+        generation = cache.get(self.key)
+        if generation is None:
+            # Seed from the clock, so a generation lost to cache eviction
+            # can never bring back values tagged with an earlier one
+            cache.add(self.key, time.time_ns(), None)
+            generation = cache.get(self.key)
+        return generation
+
+    def bump(self):
+        """Make every value tagged with an earlier generation stale"""
+        try:
+            cache.incr(self.key)
+        except ValueError:
+            cache.set(self.key, time.time_ns(), None)
+
+    def max_age(self, timeout: Optional[int] = None) -> Optional[int]:
+        """
+        Longest time, in seconds, a tagged value may be kept
+
+        ``timeout`` (None for no limit) when the cache is shared between
+        processes; otherwise capped at the local cache timeout.
+        """
+        if not cache_is_process_local():
+            return timeout
+        local_timeout = getattr(
+            settings, self.local_timeout_setting, DEFAULT_LOCAL_CACHE_TIMEOUT
+        )
+        return local_timeout if timeout is None else min(timeout, local_timeout)
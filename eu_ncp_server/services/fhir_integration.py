@@ -9,6 +9,11 @@ This service handles:
 - FHIR resource validation and conversion
 - Audit logging for healthcare data access
 
+Patient Summaries are posted as a single FHIR transaction Bundle (or, above
+HAPI_FHIR_TRANSACTION_MAX_ENTRIES entries, as a few dependency-ordered
+transactions) over one pooled requests.Session, so the server receives one
+request and commits once per transaction rather than once per resource.
+
 HAPI FHIR Server Details:
 - Base URL: https://hapi.fhir.org/baseR4 (test server)
 - FHIR Version: R4 (4.0.1)
@@ -19,14 +24,24 @@ HAPI FHIR Server Details:
 import requests
 import json
 import logging
+import uuid
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Union
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 from django.core.cache import cache
 
 logger = logging.getLogger("ehealth")
 audit_logger = logging.getLogger("audit")
 
+# Defaults (overridable in settings)
+DEFAULT_TRANSACTION_MAX_ENTRIES = 500
+DEFAULT_POOL_MAXSIZE = 10
+
+# Resource types created conditionally (ifNoneExist on their first
+# identifier) so re-posting a summary does not duplicate them
+CONDITIONAL_CREATE_TYPES = ("Patient", "Practitioner", "Organization")
+
 
 class HAPIFHIRIntegrationService:
     """Service for integrating with HAPI FHIR R4 server"""
@@ -36,7 +51,18 @@ class HAPIFHIRIntegrationService:
         self.base_url = getattr(settings, 'HAPI_FHIR_BASE_URL', 'https://hapi.fhir.org/baseR4')
         self.timeout = getattr(settings, 'HAPI_FHIR_TIMEOUT', 30)
         self.cache_timeout = 300  # 5 minutes
-        
+        self.transaction_max_entries = getattr(
+            settings, 'HAPI_FHIR_TRANSACTION_MAX_ENTRIES', DEFAULT_TRANSACTION_MAX_ENTRIES
+        )
+
+        # Keep-alive connection pool for all requests to the FHIR server
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_maxsize=getattr(settings, 'HAPI_FHIR_POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
     def _get_headers(self) -> Dict[str, str]:
         """Get standard headers for HAPI FHIR API requests"""
         headers = {
@@ -53,11 +79,11 @@ class HAPIFHIRIntegrationService:
         
         try:
             if method.upper() == 'GET':
-                response = requests.get(url, headers=headers, params=params, timeout=self.timeout)
+                response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
             elif method.upper() == 'POST':
-                response = requests.post(url, headers=headers, json=data, timeout=self.timeout)
+                response = self.session.post(url, headers=headers, json=data, timeout=self.timeout)
             elif method.upper() == 'PUT':
-                response = requests.put(url, headers=headers, json=data, timeout=self.timeout)
+                response = self.session.put(url, headers=headers, json=data, timeout=self.timeout)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
@@ -435,11 +461,18 @@ class HAPIFHIRIntegrationService:
     def post_patient_summary(self, patient_summary_bundle: Dict[str, Any], requesting_user: str) -> Dict[str, Any]:
         """
         Post Patient Summary Bundle to HAPI FHIR server
-        
+
+        The bundle's resources are posted as one FHIR transaction, linked by
+        urn:uuid references. Patient, Practitioner and Organization are
+        created conditionally on their identifier. Bundles larger than
+        HAPI_FHIR_TRANSACTION_MAX_ENTRIES are split into transactions in
+        dependency order, with references to resources created by earlier
+        transactions rewritten to their server ids.
+
         Args:
             patient_summary_bundle: FHIR Bundle to post
             requesting_user: Username of posting user
-            
+
         Returns:
             Server response with created resource information
         """
@@ -447,40 +480,158 @@ class HAPIFHIRIntegrationService:
             # Validate bundle structure
             if not self._validate_fhir_bundle(patient_summary_bundle):
                 raise ValueError("Invalid FHIR Bundle structure")
-            
-            # Post bundle to HAPI FHIR server
-            response = self._make_request('POST', '', patient_summary_bundle)
-            
-            # Extract created resource information
+
+            entries = self._build_transaction_entries(patient_summary_bundle)
+            chunk_size = max(1, self.transaction_max_entries)
+
+            responses = []
             created_resources = []
-            if response.get('resourceType') == 'Bundle' and response.get('type') == 'transaction-response':
-                for entry in response.get('entry', []):
-                    if entry.get('response', {}).get('status', '').startswith('201'):
+            server_ids: Dict[str, str] = {}
+            for start in range(0, len(entries), chunk_size):
+                chunk = entries[start:start + chunk_size]
+                for entry in chunk:
+                    self._rewrite_references(entry['resource'], server_ids)
+
+                response = self._make_request('POST', '', {
+                    'resourceType': 'Bundle',
+                    'type': 'transaction',
+                    'entry': chunk,
+                })
+                responses.append(response)
+
+                for entry, response_entry in zip(chunk, response.get('entry', [])):
+                    entry_response = response_entry.get('response', {})
+                    location = entry_response.get('location', '')
+                    resource_reference = '/'.join(location.split('/_history')[0].split('/')[-2:])
+                    if resource_reference:
+                        server_ids[entry['fullUrl']] = resource_reference
+                    if entry_response.get('status', '').startswith('201'):
+                        resource_type, _, resource_id = resource_reference.partition('/')
                         created_resources.append({
-                            'resource_type': entry.get('resource', {}).get('resourceType'),
-                            'id': entry.get('resource', {}).get('id'),
-                            'location': entry.get('response', {}).get('location')
+                            'resource_type': resource_type,
+                            'id': resource_id,
+                            'location': location
                         })
-            
+
             result = {
                 'status': 'success',
-                'bundle_id': response.get('id'),
+                'bundle_id': responses[-1].get('id') if responses else None,
                 'created_resources': created_resources,
-                'server_response': response,
+                'transaction_count': len(responses),
+                'server_response': responses[-1] if responses else {},
                 'posted_at': datetime.now(timezone.utc).isoformat()
             }
-            
+
             audit_logger.info(
                 f"Patient Summary posted to HAPI FHIR: resources={len(created_resources)}, "
-                f"user={requesting_user}, bundle_id={response.get('id')}"
+                f"transactions={len(responses)}, user={requesting_user}, "
+                f"bundle_id={result['bundle_id']}"
             )
-            
+
             return result
-            
+
         except Exception as e:
             logger.error(f"Failed to post Patient Summary to HAPI FHIR: {str(e)}")
             raise HAPIFHIRIntegrationError(f"Patient Summary posting failed: {str(e)}")
-    
+
+    def _build_transaction_entries(self, bundle: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Transaction entries for a bundle's resources, in dependency order
+
+        Every entry gets a urn:uuid fullUrl and references between the
+        bundle's resources are rewritten to those urn:uuids. Referenced
+        resources are ordered before the resources referencing them, so a
+        bundle split into several transactions never refers forward.
+        Entries that bring their own non-POST request keep their resource
+        id and are not made conditional; the bundle itself is not modified.
+        """
+        entries = []
+        aliases: Dict[str, str] = {}
+        for entry in bundle.get('entry', []):
+            resource = entry.get('resource')
+            if not resource:
+                continue
+            resource = json.loads(json.dumps(resource))
+            resource_type = resource['resourceType']
+
+            full_url = entry.get('fullUrl', '')
+            if not full_url.startswith('urn:uuid:'):
+                full_url = f"urn:uuid:{uuid.uuid4()}"
+                if entry.get('fullUrl'):
+                    aliases[entry['fullUrl']] = full_url
+            request = dict(entry.get('request') or {'method': 'POST', 'url': resource_type})
+            creates = request.get('method', 'POST').upper() == 'POST'
+
+            if resource.get('id'):
+                aliases[f"{resource_type}/{resource['id']}"] = full_url
+                # A created resource gets its id from the server; any other
+                # request (e.g. PUT Patient/123) addresses the id it carries
+                if creates:
+                    del resource['id']
+
+            if creates and resource_type in CONDITIONAL_CREATE_TYPES and 'ifNoneExist' not in request:
+                identifier = next(
+                    (i for i in resource.get('identifier', []) if i.get('system') and i.get('value')),
+                    None,
+                )
+                if identifier:
+                    request['ifNoneExist'] = f"identifier={identifier['system']}|{identifier['value']}"
+
+            entries.append({'fullUrl': full_url, 'resource': resource, 'request': request})
+
+        for entry in entries:
+            self._rewrite_references(entry['resource'], aliases)
+
+        return self._dependency_order(entries)
+
+    def _dependency_order(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Order entries so referenced entries come first; cycles keep bundle order"""
+        by_url = {entry['fullUrl']: entry for entry in entries}
+        ordered: List[Dict[str, Any]] = []
+        placed = set()
+        visiting = set()
+
+        def place(entry):
+            full_url = entry['fullUrl']
+            if full_url in placed or full_url in visiting:
+                return
+            visiting.add(full_url)
+            for reference in self._references(entry['resource']):
+                if reference in by_url:
+                    place(by_url[reference])
+            visiting.discard(full_url)
+            placed.add(full_url)
+            ordered.append(entry)
+
+        for entry in entries:
+            place(entry)
+        return ordered
+
+    def _references(self, value: Any):
+        """All reference strings in a resource"""
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key == 'reference' and isinstance(item, str):
+                    yield item
+                else:
+                    yield from self._references(item)
+        elif isinstance(value, list):
+            for item in value:
+                yield from self._references(item)
+
+    def _rewrite_references(self, value: Any, replacements: Dict[str, str]):
+        """Replace reference strings in a resource, in place"""
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key == 'reference' and isinstance(item, str):
+                    if item in replacements:
+                        value[key] = replacements[item]
+                else:
+                    self._rewrite_references(item, replacements)
+        elif isinstance(value, list):
+            for item in value:
+                self._rewrite_references(item, replacements)
+
     def search_patients(self, search_params: Dict[str, str]) -> Dict[str, Any]:
         """
         Search for patients in HAPI FHIR server
@@ -16,14 +16,15 @@ import logging
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Union
 from django.conf import settings
-from fhir.resources.bundle import Bundle
-from fhir.resources.patient import Patient
-from fhir.resources.allergyintolerance import AllergyIntolerance
-from fhir.resources.medicationstatement import MedicationStatement
-from fhir.resources.condition import Condition
-from fhir.resources.observation import Observation
 from translation_services.terminology_translator import TerminologyTranslator
 from patient_data.utils.date_formatter import ClinicalDateFormatter
+from eu_ncp_server.services.ucum_formatting import (
+    format_observation_series,
+    is_ucum_system,
+    quantity_display,
+    ucum_display,
+    unit_display,
+)
 
 logger = logging.getLogger("ehealth")
 
@@ -436,7 +437,9 @@ class FHIRResourceProcessor:
     # Comprehensive support for all major FHIR data types
     # ===================================================================
     
-    def _extract_quantity_data(self, quantity: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_quantity_data(
+        self, quantity: Dict[str, Any], display_value: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Extract complete FHIR R4 Quantity data structure"""
         if not quantity:
             return {}
@@ -445,98 +448,26 @@ class FHIRResourceProcessor:
             'value': quantity.get('value'),
             'comparator': quantity.get('comparator'),  # <, <=, >=, >
             'unit': quantity.get('unit'),
+            'unit_display': unit_display(
+                quantity.get('unit'), quantity.get('code'), quantity.get('system')
+            ),
             'system': quantity.get('system'),  # UCUM system preferred
             'code': quantity.get('code'),
-            'display_value': self._format_quantity_display(quantity),
+            'display_value': display_value or quantity_display(quantity),
             'is_ucum_compliant': self._is_ucum_quantity(quantity)
         }
     
     def _format_quantity_display(self, quantity: Dict[str, Any]) -> str:
         """Format quantity for human-readable display with UCUM code translation"""
-        if not quantity or not quantity.get('value'):
-            return 'Unknown quantity'
-        
-        value = quantity.get('value')
-        unit_text = quantity.get('unit')
-        ucum_code = quantity.get('code', '')
-        comparator = quantity.get('comparator', '')
-        
-        # CRITICAL: FHIR 'unit' field often contains UCUM codes, not human-readable text
-        # Always attempt translation through UCUM mapper first
-        if ucum_code:
-            translated_unit = self._ucum_to_readable(ucum_code)
-            # If mapper didn't change it (returned same code), check if unit_text is better
-            if translated_unit == ucum_code and unit_text and unit_text != ucum_code:
-                final_unit = unit_text
-            else:
-                final_unit = translated_unit
-        elif unit_text:
-            final_unit = unit_text
-        else:
-            final_unit = ''
-        
-        # Format display value
-        display = f"{comparator}{value}"
-        if final_unit:
-            display += f" {final_unit}"
-        
-        return display
+        return quantity_display(quantity)
     
     def _ucum_to_readable(self, ucum_code: str) -> str:
-        """
-        Convert UCUM codes to human-readable text
-        
-        Common UCUM codes in healthcare observations:
-        - /d = per day
-        - /wk = per week
-        - /mo = per month
-        - /yr = per year
-        - mg = milligram
-        - g = gram
-        - mL = milliliter
-        - L = liter
-        - cm = centimeter
-        - kg = kilogram
-        """
-        ucum_to_text = {
-            # Time-based rates
-            '/d': 'per day',
-            '/wk': 'per week',
-            '/mo': 'per month',
-            '/yr': 'per year',
-            '/h': 'per hour',
-            '/min': 'per minute',
-            # Compound units (packs per day, drinks per day)
-            '{pack}/d': 'packs per day',
-            '{drink}/d': 'drinks per day',
-            # Mass units
-            'mg': 'mg',
-            'g': 'g',
-            'kg': 'kg',
-            'ug': 'mcg',  # microgram
-            # Volume units
-            'mL': 'mL',
-            'L': 'L',
-            'dL': 'dL',
-            # Length units
-            'cm': 'cm',
-            'm': 'm',
-            'mm': 'mm',
-            # Pressure units
-            'mm[Hg]': 'mmHg',
-            # Percentage
-            '%': '%',
-            # Dimensionless (per unit)
-            '1': '',
-            '{count}': '',
-        }
-        
-        return ucum_to_text.get(ucum_code, ucum_code)
+        """Convert UCUM codes to human-readable text (see ucum_formatting.UCUM_DISPLAY)"""
+        return ucum_display(ucum_code)
     
     def _is_ucum_quantity(self, quantity: Dict[str, Any]) -> bool:
         """Check if quantity uses UCUM system"""
-        system = quantity.get('system', '')
-        return 'unitsofmeasure.org' in system.lower() or 'ucum.org' in system.lower()
+        return is_ucum_system(quantity.get('system'))
     
     def _extract_range_data(self, range_obj: Dict[str, Any]) -> Dict[str, Any]:
         """Extract FHIR R4 Range data structure"""
@@ -991,10 +922,14 @@ class FHIRResourceProcessor:
     def _format_observations_for_display(self, observations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Format observations for template display"""
         formatted = []
-        for obs in observations:
+        quantity_displays = format_observation_series(
+            {'valueQuantity': obs['value']} if obs['value'].get('type') == 'quantity' else {}
+            for obs in observations
+        )
+        for obs, quantity_text in zip(observations, quantity_displays):
             value_display = "Unknown"
-            if obs['value'].get('type') == 'quantity':
-                value_display = f"{obs['value']['value']} {obs['value']['unit']}"
+            if quantity_text is not None:
+                value_display = quantity_text
             elif obs['value'].get('type') == 'concept':
                 value_display = obs['value']['coding'].get('display', 'Unknown')
             elif obs['value'].get('type') == 'string':
@@ -6,6 +6,8 @@ based on Django settings. Azure FHIR is the default production service.
 """
 
 import logging
+from threading import Lock
+
 from django.conf import settings
 
 logger = logging.getLogger("ehealth")
@@ -34,20 +36,41 @@ def get_fhir_service():
         return HAPIFHIRIntegrationService()
 
 
-# Singleton instance for convenience
-_fhir_service_instance = None
+# Cached service instances, keyed by provider
+_fhir_service_instances = {}
+_fhir_service_lock = Lock()
 
 
 def get_fhir_service_singleton():
-    """Get cached singleton instance of FHIR service"""
-    global _fhir_service_instance
-    
-    if _fhir_service_instance is None:
-        _fhir_service_instance = get_fhir_service()
-        logger.info(f"Initialized FHIR service: {type(_fhir_service_instance).__name__}")
-    
-    return _fhir_service_instance
+    """
+    Get the cached FHIR service instance for the configured provider
+
+    The service is constructed on first use, not at import, so importing
+    this module (and every view that does) costs nothing and a missing
+    provider configuration only fails when the service is actually needed.
+    Construction is serialized so concurrent first requests share one
+    instance (and its connection pool and access token).
+    """
+    fhir_provider = getattr(settings, 'FHIR_PROVIDER', 'AZURE').upper()
+    service = _fhir_service_instances.get(fhir_provider)
+    if service is None:
+        with _fhir_service_lock:
+            service = _fhir_service_instances.get(fhir_provider)
+            if service is None:
+                service = get_fhir_service()
+                _fhir_service_instances[fhir_provider] = service
+                logger.info(f"Initialized FHIR service: {type(service).__name__}")
+    return service
+
+
+def reset_fhir_service_singleton():
+    """Drop cached service instances (after a settings or credentials change)"""
+    with _fhir_service_lock:
+        _fhir_service_instances.clear()
 
 
-# Convenience alias for backward compatibility
-fhir_service = get_fhir_service_singleton()
+def __getattr__(name):
+    # Convenience alias for backward compatibility, resolved on first access
+    if name == 'fhir_service':
+        return get_fhir_service_singleton()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,50 +1,119 @@
 """
 System Status Service
-Provides real-time status checking for EU eHealth NCP infrastructure components
+Provides status checking for EU eHealth NCP infrastructure components
+
+Component probes run in a periodic in-process background prober, never on
+the request thread. Each cycle runs the probes concurrently with a per-check
+timeout and stores the resulting snapshot in the cache; the status page only
+reads the last snapshot and reports its age.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
+import threading
+import time
 import requests
 from django.conf import settings
 from django.core.cache import cache
+from django.db import connections
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Defaults (overridable in settings)
+DEFAULT_PROBE_INTERVAL_SECONDS = 60
+DEFAULT_PROBE_TIMEOUT_SECONDS = 5
+
 
 class SystemStatusService:
-    """Service for checking and caching system component status"""
+    """Service for reading the system status snapshot kept by the prober"""
     
     CACHE_KEY = "system_status"
     CACHE_TIMEOUT = 300  # 5 minutes
+
+    # Component name -> check method name; the methods return status dicts
+    PROBES = {
+        'api_gateway': '_check_api_gateway',
+        'smp_services': '_check_smp_services',
+        'authentication': '_check_authentication',
+    }
     
     @classmethod
     def get_system_status(cls) -> Dict[str, Any]:
         """
-        Get current system status with caching
-        Returns cached status if available, otherwise performs fresh check
+        Get the last status snapshot and its age
+
+        Never probes on the calling thread. Until the background prober has
+        completed its first cycle, a snapshot with 'unknown' status is
+        returned.
         """
-        cached_status = cache.get(cls.CACHE_KEY)
-        if cached_status:
-            return cached_status
-        
-        return cls.check_system_status()
+        if getattr(settings, "SYSTEM_STATUS_PROBER_ENABLED", True):
+            system_status_prober.ensure_started()
+
+        status = cache.get(cls.CACHE_KEY)
+        if not status:
+            return cls._pending_status()
+
+        status = dict(status)
+        status['age_seconds'] = (
+            datetime.now(timezone.utc) - status['last_updated']
+        ).total_seconds()
+        return status
+
+    @classmethod
+    def _pending_status(cls) -> Dict[str, Any]:
+        pending = {'status': 'unknown', 'label': 'Checking', 'last_check': None}
+        return {
+            'last_updated': None,
+            'age_seconds': None,
+            'overall_status': 'unknown',
+            'components': {name: dict(pending) for name in cls.PROBES},
+        }
     
     @classmethod
-    def check_system_status(cls) -> Dict[str, Any]:
+    def check_system_status(cls, timeout: Optional[float] = None) -> Dict[str, Any]:
         """
-        Perform real-time system status check
-        Returns status information for all components
+        Run all component probes concurrently and cache the snapshot
+
+        A probe that does not finish within ``timeout`` seconds is reported
+        as offline; it keeps running in its worker but does not delay the
+        snapshot.
         """
+        if timeout is None:
+            timeout = getattr(
+                settings, "SYSTEM_STATUS_PROBE_TIMEOUT", DEFAULT_PROBE_TIMEOUT_SECONDS
+            )
+
+        executor = ThreadPoolExecutor(
+            max_workers=len(cls.PROBES), thread_name_prefix="status-probe"
+        )
+        futures = {
+            name: executor.submit(cls._run_probe, getattr(cls, check))
+            for name, check in cls.PROBES.items()
+        }
+        executor.shutdown(wait=False)
+
+        components = {}
+        deadline = time.monotonic() + timeout
+        for name, future in futures.items():
+            remaining = max(deadline - time.monotonic(), 0)
+            try:
+                components[name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                logger.warning(f"Status probe {name} timed out after {timeout}s")
+                components[name] = {
+                    'status': 'offline',
+                    'label': 'Timeout',
+                    'last_check': datetime.now(timezone.utc),
+                    'error': f'No response within {timeout}s',
+                }
+
         status = {
             'last_updated': datetime.now(timezone.utc),
             'overall_status': 'operational',
-            'components': {
-                'api_gateway': cls._check_api_gateway(),
-                'smp_services': cls._check_smp_services(),
-                'authentication': cls._check_authentication(),
-            }
+            'components': components,
         }
         
         # Determine overall status based on components
@@ -58,6 +127,22 @@ class SystemStatusService:
         cache.set(cls.CACHE_KEY, status, cls.CACHE_TIMEOUT)
         
         return status
+
+    @staticmethod
+    def _run_probe(check: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        try:
+            return check()
+        except Exception as e:
+            logger.error(f"Status probe failed: {e}")
+            return {
+                'status': 'offline',
+                'label': 'Error',
+                'last_check': datetime.now(timezone.utc),
+                'error': str(e),
+            }
+        finally:
+            # Probe threads are short-lived; release their DB connections
+            connections.close_all()
     
     @classmethod
     def _check_api_gateway(cls) -> Dict[str, Any]:
@@ -65,8 +150,14 @@ class SystemStatusService:
         try:
             # Test a simple API endpoint
             response = requests.get(
-                'http://127.0.0.1:8000/api/countries/',
-                timeout=5,
+                getattr(
+                    settings,
+                    "SYSTEM_STATUS_API_URL",
+                    'http://127.0.0.1:8000/api/countries/',
+                ),
+                timeout=getattr(
+                    settings, "SYSTEM_STATUS_PROBE_TIMEOUT", DEFAULT_PROBE_TIMEOUT_SECONDS
+                ),
                 headers={'Accept': 'application/json'}
             )
             
@@ -159,4 +250,58 @@ class SystemStatusService:
     def force_status_refresh(cls) -> Dict[str, Any]:
         """Force a fresh status check, bypassing cache"""
         cache.delete(cls.CACHE_KEY)
-        return cls.check_system_status()
\ No newline at end of file
+        return cls.check_system_status()
+
+
+class SystemStatusProber:
+    """
+    Periodic in-process background prober
+
+    A daemon thread runs SystemStatusService.check_system_status every
+    SYSTEM_STATUS_PROBE_INTERVAL seconds. Started lazily by the first status
+    request in each worker process.
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        self._interval = interval
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def interval(self) -> float:
+        if self._interval is not None:
+            return self._interval
+        return getattr(
+            settings, "SYSTEM_STATUS_PROBE_INTERVAL", DEFAULT_PROBE_INTERVAL_SECONDS
+        )
+
+    def ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="system-status-prober", daemon=True
+            )
+            self._thread.start()
+            logger.info(f"Started system status prober (interval {self.interval}s)")
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                SystemStatusService.check_system_status()
+            except Exception as e:
+                logger.error(f"System status probe cycle failed: {e}")
+            self._stop_event.wait(self.interval)
+
+
+system_status_prober = SystemStatusProber()
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+UCUM Unit and Quantity Formatting
+
+Single place where FHIR Quantities are turned into display strings. UCUM
+codes are translated through a precompiled table, and formatted quantities
+are memoized in a bounded LRU keyed on (comparator, value, unit, code,
+system): observation series repeat the same few units and values, so most
+lookups are cache hits.
+
+format_observation_series formats a whole list of Observations in one call
+and is what the bundle parser and the display conversion use.
+"""
+
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Optional
+
+# Formatted quantities kept in the LRU cache
+QUANTITY_CACHE_SIZE = 4096
+
+UCUM_SYSTEMS = ("unitsofmeasure.org", "ucum.org")
+
+# UCUM code -> display unit
+UCUM_DISPLAY = MappingProxyType({
+    # Time-based rates
+    "/d": "per day",
+    "/wk": "per week",
+    "/mo": "per month",
+    "/yr": "per year",
+    "/a": "per year",
+    "/h": "per hour",
+    "/min": "per minute",
+    # Compound units (packs per day, drinks per day)
+    "{pack}/d": "packs per day",
+    "{drink}/d": "drinks per day",
+    "{beats}/min": "beats per minute",
+    "{breaths}/min": "breaths per minute",
+    # Mass units
+    "mg": "mg",
+    "g": "g",
+    "kg": "kg",
+    "ug": "mcg",  # microgram
+    "ng": "ng",
+    "[lb_av]": "lb",
+    # Volume units
+    "mL": "mL",
+    "L": "L",
+    "dL": "dL",
+    # Length units
+    "cm": "cm",
+    "m": "m",
+    "mm": "mm",
+    "[in_i]": "in",
+    # Pressure units
+    "mm[Hg]": "mmHg",
+    # Temperature units
+    "Cel": "°C",
+    "[degF]": "°F",
+    # Body mass index
+    "kg/m2": "kg/m²",
+    # Laboratory concentrations and counts
+    "mg/dL": "mg/dL",
+    "g/dL": "g/dL",
+    "mmol/L": "mmol/L",
+    "umol/L": "µmol/L",
+    "U/L": "U/L",
+    "[IU]": "IU",
+    "[IU]/L": "IU/L",
+    "meq/L": "mEq/L",
+    "10*3/uL": "×10³/µL",
+    "10*9/L": "×10⁹/L",
+    "10*12/L": "×10¹²/L",
+    # Percentage
+    "%": "%",
+    # Dimensionless (per unit)
+    "1": "",
+    "{count}": "",
+})
+
+
+def is_ucum_system(system: Optional[str]) -> bool:
+    """Whether a Quantity system URI is UCUM"""
+    system = (system or "").lower()
+    return any(ucum in system for ucum in UCUM_SYSTEMS)
+
+
+def ucum_display(code: str) -> str:
+    """Display text for a UCUM code; unknown codes are shown as is"""
+    return UCUM_DISPLAY.get(code, code)
+
+
+def unit_display(
+    unit: Optional[str] = None, code: Optional[str] = None, system: Optional[str] = None
+) -> str:
+    """
+    Display unit for a Quantity's unit, code and system
+
+    The UCUM code is translated first; a human-readable unit text is
+    preferred over an untranslated code. A UCUM quantity without a code
+    often carries the code in unit, so that is translated too.
+    """
+    if code:
+        translated = ucum_display(code)
+        if translated == code and unit and unit != code:
+            return unit
+        return translated
+    if unit:
+        return ucum_display(unit) if is_ucum_system(system) else unit
+    return ""
+
+
+# typed: 5 and 5.0 display differently
+@lru_cache(maxsize=QUANTITY_CACHE_SIZE, typed=True)
+def format_quantity(
+    value: Any,
+    unit: Optional[str] = None,
+    code: Optional[str] = None,
+    system: Optional[str] = None,
+    comparator: Optional[str] = None,
+) -> str:
+    """Display string for a Quantity, e.g. "<5 mmol/L" or "120 mmHg\""""
+    if value is None or value == "":
+        return "Unknown quantity"
+    display = f"{comparator or ''}{value}"
+    unit_text = unit_display(unit, code, system)
+    if unit_text:
+        display += f" {unit_text}"
+    return display
+
+
+def quantity_display(quantity: Optional[Dict[str, Any]]) -> str:
+    """Display string for a FHIR Quantity dict"""
+    if not quantity:
+        return "Unknown quantity"
+    return format_quantity(
+        quantity.get("value"),
+        quantity.get("unit"),
+        quantity.get("code"),
+        quantity.get("system"),
+        quantity.get("comparator"),
+    )
+
+
+def format_quantities(quantities: Iterable[Optional[Dict[str, Any]]]) -> List[str]:
+    """Display strings for a series of FHIR Quantity dicts"""
+    return [quantity_display(quantity) for quantity in quantities]
+
+
+def format_observation_series(
+    observations: Iterable[Dict[str, Any]],
+) -> List[Optional[str]]:
+    """
+    Value display strings for a series of Observations, in order
+
+    Observations without a valueQuantity give None.
+    """
+    return [
+        quantity_display(observation["valueQuantity"])
+        if observation.get("valueQuantity")
+        else None
+        for observation in observations
+    ]
@@ -62,6 +62,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Server-Timing / request profiles; removes itself unless SERVER_TIMING_ENABLED
+    "patient_data.middleware.request_profiling.RequestProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -75,13 +77,16 @@ MIDDLEWARE = [
     # Patient Session Management Middleware
     "patient_data.middleware.session_security.PatientSessionMiddleware",
     "patient_data.middleware.session_security.SessionSecurityMiddleware",
-    "patient_data.middleware.session_security.SessionCleanupMiddleware",
     "patient_data.middleware.session_security.AuditLoggingMiddleware",
     # NEW: Patient Session Security Middleware for automatic cleanup
     "patient_data.middleware.patient_session_security.PatientSessionSecurityMiddleware",
     "patient_data.middleware.patient_session_security.PatientSessionCleanupMiddleware",
 ]
 
+# Request profiling (patient_data.middleware.request_profiling)
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "False") == "True"
+REQUEST_PROFILE_ENABLED = os.getenv("REQUEST_PROFILE_ENABLED", "False") == "True"
+
 ROOT_URLCONF = "eu_ncp_server.urls"
 
 TEMPLATES = [
@@ -356,6 +361,10 @@ else:
         },
     }
 
+# Quiet hot-path logging: suppress per-item parser diagnostics and emit
+# per-stage timing records on the "ehealth.performance" logger at INFO level
+PERFORMANCE_LOGGING = os.getenv("PERFORMANCE_LOGGING", "False") == "True"
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
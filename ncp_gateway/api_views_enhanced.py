@@ -17,13 +17,19 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.conf import settings
 from django.http import HttpResponse
+from django.utils import timezone
 import logging
 import json
 from typing import Dict, Any, Optional
 
 # Import FHIR services via factory pattern
-from eu_ncp_server.services.fhir_service_factory import get_fhir_service
+from eu_ncp_server.services.fhir_service_factory import get_fhir_service_singleton
 from eu_ncp_server.services.fhir_processing import fhir_processor, FHIRProcessingError
+from patient_data.services.cda_to_fhir_service import (
+    CDAConversionError,
+    SUPPORTED_PROFILES,
+    cda_to_fhir_service,
+)
 
 # Custom exception for FHIR integration errors
 class FHIRIntegrationError(Exception):
@@ -33,6 +39,9 @@ class FHIRIntegrationError(Exception):
 logger = logging.getLogger("ehealth")
 audit_logger = logging.getLogger("audit")
 
+# Defaults (overridable in settings)
+DEFAULT_BATCH_MAX_DOCUMENTS = 100
+
 
 # =====================================================
 # FHIR Integration API Endpoints
@@ -52,7 +61,7 @@ def get_fhir_patient_summary(request, patient_id: str):
     """
     try:
         # Get configured FHIR service (Azure FHIR by default)
-        fhir_service = get_fhir_service()
+        fhir_service = get_fhir_service_singleton()
         fhir_bundle = fhir_service.get_patient_summary(patient_id, request.user.username)
         
         # Process FHIR bundle into structured format
@@ -151,29 +160,25 @@ def convert_cda_to_fhir(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # TODO: Implement CDA to FHIR conversion service
-        
         audit_logger.info(
             f"CDA to FHIR conversion requested: profile={target_profile}, "
             f"user={request.user.username}"
         )
-        
-        # Mock conversion result
+
+        try:
+            fhir_bundle = cda_to_fhir_service.convert(cda_document, target_profile)
+        except CDAConversionError as e:
+            return Response(
+                {"error": "Conversion failed", "details": str(e)},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
         conversion_result = {
             "status": "success",
-            "fhir_bundle": {
-                "resourceType": "Bundle",
-                "type": "document",
-                "entry": []  # TODO: Populate with converted resources
-            },
-            "conversion_metadata": {
-                "source_format": "CDA",
-                "target_format": "FHIR R4",
-                "profile": target_profile,
-                "timestamp": "2025-10-10T12:00:00Z"
-            }
+            "fhir_bundle": fhir_bundle,
+            "conversion_metadata": _conversion_metadata(target_profile)
         }
-        
+
         return Response(conversion_result, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -184,6 +189,78 @@ def convert_cda_to_fhir(request):
         )
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def convert_cda_to_fhir_batch(request):
+    """
+    Convert many CDA documents to FHIR R4 resources in parallel
+
+    Expected payload:
+    {
+        "documents": ["<ClinicalDocument>...</ClinicalDocument>", ...],
+        "target_profile": "patient-summary" | "eprescription" | "edispensation"
+    }
+
+    Returns one result per document, in request order.
+    """
+    try:
+        documents = request.data.get('documents')
+        target_profile = request.data.get('target_profile', 'patient-summary')
+
+        if not isinstance(documents, list) or not documents:
+            return Response(
+                {"error": "List of CDA documents required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        max_documents = getattr(
+            settings, "CDA_FHIR_BATCH_MAX_DOCUMENTS", DEFAULT_BATCH_MAX_DOCUMENTS
+        )
+        if len(documents) > max_documents:
+            return Response(
+                {"error": f"At most {max_documents} documents per batch"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if target_profile not in SUPPORTED_PROFILES:
+            return Response(
+                {"error": f"Unsupported target profile: {target_profile}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        audit_logger.info(
+            f"CDA to FHIR batch conversion requested: documents={len(documents)}, "
+            f"profile={target_profile}, user={request.user.username}"
+        )
+
+        results = cda_to_fhir_service.convert_batch(documents, target_profile)
+        converted = sum(1 for result in results if result["status"] == "success")
+
+        return Response({
+            "status": "success" if converted == len(results) else "partial",
+            "results": results,
+            "conversion_metadata": dict(
+                _conversion_metadata(target_profile),
+                documents=len(results),
+                converted=converted,
+            )
+        }, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.error(f"Error in CDA to FHIR batch conversion: {str(e)}")
+        return Response(
+            {"error": "Conversion failed", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+def _conversion_metadata(target_profile: str) -> Dict[str, Any]:
+    return {
+        "source_format": "CDA",
+        "target_format": "FHIR R4",
+        "profile": target_profile,
+        "timestamp": timezone.now().isoformat()
+    }
+
+
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def convert_fhir_to_cda(request):
@@ -270,7 +347,7 @@ def search_healthcare_providers(request):
             )
         
         # Get configured FHIR service and search patients
-        fhir_service = get_fhir_service()
+        fhir_service = get_fhir_service_singleton()
         search_results = fhir_service.search_patients(search_params)
         
         return Response({
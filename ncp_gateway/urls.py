@@ -1,6 +1,6 @@
 # API URLs for Java Portal Integration
 from django.urls import path
-from . import api_views
+from . import api_views, api_views_enhanced
 
 urlpatterns = [
     # API endpoints for Java OpenNCP Portal integration
@@ -11,4 +11,15 @@ urlpatterns = [
         api_views.get_patient_document,
         name="api_patient_document",
     ),
+    # CDA to FHIR R4 conversion
+    path(
+        "fhir/convert/cda-to-fhir/",
+        api_views_enhanced.convert_cda_to_fhir,
+        name="api_convert_cda_to_fhir",
+    ),
+    path(
+        "fhir/convert/batch/",
+        api_views_enhanced.convert_cda_to_fhir_batch,
+        name="api_convert_cda_to_fhir_batch",
+    ),
 ]
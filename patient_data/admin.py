@@ -24,6 +24,7 @@ from .models import (
     DataExtractionLog,
     Tooltip,
 )
+from .services.tooltip_registry import invalidate_tooltips
 
 # from . import test_data_views  # Temporarily disabled - needs fixing
 
@@ -608,6 +609,7 @@ class TooltipAdmin(admin.ModelAdmin):
     def make_active(self, request, queryset):
         """Bulk action to activate tooltips"""
         count = queryset.update(is_active=True)
+        invalidate_tooltips()
         self.message_user(request, f"{count} tooltip(s) have been activated.")
 
     make_active.short_description = "Activate selected tooltips"
@@ -615,6 +617,7 @@ class TooltipAdmin(admin.ModelAdmin):
     def make_inactive(self, request, queryset):
         """Bulk action to deactivate tooltips"""
         count = queryset.update(is_active=False)
+        invalidate_tooltips()
         self.message_user(request, f"{count} tooltip(s) have been deactivated.")
 
     make_inactive.short_description = "Deactivate selected tooltips"
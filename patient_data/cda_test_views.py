@@ -14,6 +14,7 @@ from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 
 from .services.cda_document_index import get_cda_indexer
+from .services.session_data_service import SessionDataService
 
 logger = logging.getLogger(__name__)
 import logging
@@ -294,8 +295,7 @@ def smart_patient_search_view(request, patient_id):
                 # Continue with original match_data
 
             # Store enhanced session data 
-            session_key = f"patient_match_{patient_id}"
-            request.session[session_key] = match_data
+            SessionDataService.store_patient_match(request, patient_id, match_data)
 
             # Add success message
             messages.success(
@@ -12,6 +12,8 @@ Currently only medications have proper template compatibility - this mapper exte
 import logging
 from typing import Any, Dict, List, Optional
 
+from .utils.date_engine import format_date
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,37 +30,10 @@ class ClinicalFieldMapper:
     
     def _format_cda_date(self, cda_date: str) -> str:
         """Format CDA date string (YYYYMMDD) to European display format (DD/MM/YYYY)"""
-        from datetime import datetime
-        import re
-        
         if not cda_date or cda_date == "Not specified":
             return "Not recorded"
         
-        try:
-            # Remove any timezone info and clean up
-            date_clean = re.sub(r'[T\+\-].*$', '', str(cda_date))
-            
-            # Handle different date formats
-            if len(date_clean) == 8:  # YYYYMMDD
-                dt = datetime.strptime(date_clean, '%Y%m%d')
-                return dt.strftime('%d/%m/%Y')  # European format: DD/MM/YYYY
-            elif len(date_clean) == 6:  # YYYYMM
-                dt = datetime.strptime(date_clean, '%Y%m')
-                return dt.strftime('%m/%Y')  # Month/Year format
-            elif len(date_clean) == 4:  # YYYY
-                return date_clean
-            elif '/' in date_clean:  # Already formatted in European style
-                return date_clean
-            elif '-' in date_clean:  # ISO format - convert to European
-                try:
-                    dt = datetime.strptime(date_clean, '%Y-%m-%d')
-                    return dt.strftime('%d/%m/%Y')
-                except ValueError:
-                    return date_clean
-            else:
-                return date_clean
-        except (ValueError, AttributeError):
-            return "Not recorded"
+        return format_date(str(cda_date), "dmy", default=str(cda_date))
 
     def map_clinical_arrays(self, clinical_arrays: Dict[str, List]) -> Dict[str, List]:
         """Apply field mapping to all clinical sections for template compatibility"""
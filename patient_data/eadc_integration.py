@@ -1,22 +1,38 @@
 """
 EADC (Epsos Automatic Data Collector) Integration
 Handles clinical document transformation, validation, and processing
+
+Documents are validated against the XML Schema and transformed with the
+XSLT stylesheets found in the EADC resources (a country subdirectory
+overrides the shared file). Compiled schemas and stylesheets are cached by
+xml_artefacts, so compilation is paid once per file version rather than
+once per document.
 """
 
-import xml.etree.ElementTree as ET
+import copy
 import json
 import logging
 import os
 import subprocess
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from django.conf import settings
 from django.utils import timezone
 from datetime import datetime
 import uuid
 import base64
 
+from lxml import etree
+
+from .services.xml_artefacts import parse_document, xml_artefacts
+
 logger = logging.getLogger(__name__)
 
+CDA_NAMESPACES = {"cda": "urn:hl7-org:v3"}
+# Leading ClinicalDocument header elements, in CDA schema order
+CDA_HEADER_ORDER = ("realmCode", "typeId", "templateId")
+# Schema errors reported per document
+MAX_SCHEMA_ERRORS = 20
+
 
 class EADCProcessor:
     """
@@ -40,32 +56,63 @@ class EADCProcessor:
                 "name": "Patient Summary",
                 "national_to_epsos": "ps_national_to_epsos.xsl",
                 "epsos_to_national": "ps_epsos_to_national.xsl",
+                "schema": "CDA_extended.xsd",
                 "template_id": "1.3.6.1.4.1.12559.11.10.1.3.1.1.3",
             },
             "EP": {
                 "name": "ePrescription",
                 "national_to_epsos": "ep_national_to_epsos.xsl",
                 "epsos_to_national": "ep_epsos_to_national.xsl",
+                "schema": "CDA_Pharma.xsd",
                 "template_id": "1.3.6.1.4.1.12559.11.10.1.3.1.1.1",
             },
             "ED": {
                 "name": "eDispensation",
                 "national_to_epsos": "ed_national_to_epsos.xsl",
                 "epsos_to_national": "ed_epsos_to_national.xsl",
+                "schema": "CDA_Pharma.xsd",
                 "template_id": "1.3.6.1.4.1.12559.11.10.1.3.1.1.2",
             },
         }
 
+    def _artefact_path(
+        self, directory: str, country_code: Optional[str], filename: str
+    ) -> str:
+        """Path of an XSD/XSLT file; a country subdirectory overrides the shared one"""
+        if country_code:
+            country_path = os.path.join(directory, country_code.upper(), filename)
+            if os.path.exists(country_path):
+                return country_path
+        return os.path.join(directory, filename)
+
     def validate_cda_document(
-        self, cda_content: str, document_type: str = "PS"
+        self,
+        cda_content: str,
+        document_type: str = "PS",
+        country_code: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Validate CDA document against epSOS schemas
         """
         try:
-            # Parse XML
-            root = ET.fromstring(cda_content)
+            root = parse_document(cda_content)
+        except etree.XMLSyntaxError as e:
+            return {
+                "is_valid": False,
+                "errors": [f"XML Parse Error: {str(e)}"],
+                "warnings": [],
+                "document_type": document_type,
+                "template_id": None,
+                "epsos_compliant": False,
+                "schema_validated": False,
+            }
+        return self._validate_tree(root, document_type, country_code)
 
+    def _validate_tree(
+        self, root, document_type: str, country_code: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Validate a parsed CDA document"""
+        try:
             validation_result = {
                 "is_valid": True,
                 "errors": [],
@@ -73,31 +120,49 @@ class EADCProcessor:
                 "document_type": document_type,
                 "template_id": None,
                 "epsos_compliant": False,
+                "schema_validated": False,
             }
 
+            # XML Schema validation, when the schema is available
+            transformation_info = self.supported_transformations.get(document_type)
+            if transformation_info:
+                schema_path = self._artefact_path(
+                    self.schema_path, country_code, transformation_info["schema"]
+                )
+                with xml_artefacts.checkout("schema", schema_path) as schema:
+                    if schema is not None:
+                        validation_result["schema_validated"] = True
+                        if not schema.validate(root):
+                            validation_result["is_valid"] = False
+                            validation_result["errors"].extend(
+                                f"Schema: line {error.line}: {error.message}"
+                                for error in list(schema.error_log)[:MAX_SCHEMA_ERRORS]
+                            )
+
             # Check for template ID
-            template_elements = root.findall(".//templateId", {"cda": "urn:hl7-org:v3"})
-            for template in template_elements:
+            epsos_template_ids = {
+                info["template_id"] for info in self.supported_transformations.values()
+            }
+            for template in root.iterfind("cda:templateId", CDA_NAMESPACES):
                 template_root = template.get("root", "")
-                if template_root in [
-                    info["template_id"]
-                    for info in self.supported_transformations.values()
-                ]:
+                if template_root in epsos_template_ids:
                     validation_result["template_id"] = template_root
                     validation_result["epsos_compliant"] = True
                     break
 
             # Basic structural validation
+            namespaces = CDA_NAMESPACES
+            if root.tag != "{urn:hl7-org:v3}ClinicalDocument":
+                validation_result["errors"].append("Missing ClinicalDocument root")
+                validation_result["is_valid"] = False
+
             required_elements = [
-                (".//cda:ClinicalDocument", "Missing ClinicalDocument root"),
-                (".//cda:recordTarget/cda:patientRole", "Missing patient information"),
-                (".//cda:author", "Missing document author"),
-                (".//cda:custodian", "Missing document custodian"),
+                ("cda:recordTarget/cda:patientRole", "Missing patient information"),
+                ("cda:author", "Missing document author"),
+                ("cda:custodian", "Missing document custodian"),
             ]
-
-            namespaces = {"cda": "urn:hl7-org:v3"}
             for xpath, error_msg in required_elements:
-                if not root.findall(xpath, namespaces):
+                if root.find(xpath, namespaces) is None:
                     validation_result["errors"].append(error_msg)
                     validation_result["is_valid"] = False
 
@@ -111,15 +176,6 @@ class EADCProcessor:
 
             return validation_result
 
-        except ET.ParseError as e:
-            return {
-                "is_valid": False,
-                "errors": [f"XML Parse Error: {str(e)}"],
-                "warnings": [],
-                "document_type": document_type,
-                "template_id": None,
-                "epsos_compliant": False,
-            }
         except Exception as e:
             logger.error(f"Error validating CDA document: {e}")
             return {
@@ -129,6 +185,7 @@ class EADCProcessor:
                 "document_type": document_type,
                 "template_id": None,
                 "epsos_compliant": False,
+                "schema_validated": False,
             }
 
     def _validate_patient_summary(self, root, result, namespaces):
@@ -140,8 +197,8 @@ class EADCProcessor:
         ]
 
         for code, name in ps_sections:
-            sections = root.findall(
-                f'.//cda:section[cda:code[@code="{code}"]]', namespaces
+            sections = root.xpath(
+                ".//cda:section[cda:code/@code=$code]", namespaces=namespaces, code=code
             )
             if not sections:
                 result["warnings"].append(
@@ -164,6 +221,38 @@ class EADCProcessor:
             result["errors"].append("No dispensed items found")
             result["is_valid"] = False
 
+    def _transform(
+        self, root, document_type: str, direction: str, country_code: str
+    ) -> Tuple[Any, str]:
+        """
+        Apply the country's XSLT for a document type and direction
+
+        Returns the transformed root element and the method used; documents
+        without a stylesheet get the built-in minimal transformation.
+        """
+        transformation_info = self.supported_transformations[document_type]
+        xslt_path = self._artefact_path(
+            self.xslt_path, country_code, transformation_info[direction]
+        )
+        with xml_artefacts.checkout("xslt", xslt_path) as transformer:
+            if transformer is not None:
+                result = transformer(
+                    root, countryCode=etree.XSLT.strparam(country_code)
+                )
+                if result.getroot() is None:
+                    raise ValueError(f"XSLT {xslt_path} produced no document")
+                return result.getroot(), "xslt"
+
+        if direction == "national_to_epsos":
+            return (
+                self._apply_epsos_transformation(root, transformation_info, country_code),
+                "builtin",
+            )
+        return (
+            self._apply_national_transformation(root, transformation_info, country_code),
+            "builtin",
+        )
+
     def transform_national_to_epsos(
         self, national_document: str, document_type: str, country_code: str
     ) -> Dict[str, Any]:
@@ -174,32 +263,26 @@ class EADCProcessor:
             if document_type not in self.supported_transformations:
                 raise ValueError(f"Unsupported document type: {document_type}")
 
-            transformation_info = self.supported_transformations[document_type]
-
-            # For demo purposes, we'll simulate the transformation
-            # In production, this would use XSLT processors
             logger.info(
                 f"Transforming {country_code} national {document_type} to epSOS format"
             )
 
             # Parse the national document
-            root = ET.fromstring(national_document)
+            root = parse_document(national_document)
 
-            # Apply transformation logic (simplified for demo)
-            epsos_document = self._apply_epsos_transformation(
-                root, transformation_info, country_code
+            epsos_root, method = self._transform(
+                root, document_type, "national_to_epsos", country_code
             )
 
             # Validate the result
-            validation_result = self.validate_cda_document(
-                epsos_document, document_type
-            )
+            validation_result = self._validate_tree(epsos_root, document_type)
 
             return {
                 "success": True,
-                "epsos_document": epsos_document,
+                "epsos_document": etree.tostring(epsos_root, encoding="unicode"),
                 "validation": validation_result,
                 "transformation_type": f"{country_code}_to_epSOS",
+                "transformation_method": method,
                 "document_type": document_type,
                 "timestamp": timezone.now().isoformat(),
             }
@@ -224,24 +307,22 @@ class EADCProcessor:
             if document_type not in self.supported_transformations:
                 raise ValueError(f"Unsupported document type: {document_type}")
 
-            transformation_info = self.supported_transformations[document_type]
-
             logger.info(
                 f"Transforming epSOS {document_type} to {target_country} national format"
             )
 
             # Parse the epSOS document
-            root = ET.fromstring(epsos_document)
+            root = parse_document(epsos_document)
 
-            # Apply reverse transformation logic
-            national_document = self._apply_national_transformation(
-                root, transformation_info, target_country
+            national_root, method = self._transform(
+                root, document_type, "epsos_to_national", target_country
             )
 
             return {
                 "success": True,
-                "national_document": national_document,
+                "national_document": etree.tostring(national_root, encoding="unicode"),
                 "transformation_type": f"epSOS_to_{target_country}",
+                "transformation_method": method,
                 "document_type": document_type,
                 "timestamp": timezone.now().isoformat(),
             }
@@ -259,50 +340,76 @@ class EADCProcessor:
     def _apply_epsos_transformation(self, root, transformation_info, country_code):
         """Apply transformation from national to epSOS format"""
         # Clone the document
-        new_root = ET.fromstring(ET.tostring(root))
+        new_root = copy.deepcopy(root)
 
         # Add epSOS template ID
-        template_element = ET.SubElement(new_root, "templateId")
-        template_element.set("root", transformation_info["template_id"])
+        template_id = transformation_info["template_id"]
+        if not new_root.xpath(
+            "cda:templateId[@root=$root]", namespaces=CDA_NAMESPACES, root=template_id
+        ):
+            self._insert_header_element(new_root, "templateId", root=template_id)
 
         # Add epSOS specific elements and attributes
         self._add_epsos_metadata(new_root, country_code)
 
-        return ET.tostring(new_root, encoding="unicode")
+        return new_root
 
     def _apply_national_transformation(self, root, transformation_info, target_country):
         """Apply transformation from epSOS to national format"""
         # Clone the document
-        new_root = ET.fromstring(ET.tostring(root))
+        new_root = copy.deepcopy(root)
 
         # Remove epSOS specific elements
-        epsos_templates = new_root.findall(
-            f'.//templateId[@root="{transformation_info["template_id"]}"]'
+        epsos_templates = new_root.xpath(
+            "cda:templateId[@root=$root]",
+            namespaces=CDA_NAMESPACES,
+            root=transformation_info["template_id"],
         )
         for template in epsos_templates:
-            template.getparent().remove(template)
+            new_root.remove(template)
 
         # Add national specific elements
         self._add_national_metadata(new_root, target_country)
 
-        return ET.tostring(new_root, encoding="unicode")
+        return new_root
+
+    def _insert_header_element(self, document, name, **attributes):
+        """
+        Insert a CDA header element in schema order
+
+        The element is created in the HL7 v3 namespace and placed after the
+        leading header elements that precede or repeat it (realmCode, typeId,
+        templateId), so the document stays valid and is found by
+        _validate_tree.
+        """
+        preceding = CDA_HEADER_ORDER[: CDA_HEADER_ORDER.index(name) + 1]
+        index = 0
+        for position, child in enumerate(document):
+            if isinstance(child.tag, str):
+                if etree.QName(child).localname not in preceding:
+                    break
+                index = position + 1
+        element = document.makeelement(f"{{{CDA_NAMESPACES['cda']}}}{name}", attributes)
+        document.insert(index, element)
+        return element
 
     def _add_epsos_metadata(self, root, country_code):
         """Add epSOS specific metadata to document"""
         # Add realm code for epSOS
-        realm_code = ET.SubElement(root, "realmCode")
-        realm_code.set("code", "EU")
+        if root.find("cda:realmCode[@code='EU']", CDA_NAMESPACES) is None:
+            self._insert_header_element(root, "realmCode", code="EU")
 
         # Add epSOS type ID
-        type_id = ET.SubElement(root, "typeId")
-        type_id.set("root", "2.16.840.1.113883.1.3")
-        type_id.set("extension", "POCD_HD000040")
+        if root.find("cda:typeId", CDA_NAMESPACES) is None:
+            self._insert_header_element(
+                root, "typeId", root="2.16.840.1.113883.1.3", extension="POCD_HD000040"
+            )
 
     def _add_national_metadata(self, root, target_country):
         """Add national specific metadata to document"""
         # Add national realm code
-        realm_code = ET.SubElement(root, "realmCode")
-        realm_code.set("code", target_country)
+        if not root.xpath("cda:realmCode[@code=$code]", namespaces=CDA_NAMESPACES, code=target_country):
+            self._insert_header_element(root, "realmCode", code=target_country)
 
     def get_demo_documents(self) -> List[Dict[str, Any]]:
         """Get available demo documents from EADC resources"""
@@ -366,9 +473,10 @@ class EADCDocumentManager:
         processing_id = str(uuid.uuid4())
 
         try:
-            # Step 1: Validate incoming document
+            # Step 1: Validate incoming document (against the source
+            # country's schema when it has its own)
             validation_result = self.processor.validate_cda_document(
-                document_content, document_type
+                document_content, document_type, source_country
             )
 
             # Step 2: Transform to epSOS if not already compliant
@@ -387,10 +495,12 @@ class EADCDocumentManager:
                 processed_document = document_content
                 transformation_applied = False
 
-            # Step 3: Final validation
-            final_validation = self.processor.validate_cda_document(
-                processed_document, document_type
-            )
+            # Step 3: Final validation; the transformation already validated
+            # its output, and an untransformed document was validated in step 1
+            if transformation_applied:
+                final_validation = transformation_result["validation"]
+            else:
+                final_validation = validation_result
 
             return {
                 "processing_id": processing_id,
@@ -0,0 +1,81 @@
+"""
+Django Management Command: Benchmark CDA to FHIR Conversion
+
+Converts the CDA documents in test_data to FHIR R4 Bundles and reports the
+conversion throughput in documents per second per core, both in-process and
+through the parallel batch conversion used by the batch API endpoint.
+"""
+
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from patient_data.services.cda_to_fhir_service import CDAToFHIRService
+
+
+class Command(BaseCommand):
+    help = "Benchmark CDA to FHIR R4 conversion throughput over the test_data CDAs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=str(Path(settings.BASE_DIR) / "test_data"),
+            help="Directory searched recursively for CDA XML files",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=5,
+            help="Conversions of the whole document set used for the timing",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes for the batch run (0 skips the batch run)",
+        )
+
+    def handle(self, *args, **options):
+        iterations = max(1, options["iterations"])
+        documents = [path.read_bytes() for path in sorted(Path(options["path"]).rglob("*.xml"))]
+        if not documents:
+            self.stdout.write(self.style.WARNING("No CDA documents found"))
+            return
+
+        service = CDAToFHIRService(max_workers=0)
+        bundles = [
+            result["fhir_bundle"]
+            for result in service.convert_batch(documents)
+            if result["status"] == "success"
+        ]
+        self.stdout.write(
+            f"{len(bundles)} of {len(documents)} documents converted, "
+            f"{sum(len(bundle['entry']) for bundle in bundles)} FHIR resources"
+        )
+
+        self.stdout.write(f"{'mode':<20} {'workers':>7} {'docs/s':>9} {'docs/s/core':>12}")
+        self._run("in-process", service, documents, iterations, cores=1)
+
+        workers = options["workers"]
+        if workers > 0:
+            service = CDAToFHIRService(max_workers=workers)
+            try:
+                # Start the worker processes before timing
+                service.convert_batch(documents[: workers * 2])
+                self._run("batch", service, documents, iterations, cores=workers)
+            finally:
+                service.shutdown()
+
+    def _run(self, mode, service, documents, iterations, cores):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            service.convert_batch(documents)
+        rate = len(documents) * iterations / (time.perf_counter() - start)
+
+        self.stdout.write(f"{mode:<20} {cores:>7} {rate:>9.1f} {rate / cores:>12.1f}")
+        self.stdout.write(
+            self.style.SUCCESS(f"{mode}: {rate / cores:.1f} documents per second per core")
+        )
@@ -0,0 +1,89 @@
+"""
+Django Management Command: Benchmark CDA Header Extraction
+
+Runs the unified single-pass header extractor over the CDA documents in
+test_data and reports, per document, how many times the XML was parsed,
+how many elements the header walk visited compared to the size of the
+whole tree, and the extraction time.
+"""
+
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from patient_data.services.enhanced_cda_xml_parser import EnhancedCDAXMLParser
+from patient_data.services.unified_cda_header_extractor import unified_header_extractor
+
+
+class Command(BaseCommand):
+    help = "Benchmark single-pass CDA header extraction over the test_data CDAs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=str(Path(settings.BASE_DIR) / "test_data"),
+            help="Directory searched recursively for CDA XML files",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=5,
+            help="Extractions per document used for the average timing",
+        )
+
+    def handle(self, *args, **options):
+        iterations = max(1, options["iterations"])
+        parser = EnhancedCDAXMLParser()
+        documents = sorted(Path(options["path"]).rglob("*.xml"))
+
+        self.stdout.write(
+            f"{'document':<50} {'parses':>6} {'visited':>8} {'elements':>9} {'ms':>8}"
+        )
+
+        totals = {"documents": 0, "visited": 0, "elements": 0, "ms": 0.0}
+        for path in documents:
+            try:
+                xml_content = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                continue
+
+            # Count XML parses performed by one header-only extraction
+            with mock.patch.object(ET, "fromstring", wraps=ET.fromstring) as parse_spy:
+                result = parser.parse_cda_header(xml_content)
+            if not result:
+                continue
+
+            root = ET.fromstring(xml_content.encode("utf-8"))
+            element_count = sum(1 for _ in root.iter())
+            visited = unified_header_extractor.extract(root).elements.visited_elements
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                parser.parse_cda_header(xml_content)
+            duration_ms = (time.perf_counter() - start) * 1000 / iterations
+
+            totals["documents"] += 1
+            totals["visited"] += visited
+            totals["elements"] += element_count
+            totals["ms"] += duration_ms
+
+            self.stdout.write(
+                f"{path.name[:50]:<50} {parse_spy.call_count:>6} {visited:>8} "
+                f"{element_count:>9} {duration_ms:>8.2f}"
+            )
+
+        if not totals["documents"]:
+            self.stdout.write(self.style.WARNING("No CDA documents found"))
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{totals['documents']} documents: header walk visited "
+                f"{totals['visited']} of {totals['elements']} elements, "
+                f"{totals['ms'] / totals['documents']:.2f} ms per document"
+            )
+        )
@@ -0,0 +1,132 @@
+"""
+Django Management Command: Benchmark Demographic Patient Search
+
+Builds the normalized demographic search keys for a synthetic CDA index of
+--patients patients and resolves --queries queries against it in one batch.
+The queries mix identifier and name/birth-date lookups, spelled the way
+users type them (other case, no accents, day-first dates), plus misses.
+"""
+
+import random
+import time
+from typing import Dict, List, Tuple
+
+from django.core.management.base import BaseCommand
+
+from patient_data.services.cda_document_index import CDADocumentInfo
+from patient_data.services.demographic_search import DemographicQuery, DemographicSearchIndex
+
+COUNTRIES = ("BE", "CY", "GR", "IE", "IT", "LU", "LV", "MT", "PT")
+GIVEN_NAMES = ("Diana", "Seán", "Mario", "Aoife", "João", "Μαρία", "Zoë", "Pádraig", "Anna", "Jānis")
+FAMILY_NAMES = ("Ferreira", "O'Connor", "Pino", "Kelly", "Silva", "Δήμου", "Müller", "Doe-Calla", "Borg", "Bērziņš")
+
+
+def synthetic_index(patients: int, seed: int = 1) -> Dict[str, List[CDADocumentInfo]]:
+    """A CDA document index (patient_id -> documents) of generated patients"""
+    rng = random.Random(seed)
+    index = {}
+    for number in range(patients):
+        patient_id = f"{number:06d}-{rng.randrange(10_000):04d}"
+        index[patient_id] = [
+            CDADocumentInfo(
+                file_path=f"/synthetic/{patient_id}_{cda_type}.xml",
+                patient_id=patient_id,
+                given_name=rng.choice(GIVEN_NAMES),
+                family_name=rng.choice(FAMILY_NAMES),
+                birth_date=f"{rng.randrange(1930, 2020)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+                gender=rng.choice(("Male", "Female")),
+                country_code=COUNTRIES[number % len(COUNTRIES)],
+                cda_type=cda_type,
+                assigning_authority="",
+                last_modified=0.0,
+                file_size=0,
+                patient_id_root=f"2.16.17.710.{number % len(COUNTRIES)}.1000.990.1",
+            )
+            for cda_type in ("L1", "L3")
+        ]
+    return index
+
+
+def _as_typed(document: CDADocumentInfo, rng: random.Random) -> Tuple[str, str, str]:
+    """Name and birth date of a patient the way a user might enter them"""
+    given = document.given_name.upper() if rng.random() < 0.5 else document.given_name.lower()
+    family = document.family_name.replace("'", "") if rng.random() < 0.5 else document.family_name
+    year, month, day = document.birth_date.split("-")
+    birth_date = f"{day}/{month}/{year}" if rng.random() < 0.5 else document.birth_date
+    return given, family, birth_date
+
+
+def synthetic_queries(index: Dict[str, List[CDADocumentInfo]], count: int, seed: int = 2):
+    """Queries against a synthetic index, with the patient each should find (or None)"""
+    rng = random.Random(seed)
+    patients = list(index.values())
+    queries = []
+    for number in range(count):
+        document = rng.choice(patients)[0]
+        kind = number % 4
+        if kind == 0:
+            query = DemographicQuery(
+                country_code=document.country_code.lower(),
+                patient_id=f" {document.patient_id.lower()} ",
+            )
+        elif kind == 1:
+            query = DemographicQuery(
+                patient_id=document.patient_id,
+                id_root=document.patient_id_root,
+            )
+        elif kind == 2:
+            given, family, birth_date = _as_typed(document, rng)
+            query = DemographicQuery(
+                country_code=document.country_code,
+                given_name=given,
+                family_name=family,
+                birth_date=birth_date,
+            )
+        else:
+            query = DemographicQuery(
+                country_code=document.country_code, patient_id=f"missing-{number}"
+            )
+            document = None
+        queries.append((query, document and document.patient_id))
+    return queries
+
+
+class Command(BaseCommand):
+    help = "Benchmark batch demographic patient search over a synthetic CDA index"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--patients", type=int, default=10_000)
+        parser.add_argument("--queries", type=int, default=1_000)
+
+    def handle(self, *args, **options):
+        index = synthetic_index(max(1, options["patients"]))
+        expected = synthetic_queries(index, max(1, options["queries"]))
+        queries = [query for query, _ in expected]
+
+        start = time.perf_counter()
+        search_index = DemographicSearchIndex.from_cda_index(index)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        results = search_index.search(queries)
+        search_ms = (time.perf_counter() - start) * 1000
+
+        found = sum(bool(records) for records in results)
+        wrong = sum(
+            patient_id is not None
+            and patient_id not in {record.patient_id for record in records}
+            for (_, patient_id), records in zip(expected, results)
+        )
+
+        self.stdout.write(f"{'indexed patients':<28} {len(search_index):>10}")
+        self.stdout.write(f"{'queries':<28} {len(queries):>10}")
+        self.stdout.write(f"{'queries with matches':<28} {found:>10}")
+        self.stdout.write(f"{'expected patient missed':<28} {wrong:>10}")
+        self.stdout.write(f"{'key table build (ms)':<28} {build_ms:>10.2f}")
+        self.stdout.write(f"{'batch search (ms)':<28} {search_ms:>10.2f}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(queries)} queries over {len(search_index)} patients "
+                f"in {search_ms:.1f} ms (+{build_ms:.1f} ms key table build)"
+            )
+        )
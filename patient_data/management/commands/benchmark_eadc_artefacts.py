@@ -0,0 +1,143 @@
+"""
+Django Management Command: Benchmark EADC Validation and Transformation
+
+Validates and transforms (national to epSOS) a stream of CDA documents from
+test_data through EADCProcessor and reports how many XML Schema / XSLT
+compilations were needed, against the cost of compiling them for every
+document. When the EADC resources have no schema or stylesheet for the
+document type, a permissive CDA schema and an identity stylesheet are
+written to a temporary directory and used instead.
+"""
+
+import os
+import tempfile
+import time
+from itertools import cycle, islice
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from patient_data.eadc_integration import EADCProcessor
+from patient_data.services.xml_artefacts import compile_schema, compile_xslt, xml_artefacts
+
+DEMO_SCHEMA = """<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           targetNamespace="urn:hl7-org:v3" elementFormDefault="qualified">
+  <xs:element name="ClinicalDocument">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:any processContents="skip" minOccurs="0" maxOccurs="unbounded"/>
+      </xs:sequence>
+      <xs:anyAttribute processContents="lax"/>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>
+"""
+
+DEMO_XSLT = """<?xml version="1.0" encoding="UTF-8"?>
+<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+  <xsl:param name="countryCode"/>
+  <xsl:template match="@*|node()">
+    <xsl:copy><xsl:apply-templates select="@*|node()"/></xsl:copy>
+  </xsl:template>
+</xsl:stylesheet>
+"""
+
+
+class Command(BaseCommand):
+    help = "Benchmark cached XML Schema validation and XSLT transformation for EADC"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=str(Path(settings.BASE_DIR) / "test_data"),
+            help="Directory searched recursively for CDA XML files",
+        )
+        parser.add_argument(
+            "--documents",
+            type=int,
+            default=1000,
+            help="Documents to validate and transform (the CDAs are cycled)",
+        )
+        parser.add_argument("--document-type", default="PS")
+        parser.add_argument("--country", default="IE")
+
+    def handle(self, *args, **options):
+        sources = [
+            path.read_text(encoding="utf-8")
+            for path in sorted(Path(options["path"]).rglob("*.xml"))
+        ]
+        if not sources:
+            self.stdout.write(self.style.WARNING("No CDA documents found"))
+            return
+
+        with tempfile.TemporaryDirectory() as demo_dir:
+            processor = EADCProcessor()
+            schema_path, xslt_path = self._artefacts(
+                processor, options["document_type"], options["country"], demo_dir
+            )
+            self._run(processor, sources, schema_path, xslt_path, options)
+
+    def _artefacts(self, processor, document_type, country, demo_dir):
+        info = processor.supported_transformations[document_type]
+        schema_path = processor._artefact_path(processor.schema_path, country, info["schema"])
+        xslt_path = processor._artefact_path(
+            processor.xslt_path, country, info["national_to_epsos"]
+        )
+        if os.path.exists(schema_path) and os.path.exists(xslt_path):
+            return schema_path, xslt_path
+
+        self.stdout.write(
+            f"No {document_type} schema/XSLT in {processor.eadc_config_path}; "
+            "using a permissive demo schema and an identity stylesheet"
+        )
+        processor.schema_path = os.path.join(demo_dir, "schema")
+        processor.xslt_path = os.path.join(demo_dir, "xslt")
+        os.makedirs(processor.schema_path)
+        os.makedirs(processor.xslt_path)
+        schema_path = os.path.join(processor.schema_path, info["schema"])
+        xslt_path = os.path.join(processor.xslt_path, info["national_to_epsos"])
+        Path(schema_path).write_text(DEMO_SCHEMA, encoding="utf-8")
+        Path(xslt_path).write_text(DEMO_XSLT, encoding="utf-8")
+        return schema_path, xslt_path
+
+    def _run(self, processor, sources, schema_path, xslt_path, options):
+        document_type = options["document_type"]
+        country = options["country"]
+        documents = list(islice(cycle(sources), max(1, options["documents"])))
+
+        start = time.perf_counter()
+        compile_schema(schema_path)
+        compile_xslt(xslt_path)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        xml_artefacts.clear()
+        compilations = xml_artefacts.compilations
+        invalid = failures = 0
+        start = time.perf_counter()
+        for document in documents:
+            validation = processor.validate_cda_document(document, document_type, country)
+            result = processor.transform_national_to_epsos(document, document_type, country)
+            invalid += not validation["is_valid"]
+            failures += not result["success"]
+        total_ms = (time.perf_counter() - start) * 1000
+        compilations = xml_artefacts.compilations - compilations
+
+        self.stdout.write(f"{'documents':<36} {len(documents):>10}")
+        self.stdout.write(f"{'invalid documents':<36} {invalid:>10}")
+        self.stdout.write(f"{'failed transformations':<36} {failures:>10}")
+        self.stdout.write(f"{'schema + XSLT compile (ms)':<36} {compile_ms:>10.2f}")
+        self.stdout.write(f"{'compilations performed':<36} {compilations:>10}")
+        self.stdout.write(f"{'total (ms)':<36} {total_ms:>10.2f}")
+        self.stdout.write(f"{'per document (ms)':<36} {total_ms / len(documents):>10.3f}")
+        self.stdout.write(
+            f"{'compiling per document would add (ms)':<36} "
+            f"{compile_ms * len(documents):>10.2f}"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(documents)} documents validated and transformed with "
+                f"{compilations} compilations in {total_ms:.0f} ms"
+            )
+        )
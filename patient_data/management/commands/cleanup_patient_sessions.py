@@ -5,13 +5,25 @@ This command removes patient data from sessions that are:
 1. Not authenticated (no logged-in user)
 2. Expired
 3. Contains patient data without proper authentication
+
+It also expires PatientSession records and purges expired PatientDataCache
+entries. Sessions are processed in batches of --batch-size, so memory use
+does not grow with the number of sessions; --max-runtime stops the run
+after the given number of seconds (rerun to continue).
 """
 
-from django.core.management.base import BaseCommand, CommandError
-from django.contrib.sessions.models import Session
 from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
 from django.utils import timezone
-from datetime import timedelta
+
+from patient_data.services.session_cleanup import (
+    DEFAULT_BATCH_SIZE,
+    Deadline,
+    cleanup_expired_records,
+    count_expired_records,
+    iter_batches,
+)
 
 
 class Command(BaseCommand):
@@ -38,89 +50,51 @@ class Command(BaseCommand):
             action="store_true",
             help="Only clean sessions without authentication",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Sessions loaded and written per batch (default {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--max-runtime",
+            type=float,
+            default=None,
+            help="Stop after this many seconds; rerun to continue",
+        )
 
     def handle(self, *args, **options):
         dry_run = options["dry_run"]
         force = options["force"]
-        expired_only = options["expired_only"]
-        unauthenticated_only = options["unauthenticated_only"]
+        self.expired_only = options["expired_only"]
+        self.unauthenticated_only = options["unauthenticated_only"]
+        self.force = force
+        batch_size = max(1, options["batch_size"])
+        deadline = Deadline(options["max_runtime"])
 
         self.stdout.write(self.style.WARNING("🔒 PATIENT SESSION DATA CLEANUP UTILITY"))
         self.stdout.write(self.style.WARNING("=" * 50))
 
-        # Get all sessions
         total_sessions = Session.objects.count()
         sessions_with_patient_data = 0
         unauthenticated_with_patient_data = 0
         expired_with_patient_data = 0
-        sessions_to_clean = []
+        sessions_to_clean = 0
+        samples = []
 
         self.stdout.write(f"📊 Analyzing {total_sessions} sessions...")
 
-        for session in Session.objects.all():
-            data = session.get_decoded()
-
-            # Check for patient data
-            patient_keys = [key for key in data.keys() if "patient" in key.lower()]
-            if not patient_keys:
-                continue
-
-            sessions_with_patient_data += 1
-
-            # Check authentication
-            is_authenticated = "_auth_user_id" in data
-            auth_user = None
-            if is_authenticated:
-                try:
-                    auth_user = User.objects.get(id=data["_auth_user_id"])
-                except User.DoesNotExist:
-                    is_authenticated = False
-
-            # Check expiration
-            is_expired = session.expire_date < timezone.now()
-
-            # Determine if this session should be cleaned
-            should_clean = False
-            reason = []
-
-            if force:
-                should_clean = True
-                reason.append("force flag")
-            elif expired_only and is_expired:
-                should_clean = True
-                reason.append("expired")
-                expired_with_patient_data += 1
-            elif unauthenticated_only and not is_authenticated:
-                should_clean = True
-                reason.append("unauthenticated")
-                unauthenticated_with_patient_data += 1
-            elif not expired_only and not unauthenticated_only:
-                # Default behavior: clean unauthenticated or expired
-                if not is_authenticated:
-                    should_clean = True
-                    reason.append("unauthenticated")
+        for batch in iter_batches(self._candidate_sessions(), batch_size, deadline):
+            for item in self._classify_batch(batch):
+                sessions_with_patient_data += 1
+                if not item["is_authenticated"]:
                     unauthenticated_with_patient_data += 1
-                elif is_expired:
-                    should_clean = True
-                    reason.append("expired")
+                if item["is_expired"]:
                     expired_with_patient_data += 1
-
-            if not is_authenticated:
-                unauthenticated_with_patient_data += 1
-            if is_expired:
-                expired_with_patient_data += 1
-
-            if should_clean:
-                sessions_to_clean.append(
-                    {
-                        "session": session,
-                        "patient_keys": patient_keys,
-                        "is_authenticated": is_authenticated,
-                        "auth_user": auth_user.username if auth_user else None,
-                        "is_expired": is_expired,
-                        "reason": reason,
-                    }
-                )
+                if item["reason"]:
+                    sessions_to_clean += 1
+                    if len(samples) < 10:
+                        samples.append(item)
 
         # Display summary
         self.stdout.write("")
@@ -133,7 +107,19 @@ class Command(BaseCommand):
             f"   Unauthenticated with Patient Data: {unauthenticated_with_patient_data}"
         )
         self.stdout.write(f"   Expired with Patient Data: {expired_with_patient_data}")
-        self.stdout.write(f"   Sessions to Clean: {len(sessions_to_clean)}")
+        self.stdout.write(f"   Sessions to Clean: {sessions_to_clean}")
+        expired_records = count_expired_records()
+        self.stdout.write(
+            f"   Patient Sessions to Expire: {expired_records['patient_sessions']}"
+        )
+        self.stdout.write(
+            f"   Expired Cache Entries: {expired_records['cache_entries']}"
+        )
+
+        if deadline.reached():
+            self.stdout.write(
+                self.style.WARNING("⏱️  Max runtime reached during analysis; counts are partial.")
+            )
 
         if sessions_with_patient_data > 0:
             self.stdout.write(
@@ -142,27 +128,25 @@ class Command(BaseCommand):
                 )
             )
 
-        if not sessions_to_clean:
+        if not sessions_to_clean and not any(expired_records.values()):
             self.stdout.write(self.style.SUCCESS("✅ No sessions need cleaning."))
             return
 
         # Show what would be cleaned
-        if dry_run or not force:
+        if sessions_to_clean and (dry_run or not force):
             self.stdout.write("")
             self.stdout.write("🔍 SESSIONS TO BE CLEANED:")
-            for i, item in enumerate(sessions_to_clean[:10]):  # Show first 10
-                session = item["session"]
-                session_key = getattr(session, "session_key", "unknown")
+            for i, item in enumerate(samples):  # Show first 10
                 self.stdout.write(
-                    f"   {i+1}. {session_key[:20] if session_key != 'unknown' else 'unknown'}... "
+                    f"   {i+1}. {item['session'].session_key[:20]}... "
                     f"({len(item['patient_keys'])} patient keys, "
                     f"auth: {item['is_authenticated']}, "
                     f"expired: {item['is_expired']}, "
                     f"reason: {', '.join(item['reason'])})"
                 )
 
-            if len(sessions_to_clean) > 10:
-                self.stdout.write(f"   ... and {len(sessions_to_clean) - 10} more")
+            if sessions_to_clean > len(samples):
+                self.stdout.write(f"   ... and {sessions_to_clean - len(samples)} more")
 
         if dry_run:
             self.stdout.write("")
@@ -170,60 +154,71 @@ class Command(BaseCommand):
             self.stdout.write("Run with --force to actually clean the sessions.")
             return
 
-        # Perform cleanup
+        # Perform cleanup; nothing is changed until the operator confirms
         if not force:
             confirm = input(
-                f"\\n⚠️  Are you sure you want to clean {len(sessions_to_clean)} sessions? [y/N]: "
+                f"\\n⚠️  Are you sure you want to clean {sessions_to_clean} sessions "
+                f"and {sum(expired_records.values())} expired records? [y/N]: "
             )
             if confirm.lower() != "y":
                 self.stdout.write("❌ Cleanup cancelled.")
                 return
 
+        expired = cleanup_expired_records(batch_size, deadline)
+        self.stdout.write(
+            f"📅 Expired {expired['patient_sessions']} patient sessions, "
+            f"removed {expired['cache_entries']} expired cache entries"
+        )
+
+        if not sessions_to_clean:
+            self.stdout.write(self.style.SUCCESS("✅ No sessions need cleaning."))
+            return
+
         self.stdout.write("")
         self.stdout.write("🧹 CLEANING SESSIONS...")
 
         cleaned_sessions = 0
         total_patient_keys_removed = 0
+        session_store_class = Session.get_session_store_class()
+
+        for batch_number, batch in enumerate(
+            iter_batches(self._candidate_sessions(), batch_size, deadline), start=1
+        ):
+            to_delete = []
+            to_update = []
+            for item in self._classify_batch(batch):
+                if not item["reason"]:
+                    continue
+                session = item["session"]
+                total_patient_keys_removed += len(item["patient_keys"])
 
-        for item in sessions_to_clean:
-            session = item["session"]
-            session_key = getattr(session, "session_key", "unknown")
-            try:
                 # For unauthenticated sessions with patient data, delete the entire session
                 if not item["is_authenticated"]:
-                    session.delete()
-                    cleaned_sessions += 1
-                    total_patient_keys_removed += len(item["patient_keys"])
-                    self.stdout.write(
-                        f"   ✅ Deleted session {session_key[:20] if session_key != 'unknown' else 'unknown'}..."
-                    )
+                    to_delete.append(session.session_key)
                 else:
                     # For authenticated sessions, just remove patient data
-                    data = session.get_decoded()
-                    patient_keys_removed = 0
+                    data = item["data"]
                     for key in item["patient_keys"]:
-                        if key in data:
-                            del data[key]
-                            patient_keys_removed += 1
-
-                    # Save the modified session
-                    session_store = session.get_session_store_class()(session_key)
-                    for key, value in data.items():
-                        session_store[key] = value
-                    session_store.save()
-
-                    cleaned_sessions += 1
-                    total_patient_keys_removed += patient_keys_removed
-                    self.stdout.write(
-                        f"   ✅ Cleaned {patient_keys_removed} patient keys from "
-                        f"session {session_key[:20] if session_key != 'unknown' else 'unknown'}..."
-                    )
+                        del data[key]
+                    session.session_data = session_store_class().encode(data)
+                    to_update.append(session)
 
+            try:
+                if to_delete:
+                    Session.objects.filter(session_key__in=to_delete).delete()
+                if to_update:
+                    Session.objects.bulk_update(to_update, ["session_data"])
             except Exception as e:
                 self.stdout.write(
-                    self.style.ERROR(
-                        f"   ❌ Error cleaning session {session_key[:20] if session_key != 'unknown' else 'unknown'}: {e}"
-                    )
+                    self.style.ERROR(f"   ❌ Error cleaning batch {batch_number}: {e}")
+                )
+                continue
+
+            cleaned_sessions += len(to_delete) + len(to_update)
+            if to_delete or to_update:
+                self.stdout.write(
+                    f"   ✅ Batch {batch_number}: deleted {len(to_delete)} sessions, "
+                    f"removed patient data from {len(to_update)} sessions"
                 )
 
         # Final summary
@@ -234,6 +229,14 @@ class Command(BaseCommand):
             f"   Patient Data Items Removed: {total_patient_keys_removed}"
         )
 
+        if deadline.reached():
+            self.stdout.write(
+                self.style.WARNING(
+                    "⏱️  Max runtime reached; rerun the command to clean the remaining sessions."
+                )
+            )
+            return
+
         if cleaned_sessions > 0:
             self.stdout.write(
                 self.style.SUCCESS(
@@ -243,11 +246,11 @@ class Command(BaseCommand):
 
         # Check remaining sessions
         remaining_patient_sessions = 0
-        for session in Session.objects.all():
-            data = session.get_decoded()
-            patient_keys = [key for key in data.keys() if "patient" in key.lower()]
-            if patient_keys:
-                remaining_patient_sessions += 1
+        for batch in iter_batches(Session.objects.all(), batch_size):
+            for session in batch:
+                data = session.get_decoded()
+                if any("patient" in key.lower() for key in data):
+                    remaining_patient_sessions += 1
 
         if remaining_patient_sessions > 0:
             self.stdout.write(
@@ -262,3 +265,66 @@ class Command(BaseCommand):
                     "🔒 All unauthorized patient session data has been cleared!"
                 )
             )
+
+    def _candidate_sessions(self):
+        """Sessions that may need cleaning, narrowed by the indexed expiry column"""
+        sessions = Session.objects.all()
+        if self.expired_only and not self.force:
+            sessions = sessions.filter(expire_date__lt=timezone.now())
+        return sessions
+
+    def _classify_batch(self, batch):
+        """
+        Decode a batch of sessions and yield those holding patient data
+
+        Each yielded item has a non-empty "reason" list if the session
+        should be cleaned.
+        """
+        now = timezone.now()
+        decoded = []
+        user_ids = set()
+        for session in batch:
+            data = session.get_decoded()
+
+            # Check for patient data
+            patient_keys = [key for key in data.keys() if "patient" in key.lower()]
+            if not patient_keys:
+                continue
+            decoded.append((session, data, patient_keys))
+            if "_auth_user_id" in data:
+                user_ids.add(data["_auth_user_id"])
+
+        # One query per batch for the authenticated users
+        existing_users = {
+            str(user_id)
+            for user_id in User.objects.filter(id__in=user_ids).values_list("id", flat=True)
+        } if user_ids else set()
+
+        for session, data, patient_keys in decoded:
+            is_authenticated = str(data.get("_auth_user_id")) in existing_users
+            is_expired = session.expire_date < now
+
+            # Determine if this session should be cleaned
+            reason = []
+            if self.force:
+                reason.append("force flag")
+            elif self.expired_only:
+                if is_expired:
+                    reason.append("expired")
+            elif self.unauthenticated_only:
+                if not is_authenticated:
+                    reason.append("unauthenticated")
+            elif not is_authenticated:
+                # Default behavior: clean unauthenticated or expired
+                reason.append("unauthenticated")
+            elif is_expired:
+                reason.append("expired")
+
+            yield {
+                "session": session,
+                "data": data,
+                "patient_keys": patient_keys,
+                "is_authenticated": is_authenticated,
+                "is_expired": is_expired,
+                "reason": reason,
+            }
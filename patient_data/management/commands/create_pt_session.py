@@ -10,6 +10,8 @@ from django.contrib.sessions.backends.db import SessionStore
 from django.contrib.sessions.models import Session
 from django.core.management.base import BaseCommand
 
+from patient_data.services.session_data_service import SessionDataService
+
 
 class Command(BaseCommand):
     help = "Create a fresh session with Portuguese test patient data"
@@ -58,9 +60,10 @@ class Command(BaseCommand):
             "cda_content": cda_content,  # Fallback
         }
 
-        # Store in session
+        # Store in session and index it for cross-session recovery
         session_key = f"patient_match_{session_id}"
         session[session_key] = patient_match_data
+        SessionDataService.index_patient_match(session, session_id)
         session.save()
 
         self.stdout.write(f"\n✅ Created new session!")
@@ -7,6 +7,11 @@ from django.conf import settings
 from django.contrib.sessions.models import Session
 from django.core.management.base import BaseCommand, CommandError
 
+from patient_data.services.session_cleanup import (
+    DEFAULT_BATCH_SIZE,
+    Deadline,
+    delete_expired_sessions,
+)
 from patient_data.session_management import DevelopmentSessionManager
 
 
@@ -24,6 +29,18 @@ class Command(BaseCommand):
         parser.add_argument(
             "--force", action="store_true", help="Force operations without confirmation"
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Sessions deleted per batch by clean (default {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--max-runtime",
+            type=float,
+            default=None,
+            help="Stop clean after this many seconds; rerun to continue",
+        )
 
     def handle(self, *args, **options):
         if not settings.DEBUG:
@@ -40,7 +57,11 @@ class Command(BaseCommand):
         elif action == "delete":
             self.delete_session(options.get("session_key"), options.get("force"))
         elif action == "clean":
-            self.clean_sessions(options.get("force"))
+            self.clean_sessions(
+                options.get("force"),
+                max(1, options["batch_size"]),
+                Deadline(options["max_runtime"]),
+            )
 
     def list_sessions(self):
         """List all available sessions"""
@@ -126,12 +147,11 @@ class Command(BaseCommand):
         except Session.DoesNotExist:
             self.stdout.write(self.style.ERROR(f"❌ Session not found: {session_key}"))
 
-    def clean_sessions(self, force):
-        """Clean expired sessions"""
+    def clean_sessions(self, force, batch_size=DEFAULT_BATCH_SIZE, deadline=None):
+        """Clean expired sessions in batches"""
         from django.utils import timezone
 
-        expired_sessions = Session.objects.filter(expire_date__lt=timezone.now())
-        count = expired_sessions.count()
+        count = Session.objects.filter(expire_date__lt=timezone.now()).count()
 
         if count == 0:
             self.stdout.write("✅ No expired sessions to clean")
@@ -144,5 +164,9 @@ class Command(BaseCommand):
                 self.stdout.write("❌ Cleanup cancelled")
                 return
 
-        expired_sessions.delete()
-        self.stdout.write(self.style.SUCCESS(f"✅ Cleaned {count} expired sessions"))
+        deleted = delete_expired_sessions(batch_size, deadline)
+        self.stdout.write(self.style.SUCCESS(f"✅ Cleaned {deleted} expired sessions"))
+        if deadline is not None and deadline.reached():
+            self.stdout.write(
+                self.style.WARNING("⏱️  Max runtime reached; rerun to continue")
+            )
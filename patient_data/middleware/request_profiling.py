@@ -0,0 +1,64 @@
+"""
+Request Profiling Middleware
+Server-Timing headers and on-demand JSON profiles for clinical views
+
+Opt-in with SERVER_TIMING_ENABLED = True: every response then carries a
+Server-Timing header with the request's total time, database time and the
+spans recorded by the pipeline managers and services (session decrypt, CDA
+parse, section extraction, translation, template and PDF render). When
+disabled the middleware removes itself at startup and costs nothing.
+
+With REQUEST_PROFILE_ENABLED = True as well, a staff user can add
+?_profile=1 (REQUEST_PROFILE_PARAM) to a URL to get the JSON profile
+(stage durations, query count, cache hit ratios) instead of the page.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, JsonResponse
+
+from patient_data.utils.request_profiling import profile_request
+
+logger = logging.getLogger(__name__)
+
+# Defaults (overridable in settings)
+DEFAULT_SERVER_TIMING_ENABLED = False
+DEFAULT_REQUEST_PROFILE_ENABLED = False
+DEFAULT_REQUEST_PROFILE_PARAM = "_profile"
+
+
+class RequestProfilingMiddleware:
+    """Profiles each request and reports it as Server-Timing (and JSON on demand)"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "SERVER_TIMING_ENABLED", DEFAULT_SERVER_TIMING_ENABLED):
+            raise MiddlewareNotUsed("SERVER_TIMING_ENABLED is off")
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        with profile_request() as profile:
+            response = self.get_response(request)
+
+        if self._profile_requested(request):
+            logger.info(f"Request profile served for {request.path}")
+            response = JsonResponse(
+                {
+                    "path": request.path,
+                    "status": response.status_code,
+                    **profile.as_dict(),
+                }
+            )
+
+        response["Server-Timing"] = profile.server_timing()
+        return response
+
+    def _profile_requested(self, request: HttpRequest) -> bool:
+        param = getattr(settings, "REQUEST_PROFILE_PARAM", DEFAULT_REQUEST_PROFILE_PARAM)
+        if not request.GET.get(param):
+            return False
+        if not getattr(settings, "REQUEST_PROFILE_ENABLED", DEFAULT_REQUEST_PROFILE_ENABLED):
+            return False
+        user = getattr(request, "user", None)
+        return bool(user is not None and user.is_authenticated and user.is_staff)
@@ -382,56 +382,6 @@ class SessionSecurityMiddleware(MiddlewareMixin):
         return response
 
 
-class SessionCleanupMiddleware(MiddlewareMixin):
-    """
-    Middleware for automatic session cleanup.
-
-    Periodically cleans up expired sessions and cached data.
-    """
-
-    def __init__(self, get_response):
-        self.get_response = get_response
-        self.last_cleanup = 0
-        super().__init__(get_response)
-
-    def process_request(self, request: HttpRequest) -> Optional[HttpResponse]:
-        """Perform periodic cleanup of expired sessions."""
-
-        # Only run cleanup every 5 minutes
-        cleanup_interval = getattr(
-            settings, "SESSION_CLEANUP_INTERVAL", 300
-        )  # 5 minutes
-        current_time = time.time()
-
-        if current_time - self.last_cleanup > cleanup_interval:
-            self._cleanup_expired_sessions()
-            self.last_cleanup = current_time
-
-        return None
-
-    def _cleanup_expired_sessions(self) -> None:
-        """Clean up expired sessions and cached data."""
-        try:
-            # Clean up expired sessions
-            expired_count = PatientSession.objects.cleanup_expired_sessions()
-            if expired_count > 0:
-                logger.info(f"Cleaned up {expired_count} expired patient sessions")
-
-            # Clean up expired cache entries
-            from patient_data.models import PatientDataCache
-
-            expired_cache = PatientDataCache.objects.filter(
-                expires_at__lt=timezone.now()
-            )
-            cache_count = expired_cache.count()
-            if cache_count > 0:
-                expired_cache.delete()
-                logger.info(f"Cleaned up {cache_count} expired cache entries")
-
-        except Exception as e:
-            logger.error(f"Error during session cleanup: {e}")
-
-
 class AuditLoggingMiddleware(MiddlewareMixin):
     """
     Middleware for comprehensive audit logging of patient data access.
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patient_data", "0007_tooltip"),
+        ("sessions", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PatientMatchSessionIndex",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "match_id",
+                    models.CharField(
+                        help_text="Patient match ID used in patient_match_<id> session keys",
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "session",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="patient_match_index",
+                        to="sessions.session",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Patient Match Session Index",
+                "verbose_name_plural": "Patient Match Session Index",
+                "db_table": "patient_match_session_index",
+            },
+        ),
+    ]
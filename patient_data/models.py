@@ -5,6 +5,7 @@ Django models for managing patient data retrieved from other EU member states
 
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
 from django.utils import timezone
 from datetime import timedelta
 from dataclasses import dataclass, field
@@ -784,6 +785,35 @@ class SessionAuditLog(models.Model):
         return f"[{status}] {self.action} - {session_id}... ({self.timestamp})"
 
 
+class PatientMatchSessionIndex(models.Model):
+    """
+    Index from a patient match ID to the Django session holding its data.
+
+    Written whenever ``patient_match_<id>`` data is stored in a session, so
+    views can recover match data from another session with one indexed
+    lookup instead of decoding every stored session. Rows are removed with
+    their session.
+    """
+
+    match_id = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Patient match ID used in patient_match_<id> session keys",
+    )
+    session = models.ForeignKey(
+        Session, on_delete=models.CASCADE, related_name="patient_match_index"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "patient_match_session_index"
+        verbose_name = "Patient Match Session Index"
+        verbose_name_plural = "Patient Match Session Index"
+
+    def __str__(self):
+        return f"patient_match_{self.match_id} -> {self.session_id[:8]}..."
+
+
 class Tooltip(models.Model):
     """
     Centralized tooltip management for the healthcare interface
@@ -883,27 +913,20 @@ class Tooltip(models.Model):
         Retrieve tooltip content by key
         Returns the tooltip content or default if not found/inactive
         """
-        try:
-            tooltip = cls.objects.get(key=key, is_active=True)
-            return tooltip.content
-        except cls.DoesNotExist:
-            return default
+        tooltip = cls.get_tooltip_data(key)
+        return tooltip["content"] if tooltip is not None else default
 
     @classmethod
     def get_tooltip_data(cls, key):
         """
         Retrieve complete tooltip data (content + placement) by key
         Returns dict with content and placement or None if not found
+
+        Served from the in-memory tooltip registry, not a per-key query.
         """
-        try:
-            tooltip = cls.objects.get(key=key, is_active=True)
-            return {
-                "content": tooltip.content,
-                "placement": tooltip.placement,
-                "title": tooltip.title,
-            }
-        except cls.DoesNotExist:
-            return None
+        from .services.tooltip_registry import tooltip_registry
+
+        return tooltip_registry.get(key)
 
 
 # Data Classes for Service Layer
@@ -20,6 +20,8 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import logging
 
+from patient_data.utils.request_profiling import span
+
 logger = logging.getLogger(__name__)
 
 
@@ -347,7 +349,8 @@ class SessionSecurity:
 
     def decrypt_patient_data(self, encrypted_data: bytes, key_version: int) -> Dict:
         """Decrypt patient data from secure storage."""
-        return self.encryption.decrypt_session_data(encrypted_data, key_version)
+        with span("session.decrypt"):
+            return self.encryption.decrypt_session_data(encrypted_data, key_version)
 
     def generate_csrf_token(self, session_id: str) -> str:
         """Generate CSRF token for session."""
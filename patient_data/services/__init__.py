@@ -5,5 +5,6 @@ from .patient_search_service import (
     PatientCredentials,
     PatientMatch,
 )
+from .demographic_search import DemographicQuery, DemographicRecord
 
 from .clinical_pdf_service import ClinicalDocumentPDFService
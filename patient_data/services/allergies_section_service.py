@@ -12,6 +12,7 @@ Version: 1.0.0
 import logging
 from typing import Dict, List, Any
 from django.http import HttpRequest
+from .session_data_service import SessionDataService
 from .clinical_sections.pipeline.clinical_data_pipeline_manager import ClinicalSectionServiceInterface
 
 logger = logging.getLogger(__name__)
@@ -135,7 +136,7 @@ class AllergiesSectionService(ClinicalSectionServiceInterface):
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_allergies'] = enhanced_allergies
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         logger.info(f"[ALLERGIES SERVICE] Enhanced and stored {len(enhanced_allergies)} allergies")
@@ -2,6 +2,9 @@
 CDA Administrative Information Extractor
 Extracts comprehensive administrative data from European L1/L3 CDA documents
 including contact information, healthcare providers, legal authenticators, etc.
+
+Header elements are located by UnifiedCDAHeaderExtractor in a single pass;
+this module formats them into the legacy AdministrativeData structure.
 """
 
 import logging
@@ -10,6 +13,12 @@ import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+from .unified_cda_header_extractor import (
+    CDAHeaderData,
+    CDAHeaderElements,
+    unified_header_extractor,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -129,12 +138,8 @@ class CDAAdministrativeExtractor:
             # Parse XML content
             if cda_content.strip().startswith("<"):
                 # XML format
-                root = ET.fromstring(cda_content)
-
-                # Detect source country to optimize parsing strategy
-                source_country = self._detect_source_country(root)
-
-                return self._extract_from_xml(root, source_country)
+                header = unified_header_extractor.extract(ET.fromstring(cda_content))
+                return self.extract_from_header(header)
             else:
                 # HTML format - try to extract what we can
                 return self._extract_from_html(cda_content)
@@ -143,7 +148,19 @@ class CDAAdministrativeExtractor:
             print(f"Error extracting administrative data: {e}")
             return AdministrativeData()
 
-    def _detect_source_country(self, root: ET.Element) -> str:
+    def extract_from_header(self, header: CDAHeaderData) -> AdministrativeData:
+        """
+        Build administrative data from an already extracted CDA header
+
+        Args:
+            header: Result of UnifiedCDAHeaderExtractor over an ElementTree root
+        """
+        # Detect source country to optimize parsing strategy
+        source_country = self._detect_source_country(header.elements)
+
+        return self._extract_from_xml(header.elements, source_country)
+
+    def _detect_source_country(self, elements: CDAHeaderElements) -> str:
         """
         Detect the source country of the CDA document to optimize parsing
 
@@ -152,7 +169,7 @@ class CDAAdministrativeExtractor:
         """
         try:
             # Check language code first
-            language_code = root.get("languageCode")
+            language_code = elements.language_code
             if language_code:
                 country_mapping = {
                     "en-IE": "IE",
@@ -169,9 +186,11 @@ class CDAAdministrativeExtractor:
                     return country_mapping[language_code]
 
             # Check custodian organization for country indicators
-            custodian = root.find(
-                ".//custodian/assignedCustodian/representedCustodianOrganization/name",
-                self.namespaces,
+            custodian_org = elements.custodian_organization
+            custodian = (
+                custodian_org.find("name", self.namespaces)
+                if custodian_org is not None
+                else None
             )
             if custodian is not None and custodian.text:
                 custodian_name = custodian.text.lower()
@@ -189,8 +208,11 @@ class CDAAdministrativeExtractor:
                     return "LU"
 
             # Check address country codes
-            patient_country = root.find(
-                ".//recordTarget/patientRole/addr/country", self.namespaces
+            patient_role = elements.patient_role
+            patient_country = (
+                patient_role.find("addr/country", self.namespaces)
+                if patient_role is not None
+                else None
             )
             if patient_country is not None and patient_country.text:
                 return patient_country.text.upper()
@@ -202,13 +224,13 @@ class CDAAdministrativeExtractor:
             return "UNKNOWN"
 
     def _extract_from_xml(
-        self, root: ET.Element, source_country: str = "UNKNOWN"
+        self, root: CDAHeaderElements, source_country: str = "UNKNOWN"
     ) -> AdministrativeData:
         """
         Extract administrative data from CDA XML with country-specific optimizations
 
         Args:
-            root: XML root element
+            root: Header elements located by the unified header extractor
             source_country: Detected source country code
         """
         admin_data = AdministrativeData()
@@ -258,7 +280,7 @@ class CDAAdministrativeExtractor:
         return admin_data
 
     def _extract_patient_contact_info(
-        self, root: ET.Element, source_country: str = "UNKNOWN"
+        self, root: CDAHeaderElements, source_country: str = "UNKNOWN"
     ) -> ContactInfo:
         """
         Extract patient contact information with country-specific optimizations
@@ -274,7 +296,7 @@ class CDAAdministrativeExtractor:
         contact_info = ContactInfo()
 
         # Look for patient role section
-        patient_role = root.find(".//recordTarget/patientRole", self.namespaces)
+        patient_role = root.patient_role
         if patient_role is not None:
             # Extract addresses - only direct children, not guardian addresses
             addresses = patient_role.findall("addr", self.namespaces)
@@ -292,32 +314,33 @@ class CDAAdministrativeExtractor:
 
         return contact_info
 
-    def _extract_patient_languages(self, root: ET.Element) -> List[str]:
+    def _extract_patient_languages(self, root: CDAHeaderElements) -> List[str]:
         """Extract patient language communication preferences"""
         languages = []
 
         # Look for language communication in patient section
-        lang_elements = root.findall(
-            ".//recordTarget/patientRole/patient/languageCommunication/languageCode",
-            self.namespaces,
-        )
+        for record_target in root.record_targets:
+            lang_elements = record_target.findall(
+                "patientRole/patient/languageCommunication/languageCode",
+                self.namespaces,
+            )
 
-        for lang_elem in lang_elements:
-            lang_code = lang_elem.get("code")
-            if lang_code:
-                languages.append(lang_code)
+            for lang_elem in lang_elements:
+                lang_code = lang_elem.get("code")
+                if lang_code:
+                    languages.append(lang_code)
 
         return languages
 
     def _extract_author_info(
-        self, root: ET.Element, source_country: str = "UNKNOWN"
+        self, root: CDAHeaderElements, source_country: str = "UNKNOWN"
     ) -> PersonInfo:
         """Extract author (Healthcare Professional) information"""
         person_info = PersonInfo()
         person_info.role = "Author (HCP)"
 
         # Look for author section
-        author = root.find(".//author", self.namespaces)
+        author = root.authors[0] if root.authors else None
         if author is not None:
             # Extract person name
             person_name = author.find(".//assignedPerson/name", self.namespaces)
@@ -353,14 +376,14 @@ class CDAAdministrativeExtractor:
         return person_info
 
     def _extract_legal_authenticator(
-        self, root: ET.Element, source_country: str = "UNKNOWN"
+        self, root: CDAHeaderElements, source_country: str = "UNKNOWN"
     ) -> PersonInfo:
         """Extract legal authenticator information"""
         person_info = PersonInfo()
         person_info.role = "Legal Authenticator"
 
         # Look for legal authenticator section
-        auth = root.find(".//legalAuthenticator", self.namespaces)
+        auth = root.legal_authenticators[0] if root.legal_authenticators else None
         if auth is not None:
             # Extract person name
             person_name = auth.find(".//assignedPerson/name", self.namespaces)
@@ -386,17 +409,14 @@ class CDAAdministrativeExtractor:
         return person_info
 
     def _extract_custodian_info(
-        self, root: ET.Element, source_country: str = "UNKNOWN"
+        self, root: CDAHeaderElements, source_country: str = "UNKNOWN"
     ) -> OrganizationInfo:
         """Extract custodian organization information"""
         org_info = OrganizationInfo()
         org_info.organization_type = "Custodian"
 
         # Look for custodian section
-        custodian = root.find(
-            ".//custodian/assignedCustodian/representedCustodianOrganization",
-            self.namespaces,
-        )
+        custodian = root.custodian_organization
         if custodian is not None:
             org_info = self._extract_organization_info(custodian, source_country)
             org_info.organization_type = "Custodian"
@@ -404,7 +424,7 @@ class CDAAdministrativeExtractor:
         return org_info
 
     def _extract_guardian_info(
-        self, root: ET.Element, source_country: str = "UNKNOWN"
+        self, root: CDAHeaderElements, source_country: str = "UNKNOWN"
     ) -> PersonInfo:
         """
         Extract guardian information
@@ -418,7 +438,11 @@ class CDAAdministrativeExtractor:
         person_info.role = "Guardian"
 
         # Look for guardian section
-        guardian = root.find(".//guardian", self.namespaces)
+        guardian = None
+        for record_target in root.record_targets:
+            guardian = record_target.find(".//guardian", self.namespaces)
+            if guardian is not None:
+                break
         if guardian is not None:
             # Extract person name
             person_name = guardian.find(".//guardianPerson/name", self.namespaces)
@@ -434,14 +458,18 @@ class CDAAdministrativeExtractor:
         return person_info
 
     def _extract_preferred_hcp(
-        self, root: ET.Element, source_country: str = "UNKNOWN"
+        self, root: CDAHeaderElements, source_country: str = "UNKNOWN"
     ) -> OrganizationInfo:
         """Extract preferred healthcare provider (Cabinet Medicale) information"""
         org_info = OrganizationInfo()
         org_info.organization_type = "Preferred HCP Organization"
 
         # Look for participant with type code PPRF (primary performer)
-        participants = root.findall('.//participant[@typeCode="PPRF"]', self.namespaces)
+        participants = [
+            participant
+            for participant in root.participants
+            if participant.get("typeCode") == "PPRF"
+        ]
         for participant in participants:
             org = participant.find(".//scopingOrganization", self.namespaces)
             if org is not None:
@@ -452,14 +480,13 @@ class CDAAdministrativeExtractor:
         return org_info
 
     def _extract_other_contacts(
-        self, root: ET.Element, source_country: str = "UNKNOWN"
+        self, root: CDAHeaderElements, source_country: str = "UNKNOWN"
     ) -> List[PersonInfo]:
         """Extract other contact information"""
         contacts = []
 
         # Look for informants, participants, etc.
-        informants = root.findall(".//informant", self.namespaces)
-        for informant in informants:
+        for informant in root.informants:
             person_info = PersonInfo()
             person_info.role = "Informant"
 
@@ -727,65 +754,48 @@ class CDAAdministrativeExtractor:
             return part_elem.text.strip()
         return ""
 
-    def _extract_document_creation_date(self, root: ET.Element) -> str:
+    def _extract_document_creation_date(self, root: CDAHeaderElements) -> str:
         """Extract document creation date from CDA header"""
         # Look for effectiveTime in the CDA header
-        effective_time = root.find(".//effectiveTime[@value]", self.namespaces)
+        effective_time = root.effective_time
         if effective_time is not None and effective_time.get("value"):
             return self._format_cda_datetime(effective_time.get("value"))
 
-        # Alternative path: look for creationTime
-        creation_time = root.find(".//creationTime[@value]", self.namespaces)
-        if creation_time is not None and creation_time.get("value"):
-            return self._format_cda_datetime(creation_time.get("value"))
-
         return ""
 
-    def _extract_document_last_update_date(self, root: ET.Element) -> str:
+    def _extract_document_last_update_date(self, root: CDAHeaderElements) -> str:
         """
         Extract document last update date from CDA header.
         This is critical for healthcare professionals to understand data currency.
         """
         # Priority 1: Look for explicit update/revision time in document header
-        update_time = root.find(
-            ".//documentationOf/serviceEvent/effectiveTime/high[@value]",
-            self.namespaces,
-        )
-        if update_time is not None and update_time.get("value"):
-            return self._format_cda_datetime(update_time.get("value"))
-
-        # Priority 2: Look for revision history or version-specific time
-        version_elem = root.find(".//versionNumber", self.namespaces)
-        if version_elem is not None:
-            # Look for associated time element in same parent
-            time_elem = version_elem.find("../effectiveTime[@value]", self.namespaces)
-            if time_elem is not None and time_elem.get("value"):
-                return self._format_cda_datetime(time_elem.get("value"))
-
-        # Priority 3: Look for any modification/update timestamp
-        modification_time = root.find(".//lastModified[@value]", self.namespaces)
-        if modification_time is not None and modification_time.get("value"):
-            return self._format_cda_datetime(modification_time.get("value"))
-
-        # Priority 4: Look for participant time (author time can indicate updates)
-        participant_time = root.find(".//participant/time[@value]", self.namespaces)
-        if participant_time is not None and participant_time.get("value"):
-            return self._format_cda_datetime(participant_time.get("value"))
+        for documentation_of in root.documentation_of:
+            update_time = documentation_of.find(
+                "serviceEvent/effectiveTime/high[@value]", self.namespaces
+            )
+            if update_time is not None and update_time.get("value"):
+                return self._format_cda_datetime(update_time.get("value"))
+
+        # Priority 2: Look for participant time (author time can indicate updates)
+        for participant in root.participants:
+            participant_time = participant.find("time[@value]", self.namespaces)
+            if participant_time is not None and participant_time.get("value"):
+                return self._format_cda_datetime(participant_time.get("value"))
 
         # Fallback: Use creation date (indicates no updates since creation)
         creation_date = self._extract_document_creation_date(root)
         return creation_date if creation_date else "Unknown"
 
-    def _extract_document_version_number(self, root: ET.Element) -> str:
+    def _extract_document_version_number(self, root: CDAHeaderElements) -> str:
         """Extract document version number from CDA header"""
-        version_elem = root.find(".//versionNumber[@value]", self.namespaces)
+        version_elem = root.version_number
         if version_elem is not None and version_elem.get("value"):
             return version_elem.get("value")
         return ""
 
-    def _extract_document_set_id(self, root: ET.Element) -> str:
+    def _extract_document_set_id(self, root: CDAHeaderElements) -> str:
         """Extract document set ID from CDA header"""
-        set_id_elem = root.find(".//setId[@root]", self.namespaces)
+        set_id_elem = root.set_id
         if set_id_elem is not None and set_id_elem.get("root"):
             extension = set_id_elem.get("extension", "")
             root_id = set_id_elem.get("root")
@@ -866,14 +876,12 @@ class CDAAdministrativeExtractor:
 
         return admin_data
 
-    def _extract_participants(self, root: ET.Element) -> List[PersonInfo]:
+    def _extract_participants(self, root: CDAHeaderElements) -> List[PersonInfo]:
         """Extract participant information including emergency contacts, next of kin, dependencies"""
         participants = []
 
-        # Find all participant elements
-        participant_elements = root.findall(".//participant", self.namespaces)
-
-        for participant in participant_elements:
+        # Header participant elements
+        for participant in root.participants:
             person_info = self._extract_participant_info(participant)
             if person_info and (
                 person_info.family_name or person_info.given_name or person_info.role
@@ -19,6 +19,8 @@ from dataclasses import dataclass, asdict
 from django.conf import settings
 import logging
 
+from .demographic_search import DemographicSearchIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -94,6 +96,7 @@ class CDADocumentInfo:
     document_title: str = None  # Document title from <title> element
     document_extension: str = None  # Document ID extension from <id>
     document_root: str = None  # Document ID root from <id>
+    patient_id_root: str = None  # Patient ID root (assigning authority OID)
 
     def to_dict(self) -> Dict:
         return asdict(self)
@@ -118,6 +121,7 @@ class CDADocumentIndexer:
         )
         self.index_file = os.path.join(settings.BASE_DIR, "cda_document_index.json")
         self.index_cache = None
+        self.search_index_cache = None
 
     def extract_patient_info_from_cda(self, file_path: str) -> Optional[Dict[str, str]]:
         """Extract patient information from CDA file"""
@@ -138,12 +142,14 @@ class CDADocumentIndexer:
 
             # Extract patient ID
             patient_id = ""
+            patient_id_root = ""
             assigning_authority = ""
             id_elements = patient_role.findall("hl7:id", namespaces)
             if id_elements:
                 # Use the first ID element (usually the primary one)
                 first_id = id_elements[0]
                 patient_id = first_id.get("extension", "")
+                patient_id_root = first_id.get("root", "")
                 assigning_authority = first_id.get("assigningAuthorityName", "")
 
             if not patient_id:
@@ -202,6 +208,7 @@ class CDADocumentIndexer:
 
             return {
                 "patient_id": patient_id,
+                "patient_id_root": patient_id_root,
                 "given_name": given_name,
                 "family_name": family_name,
                 "birth_date": birth_date,
@@ -315,6 +322,7 @@ class CDADocumentIndexer:
                             document_title=patient_info.get("document_title", "Untitled Document"),
                             document_extension=patient_info.get("document_extension", ""),
                             document_root=patient_info.get("document_root", ""),
+                            patient_id_root=patient_info.get("patient_id_root", ""),
                         )
 
                         documents.append(doc_info)
@@ -384,6 +392,12 @@ class CDADocumentIndexer:
             self.index_cache = self.build_index()
         return self.index_cache
 
+    def get_search_index(self) -> DemographicSearchIndex:
+        """Normalized demographic search keys for the current index (cached)"""
+        if self.search_index_cache is None:
+            self.search_index_cache = DemographicSearchIndex.from_cda_index(self.get_index())
+        return self.search_index_cache
+
     def find_patient_documents(
         self, patient_id: str, country_code: Optional[str] = None
     ) -> List[CDADocumentInfo]:
@@ -442,6 +456,7 @@ class CDADocumentIndexer:
     def refresh_index(self):
         """Force refresh of the index"""
         self.index_cache = None
+        self.search_index_cache = None
         if os.path.exists(self.index_file):
             os.remove(self.index_file)
         return self.build_index(force_rebuild=True)
@@ -0,0 +1,197 @@
+"""
+Disk cache and bounded render pool for rendered CDA documents
+
+Rendering a structured CDA document (section processing, terminology
+translation and HTML generation) is expensive and its output only depends
+on the CDA content, the target language and the renderer version. Rendered
+documents are stored on local disk under a hash of that key, and the least
+recently used files are evicted once the cache exceeds its size limit.
+
+Cold renders run in a small worker pool. Concurrent requests for the same
+key wait on the render already in flight instead of starting their own.
+"""
+
+import contextvars
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional, Sequence
+
+from django.conf import settings
+from django.db import connections
+
+from patient_data.utils.request_profiling import record_cache_lookup, span
+
+logger = logging.getLogger(__name__)
+
+# Defaults (overridable in settings)
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_RENDER_WORKERS = 2
+DEFAULT_RENDER_TIMEOUT_SECONDS = 60
+
+
+class DocumentRenderError(Exception):
+    """Raised when a document could not be rendered"""
+
+
+class CDARenderCache:
+    """
+    Size-bounded disk cache of rendered documents with request coalescing
+
+    Entries are keyed by a sequence of strings, typically
+    (CDA content hash, target language, renderer version, ...).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.cache_dir = cache_dir or getattr(
+            settings,
+            "CDA_RENDER_CACHE_DIR",
+            os.path.join(tempfile.gettempdir(), "ehealth_cda_renders"),
+        )
+        self.max_bytes = max_bytes or getattr(
+            settings, "CDA_RENDER_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES
+        )
+        self.max_workers = max_workers or getattr(
+            settings, "CDA_RENDER_WORKERS", DEFAULT_RENDER_WORKERS
+        )
+        self.timeout = getattr(
+            settings, "CDA_RENDER_TIMEOUT", DEFAULT_RENDER_TIMEOUT_SECONDS
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(cda_content: str) -> str:
+        return hashlib.sha256(cda_content.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def cache_key(key_parts: Sequence[str]) -> str:
+        return hashlib.sha256("\x1f".join(map(str, key_parts)).encode("utf-8")).hexdigest()
+
+    def _path(self, cache_key: str) -> str:
+        return os.path.join(self.cache_dir, f"{cache_key}.render")
+
+    def get_or_render(
+        self, key_parts: Sequence[str], render: Callable[[], bytes]
+    ) -> bytes:
+        """
+        Return the cached rendering for ``key_parts``, rendering it if needed
+
+        ``render`` runs on a pool thread, so it must not touch the request.
+
+        Raises:
+            DocumentRenderError: If the render failed or timed out
+        """
+        cache_key = self.cache_key(key_parts)
+
+        with span("cda_render"):
+            cached = self._read(cache_key)
+            record_cache_lookup("cda_render", hit=cached is not None)
+            if cached is not None:
+                return cached
+            return self._render_shared(cache_key, render)
+
+    def _render_shared(self, cache_key: str, render: Callable[[], bytes]) -> bytes:
+        """Render on the pool, joining a render of the same key in flight"""
+        with self._lock:
+            future = self._in_flight.get(cache_key)
+            if future is None:
+                # A render may have completed between the read and the lock
+                cached = self._read(cache_key)
+                if cached is not None:
+                    return cached
+                # The copied context lets the render's stages show up in the
+                # requesting request's profile
+                future = self._get_executor().submit(
+                    contextvars.copy_context().run, self._render, cache_key, render
+                )
+                self._in_flight[cache_key] = future
+            else:
+                logger.info(f"Joining in-flight render {cache_key[:12]}")
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise DocumentRenderError(
+                f"Rendering did not finish within {self.timeout} seconds"
+            )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="cda-render"
+            )
+        return self._executor
+
+    def _render(self, cache_key: str, render: Callable[[], bytes]) -> bytes:
+        try:
+            content = render()
+            self._write(cache_key, content)
+            return content
+        except DocumentRenderError:
+            raise
+        except Exception as e:
+            logger.error(f"Render {cache_key[:12]} failed: {e}")
+            raise DocumentRenderError(str(e)) from e
+        finally:
+            with self._lock:
+                self._in_flight.pop(cache_key, None)
+            # Pool threads outlive the render; release their DB connections
+            connections.close_all()
+
+    def _read(self, cache_key: str) -> Optional[bytes]:
+        path = self._path(cache_key)
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        try:
+            # Touch for least-recently-used eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return content
+
+    def _write(self, cache_key: str, content: bytes):
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".render.tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, self._path(cache_key))
+        logger.info(f"Cached render {cache_key[:12]} ({len(content)} bytes)")
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used renders until under max_bytes"""
+        try:
+            entries = [
+                (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith(".render") and entry.is_file()
+            ]
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+
+
+cda_render_cache = CDARenderCache()
@@ -0,0 +1,830 @@
+"""
+CDA to FHIR R4 Conversion
+
+Converts epSOS/eHDSI CDA documents into FHIR R4 document Bundles. The CDA
+is parsed once and each body section is visited once: the section is
+routed by its templateIds and LOINC code to a mapper that turns its entries
+into FHIR resources (the sections handled by the clinical section
+services), and every section becomes a Composition section referencing
+the resources built from it. The templateId/code dispatch is memoized.
+
+The conversion is pure XML processing with no database access, so batches
+can be converted in parallel worker processes (see convert_batch).
+"""
+
+import logging
+import os
+import re
+import uuid
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from html import escape
+from multiprocessing import get_context
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Defaults (overridable in settings)
+# Documents queued per worker process during a batch conversion
+DEFAULT_QUEUE_PER_WORKER = 2
+
+SUPPORTED_PROFILES = ("patient-summary", "eprescription", "edispensation")
+
+HL7 = "{urn:hl7-org:v3}"
+XSI_TYPE = "{http://www.w3.org/2001/XMLSchema-instance}type"
+
+# CDA code system OIDs and their FHIR system URIs
+CODE_SYSTEM_URIS = {
+    "2.16.840.1.113883.6.1": "http://loinc.org",
+    "2.16.840.1.113883.6.96": "http://snomed.info/sct",
+    "2.16.840.1.113883.6.73": "http://www.whocc.no/atc",
+    "2.16.840.1.113883.6.3": "http://hl7.org/fhir/sid/icd-10",
+    "2.16.840.1.113883.6.90": "http://hl7.org/fhir/sid/icd-10-cm",
+    "2.16.840.1.113883.6.103": "http://hl7.org/fhir/sid/icd-9-cm",
+    "2.16.840.1.113883.6.8": "http://unitsofmeasure.org",
+    "0.4.0.127.0.16.1.1.2.1": "http://standardterms.edqm.eu",
+    "2.16.840.1.113883.5.1": "http://terminology.hl7.org/CodeSystem/v3-AdministrativeGender",
+}
+UCUM = "http://unitsofmeasure.org"
+
+GENDERS = {"M": "male", "F": "female", "UN": "other", "UNK": "unknown"}
+
+# Section kinds, identified by IHE PCC / CCD section templateIds (checked
+# first) or by the section LOINC code. epSOS section templateIds are not
+# used as they are not applied consistently across countries.
+SECTION_TEMPLATES = {
+    "1.3.6.1.4.1.19376.1.5.3.1.3.19": "medications",
+    "2.16.840.1.113883.10.20.1.8": "medications",
+    "1.3.6.1.4.1.19376.1.5.3.1.3.13": "allergies",
+    "2.16.840.1.113883.10.20.1.2": "allergies",
+    "1.3.6.1.4.1.19376.1.5.3.1.3.6": "problems",
+    "2.16.840.1.113883.10.20.1.11": "problems",
+    "1.3.6.1.4.1.19376.1.5.3.1.3.8": "past_illness",
+    "1.3.6.1.4.1.19376.1.5.3.1.3.12": "procedures",
+    "2.16.840.1.113883.10.20.1.12": "procedures",
+    "1.3.6.1.4.1.19376.1.5.3.1.3.23": "immunizations",
+    "2.16.840.1.113883.10.20.1.6": "immunizations",
+    "1.3.6.1.4.1.19376.1.5.3.1.1.5.3.5": "medical_devices",
+    "2.16.840.1.113883.10.20.1.7": "medical_devices",
+    "1.3.6.1.4.1.19376.1.5.3.1.1.5.3.2": "vital_signs",
+    "1.3.6.1.4.1.19376.1.5.3.1.3.25": "vital_signs",
+    "1.3.6.1.4.1.19376.1.5.3.1.3.16": "social_history",
+    "2.16.840.1.113883.10.20.1.15": "social_history",
+}
+SECTION_CODES = {
+    "10160-0": "medications",
+    "57828-6": "prescriptions",
+    "60590-7": "dispensations",
+    "48765-2": "allergies",
+    "11450-4": "problems",
+    "11348-0": "past_illness",
+    "47519-4": "procedures",
+    "11369-6": "immunizations",
+    "46264-8": "medical_devices",
+    "8716-3": "vital_signs",
+    "30954-2": "results",
+    "29762-2": "social_history",
+    "10162-6": "pregnancy_history",
+    "47420-5": "functional_status",
+}
+
+# Observation category for sections mapped to Observation resources
+OBSERVATION_CATEGORIES = {
+    "vital_signs": "vital-signs",
+    "results": "laboratory",
+    "social_history": "social-history",
+    "functional_status": "survey",
+    "pregnancy_history": None,
+}
+
+TS_PATTERN = re.compile(
+    r"^(\d{4})(\d{2})?(\d{2})?(?:(\d{2})(\d{2})?(\d{2})?(?:\.\d+)?)?([+-]\d{2})?(\d{2})?$"
+)
+
+
+class CDAConversionError(Exception):
+    """Raised when a document cannot be converted to FHIR"""
+
+
+@lru_cache(maxsize=512)
+def section_kind(code: Optional[str], template_ids: Tuple[str, ...]) -> Optional[str]:
+    """Section kind for a section's LOINC code and templateIds, or None"""
+    for template_id in template_ids:
+        kind = SECTION_TEMPLATES.get(template_id)
+        if kind:
+            return kind
+    return SECTION_CODES.get(code)
+
+
+def _fhir_datetime(value: Optional[str]) -> Optional[str]:
+    """FHIR date/dateTime for an HL7 TS value
+
+    A time is only kept when the TS carries a UTC offset, as FHIR requires
+    a time zone on every dateTime with a time.
+    """
+    if not value:
+        return None
+    match = TS_PATTERN.match(value.strip())
+    if not match:
+        return None
+    year, month, day, hour, minute, second, tz_hours, tz_minutes = match.groups()
+    date = "-".join(part for part in (year, month, day if month else None) if part)
+    if hour is None or day is None or tz_hours is None:
+        return date
+    return (
+        f"{date}T{hour}:{minute or '00'}:{second or '00'}"
+        f"{tz_hours}:{tz_minutes or '00'}"
+    )
+
+
+def _attribute(element: ET.Element, path: str, name: str) -> Optional[str]:
+    """Attribute of the first element at path, or None"""
+    child = element.find(path)
+    return child.get(name) if child is not None else None
+
+
+def _plain_text(element: Optional[ET.Element]) -> str:
+    if element is None:
+        return ""
+    return " ".join(" ".join(element.itertext()).split())
+
+
+def _coding(element: ET.Element) -> Optional[Dict[str, str]]:
+    code = element.get("code")
+    if not code:
+        return None
+    coding = {"code": code}
+    code_system = element.get("codeSystem")
+    if code_system:
+        coding["system"] = CODE_SYSTEM_URIS.get(code_system, f"urn:oid:{code_system}")
+    display = element.get("displayName")
+    if display:
+        coding["display"] = display
+    return coding
+
+
+def _codeable_concept(element: Optional[ET.Element], text: str = "") -> Optional[Dict[str, Any]]:
+    """CodeableConcept for a CD/CE element, including its translations"""
+    if element is None:
+        return {"text": text} if text else None
+
+    # Translations often repeat the code with a localised display name
+    codings = {}
+    for coded in (element, *element.findall(f"{HL7}translation")):
+        coding = _coding(coded)
+        if coding:
+            codings.setdefault((coding.get("system"), coding["code"]), coding)
+    codings = list(codings.values())
+
+    concept: Dict[str, Any] = {}
+    if codings:
+        concept["coding"] = codings
+    text = text or next((c["display"] for c in codings if "display" in c), "")
+    if not text:
+        original_text = element.find(f"{HL7}originalText")
+        if original_text is not None and original_text.find(f"{HL7}reference") is None:
+            text = _plain_text(original_text)
+    if text:
+        concept["text"] = text
+    return concept or None
+
+
+def _effective(element: ET.Element) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """(point in time, period start, period end) of an element's effectiveTime"""
+    effective_time = element.find(f"{HL7}effectiveTime")
+    if effective_time is None:
+        return None, None, None
+    low = effective_time.find(f"{HL7}low")
+    high = effective_time.find(f"{HL7}high")
+    return (
+        _fhir_datetime(effective_time.get("value")),
+        _fhir_datetime(low.get("value")) if low is not None else None,
+        _fhir_datetime(high.get("value")) if high is not None else None,
+    )
+
+
+def _quantity(element: Optional[ET.Element]) -> Optional[Dict[str, Any]]:
+    if element is None or element.get("value") is None:
+        return None
+    try:
+        value = float(element.get("value"))
+    except ValueError:
+        return None
+    quantity: Dict[str, Any] = {"value": int(value) if value.is_integer() else value}
+    unit = element.get("unit")
+    if unit and unit != "1":
+        quantity.update(unit=unit, system=UCUM, code=unit)
+    return quantity
+
+
+def _observation_value(value: ET.Element) -> Optional[Tuple[str, Any]]:
+    """(value[x] element name, value) for an observation value"""
+    value_type = (value.get(XSI_TYPE) or "").split(":")[-1]
+    if value_type == "PQ":
+        quantity = _quantity(value)
+        return ("valueQuantity", quantity) if quantity else None
+    if value_type == "IVL_PQ":
+        value_range = {
+            key: quantity
+            for key, quantity in (
+                ("low", _quantity(value.find(f"{HL7}low"))),
+                ("high", _quantity(value.find(f"{HL7}high"))),
+            )
+            if quantity
+        }
+        return ("valueRange", value_range) if value_range else None
+    if value_type in ("CD", "CE", "CO", "CV"):
+        concept = _codeable_concept(value)
+        return ("valueCodeableConcept", concept) if concept else None
+    if value_type == "TS":
+        date = _fhir_datetime(value.get("value"))
+        return ("valueDateTime", date) if date else None
+    if value_type == "INT" and value.get("value", "").lstrip("-").isdigit():
+        return ("valueInteger", int(value.get("value")))
+    if value_type == "BL" and value.get("value") in ("true", "false"):
+        return ("valueBoolean", value.get("value") == "true")
+    text = _plain_text(value)
+    return ("valueString", text) if text else None
+
+
+def _person_name(element: Optional[ET.Element]) -> Optional[Dict[str, Any]]:
+    if element is None:
+        return None
+    name: Dict[str, Any] = {}
+    family = _plain_text(element.find(f"{HL7}family"))
+    given = [_plain_text(g) for g in element.findall(f"{HL7}given") if _plain_text(g)]
+    if family:
+        name["family"] = family
+    if given:
+        name["given"] = given
+    if not name:
+        text = _plain_text(element)
+        if text:
+            name["text"] = text
+    return name or None
+
+
+def _identifier(element: ET.Element) -> Optional[Dict[str, str]]:
+    root = element.get("root")
+    if not root:
+        return None
+    extension = element.get("extension")
+    if extension:
+        return {"system": f"urn:oid:{root}", "value": extension}
+    if root[0].isdigit():
+        return {"system": "urn:ietf:rfc:3986", "value": f"urn:oid:{root}"}
+    return {"system": "urn:ietf:rfc:3986", "value": f"urn:uuid:{root.lower()}"}
+
+
+class _Conversion:
+    """Resources built while converting one document"""
+
+    def __init__(self, target_profile: str):
+        self.target_profile = target_profile
+        self.entries: List[Dict[str, Any]] = []
+        self.patient_reference: Dict[str, str] = {}
+
+    def add(self, resource: Dict[str, Any]) -> Dict[str, str]:
+        """Add a resource to the bundle and return a reference to it"""
+        full_url = f"urn:uuid:{uuid.uuid4()}"
+        self.entries.append({"fullUrl": full_url, "resource": resource})
+        return {"reference": full_url}
+
+
+class CDAToFHIRService:
+    """Converts CDA documents to FHIR R4 document Bundles"""
+
+    # Section kind -> mapper method
+    MAPPERS = {
+        "medications": "_map_medications",
+        "prescriptions": "_map_medications",
+        "dispensations": "_map_medications",
+        "allergies": "_map_allergies",
+        "problems": "_map_conditions",
+        "past_illness": "_map_conditions",
+        "procedures": "_map_procedures",
+        "immunizations": "_map_immunizations",
+        "medical_devices": "_map_devices",
+        "vital_signs": "_map_observations",
+        "results": "_map_observations",
+        "social_history": "_map_observations",
+        "pregnancy_history": "_map_observations",
+        "functional_status": "_map_observations",
+    }
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self._max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = Lock()
+
+    def convert(self, cda_content, target_profile: str = "patient-summary") -> Dict[str, Any]:
+        """Convert one CDA document (str or bytes) to a FHIR document Bundle"""
+        if target_profile not in SUPPORTED_PROFILES:
+            raise CDAConversionError(f"Unsupported target profile: {target_profile}")
+        if isinstance(cda_content, str):
+            cda_content = cda_content.encode("utf-8")
+        try:
+            root = ET.fromstring(cda_content)
+        except ET.ParseError as e:
+            raise CDAConversionError(f"Invalid CDA XML: {e}") from e
+        if root.tag != f"{HL7}ClinicalDocument":
+            raise CDAConversionError("Document root is not an HL7 CDA ClinicalDocument")
+
+        conversion = _Conversion(target_profile)
+        composition: Dict[str, Any] = {"resourceType": "Composition"}
+        # The Composition is the first entry of a document Bundle
+        conversion.entries.append({"fullUrl": f"urn:uuid:{uuid.uuid4()}", "resource": composition})
+
+        conversion.patient_reference = conversion.add(self._patient(root))
+        sections = [
+            self._convert_section(section, conversion)
+            for section in root.iterfind(
+                f"{HL7}component/{HL7}structuredBody/{HL7}component/{HL7}section"
+            )
+        ]
+
+        document_date = _fhir_datetime(_attribute(root, f"{HL7}effectiveTime", "value"))
+        composition.update(
+            status="final",
+            type=_codeable_concept(root.find(f"{HL7}code")) or {"text": "Patient Summary"},
+            subject=conversion.patient_reference,
+            author=self._authors(root, conversion),
+            title=_plain_text(root.find(f"{HL7}title")) or "Patient Summary",
+            section=sections,
+        )
+        if document_date:
+            composition["date"] = document_date
+
+        bundle: Dict[str, Any] = {
+            "resourceType": "Bundle",
+            "type": "document",
+            "meta": {"tag": [{"code": target_profile}]},
+            "entry": conversion.entries,
+        }
+        document_id = root.find(f"{HL7}id")
+        identifier = _identifier(document_id) if document_id is not None else None
+        if identifier:
+            bundle["identifier"] = identifier
+        if document_date and "T" in document_date:
+            bundle["timestamp"] = document_date
+        return bundle
+
+    # Document level
+
+    def _patient(self, root: ET.Element) -> Dict[str, Any]:
+        patient: Dict[str, Any] = {"resourceType": "Patient"}
+        patient_role = root.find(f"{HL7}recordTarget/{HL7}patientRole")
+        if patient_role is None:
+            return patient
+
+        identifiers = [i for i in map(_identifier, patient_role.findall(f"{HL7}id")) if i]
+        if identifiers:
+            patient["identifier"] = identifiers
+
+        person = patient_role.find(f"{HL7}patient")
+        if person is not None:
+            names = [n for n in map(_person_name, person.findall(f"{HL7}name")) if n]
+            if names:
+                patient["name"] = names
+            gender = person.find(f"{HL7}administrativeGenderCode")
+            if gender is not None and gender.get("code") in GENDERS:
+                patient["gender"] = GENDERS[gender.get("code")]
+            birth_time = person.find(f"{HL7}birthTime")
+            if birth_time is not None:
+                birth_date = _fhir_datetime(birth_time.get("value"))
+                if birth_date:
+                    patient["birthDate"] = birth_date.split("T")[0]
+
+        addresses = []
+        for addr in patient_role.findall(f"{HL7}addr"):
+            address = {
+                key: _plain_text(addr.find(f"{HL7}{tag}"))
+                for key, tag in (
+                    ("city", "city"),
+                    ("postalCode", "postalCode"),
+                    ("country", "country"),
+                )
+                if _plain_text(addr.find(f"{HL7}{tag}"))
+            }
+            lines = [_plain_text(line) for line in addr.findall(f"{HL7}streetAddressLine") if _plain_text(line)]
+            if lines:
+                address["line"] = lines
+            if address:
+                addresses.append(address)
+        if addresses:
+            patient["address"] = addresses
+        return patient
+
+    def _authors(self, root: ET.Element, conversion: _Conversion) -> List[Dict[str, str]]:
+        authors = []
+        for assigned_author in root.iterfind(f"{HL7}author/{HL7}assignedAuthor"):
+            practitioner: Dict[str, Any] = {"resourceType": "Practitioner"}
+            identifiers = [i for i in map(_identifier, assigned_author.findall(f"{HL7}id")) if i]
+            if identifiers:
+                practitioner["identifier"] = identifiers
+            name = _person_name(assigned_author.find(f"{HL7}assignedPerson/{HL7}name"))
+            if name:
+                practitioner["name"] = [name]
+            authors.append(conversion.add(practitioner))
+        return authors or [{"display": "Unknown author"}]
+
+    def _convert_section(self, section: ET.Element, conversion: _Conversion) -> Dict[str, Any]:
+        code = section.find(f"{HL7}code")
+        kind = section_kind(
+            code.get("code") if code is not None else None,
+            tuple(t.get("root", "") for t in section.findall(f"{HL7}templateId")),
+        )
+
+        references = []
+        mapper = self.MAPPERS.get(kind)
+        if mapper:
+            for entry in section.findall(f"{HL7}entry"):
+                try:
+                    for resource in getattr(self, mapper)(entry, kind, conversion):
+                        references.append(conversion.add(resource))
+                except Exception as e:
+                    logger.debug(f"Skipped unconvertible {kind} entry: {e}")
+
+        composition_section: Dict[str, Any] = {
+            "title": _plain_text(section.find(f"{HL7}title")) or (code.get("displayName", "") if code is not None else ""),
+        }
+        concept = _codeable_concept(code)
+        if concept:
+            composition_section["code"] = concept
+        narrative = _plain_text(section.find(f"{HL7}text"))
+        if narrative:
+            composition_section["text"] = {
+                "status": "generated",
+                "div": f'<div xmlns="http://www.w3.org/1999/xhtml">{escape(narrative)}</div>',
+            }
+        if references:
+            composition_section["entry"] = references
+        if not narrative and not references:
+            composition_section["emptyReason"] = {
+                "coding": [{"system": "http://terminology.hl7.org/CodeSystem/list-empty-reason", "code": "unavailable"}]
+            }
+
+        subsections = [
+            self._convert_section(subsection, conversion)
+            for subsection in section.iterfind(f"{HL7}component/{HL7}section")
+        ]
+        if subsections:
+            composition_section["section"] = subsections
+        return composition_section
+
+    # Section mappers: each yields the resources for one section entry
+
+    def _map_medications(self, entry: ET.Element, kind: str, conversion: _Conversion) -> Iterable[Dict[str, Any]]:
+        for administration in entry.iterfind(f"{HL7}substanceAdministration"):
+            material = administration.find(
+                f"{HL7}consumable/{HL7}manufacturedProduct/{HL7}manufacturedMaterial"
+            )
+            medication = _codeable_concept(
+                material.find(f"{HL7}code") if material is not None else None,
+                _plain_text(material.find(f"{HL7}name")) if material is not None else "",
+            ) or {"text": "Unknown medication"}
+
+            dosage: Dict[str, Any] = {}
+            route = _codeable_concept(administration.find(f"{HL7}routeCode"))
+            if route:
+                dosage["route"] = route
+            dose = administration.find(f"{HL7}doseQuantity")
+            if dose is not None:
+                if dose.get("value") is not None:
+                    dose_quantity = _quantity(dose)
+                    if dose_quantity:
+                        dosage["doseAndRate"] = [{"doseQuantity": dose_quantity}]
+                else:
+                    dose_range = {
+                        key: quantity
+                        for key, quantity in (
+                            ("low", _quantity(dose.find(f"{HL7}low"))),
+                            ("high", _quantity(dose.find(f"{HL7}high"))),
+                        )
+                        if quantity
+                    }
+                    if dose_range:
+                        dosage["doseAndRate"] = [{"doseRange": dose_range}]
+
+            at, start, end = _effective(administration)
+            status = _attribute(administration, f"{HL7}statusCode", "code")
+
+            if kind == "prescriptions":
+                resource = {
+                    "resourceType": "MedicationRequest",
+                    "status": "active" if status in (None, "active") else "completed",
+                    "intent": "order",
+                    "medicationCodeableConcept": medication,
+                    "subject": conversion.patient_reference,
+                }
+                if start or at:
+                    resource["authoredOn"] = start or at
+                if dosage:
+                    resource["dosageInstruction"] = [dosage]
+            elif kind == "dispensations":
+                resource = {
+                    "resourceType": "MedicationDispense",
+                    "status": "completed",
+                    "medicationCodeableConcept": medication,
+                    "subject": conversion.patient_reference,
+                }
+                if at or start:
+                    resource["whenHandedOver"] = at or start
+                if dosage:
+                    resource["dosageInstruction"] = [dosage]
+            else:
+                resource = {
+                    "resourceType": "MedicationStatement",
+                    "status": "completed" if status == "completed" else "active",
+                    "medicationCodeableConcept": medication,
+                    "subject": conversion.patient_reference,
+                }
+                if start or end:
+                    resource["effectivePeriod"] = {
+                        key: value for key, value in (("start", start), ("end", end)) if value
+                    }
+                elif at:
+                    resource["effectiveDateTime"] = at
+                if dosage:
+                    resource["dosage"] = [dosage]
+            yield resource
+
+    def _map_allergies(self, entry: ET.Element, kind: str, conversion: _Conversion) -> Iterable[Dict[str, Any]]:
+        for act in entry.iterfind(f"{HL7}act"):
+            act_status = _attribute(act, f"{HL7}statusCode", "code")
+            for observation in act.iterfind(f"{HL7}entryRelationship/{HL7}observation"):
+                entity = observation.find(
+                    f"{HL7}participant/{HL7}participantRole/{HL7}playingEntity"
+                )
+                substance = _codeable_concept(
+                    entity.find(f"{HL7}code") if entity is not None else None,
+                    _plain_text(entity.find(f"{HL7}name")) if entity is not None else "",
+                )
+                resource: Dict[str, Any] = {
+                    "resourceType": "AllergyIntolerance",
+                    "clinicalStatus": {
+                        "coding": [{
+                            "system": "http://terminology.hl7.org/CodeSystem/allergyintolerance-clinical",
+                            "code": "resolved" if act_status == "completed" else "active",
+                        }]
+                    },
+                    "patient": conversion.patient_reference,
+                    "code": substance or {"text": "Unknown substance"},
+                }
+                if observation.get("negationInd") == "true":
+                    resource["verificationStatus"] = {
+                        "coding": [{
+                            "system": "http://terminology.hl7.org/CodeSystem/allergyintolerance-verification",
+                            "code": "refuted",
+                        }]
+                    }
+                allergy_type = _codeable_concept(observation.find(f"{HL7}code"))
+                if allergy_type:
+                    display = (allergy_type.get("text") or "").lower()
+                    if "intolerance" in display:
+                        resource["type"] = "intolerance"
+                    elif "allerg" in display:
+                        resource["type"] = "allergy"
+                at, start, _ = _effective(observation)
+                if start or at:
+                    resource["onsetDateTime"] = start or at
+
+                reactions = []
+                for related in observation.iterfind(f"{HL7}entryRelationship"):
+                    if related.get("typeCode") != "MFST":
+                        continue
+                    manifestation = _codeable_concept(related.find(f"{HL7}observation/{HL7}value"))
+                    if manifestation:
+                        reactions.append({"manifestation": [manifestation]})
+                if reactions:
+                    resource["reaction"] = reactions
+                yield resource
+
+    def _map_conditions(self, entry: ET.Element, kind: str, conversion: _Conversion) -> Iterable[Dict[str, Any]]:
+        observations = list(entry.iterfind(f"{HL7}act/{HL7}entryRelationship/{HL7}observation"))
+        observations += entry.findall(f"{HL7}observation")
+        for observation in observations:
+            value = observation.find(f"{HL7}value")
+            code = _codeable_concept(value) or {"text": _plain_text(observation.find(f"{HL7}text")) or "Unknown problem"}
+            at, start, end = _effective(observation)
+            resolved = kind == "past_illness" or end is not None
+            resource: Dict[str, Any] = {
+                "resourceType": "Condition",
+                "clinicalStatus": {
+                    "coding": [{
+                        "system": "http://terminology.hl7.org/CodeSystem/condition-clinical",
+                        "code": "resolved" if resolved else "active",
+                    }]
+                },
+                "category": [{
+                    "coding": [{
+                        "system": "http://terminology.hl7.org/CodeSystem/condition-category",
+                        "code": "problem-list-item",
+                    }]
+                }],
+                "code": code,
+                "subject": conversion.patient_reference,
+            }
+            if start or at:
+                resource["onsetDateTime"] = start or at
+            if end:
+                resource["abatementDateTime"] = end
+            yield resource
+
+    def _map_procedures(self, entry: ET.Element, kind: str, conversion: _Conversion) -> Iterable[Dict[str, Any]]:
+        for procedure in entry.iterfind(f"{HL7}procedure"):
+            resource: Dict[str, Any] = {
+                "resourceType": "Procedure",
+                "status": "not-done" if procedure.get("negationInd") == "true" else "completed",
+                "code": _codeable_concept(procedure.find(f"{HL7}code")) or {"text": "Unknown procedure"},
+                "subject": conversion.patient_reference,
+            }
+            at, start, end = _effective(procedure)
+            if start or end:
+                resource["performedPeriod"] = {
+                    key: value for key, value in (("start", start), ("end", end)) if value
+                }
+            elif at:
+                resource["performedDateTime"] = at
+            yield resource
+
+    def _map_immunizations(self, entry: ET.Element, kind: str, conversion: _Conversion) -> Iterable[Dict[str, Any]]:
+        for administration in entry.iterfind(f"{HL7}substanceAdministration"):
+            material = administration.find(
+                f"{HL7}consumable/{HL7}manufacturedProduct/{HL7}manufacturedMaterial"
+            )
+            at, start, _ = _effective(administration)
+            resource: Dict[str, Any] = {
+                "resourceType": "Immunization",
+                "status": "not-done" if administration.get("negationInd") == "true" else "completed",
+                "vaccineCode": _codeable_concept(
+                    material.find(f"{HL7}code") if material is not None else None,
+                    _plain_text(material.find(f"{HL7}name")) if material is not None else "",
+                ) or {"text": "Unknown vaccine"},
+                "patient": conversion.patient_reference,
+            }
+            if at or start:
+                resource["occurrenceDateTime"] = at or start
+            else:
+                resource["occurrenceString"] = "unknown"
+            yield resource
+
+    def _map_devices(self, entry: ET.Element, kind: str, conversion: _Conversion) -> Iterable[Dict[str, Any]]:
+        for supply in entry.iterfind(f"{HL7}supply"):
+            device_code = supply.find(
+                f"{HL7}participant/{HL7}participantRole/{HL7}playingDevice/{HL7}code"
+            )
+            device = {
+                "resourceType": "Device",
+                "type": _codeable_concept(device_code) or _codeable_concept(supply.find(f"{HL7}code")) or {"text": "Unknown device"},
+                "patient": conversion.patient_reference,
+            }
+            resource: Dict[str, Any] = {
+                "resourceType": "DeviceUseStatement",
+                "status": "active",
+                "subject": conversion.patient_reference,
+                "device": conversion.add(device),
+            }
+            at, start, end = _effective(supply)
+            if start or end:
+                resource["timingPeriod"] = {
+                    key: value for key, value in (("start", start), ("end", end)) if value
+                }
+            elif at:
+                resource["timingDateTime"] = at
+            yield resource
+
+    def _map_observations(self, entry: ET.Element, kind: str, conversion: _Conversion) -> Iterable[Dict[str, Any]]:
+        category = OBSERVATION_CATEGORIES.get(kind)
+        for observation in entry.iter(f"{HL7}observation"):
+            code = _codeable_concept(observation.find(f"{HL7}code"))
+            if code is None:
+                continue
+            resource: Dict[str, Any] = {
+                "resourceType": "Observation",
+                "status": "final",
+                "code": code,
+                "subject": conversion.patient_reference,
+            }
+            if category:
+                resource["category"] = [{
+                    "coding": [{
+                        "system": "http://terminology.hl7.org/CodeSystem/observation-category",
+                        "code": category,
+                    }]
+                }]
+            at, start, end = _effective(observation)
+            if at:
+                resource["effectiveDateTime"] = at
+            elif start or end:
+                resource["effectivePeriod"] = {
+                    key: value for key, value in (("start", start), ("end", end)) if value
+                }
+            value = observation.find(f"{HL7}value")
+            if value is not None:
+                observation_value = _observation_value(value)
+                if observation_value:
+                    resource[observation_value[0]] = observation_value[1]
+            yield resource
+
+    # Batch conversion
+
+    @property
+    def max_workers(self) -> int:
+        """Worker processes for batches; 0 converts batches in-process"""
+        if self._max_workers is not None:
+            return self._max_workers
+        return getattr(settings, "CDA_FHIR_CONVERSION_WORKERS", os.cpu_count() or 1)
+
+    def convert_batch(
+        self, documents: List[Any], target_profile: str = "patient-summary"
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert many documents, in parallel worker processes
+
+        Returns one result per document, in order: {"status": "success",
+        "fhir_bundle": ...} or {"status": "error", "error": ...}. At most
+        CDA_FHIR_CONVERSION_QUEUE_PER_WORKER documents per worker are
+        queued at a time, so a large batch is not serialized to the
+        workers all at once.
+        """
+        if self.max_workers < 1 or len(documents) < 2:
+            return [_convert_to_result(document, target_profile) for document in documents]
+
+        queue_size = self.max_workers * getattr(
+            settings, "CDA_FHIR_CONVERSION_QUEUE_PER_WORKER", DEFAULT_QUEUE_PER_WORKER
+        )
+        results: List[Optional[Dict[str, Any]]] = [None] * len(documents)
+        pending = {}
+        remaining = iter(enumerate(documents))
+        pool = self._get_pool()
+        try:
+            while True:
+                for index, document in remaining:
+                    pending[pool.submit(_convert_to_result, document, target_profile)] = index
+                    if len(pending) >= queue_size:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            logger.error("CDA conversion worker process died; batch aborted")
+            return [
+                result or {"status": "error", "error": "Conversion worker failed"}
+                for result in results
+            ]
+        return results
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn, not fork: the web process is multi-threaded
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+    def shutdown(self):
+        """Stop the worker processes, if any were started"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def _reset_pool(self, pool: ProcessPoolExecutor):
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def _convert_to_result(cda_content, target_profile: str) -> Dict[str, Any]:
+    try:
+        return {
+            "status": "success",
+            "fhir_bundle": cda_to_fhir_service.convert(cda_content, target_profile),
+        }
+    except CDAConversionError as e:
+        return {"status": "error", "error": str(e)}
+    except Exception as e:
+        logger.exception("Unexpected error converting CDA document to FHIR")
+        return {"status": "error", "error": f"Conversion failed: {e}"}
+
+
+cda_to_fhir_service = CDAToFHIRService()
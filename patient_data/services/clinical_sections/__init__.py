@@ -44,6 +44,26 @@ from .specialized.functional_status_service import FunctionalStatusSectionServic
 
 # Use the global singleton instance (don't create a new one!)
 
+SPECIALIZED_SERVICES = (
+    ProblemsSectionService,
+    VitalSignsSectionService,
+    ProceduresSectionService,
+    ImmunizationsSectionService,
+    ResultsSectionService,
+    MedicalDevicesSectionService,
+    AllergiesSectionService,
+    PastIllnessSectionService,
+    PregnancyHistorySectionService,
+    SocialHistorySectionService,
+    AdvanceDirectivesSectionService,
+    FunctionalStatusSectionService,
+)
+
+
+def _specialized_services():
+    return [service_class() for service_class in SPECIALIZED_SERVICES]
+
+
 # Register all specialized services
 def register_clinical_services():
     """
@@ -52,28 +72,16 @@ def register_clinical_services():
     This function implements the service registry pattern, automatically
     registering all available specialized services for clinical data processing.
     """
-    services = [
-        ProblemsSectionService(),
-        VitalSignsSectionService(),
-        ProceduresSectionService(),
-        ImmunizationsSectionService(),
-        ResultsSectionService(),
-        MedicalDevicesSectionService(),
-        AllergiesSectionService(),
-        PastIllnessSectionService(),
-        PregnancyHistorySectionService(),
-        SocialHistorySectionService(),
-        AdvanceDirectivesSectionService(),
-        FunctionalStatusSectionService()
-    ]
+    services = _specialized_services()
     
     for service in services:
         clinical_pipeline_manager.register_service(service)
     
     return len(services)
 
-# Auto-register services on module import
-registered_count = register_clinical_services()
+# Auto-register services on first use of the pipeline manager (not on import)
+clinical_pipeline_manager.add_service_loader(_specialized_services)
+registered_count = len(SPECIALIZED_SERVICES)
 
 # Public API exports
 __all__ = [
@@ -107,5 +115,6 @@ __author__ = 'Django_NCP Development Team'
 __registry_info__ = {
     'registered_services': registered_count,
     'auto_registration': True,
+    'lazy_registration': True,
     'architecture_pattern': 'hybrid_specialized'
 }
\ No newline at end of file
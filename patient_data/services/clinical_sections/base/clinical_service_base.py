@@ -13,6 +13,7 @@ import logging
 from typing import Dict, List, Any, Optional
 from django.http import HttpRequest
 from .section_service_interface import ClinicalSectionServiceInterface
+from ....utils.date_engine import format_date, format_date_column
 
 logger = logging.getLogger(__name__)
 
@@ -114,38 +115,22 @@ class ClinicalServiceBase(ClinicalSectionServiceInterface):
         Returns:
             Optional[str]: Formatted date string (dd/mm/yyyy) or None if parsing fails
         """
-        from datetime import datetime
-        import re
-        
         if not cda_date:
             return None
         
-        try:
-            # Remove any timezone info (e.g., "20091006T10:00:00+01:00" → "20091006")
-            date_clean = re.sub(r'T[\d:]+.*$', '', cda_date)
-            
-            # Handle different date formats
-            if len(date_clean) == 8 and date_clean.isdigit():
-                # Format: YYYYMMDD
-                date_obj = datetime.strptime(date_clean, '%Y%m%d')
-            elif '-' in date_clean and len(date_clean) == 10:
-                # Format: YYYY-MM-DD
-                date_obj = datetime.strptime(date_clean, '%Y-%m-%d')
-            elif '/' in date_clean:
-                # Format: MM/DD/YYYY or DD/MM/YYYY
-                if date_clean.split('/')[2] == '4':  # YYYY is 4 digits
-                    date_obj = datetime.strptime(date_clean, '%m/%d/%Y')
-                else:
-                    date_obj = datetime.strptime(date_clean, '%d/%m/%Y')
-            else:
-                return cda_date  # Return original if format unknown
-            
-            # Format as dd/mm/yyyy ISO format (e.g., "18/06/2009")
-            return date_obj.strftime("%d/%m/%Y")
-            
-        except (ValueError, IndexError) as e:
-            self.logger.warning(f"Could not parse date '{cda_date}': {e}")
-            return cda_date  # Return original if parsing fails
+        # Return original if format unknown
+        return format_date(cda_date, "dmy", default=cda_date)
+
+    def _format_date_columns(self, rows: List[Dict[str, Any]], *fields: str) -> List[Dict[str, Any]]:
+        """
+        Format CDA date fields across a whole list of section rows
+        
+        Each field is formatted as one column (see date_engine.format_date_column);
+        unparseable values are kept as extracted.
+        """
+        for field in fields:
+            format_date_column(rows, field, "dmy")
+        return rows
     
     def _find_section_by_code(self, root, section_codes: List[str]):
         """
@@ -8,9 +8,12 @@ Date: October 2025
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Any, Optional
 from django.http import HttpRequest
 from ..base.section_service_interface import ClinicalSectionServiceInterface
+from ....utils.cda_classifier import NOT_CDA, UNSTRUCTURED, classify_cda
+from ....utils.performance_logging import log_stage, verbose_logging_enabled
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +34,9 @@ class ClinicalDataPipelineManager:
         if not self._initialized:
             self._service_registry: Dict[str, ClinicalSectionServiceInterface] = {}
             self._cached_results: Dict[str, Dict[str, Any]] = {}  # Cache results by session_id
+            # Callables producing services, run on first use of the registry
+            self._service_loaders: List[Callable[[], Iterable[ClinicalSectionServiceInterface]]] = []
+            self._loader_lock = Lock()
             logger.info("[PIPELINE MANAGER] Initialized (Singleton)")
             ClinicalDataPipelineManager._initialized = True
         else:
@@ -38,20 +44,49 @@ class ClinicalDataPipelineManager:
     
     def register_service(self, service: ClinicalSectionServiceInterface) -> None:
         """Register a clinical section service."""
+        # Pending loaders run first so an explicit registration still wins
+        self._load_services()
+        self._add_service(service)
+
+    def _add_service(self, service: ClinicalSectionServiceInterface) -> None:
         section_code = service.get_section_code()
         section_name = service.get_section_name().lower().replace(' ', '_')
         
         self._service_registry[section_code] = service
         self._service_registry[section_name] = service
         
-        logger.info(f"[PIPELINE MANAGER] Registered: {service.get_section_name()} (Total: {len(self.get_all_services())})")
+        total = len({registered.get_section_code() for registered in self._service_registry.values()})
+        logger.info(f"[PIPELINE MANAGER] Registered: {service.get_section_name()} (Total: {total})")
     
+    def add_service_loader(self, loader: Callable[[], Iterable[ClinicalSectionServiceInterface]]) -> None:
+        """
+        Register the services a loader returns, on first use of the registry.
+
+        Lets packages declare their services at import without constructing
+        them until a CDA is actually processed.
+        """
+        with self._loader_lock:
+            self._service_loaders.append(loader)
+
+    def _load_services(self) -> None:
+        """Run pending service loaders (once, even with concurrent callers)."""
+        if not self._service_loaders:
+            return
+        with self._loader_lock:
+            while self._service_loaders:
+                # Dropped only once registered, so an empty list means loaded
+                for service in self._service_loaders[0]():
+                    self._add_service(service)
+                self._service_loaders.pop(0)
+
     def get_service(self, section_identifier: str) -> Optional[ClinicalSectionServiceInterface]:
         """Get a registered service."""
+        self._load_services()
         return self._service_registry.get(section_identifier)
     
     def get_all_services(self) -> Dict[str, ClinicalSectionServiceInterface]:
         """Get unique services."""
+        self._load_services()
         unique_services = {}
         for key, service in self._service_registry.items():
             if service.get_section_code() not in unique_services:
@@ -80,52 +115,70 @@ class ClinicalDataPipelineManager:
             cda_content = request_or_cda
             session_id = "browser_session"
             request = None
-            logger.info(f"[PIPELINE MANAGER] Processing CDA content via simple API")
+            logger.debug("[PIPELINE MANAGER] Processing CDA content via simple API")
         else:
             # Full API: process_cda_content(request, session_id, cda_content)
             request = request_or_cda
-            logger.info(f"[PIPELINE MANAGER] Processing CDA content for session {session_id}")
+            logger.debug("[PIPELINE MANAGER] Processing CDA content for session %s", session_id)
         
         results = {}
         unique_services = self.get_all_services()
-        
-        for section_code, service in unique_services.items():
-            try:
-                logger.info(f"[PIPELINE MANAGER] Processing section {section_code} ({service.get_section_name()})")
-                
-                # Extract data using the service
-                section_data = service.extract_from_cda(cda_content)
-                
-                # Enhance and store data if we have a request object (full API mode)
-                if request is not None and section_data:
-                    try:
-                        enhanced_data = service.enhance_and_store(request, session_id, section_data)
-                        section_data = enhanced_data  # Use enhanced data for results
-                        logger.info(f"[PIPELINE MANAGER] Enhanced and stored {len(enhanced_data)} items for section {section_code}")
-                    except Exception as enhance_error:
-                        logger.warning(f"[PIPELINE MANAGER] Could not enhance section {section_code}: {enhance_error}")
-                        # Continue with raw data if enhancement fails
-                
-                results[section_code] = {
-                    'section_name': service.get_section_name(),
-                    'section_code': section_code,
-                    'items': section_data,
-                    'item_count': len(section_data)
-                }
-                
-                logger.info(f"[PIPELINE MANAGER] Section {section_code}: {len(section_data)} items extracted")
-                
-            except Exception as e:
-                logger.error(f"[PIPELINE MANAGER] Error processing section {section_code}: {e}")
+
+        # L1 (nonXMLBody) and non-CDA content has no coded sections to extract
+        classification = classify_cda(cda_content)
+        if classification.kind in (UNSTRUCTURED, NOT_CDA):
+            logger.info(
+                "[PIPELINE MANAGER] Skipping section extraction for %s document %s",
+                classification.kind, classification.content_hash[:12]
+            )
+            for section_code, service in unique_services.items():
                 results[section_code] = {
                     'section_name': service.get_section_name(),
                     'section_code': section_code,
                     'items': [],
-                    'item_count': 0,
-                    'error': str(e)
+                    'item_count': 0
                 }
+            self._cached_results[session_id] = results
+            return results
         
-        logger.info(f"[PIPELINE MANAGER] Completed CDA processing: {len(results)} sections processed")
+        with log_stage('clinical_pipeline', 'extract', sections=len(unique_services)):
+            for section_code, service in unique_services.items():
+                try:
+                    logger.debug("[PIPELINE MANAGER] Processing section %s", section_code)
+                
+                    # Extract data using the service
+                    section_data = service.extract_from_cda(cda_content)
+                
+                    # Enhance and store data if we have a request object (full API mode)
+                    if request is not None and section_data:
+                        try:
+                            enhanced_data = service.enhance_and_store(request, session_id, section_data)
+                            section_data = enhanced_data  # Use enhanced data for results
+                            logger.debug("[PIPELINE MANAGER] Enhanced and stored %d items for section %s", len(enhanced_data), section_code)
+                        except Exception as enhance_error:
+                            logger.warning(f"[PIPELINE MANAGER] Could not enhance section {section_code}: {enhance_error}")
+                            # Continue with raw data if enhancement fails
+                
+                    results[section_code] = {
+                        'section_name': service.get_section_name(),
+                        'section_code': section_code,
+                        'items': section_data,
+                        'item_count': len(section_data)
+                    }
+                
+                    logger.debug("[PIPELINE MANAGER] Section %s: %d items extracted", section_code, len(section_data))
+                
+                except Exception as e:
+                    logger.error(f"[PIPELINE MANAGER] Error processing section {section_code}: {e}")
+                    results[section_code] = {
+                        'section_name': service.get_section_name(),
+                        'section_code': section_code,
+                        'items': [],
+                        'item_count': 0,
+                        'error': str(e)
+                    }
+        
+        logger.info("[PIPELINE MANAGER] Completed CDA processing: %d sections processed", len(results))
         
         # Cache the results for this session
         self._cached_results[session_id] = results
@@ -151,10 +204,10 @@ class ClinicalDataPipelineManager:
         if request is None and session_id is None:
             # Simple API: get_template_context()
             session_id = "browser_session"
-            logger.info(f"[PIPELINE MANAGER] Building template context via simple API")
+            logger.debug("[PIPELINE MANAGER] Building template context via simple API")
         else:
             # Full API: get_template_context(request, session_id)
-            logger.info(f"[PIPELINE MANAGER] Building template context for session {session_id}")
+            logger.debug("[PIPELINE MANAGER] Building template context for session %s", session_id)
         
         # Get cached results from process_cda_content
         cached_results = self._cached_results.get(session_id, {})
@@ -179,10 +232,10 @@ class ClinicalDataPipelineManager:
         
         # Log the procedures specifically for debugging
         procedures_count = len(context['procedures'])
-        logger.info(f"[PIPELINE MANAGER] Template context built with {procedures_count} procedures for session {session_id}")
+        logger.debug("[PIPELINE MANAGER] Template context built with %d procedures for session %s", procedures_count, session_id)
         
-        if procedures_count > 0:
-            logger.info(f"[PIPELINE MANAGER] *** PROCEDURES FOUND: {[p.get('name', 'Unknown') for p in context['procedures']]} ***")
+        if procedures_count > 0 and verbose_logging_enabled(logger):
+            logger.debug("[PIPELINE MANAGER] Procedures found: %s", [p.get('name', 'Unknown') for p in context['procedures']])
         
         return context
 
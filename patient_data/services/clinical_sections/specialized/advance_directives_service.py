@@ -17,6 +17,7 @@ Version: 1.0.0
 import logging
 from typing import Dict, List, Any
 from django.http import HttpRequest
+from ...session_data_service import SessionDataService
 from ..base.clinical_service_base import ClinicalServiceBase
 
 logger = logging.getLogger(__name__)
@@ -94,19 +95,21 @@ class AdvanceDirectivesSectionService(ClinicalServiceBase):
                 'type': self._extract_field_value(directive_data, 'type', 'General directive'),
                 'description': self._extract_field_value(directive_data, 'description', 'Not specified'),
                 'status': self._extract_field_value(directive_data, 'status', 'Active'),
-                'date_created': self._format_cda_date(self._extract_field_value(directive_data, 'date_created', 'Not specified')),
-                'date_effective': self._format_cda_date(self._extract_field_value(directive_data, 'date_effective', 'Not specified')),
+                'date_created': self._extract_field_value(directive_data, 'date_created', 'Not specified'),
+                'date_effective': self._extract_field_value(directive_data, 'date_effective', 'Not specified'),
                 'healthcare_proxy': self._extract_field_value(directive_data, 'healthcare_proxy', 'Not specified'),
                 'witness': self._extract_field_value(directive_data, 'witness', 'Not specified'),
                 'source': 'cda_extraction_enhanced'
             }
             enhanced_directives.append(enhanced_directive)
         
+        self._format_date_columns(enhanced_directives, 'date_created', 'date_effective')
+        
         # Store in session
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_advance_directives'] = enhanced_directives
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         self.logger.info(f"[ADVANCE DIRECTIVES SERVICE] Enhanced and stored {len(enhanced_directives)} advance directives")
@@ -17,7 +17,9 @@ Version: 1.0.0
 import logging
 from typing import Dict, List, Any
 from django.http import HttpRequest
+from ...session_data_service import SessionDataService
 from ..base.clinical_service_base import ClinicalServiceBase
+from ....utils.date_engine import format_date
 
 logger = logging.getLogger(__name__)
 
@@ -118,7 +120,7 @@ class AllergiesSectionService(ClinicalServiceBase):
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_allergies'] = enhanced_allergies
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         self.logger.info(f"[ALLERGIES SERVICE] Enhanced and stored {len(enhanced_allergies)} comprehensive allergies")
@@ -729,23 +731,4 @@ class AllergiesSectionService(ClinicalServiceBase):
         if not date_str or date_str == "Not specified":
             return date_str
         
-        try:
-            # Remove any non-digit characters for processing
-            clean_date = ''.join(filter(str.isdigit, date_str))
-            
-            if len(clean_date) >= 8:  # YYYYMMDD
-                year = clean_date[:4]
-                month = clean_date[4:6]
-                day = clean_date[6:8]
-                return f"{day}/{month}/{year}"
-            elif len(clean_date) == 4:  # YYYY
-                return clean_date
-            elif len(clean_date) == 6:  # YYYYMM
-                year = clean_date[:4]
-                month = clean_date[4:6]
-                return f"{month}/{year}"
-            else:
-                return date_str
-        except Exception as e:
-            self.logger.warning(f"[ALLERGIES SERVICE] Date formatting error for '{date_str}': {e}")
-            return date_str
\ No newline at end of file
+        return format_date(date_str, "dmy", default=date_str)
\ No newline at end of file
@@ -17,6 +17,7 @@ Version: 1.0.0
 import logging
 from typing import Dict, List, Any
 from django.http import HttpRequest
+from ...session_data_service import SessionDataService
 from ..base.clinical_service_base import ClinicalServiceBase
 
 logger = logging.getLogger(__name__)
@@ -97,16 +98,18 @@ class FunctionalStatusSectionService(ClinicalServiceBase):
                 'level': self._extract_field_value(status_data, 'level', 'Not specified'),
                 'independence': self._extract_field_value(status_data, 'independence', 'Not specified'),
                 'assistance_required': self._extract_field_value(status_data, 'assistance_required', 'Not specified'),
-                'assessment_date': self._format_cda_date(self._extract_field_value(status_data, 'assessment_date', 'Not specified')),
+                'assessment_date': self._extract_field_value(status_data, 'assessment_date', 'Not specified'),
                 'source': 'cda_extraction_enhanced'
             }
             enhanced_functional_status.append(enhanced_status)
         
+        self._format_date_columns(enhanced_functional_status, 'assessment_date')
+        
         # Store in session
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_functional_status'] = enhanced_functional_status
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         self.logger.info(f"[FUNCTIONAL STATUS SERVICE] Enhanced and stored {len(enhanced_functional_status)} functional status assessments")
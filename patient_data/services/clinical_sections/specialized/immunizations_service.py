@@ -17,6 +17,7 @@ Version: 1.0.0
 import logging
 from typing import Dict, List, Any
 from django.http import HttpRequest
+from ...session_data_service import SessionDataService
 from ..base.clinical_service_base import ClinicalServiceBase
 from ..cts_integration_mixin import CTSIntegrationMixin
 
@@ -94,21 +95,19 @@ class ImmunizationsSectionService(CTSIntegrationMixin, ClinicalServiceBase):
             if 'display_name' not in enhanced_immunization:
                 enhanced_immunization['display_name'] = enhanced_immunization.get('name', 'Unknown vaccine')
             
-            # Format date_administered if present
-            if 'date_administered' in enhanced_immunization and enhanced_immunization['date_administered']:
-                enhanced_immunization['date_administered'] = self._format_cda_date(enhanced_immunization['date_administered'])
-            
             # Mark as enhanced
             enhanced_immunization['source'] = 'cda_extraction_enhanced'
             enhanced_immunization['enhanced_data'] = True
             
             enhanced_immunizations.append(enhanced_immunization)
         
+        self._format_date_columns(enhanced_immunizations, 'date_administered')
+        
         # Store in session
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_immunizations'] = enhanced_immunizations
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         self.logger.info(f"[IMMUNIZATIONS SERVICE] Enhanced and stored {len(enhanced_immunizations)} immunizations with comprehensive fields")
@@ -17,6 +17,7 @@ Version: 1.0.0
 import logging
 from typing import Dict, List, Any
 from django.http import HttpRequest
+from ...session_data_service import SessionDataService
 from ..base.clinical_service_base import ClinicalServiceBase
 
 logger = logging.getLogger(__name__)
@@ -107,7 +108,7 @@ class MedicalDevicesSectionService(ClinicalServiceBase):
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_medical_devices'] = enhanced_devices
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         self.logger.info(f"[MEDICAL DEVICES SERVICE] Enhanced and stored {len(enhanced_devices)} medical devices")
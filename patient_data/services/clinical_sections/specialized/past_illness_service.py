@@ -18,6 +18,7 @@ Version: 2.0.0 - Enhanced with CTS Integration
 import logging
 from typing import Dict, List, Any
 from django.http import HttpRequest
+from ...session_data_service import SessionDataService
 from ..base.clinical_service_base import ClinicalServiceBase
 from ..cts_integration_mixin import CTSIntegrationMixin
 
@@ -133,7 +134,7 @@ class PastIllnessSectionService(CTSIntegrationMixin, ClinicalServiceBase):
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_past_illness'] = enhanced_past_illness
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         self.logger.info(f"[PAST ILLNESS SERVICE] Enhanced and stored {len(enhanced_past_illness)} past illness records")
@@ -17,6 +17,7 @@ Version: 2.0.0 - Enhanced with CTS Integration
 import logging
 from typing import Dict, List, Any, Optional
 from django.http import HttpRequest
+from ...session_data_service import SessionDataService
 from ..base.clinical_service_base import ClinicalServiceBase
 from ..cts_integration_mixin import CTSIntegrationMixin
 
@@ -102,7 +103,7 @@ class PregnancyHistorySectionService(CTSIntegrationMixin, ClinicalServiceBase):
                 'pregnancy_number': self._extract_field_value(pregnancy_data, 'pregnancy_number', 'Not specified'),
                 'outcome': self._extract_field_value(pregnancy_data, 'outcome', 'Not specified'),
                 'gestational_age': self._extract_field_value(pregnancy_data, 'gestational_age', 'Not specified'),
-                'delivery_date': self._format_cda_date(self._extract_field_value(pregnancy_data, 'delivery_date', 'Not specified')),
+                'delivery_date': self._extract_field_value(pregnancy_data, 'delivery_date', 'Not specified'),
                 'birth_weight': self._extract_field_value(pregnancy_data, 'birth_weight', 'Not specified'),
                 'complications': self._extract_field_value(pregnancy_data, 'complications', 'None reported'),
                 'delivery_method': self._extract_field_value(pregnancy_data, 'delivery_method', 'Not specified'),
@@ -110,11 +111,13 @@ class PregnancyHistorySectionService(CTSIntegrationMixin, ClinicalServiceBase):
             }
             enhanced_pregnancies.append(enhanced_pregnancy)
         
+        self._format_date_columns(enhanced_pregnancies, 'delivery_date')
+        
         # Store in session
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_pregnancy_history'] = enhanced_pregnancies
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         self.logger.info(f"[PREGNANCY HISTORY SERVICE] Enhanced and stored {len(enhanced_pregnancies)} pregnancy records")
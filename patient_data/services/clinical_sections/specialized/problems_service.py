@@ -18,6 +18,7 @@ Version: 2.0.0 - Enhanced with CTS Integration
 import logging
 from typing import Dict, List, Any
 from django.http import HttpRequest
+from ...session_data_service import SessionDataService
 from ..base.clinical_service_base import ClinicalServiceBase
 from ..cts_integration_mixin import CTSIntegrationMixin
 
@@ -97,8 +98,8 @@ class ProblemsSectionService(CTSIntegrationMixin, ClinicalServiceBase):
                 'status': self._extract_field_value(problem_data, 'status', 'Active'),
                 'severity': self._extract_field_value(problem_data, 'severity', 'Not specified'),
                 'criticality': self._extract_field_value(problem_data, 'criticality', 'Not specified'),
-                'onset_date': self._format_cda_date(self._extract_field_value(problem_data, 'onset_date', 'Not specified')),
-                'resolution_date': self._format_cda_date(self._extract_field_value(problem_data, 'resolution_date', 'Not specified')),
+                'onset_date': self._extract_field_value(problem_data, 'onset_date', 'Not specified'),
+                'resolution_date': self._extract_field_value(problem_data, 'resolution_date', 'Not specified'),
                 'time_period': self._format_time_period(
                     self._extract_field_value(problem_data, 'onset_date', 'Not specified'),
                     self._extract_field_value(problem_data, 'resolution_date', 'Not specified')
@@ -110,11 +111,13 @@ class ProblemsSectionService(CTSIntegrationMixin, ClinicalServiceBase):
             }
             enhanced_problems.append(enhanced_problem)
         
+        self._format_date_columns(enhanced_problems, 'onset_date', 'resolution_date')
+        
         # Store in session
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_problems'] = enhanced_problems
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         self.logger.info(f"[PROBLEMS SERVICE] Enhanced and stored {len(enhanced_problems)} problems")
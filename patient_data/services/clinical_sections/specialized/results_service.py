@@ -17,6 +17,7 @@ Version: 1.0.0
 import logging
 from typing import Dict, List, Any
 from django.http import HttpRequest
+from ...session_data_service import SessionDataService
 from ..base.clinical_service_base import ClinicalServiceBase
 
 logger = logging.getLogger(__name__)
@@ -99,21 +100,19 @@ class ResultsSectionService(ClinicalServiceBase):
             if 'display_name' not in enhanced_result:
                 enhanced_result['display_name'] = enhanced_result.get('name', 'Unknown test')
             
-            # Format date field if present
-            if 'date' in enhanced_result and enhanced_result['date'] != 'Not specified':
-                enhanced_result['date'] = self._format_cda_date(enhanced_result['date'])
-            
             # Mark as enhanced
             enhanced_result['source'] = 'cda_extraction_enhanced'
             
             self.logger.debug(f"[RESULTS SERVICE] Enhanced result: {enhanced_result.get('name')} with {len(enhanced_result)} fields")
             enhanced_results.append(enhanced_result)
         
+        self._format_date_columns(enhanced_results, 'date')
+        
         # Store in session
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_results'] = enhanced_results
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         self.logger.info(f"[RESULTS SERVICE] Enhanced and stored {len(enhanced_results)} results")
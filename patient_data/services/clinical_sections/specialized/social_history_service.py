@@ -17,6 +17,7 @@ Version: 1.0.0
 import logging
 from typing import Dict, List, Any
 from django.http import HttpRequest
+from ...session_data_service import SessionDataService
 from ..base.clinical_service_base import ClinicalServiceBase
 from ..cts_integration_mixin import CTSIntegrationMixin
 
@@ -100,17 +101,19 @@ class SocialHistorySectionService(CTSIntegrationMixin, ClinicalServiceBase):
                 'status': self._extract_field_value(social_data, 'status', 'Active'),
                 'frequency': self._extract_field_value(social_data, 'frequency', 'Not specified'),
                 'quantity': self._extract_field_value(social_data, 'quantity', 'Not specified'),
-                'start_date': self._format_cda_date(self._extract_field_value(social_data, 'start_date', 'Not specified')),
-                'end_date': self._format_cda_date(self._extract_field_value(social_data, 'end_date', 'Not specified')),
+                'start_date': self._extract_field_value(social_data, 'start_date', 'Not specified'),
+                'end_date': self._extract_field_value(social_data, 'end_date', 'Not specified'),
                 'source': 'cda_extraction_enhanced'
             }
             enhanced_social_history.append(enhanced_social)
         
+        self._format_date_columns(enhanced_social_history, 'start_date', 'end_date')
+        
         # Store in session
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_social_history'] = enhanced_social_history
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         self.logger.info(f"[SOCIAL HISTORY SERVICE] Enhanced and stored {len(enhanced_social_history)} social history items")
@@ -17,6 +17,7 @@ Version: 1.0.0
 import logging
 from typing import Dict, List, Any
 from django.http import HttpRequest
+from ...session_data_service import SessionDataService
 from ..base.clinical_service_base import ClinicalServiceBase
 
 logger = logging.getLogger(__name__)
@@ -98,7 +99,7 @@ class VitalSignsSectionService(ClinicalServiceBase):
                 'display_name': self._extract_field_value(vital_data, 'name', 'Unknown measurement'),
                 'value': self._extract_field_value(vital_data, 'value', ''),
                 'unit': self._extract_field_value(vital_data, 'unit', ''),
-                'date': self._format_cda_date(self._extract_field_value(vital_data, 'date', '')),
+                'date': self._extract_field_value(vital_data, 'date', ''),
                 'status': self._extract_field_value(vital_data, 'status', 'Final'),
                 'reference_range': self._extract_field_value(vital_data, 'reference_range', ''),
                 'source': 'cda_extraction_enhanced',
@@ -113,11 +114,13 @@ class VitalSignsSectionService(ClinicalServiceBase):
             }
             enhanced_vitals.append(enhanced_vital)
         
+        self._format_date_columns(enhanced_vitals, 'date')
+        
         # Store in session
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_vital_signs'] = enhanced_vitals
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         self.logger.info(f"[VITAL SIGNS SERVICE] Enhanced and stored {len(enhanced_vitals)} vital signs")
@@ -12,6 +12,7 @@ Version: 1.0.0
 import logging
 from typing import Dict, List, Any
 from django.http import HttpRequest
+from .session_data_service import SessionDataService
 from .clinical_data_pipeline_manager import ClinicalSectionServiceInterface
 
 logger = logging.getLogger(__name__)
@@ -104,7 +105,7 @@ class ProblemsSectionService(ClinicalSectionServiceInterface):
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_problems'] = enhanced_problems
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         logger.info(f"[PROBLEMS SERVICE] Enhanced and stored {len(enhanced_problems)} problems")
@@ -321,7 +322,7 @@ class VitalSignsSectionService(ClinicalSectionServiceInterface):
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_vital_signs'] = enhanced_vitals
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         logger.info(f"[VITAL SIGNS SERVICE] Enhanced and stored {len(enhanced_vitals)} vital signs")
@@ -480,7 +481,7 @@ class ProceduresSectionService(ClinicalSectionServiceInterface):
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_procedures'] = enhanced_procedures
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         logger.info(f"[PROCEDURES SERVICE] Enhanced and stored {len(enhanced_procedures)} procedures")
@@ -638,7 +639,7 @@ class ImmunizationsSectionService(ClinicalSectionServiceInterface):
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_immunizations'] = enhanced_immunizations
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         logger.info(f"[IMMUNIZATIONS SERVICE] Enhanced and stored {len(enhanced_immunizations)} immunizations")
@@ -801,7 +802,7 @@ class ResultsSectionService(ClinicalSectionServiceInterface):
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_results'] = enhanced_results
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         logger.info(f"[RESULTS SERVICE] Enhanced and stored {len(enhanced_results)} results")
@@ -962,7 +963,7 @@ class MedicalDevicesSectionService(ClinicalSectionServiceInterface):
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_medical_devices'] = enhanced_devices
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         logger.info(f"[MEDICAL DEVICES SERVICE] Enhanced and stored {len(enhanced_devices)} medical devices")
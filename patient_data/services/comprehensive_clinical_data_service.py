@@ -24,6 +24,7 @@ from patient_data.services.cda_parser_service import CDAParserService
 from patient_data.services.enhanced_cda_xml_parser import EnhancedCDAXMLParser
 from patient_data.services.ps_table_renderer import PSTableRenderer
 from patient_data.services.structured_cda_extractor import StructuredCDAExtractor
+from patient_data.utils.date_engine import format_date
 from patient_data.services.enhanced_cts_response_service import EnhancedCTSResponseService
 from patient_data.services.clinical_sections.pipeline.clinical_data_pipeline_manager import clinical_pipeline_manager
 from translation_services.terminology_translator import TerminologyTranslator
@@ -60,18 +61,7 @@ class ComprehensiveClinicalDataService:
         if not date_value or not isinstance(date_value, str):
             return date_value or "Not specified"
         
-        # Remove any time component (keep only first 8 characters for date)
-        date_only = date_value[:8] if len(date_value) >= 8 else date_value
-        
-        # Check if it's a valid YYYYMMDD format
-        if len(date_only) == 8 and date_only.isdigit():
-            try:
-                # Convert YYYYMMDD to DD/MM/YYYY (European format)
-                return f"{date_only[6:8]}/{date_only[4:6]}/{date_only[:4]}"
-            except (IndexError, ValueError):
-                return date_value
-        
-        return date_value
+        return format_date(date_value, "dmy", default=date_value)
 
     def extract_comprehensive_clinical_data(
         self, cda_content: str, session_data: dict = None
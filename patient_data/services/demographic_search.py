@@ -0,0 +1,221 @@
+"""
+Demographic Search Keys for the CDA Document Index
+
+Patient lookups by identifier or demographics are answered from a table of
+normalized search keys built once from the CDA document index, instead of
+reading CDA files and comparing raw strings per request.
+
+Keys are normalized the same way for indexed patients and for queries:
+names are accent-stripped and case-folded (so "SEÁN O'CONNOR" matches
+"Sean OConnor" and "ΜΑΡΙΑ" matches "Μαρία"), birth dates become YYYYMMDD
+whatever their input format, and identifiers lose whitespace and case.
+
+DemographicSearchIndex.search resolves a batch of queries in one pass: the
+queries are grouped by probe key and each distinct key is looked up once
+in the key table (a hash join), so N queries cost N dictionary probes
+regardless of the number of indexed patients.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+_APOSTROPHES = re.compile(r"['’`´]")
+_NAME_SEPARATORS = re.compile(r"[^\w]+|_")
+_DAY_FIRST_DATE = re.compile(r"^(\d{1,2})[./-](\d{1,2})[./-](\d{4})$")
+_NON_DIGITS = re.compile(r"\D+")
+
+# Normalized names kept in the LRU cache (names repeat across patients)
+NAME_CACHE_SIZE = 16384
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def normalize_name(value: Optional[str]) -> str:
+    """Case-folded, accent-stripped name with single spaces between parts"""
+    if not value:
+        return ""
+    if value.isascii():
+        stripped = value
+    else:
+        decomposed = unicodedata.normalize("NFKD", value)
+        stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    parts = _NAME_SEPARATORS.split(_APOSTROPHES.sub("", stripped).casefold())
+    return " ".join(part for part in parts if part)
+
+
+def normalize_birth_date(value: Optional[str]) -> str:
+    """
+    Birth date as YYYYMMDD
+
+    Accepts ISO dates, HL7 timestamps and day-first dates (15/03/1975);
+    anything else normalizes to "".
+    """
+    value = (value or "").strip()
+    day_first = _DAY_FIRST_DATE.match(value)
+    if day_first:
+        day, month, year = day_first.groups()
+        return f"{year}{int(month):02d}{int(day):02d}"
+    digits = _NON_DIGITS.sub("", value)
+    return digits[:8] if len(digits) >= 8 else ""
+
+
+def normalize_identifier(value: Optional[str]) -> str:
+    """Identifier extension or root without whitespace, case-folded"""
+    return "".join((value or "").split()).casefold()
+
+
+def normalize_country(value: Optional[str]) -> str:
+    return (value or "").strip().upper()
+
+
+@dataclass(frozen=True)
+class DemographicRecord:
+    """One indexed patient in one country, as displayed"""
+
+    patient_id: str
+    country_code: str
+    given_name: str
+    family_name: str
+    birth_date: str
+    gender: str
+    id_root: str = ""
+
+
+@dataclass(frozen=True)
+class DemographicQuery:
+    """
+    A patient search
+
+    Queries with a patient_id match on the identifier (and id_root when
+    given); otherwise family_name and birth_date are required. Any other
+    field given narrows the match.
+    """
+
+    country_code: str = ""
+    patient_id: str = ""
+    id_root: str = ""
+    given_name: str = ""
+    family_name: str = ""
+    birth_date: str = ""
+
+
+class _Keys(NamedTuple):
+    """Normalized keys of a record or query"""
+
+    country: str
+    identifier: str
+    root: str
+    given: Tuple[str, ...]
+    family: str
+    birth_date: str
+
+    @classmethod
+    def of(cls, item) -> "_Keys":
+        return cls(
+            country=normalize_country(item.country_code),
+            identifier=normalize_identifier(item.patient_id),
+            root=normalize_identifier(item.id_root),
+            given=tuple(normalize_name(item.given_name).split()),
+            family=normalize_name(item.family_name),
+            birth_date=normalize_birth_date(item.birth_date),
+        )
+
+    def probe(self) -> Optional[Tuple[str, ...]]:
+        """Key table and key this query is looked up by, or None"""
+        if self.identifier:
+            if self.root:
+                return ("root", self.root, self.identifier)
+            return ("identifier", self.identifier)
+        if self.family and self.birth_date:
+            return ("demographics", self.family, self.birth_date)
+        return None
+
+    def accepts(self, record: "_Keys") -> bool:
+        """Whether an indexed record satisfies every field of this query"""
+        return (
+            (not self.country or self.country == record.country)
+            and (not self.identifier or self.identifier == record.identifier)
+            and (not self.root or self.root == record.root)
+            and (not self.family or self.family == record.family)
+            and (not self.birth_date or self.birth_date == record.birth_date)
+            and (not self.given or set(self.given) <= set(record.given))
+        )
+
+
+class DemographicSearchIndex:
+    """Normalized search key table over indexed patients"""
+
+    def __init__(self, records: Iterable[DemographicRecord]):
+        self.records: List[DemographicRecord] = list(records)
+        self._tables: Dict[Tuple[str, ...], List[Tuple[_Keys, DemographicRecord]]] = defaultdict(list)
+        for record in self.records:
+            keys = _Keys.of(record)
+            entry = (keys, record)
+            if keys.identifier:
+                self._tables[("identifier", keys.identifier)].append(entry)
+                if keys.root:
+                    self._tables[("root", keys.root, keys.identifier)].append(entry)
+            if keys.family and keys.birth_date:
+                self._tables[("demographics", keys.family, keys.birth_date)].append(entry)
+        # Plain dict from here on, so probing a missing key adds nothing
+        self._tables = dict(self._tables)
+
+    @classmethod
+    def from_cda_index(cls, index: Dict[str, List]) -> "DemographicSearchIndex":
+        """
+        Key table for a CDA document index (patient_id -> CDADocumentInfo list)
+
+        A patient gets one record per country holding documents for them,
+        with the demographics of that country's first document.
+        """
+        records = []
+        for patient_id, documents in index.items():
+            seen_countries = set()
+            for document in documents:
+                if document.country_code in seen_countries:
+                    continue
+                seen_countries.add(document.country_code)
+                records.append(
+                    DemographicRecord(
+                        patient_id=patient_id,
+                        country_code=document.country_code,
+                        given_name=document.given_name,
+                        family_name=document.family_name,
+                        birth_date=document.birth_date,
+                        gender=document.gender,
+                        id_root=getattr(document, "patient_id_root", None) or "",
+                    )
+                )
+        return cls(records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def search(self, queries: Iterable[DemographicQuery]) -> List[List[DemographicRecord]]:
+        """Matching records for each query, in query order"""
+        query_keys = [_Keys.of(query) for query in queries]
+
+        # Probe side of the join: distinct probe key -> positions of its queries
+        probes: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        for position, keys in enumerate(query_keys):
+            probe = keys.probe()
+            if probe is not None:
+                probes[probe].append(position)
+
+        results: List[List[DemographicRecord]] = [[] for _ in query_keys]
+        for probe, positions in probes.items():
+            candidates = self._tables.get(probe)
+            if not candidates:
+                continue
+            for position in positions:
+                keys = query_keys[position]
+                results[position] = [
+                    record for record_keys, record in candidates if keys.accepts(record_keys)
+                ]
+        return results
+
+    def search_one(self, query: DemographicQuery) -> List[DemographicRecord]:
+        return self.search([query])[0]
@@ -6,9 +6,11 @@ Provides comprehensive clinical section processing with proper titles and table
 import logging
 import re
 from typing import Dict, List, Any, Optional
-from bs4 import BeautifulSoup, NavigableString
 import xml.etree.ElementTree as ET
 
+from ..utils.date_engine import format_date
+from ..utils.html_parsing import parse_html
+
 logger = logging.getLogger(__name__)
 
 
@@ -524,7 +526,7 @@ class EnhancedCDAProcessor:
     ) -> Dict[str, Any]:
         """Process HTML CDA content and extract clinical sections"""
         try:
-            soup = BeautifulSoup(html_content, "html.parser")
+            soup = parse_html(html_content)
             sections = []
 
             # Look for section elements in HTML - prioritize by data-code attribute
@@ -2077,43 +2079,12 @@ class EnhancedCDAProcessor:
 
     def _format_hl7_datetime(self, hl7_datetime: str) -> str:
         """Format HL7 datetime string to human readable format"""
-        try:
-            if not hl7_datetime:
-                return ""
+        if not hl7_datetime:
+            return ""
 
-            # Strip whitespace and validate input
-            hl7_datetime = hl7_datetime.strip()
-            
-            # Handle different HL7 datetime formats
-            if len(hl7_datetime) >= 14:
-                # YYYYMMDDHHMMSS format
-                year = hl7_datetime[0:4]
-                month = hl7_datetime[4:6]
-                day = hl7_datetime[6:8]
-                hour = hl7_datetime[8:10]
-                minute = hl7_datetime[10:12]
-                return f"{month}/{day}/{year} {hour}:{minute}"
-            elif len(hl7_datetime) >= 8:
-                # YYYYMMDD format
-                year = hl7_datetime[0:4]
-                month = hl7_datetime[4:6]
-                day = hl7_datetime[6:8]
-                return f"{month}/{day}/{year}"
-            elif len(hl7_datetime) == 6:
-                # YYYYMM format (year and month only)
-                year = hl7_datetime[0:4]
-                month = hl7_datetime[4:6]
-                return f"{month}/{year}"
-            elif len(hl7_datetime) == 4 and hl7_datetime.isdigit():
-                # YYYY format (year only) - common in allergy onset/end dates
-                return hl7_datetime
-            else:
-                # Fallback for unknown formats - return as-is
-                return hl7_datetime
-        except Exception:
-            return hl7_datetime
-        except Exception:
-            return hl7_datetime
+        # Fallback for unknown formats - return as-is
+        hl7_datetime = hl7_datetime.strip()
+        return format_date(hl7_datetime, "mdy_time", default=hl7_datetime)
 
     def _convert_observation_to_structured_fields(
         self, obs_data: Dict[str, Any]
@@ -2482,7 +2453,7 @@ class EnhancedCDAProcessor:
                 if text_elem is not None:
                     # Parse HTML table content
                     html_content = ET.tostring(text_elem, encoding="unicode")
-                    soup = BeautifulSoup(html_content, "html.parser")
+                    soup = parse_html(html_content)
 
                     tables = soup.find_all("table")
                     for table in tables:
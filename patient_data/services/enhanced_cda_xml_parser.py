@@ -29,6 +29,8 @@ import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+from ..utils.date_engine import format_date
+
 
 class DotDict(dict):
     """Dictionary that supports dot notation access for template compatibility"""
@@ -77,6 +79,12 @@ except ImportError:
     CDAHeaderExtractor = None
     CDA_HEADER_EXTRACTOR_AVAILABLE = False
 
+# Single-pass CDA header extraction shared by the administrative strategies
+from patient_data.services.unified_cda_header_extractor import (
+    CDAHeaderData,
+    unified_header_extractor,
+)
+
 # Import unified patient demographics service
 try:
     from patient_data.services.patient_demographics_service import PatientDemographicsService
@@ -284,18 +292,10 @@ class EnhancedCDAXMLParser:
             cleaned_xml = self._clean_xml_content(xml_content)
             root = ET.fromstring(cleaned_xml)
 
-            # Extract basic document info using unified demographics service
-            if self.demographics_service:
-                # Use unified patient demographics service
-                demographics = self.demographics_service.extract_from_cda_xml(root)
-                patient_info = demographics.to_legacy_context()
-                logger.info(f"[UNIFIED] Extracted patient demographics: {demographics.get_display_name()}")
-            else:
-                # Fallback to legacy method
-                patient_info = self._extract_patient_info(root)
-                logger.warning("[LEGACY] Using legacy patient info extraction")
-            
-            administrative_data = self._extract_administrative_data(root)
+            # Walk the CDA header once for demographics and administrative data
+            header = unified_header_extractor.extract(root)
+            patient_info = self._extract_patient_identity(root, header)
+            administrative_data = self._extract_administrative_data(root, header)
 
             # Extract clinical sections with coded data
             sections = self._extract_clinical_sections_with_codes(root)
@@ -329,6 +329,40 @@ class EnhancedCDAXMLParser:
             logger.error(f"Enhanced CDA parsing failed: {str(e)}")
             return self._create_fallback_result()
 
+    def parse_cda_header(self, xml_content: str) -> Dict[str, Any]:
+        """
+        Parse only the CDA header: patient identity and administrative data
+
+        For callers that need demographics, healthcare team and contacts but
+        not the clinical sections; the body is never traversed.
+        """
+        try:
+            root = ET.fromstring(self._clean_xml_content(xml_content))
+            header = unified_header_extractor.extract(root)
+            administrative_data = self._extract_administrative_data(root, header)
+            return {
+                "patient_identity": self._extract_patient_identity(root, header),
+                "administrative_data": administrative_data,
+                "has_administrative_data": bool(administrative_data),
+            }
+        except Exception as e:
+            logger.error(f"CDA header parsing failed: {str(e)}")
+            return {}
+
+    def _extract_patient_identity(self, root: ET.Element, header: CDAHeaderData) -> Dict[str, Any]:
+        """Patient identity context from the extracted header demographics"""
+        if self.demographics_service:
+            # Use unified patient demographics service
+            demographics = header.demographics
+            if demographics is None:
+                demographics = self.demographics_service.extract_from_cda_xml(root)
+            logger.info(f"[UNIFIED] Extracted patient demographics: {demographics.get_display_name()}")
+            return demographics.to_legacy_context()
+
+        # Fallback to legacy method
+        logger.warning("[LEGACY] Using legacy patient info extraction")
+        return self._extract_patient_info(root)
+
     def _extract_clinical_sections_with_codes(
         self, root: ET.Element
     ) -> List[Dict[str, Any]]:
@@ -893,7 +927,7 @@ class EnhancedCDAXMLParser:
     # REMOVED: _extract_patient_info method has been replaced by PatientDemographicsService
     # This consolidation eliminates 132 lines of duplicate patient extraction logic
 
-    def _extract_administrative_data(self, root: ET.Element) -> Dict[str, Any]:
+    def _extract_administrative_data(self, root: ET.Element, header: Optional[CDAHeaderData] = None) -> Dict[str, Any]:
         """
         PHASE 3: Unified administrative data extraction strategy
         
@@ -909,18 +943,20 @@ class EnhancedCDAXMLParser:
         - Organizational structure (healthcare providers, custodians)
         """
         try:
+            if header is None:
+                header = unified_header_extractor.extract(root)
             # Strategy 1: Enhanced extraction (comprehensive data)
             if self.admin_extractor:
-                return self._extract_administrative_data_unified(root, strategy="enhanced")
+                return self._extract_administrative_data_unified(header, strategy="enhanced")
             else:
                 # Strategy 2: Basic extraction (fallback)
-                return self._extract_administrative_data_unified(root, strategy="basic")
+                return self._extract_administrative_data_unified(header, strategy="basic")
         except Exception as e:
             logger.warning(f"Administrative data extraction failed: {str(e)}")
             # Strategy 3: Default data creation (error handling)
-            return self._extract_administrative_data_unified(root, strategy="default")
+            return self._extract_administrative_data_unified(header, strategy="default")
 
-    def _extract_administrative_data_unified(self, root: ET.Element, strategy: str = "enhanced") -> Dict[str, Any]:
+    def _extract_administrative_data_unified(self, header: CDAHeaderData, strategy: str = "enhanced") -> Dict[str, Any]:
         """
         PHASE 3: Unified administrative data extraction strategy
         
@@ -930,20 +966,20 @@ class EnhancedCDAXMLParser:
         - Default: Fallback structure for error handling
         
         Args:
-            root: CDA XML root element
+            header: CDA header extracted once by UnifiedCDAHeaderExtractor
             strategy: "enhanced", "basic", or "default"
             
         Returns:
             Comprehensive administrative data structure for template context
         """
         if strategy == "enhanced":
-            return self._extract_enhanced_administrative_data_strategy(root)
+            return self._extract_enhanced_administrative_data_strategy(header)
         elif strategy == "basic":
-            return self._extract_basic_administrative_data_strategy(root)
+            return self._extract_basic_administrative_data_strategy(header)
         else:  # default
             return self._extract_default_administrative_data_strategy()
 
-    def _extract_enhanced_administrative_data_strategy(self, root: ET.Element) -> Dict[str, Any]:
+    def _extract_enhanced_administrative_data_strategy(self, header: CDAHeaderData) -> Dict[str, Any]:
         """
         Enhanced administrative data extraction strategy - Phase 3A Consolidated
         
@@ -956,27 +992,23 @@ class EnhancedCDAXMLParser:
         PHASE 3A: Consolidated from CDAAdministrativeExtractor, NonClinicalCDAParser,
         and EnhancedAdministrativeExtractor for unified administrative extraction
         """
+        elements = header.elements
+
         # PHASE 3A: Detect source country for optimized parsing
-        source_country = self._detect_source_country_phase3a(root)
+        source_country = self._detect_source_country_phase3a(elements)
         
-        # PHASE 3A: Detect document type (L1 vs L3) for optimized processing
-        document_type = self._detect_document_type_phase3a(root)
+        # PHASE 3A: Map the shared header onto the administrative extractor's structure
+        admin_data = self.admin_extractor.extract_from_header(header)
         
-        # PHASE 3A: Use consolidated administrative extractor with country optimization
-        admin_data = self.admin_extractor.extract_administrative_data(
-            ET.tostring(root, encoding="unicode")
+        logger.debug(
+            "[PHASE 3A] Administrative extraction - Country: %s, author_hcp: %s, custodian_organization: %s",
+            source_country,
+            getattr(admin_data, "author_hcp", None),
+            getattr(admin_data, "custodian_organization", None),
         )
-        
-        logger.info(f"*** CDA HEADER EXTRACTION DEBUG: admin_data type: {type(admin_data)}, has data: {admin_data is not None} ***")
-        if admin_data:
-            logger.info(f"*** CDA HEADER EXTRACTION DEBUG: admin_data attributes: {[attr for attr in dir(admin_data) if not attr.startswith('_')]} ***")
-            logger.info(f"*** CDA HEADER EXTRACTION DEBUG: author_hcp: {getattr(admin_data, 'author_hcp', 'Not found')} ***")
-            logger.info(f"*** CDA HEADER EXTRACTION DEBUG: custodian_organization: {getattr(admin_data, 'custodian_organization', 'Not found')} ***")
-        
-        logger.info(f"[PHASE 3A] Administrative extraction - Country: {source_country}, Type: {document_type}, Fields: {len(admin_data.__dict__) if admin_data else 0}")
 
         # Extract document creation date with fallback
-        effective_time = root.find(".//{urn:hl7-org:v3}effectiveTime")
+        effective_time = elements.effective_time
         creation_date = (
             admin_data.document_creation_date
             if admin_data.document_creation_date
@@ -994,13 +1026,13 @@ class EnhancedCDAXMLParser:
                 creation_date = creation_date_raw
 
         # Extract document title with fallback
-        title_elem = root.find(".//{urn:hl7-org:v3}title")
+        title_elem = elements.title
         document_title = (
             title_elem.text if title_elem is not None and title_elem.text else "Unknown"
         )
 
         # Extract document type with fallback
-        code_elem = root.find(".//{urn:hl7-org:v3}code")
+        code_elem = elements.code
         document_type = "Unknown"
         if code_elem is not None:
             document_type = code_elem.get(
@@ -1008,7 +1040,7 @@ class EnhancedCDAXMLParser:
             )
 
         # Extract document ID with fallback
-        doc_id_elem = root.find(".//{urn:hl7-org:v3}id")
+        doc_id_elem = elements.document_id
         document_id = (
             admin_data.document_set_id
             if admin_data.document_set_id
@@ -1486,19 +1518,22 @@ class EnhancedCDAXMLParser:
             ),
         }
 
-    def _detect_source_country_phase3a(self, root: ET.Element) -> str:
+    def _detect_source_country_phase3a(self, elements) -> str:
         """
         PHASE 3A: Detect the source country of the CDA document to optimize parsing
         
         Consolidated from CDAAdministrativeExtractor for country-specific optimizations.
         Supports European healthcare cross-border interoperability.
 
+        Args:
+            elements: CDAHeaderElements located by the unified header extractor
+
         Returns:
             Country code (e.g., 'IE', 'PT', 'LU', 'IT', 'MT') or 'UNKNOWN'
         """
         try:
             # Check language code first
-            language_code = root.get("languageCode")
+            language_code = elements.language_code
             if language_code:
                 country_mapping = {
                     "en-IE": "IE",  # Ireland
@@ -1518,9 +1553,11 @@ class EnhancedCDAXMLParser:
                     return country_mapping[language_code]
 
             # Check custodian organization for country indicators
-            custodian = root.find(
-                ".//custodian/assignedCustodian/representedCustodianOrganization/name",
-                self.namespaces,
+            custodian_org = elements.custodian_organization
+            custodian = (
+                custodian_org.find("cda:name", self.namespaces)
+                if custodian_org is not None
+                else None
             )
             if custodian is not None and custodian.text:
                 custodian_name = custodian.text.lower()
@@ -1547,8 +1584,11 @@ class EnhancedCDAXMLParser:
                     return "MT"
 
             # Check address country codes
-            patient_country = root.find(
-                ".//recordTarget/patientRole/addr/country", self.namespaces
+            patient_role = elements.patient_role
+            patient_country = (
+                patient_role.find("cda:addr/cda:country", self.namespaces)
+                if patient_role is not None
+                else None
             )
             if patient_country is not None and patient_country.text:
                 country_code = patient_country.text.upper()
@@ -1794,7 +1834,7 @@ class EnhancedCDAXMLParser:
 
         return telecom
 
-    def _extract_basic_administrative_data_strategy(self, root: ET.Element) -> Dict[str, Any]:
+    def _extract_basic_administrative_data_strategy(self, header: CDAHeaderData) -> Dict[str, Any]:
         """
         Basic administrative data extraction strategy
         
@@ -1803,8 +1843,10 @@ class EnhancedCDAXMLParser:
         - Basic custodian information
         - Minimal organizational structure for template compatibility
         """
+        elements = header.elements
+
         # Extract document creation date
-        effective_time = root.find(".//{urn:hl7-org:v3}effectiveTime")
+        effective_time = elements.effective_time
         creation_date = "Unknown"
         creation_date_raw = "Unknown"
         if effective_time is not None:
@@ -1818,13 +1860,13 @@ class EnhancedCDAXMLParser:
                 creation_date = creation_date_raw
 
         # Extract document title
-        title_elem = root.find(".//{urn:hl7-org:v3}title")
+        title_elem = elements.title
         document_title = (
             title_elem.text if title_elem is not None and title_elem.text else "Unknown"
         )
 
         # Extract document type
-        code_elem = root.find(".//{urn:hl7-org:v3}code")
+        code_elem = elements.code
         document_type = "Unknown"
         if code_elem is not None:
             document_type = code_elem.get(
@@ -1832,7 +1874,7 @@ class EnhancedCDAXMLParser:
             )
 
         # Extract document ID
-        doc_id_elem = root.find(".//{urn:hl7-org:v3}id")
+        doc_id_elem = elements.document_id
         document_id = (
             doc_id_elem.get("extension", "Unknown")
             if doc_id_elem is not None
@@ -1840,14 +1882,12 @@ class EnhancedCDAXMLParser:
         )
 
         # Extract custodian information
-        custodian = root.find(".//{urn:hl7-org:v3}custodian")
         custodian_name = "Unknown"
-        if custodian is not None:
-            org = custodian.find(".//{urn:hl7-org:v3}representedCustodianOrganization")
-            if org is not None:
-                org_name = org.find("{urn:hl7-org:v3}name")
-                if org_name is not None:
-                    custodian_name = org_name.text
+        org = elements.custodian_organization
+        if org is not None:
+            org_name = org.find("{urn:hl7-org:v3}name")
+            if org_name is not None:
+                custodian_name = org_name.text
 
         logger.info(f"Basic admin data: {document_title}, created: {creation_date}")
 
@@ -2425,22 +2465,8 @@ class EnhancedCDAXMLParser:
         if not cda_date:
             return ""
         
-        try:
-            # CDA dates are typically YYYYMMDD or YYYYMMDDHHMMSS
-            if len(cda_date) >= 8:
-                year = cda_date[:4]
-                month = cda_date[4:6]
-                day = cda_date[6:8]
-                
-                # Convert to readable format
-                from datetime import datetime
-                date_obj = datetime.strptime(f"{year}-{month}-{day}", "%Y-%m-%d")
-                return date_obj.strftime("%b %d, %Y")
-        except:
-            # Fallback to original format if parsing fails
-            return cda_date
-        
-        return cda_date
+        # Fallback to original format if parsing fails
+        return format_date(cda_date, "short", default=cda_date)
 
     def _map_route_code(self, route_code: str) -> str:
         """Map route codes to human-readable administration routes"""
@@ -20,6 +20,15 @@ from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Union
 from dataclasses import dataclass, asdict
 from patient_data.utils.date_formatter import ClinicalDateFormatter
+from patient_data.utils.performance_logging import log_stage, verbose_logging_enabled
+from patient_data.services.fhir_observation_classifier import (
+    LABORATORY_RESULTS,
+    PHYSICAL_FINDINGS,
+    PREGNANCY_HISTORY,
+    SOCIAL_HISTORY,
+    VITAL_SIGNS,
+    observation_classifier,
+)
 from translation_services.enhanced_cts_service import EnhancedCTSService
 
 logger = logging.getLogger("ehealth")
@@ -139,157 +148,167 @@ class FHIRBundleParser:
             Clinical sections structure for Django templates
         """
         try:
-            # Handle JSON string input
-            if isinstance(fhir_bundle, str):
-                fhir_bundle = json.loads(fhir_bundle)
-            
-            # Validate bundle structure
-            if not self._validate_fhir_bundle(fhir_bundle):
-                raise ValueError("Invalid FHIR Bundle structure")
+            with log_stage('fhir_bundle_parser', 'parse'):
+                # Handle JSON string input
+                if isinstance(fhir_bundle, str):
+                    fhir_bundle = json.loads(fhir_bundle)
+                
+                # Validate bundle structure
+                if not self._validate_fhir_bundle(fhir_bundle):
+                    raise ValueError("Invalid FHIR Bundle structure")
             
             # Extract resources by type
             resources_by_type = self._group_resources_by_type(fhir_bundle)
             
-            # Store Medication resources for reference resolution (Azure FHIR now includes these!)
-            if 'Medication' in resources_by_type:
-                for med_resource in resources_by_type['Medication']:
-                    med_id = med_resource.get('id')
-                    if med_id:
-                        self.medication_resources[med_id] = med_resource
-                logger.info(f"Loaded {len(self.medication_resources)} Medication resources for reference resolution")
-            
-            # Parse each resource type into clinical sections
-            clinical_sections = {}
-            section_summary = {}
-            
-            for resource_type, resources in resources_by_type.items():
-                if resource_type in self.section_mapping:
-                    section_info = self.section_mapping[resource_type]
+            with log_stage('fhir_bundle_parser', 'extract') as stage_fields:
+                # Store Medication resources for reference resolution (Azure FHIR now includes these!)
+                if 'Medication' in resources_by_type:
+                    for med_resource in resources_by_type['Medication']:
+                        med_id = med_resource.get('id')
+                        if med_id:
+                            self.medication_resources[med_id] = med_resource
+                    logger.info(f"Loaded {len(self.medication_resources)} Medication resources for reference resolution")
+            
+                # Parse each resource type into clinical sections
+                clinical_sections = {}
+                section_summary = {}
+            
+                for resource_type, resources in resources_by_type.items():
+                    if resource_type in self.section_mapping:
+                        section_info = self.section_mapping[resource_type]
                     
-                    # Parse resources into structured clinical section
-                    clinical_section = self._parse_clinical_section(
-                        resource_type, resources, section_info
-                    )
+                        # Parse resources into structured clinical section
+                        clinical_section = self._parse_clinical_section(
+                            resource_type, resources, section_info
+                        )
                     
-                    clinical_sections[section_info['section_type']] = clinical_section
+                        clinical_sections[section_info['section_type']] = clinical_section
                     
-                    # Create section summary for template
-                    section_summary[section_info['section_type']] = {
-                        'title': section_info['display_name'],
-                        'count': clinical_section.entry_count,
-                        'has_entries': clinical_section.entry_count > 0,
-                        'icon': section_info['icon'],
-                        'resource_type': resource_type
-                    }
+                        # Create section summary for template
+                        section_summary[section_info['section_type']] = {
+                            'title': section_info['display_name'],
+                            'count': clinical_section.entry_count,
+                            'has_entries': clinical_section.entry_count > 0,
+                            'icon': section_info['icon'],
+                            'resource_type': resource_type
+                        }
             
-            # Extract patient identity for UI
-            patient_identity = self._extract_patient_identity(
-                resources_by_type.get('Patient', [])
-            )
+                # Extract patient identity for UI
+                patient_identity = self._extract_patient_identity(
+                    resources_by_type.get('Patient', [])
+                )
             
-            # Extract extended patient information for Extended Patient Information tab
-            administrative_data = self._extract_administrative_data(
-                resources_by_type.get('Patient', []),
-                resources_by_type.get('Composition', []),
-                resources_by_type.get('RelatedPerson', []),
-                fhir_bundle
-            )
+                # Extract extended patient information for Extended Patient Information tab
+                administrative_data = self._extract_administrative_data(
+                    resources_by_type.get('Patient', []),
+                    resources_by_type.get('Composition', []),
+                    resources_by_type.get('RelatedPerson', []),
+                    fhir_bundle
+                )
             
-            contact_data = self._extract_contact_data(
-                resources_by_type.get('Patient', []),
-                resources_by_type.get('RelatedPerson', []),
-                administrative_data  # Pass administrative_data for other_contacts mapping
-            )
+                contact_data = self._extract_contact_data(
+                    resources_by_type.get('Patient', []),
+                    resources_by_type.get('RelatedPerson', []),
+                    administrative_data  # Pass administrative_data for other_contacts mapping
+                )
             
-            # Extract emergency contacts from RelatedPerson resources
-            emergency_contacts = self._extract_emergency_contacts(
-                resources_by_type.get('RelatedPerson', [])
-            )
+                # Extract emergency contacts from RelatedPerson resources
+                emergency_contacts = self._extract_emergency_contacts(
+                    resources_by_type.get('RelatedPerson', [])
+                )
             
-            # Extract all resources from bundle
-            all_practitioner_resources = resources_by_type.get('Practitioner', [])
-            organization_resources = resources_by_type.get('Organization', [])
-            composition_resources = resources_by_type.get('Composition', [])
+                # Extract all resources from bundle
+                all_practitioner_resources = resources_by_type.get('Practitioner', [])
+                organization_resources = resources_by_type.get('Organization', [])
+                composition_resources = resources_by_type.get('Composition', [])
             
-            # CRITICAL FIX: Filter practitioners by composition author references
-            # Only include practitioners that are referenced in THIS patient's compositions
-            filtered_practitioner_resources = self._filter_practitioners_by_composition(
-                all_practitioner_resources,
-                composition_resources
-            )
+                # CRITICAL FIX: Filter practitioners by composition author references
+                # Only include practitioners that are referenced in THIS patient's compositions
+                filtered_practitioner_resources = self._filter_practitioners_by_composition(
+                    all_practitioner_resources,
+                    composition_resources
+                )
             
-            logger.info(f"[PARSER DEBUG] Filtered {len(filtered_practitioner_resources)}/{len(all_practitioner_resources)} Practitioners by Composition references, {len(organization_resources)} Organizations, {len(composition_resources)} Compositions")
+                logger.debug("[PARSER DEBUG] Filtered %d/%d Practitioners by Composition references, %d Organizations, %d Compositions",
+                             len(filtered_practitioner_resources), len(all_practitioner_resources),
+                             len(organization_resources), len(composition_resources))
             
-            healthcare_data = self._extract_healthcare_data(
-                filtered_practitioner_resources,
-                organization_resources,
-                composition_resources
-            )
+                healthcare_data = self._extract_healthcare_data(
+                    filtered_practitioner_resources,
+                    organization_resources,
+                    composition_resources
+                )
             
-            # Map custodian organization from healthcare_data to administrative_data for template compatibility
-            if healthcare_data.get('custodian_organization'):
-                administrative_data['custodian_organization'] = healthcare_data['custodian_organization']
-                logger.info(f"Mapped custodian organization to administrative_data: {administrative_data['custodian_organization']['name']}")
-                logger.info(f"[CUSTODIAN DEBUG] custodian_organization keys: {list(administrative_data['custodian_organization'].keys())}")
-                logger.info(f"[CUSTODIAN DEBUG] addresses count: {len(administrative_data['custodian_organization'].get('addresses', []))}")
-                logger.info(f"[CUSTODIAN DEBUG] telecoms count: {len(administrative_data['custodian_organization'].get('telecoms', []))}")
-                if administrative_data['custodian_organization'].get('addresses'):
-                    logger.info(f"[CUSTODIAN DEBUG] First address: {administrative_data['custodian_organization']['addresses'][0]}")
-                if administrative_data['custodian_organization'].get('telecoms'):
-                    logger.info(f"[CUSTODIAN DEBUG] First telecom: {administrative_data['custodian_organization']['telecoms'][0]}")
-            
-            # Create clinical arrays for view compatibility
-            clinical_arrays = self._create_clinical_arrays(clinical_sections)
-            
-            # Convert FHIRClinicalSection objects to dictionaries for JSON serialization
-            serializable_sections = {
-                section_type: section.to_dict() if hasattr(section, 'to_dict') else section
-                for section_type, section in clinical_sections.items()
-            }
+                # Map custodian organization from healthcare_data to administrative_data for template compatibility
+                if healthcare_data.get('custodian_organization'):
+                    administrative_data['custodian_organization'] = healthcare_data['custodian_organization']
+                    if verbose_logging_enabled(logger):
+                        custodian = administrative_data['custodian_organization']
+                        logger.debug("Mapped custodian organization to administrative_data: %s", custodian['name'])
+                        logger.debug("[CUSTODIAN DEBUG] custodian_organization keys: %s", list(custodian.keys()))
+                        logger.debug("[CUSTODIAN DEBUG] addresses count: %d", len(custodian.get('addresses', [])))
+                        logger.debug("[CUSTODIAN DEBUG] telecoms count: %d", len(custodian.get('telecoms', [])))
+                        if custodian.get('addresses'):
+                            logger.debug("[CUSTODIAN DEBUG] First address: %s", custodian['addresses'][0])
+                        if custodian.get('telecoms'):
+                            logger.debug("[CUSTODIAN DEBUG] First telecom: %s", custodian['telecoms'][0])
+            
+                # Create clinical arrays for view compatibility
+                clinical_arrays = self._create_clinical_arrays(clinical_sections)
+            
+                # Convert FHIRClinicalSection objects to dictionaries for JSON serialization
+                serializable_sections = {
+                    section_type: section.to_dict() if hasattr(section, 'to_dict') else section
+                    for section_type, section in clinical_sections.items()
+                }
             
-            # Create enhanced sections structure (compatible with existing views)
-            enhanced_sections = {
-                'success': True,
-                'data_source': 'FHIR Patient Summary Bundle',
-                'sections': list(serializable_sections.values()),
-                'sections_count': len(serializable_sections),
-                'content_type': 'FHIR',
-                'patient_identity': patient_identity,
-                'patient_information': patient_identity,  # Alias for compatibility
-                'patient_data': patient_identity,  # Additional alias for view compatibility
-                'section_summary': section_summary,
+                # Create enhanced sections structure (compatible with existing views)
+                enhanced_sections = {
+                    'success': True,
+                    'data_source': 'FHIR Patient Summary Bundle',
+                    'sections': list(serializable_sections.values()),
+                    'sections_count': len(serializable_sections),
+                    'content_type': 'FHIR',
+                    'patient_identity': patient_identity,
+                    'patient_information': patient_identity,  # Alias for compatibility
+                    'patient_data': patient_identity,  # Additional alias for view compatibility
+                    'section_summary': section_summary,
                 
-                # Clinical arrays for template compatibility
-                'clinical_arrays': clinical_arrays,
+                    # Clinical arrays for template compatibility
+                    'clinical_arrays': clinical_arrays,
                 
-                # Extended patient information for Extended Patient Information tab
-                'administrative_data': administrative_data,
-                'contact_data': contact_data,
-                'emergency_contacts': emergency_contacts,
-                'healthcare_data': healthcare_data,
-                'patient_extended_data': {
-                    'administrative': administrative_data,
-                    'contact': contact_data,
+                    # Extended patient information for Extended Patient Information tab
+                    'administrative_data': administrative_data,
+                    'contact_data': contact_data,
                     'emergency_contacts': emergency_contacts,
-                    'healthcare': healthcare_data,
-                    'has_extended_data': bool(administrative_data or contact_data or emergency_contacts or healthcare_data)
-                },
+                    'healthcare_data': healthcare_data,
+                    'patient_extended_data': {
+                        'administrative': administrative_data,
+                        'contact': contact_data,
+                        'emergency_contacts': emergency_contacts,
+                        'healthcare': healthcare_data,
+                        'has_extended_data': bool(administrative_data or contact_data or emergency_contacts or healthcare_data)
+                    },
                 
-                'bundle_metadata': {
-                    'resource_count': sum(len(resources) for resources in resources_by_type.values()),
-                    'bundle_type': fhir_bundle.get('type', 'unknown'),
-                    'bundle_id': fhir_bundle.get('id', 'unknown'),
-                    'timestamp': datetime.now(timezone.utc).isoformat(),
-                    'supported_resources': list(resources_by_type.keys())
+                    'bundle_metadata': {
+                        'resource_count': sum(len(resources) for resources in resources_by_type.values()),
+                        'bundle_type': fhir_bundle.get('type', 'unknown'),
+                        'bundle_id': fhir_bundle.get('id', 'unknown'),
+                        'timestamp': datetime.now(timezone.utc).isoformat(),
+                        'supported_resources': list(resources_by_type.keys())
+                    }
                 }
-            }
+                stage_fields['sections'] = len(clinical_sections)
+                stage_fields['resources'] = enhanced_sections['bundle_metadata']['resource_count']
             
             # Add clinical arrays to top level for direct access
             # This makes them compatible with templates expecting flat structure
             enhanced_sections.update(clinical_arrays)
             
-            logger.info(f"FHIR Bundle parsed successfully: {len(clinical_sections)} sections, {enhanced_sections['bundle_metadata']['resource_count']} resources")
-            logger.info(f"Extended data extracted: admin={bool(administrative_data)}, contact={bool(contact_data)}, healthcare={bool(healthcare_data)}")
+            logger.info("FHIR Bundle parsed successfully: %d sections, %d resources",
+                        len(clinical_sections), enhanced_sections['bundle_metadata']['resource_count'])
+            logger.debug("Extended data extracted: admin=%s, contact=%s, healthcare=%s",
+                         bool(administrative_data), bool(contact_data), bool(healthcare_data))
             
             return enhanced_sections
             
@@ -323,21 +342,28 @@ class FHIRBundleParser:
         """Group FHIR resources by resourceType and deduplicate by version"""
         resources_by_type = {}
         
-        for entry in fhir_bundle.get('entry', []):
-            # Handle nested arrays (like in your EPSOS data)
-            if isinstance(entry, list):
-                for sub_entry in entry:
-                    self._add_resource_to_group(sub_entry, resources_by_type)
-            else:
-                self._add_resource_to_group(entry, resources_by_type)
-        
-        # Deduplicate resources by keeping only the latest version
-        resources_by_type = self._deduplicate_resources_by_version(resources_by_type)
+        with log_stage('fhir_bundle_parser', 'group') as stage_fields:
+            for entry in fhir_bundle.get('entry', []):
+                # Handle nested arrays (like in your EPSOS data)
+                if isinstance(entry, list):
+                    for sub_entry in entry:
+                        self._add_resource_to_group(sub_entry, resources_by_type)
+                else:
+                    self._add_resource_to_group(entry, resources_by_type)
+            stage_fields['resources'] = sum(len(resources) for resources in resources_by_type.values())
         
-        # Clinical deduplication for Conditions (same code + onset date)
-        resources_by_type = self._deduplicate_conditions_clinically(resources_by_type)
+        with log_stage('fhir_bundle_parser', 'dedupe') as stage_fields:
+            # Deduplicate resources by keeping only the latest version
+            resources_by_type = self._deduplicate_resources_by_version(resources_by_type)
+            
+            # Clinical deduplication for Conditions (same code + onset date)
+            resources_by_type = self._deduplicate_conditions_clinically(resources_by_type)
+            stage_fields['resources'] = sum(len(resources) for resources in resources_by_type.values())
         
-        logger.info(f"[PARSER DEBUG] Grouped resources: Practitioner={len(resources_by_type.get('Practitioner', []))}, Organization={len(resources_by_type.get('Organization', []))}, Composition={len(resources_by_type.get('Composition', []))}")
+        logger.debug("[PARSER DEBUG] Grouped resources: Practitioner=%d, Organization=%d, Composition=%d",
+                     len(resources_by_type.get('Practitioner', [])),
+                     len(resources_by_type.get('Organization', [])),
+                     len(resources_by_type.get('Composition', [])))
         
         return resources_by_type
     
@@ -363,12 +389,12 @@ class FHIRBundleParser:
                 if condition_type not in resources_by_type:
                     resources_by_type[condition_type] = []
                 resources_by_type[condition_type].append(resource)
-                logger.info(f"[PARSER DEBUG] Added {condition_type} resource: {resource.get('id', 'unknown-id')}")
+                logger.debug("[PARSER DEBUG] Added %s resource: %s", condition_type, resource.get('id', 'unknown-id'))
             else:
                 if resource_type not in resources_by_type:
                     resources_by_type[resource_type] = []
                 resources_by_type[resource_type].append(resource)
-                logger.info(f"[PARSER DEBUG] Added {resource_type} resource: {resource.get('id', 'unknown-id')}")
+                logger.debug("[PARSER DEBUG] Added %s resource: %s", resource_type, resource.get('id', 'unknown-id'))
     
     def _deduplicate_resources_by_version(self, resources_by_type: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
         """
@@ -384,6 +410,7 @@ class FHIRBundleParser:
             Dictionary with deduplicated resources (only latest version per ID)
         """
         deduplicated = {}
+        verbose = verbose_logging_enabled(logger)
         
         for resource_type, resources in resources_by_type.items():
             # Group by resource ID
@@ -418,7 +445,8 @@ class FHIRBundleParser:
                 
                 for resource_id, data in by_id.items():
                     deduplicated[resource_type].append(data['resource'])
-                    logger.info(f"[DEDUP] Kept {resource_type} {resource_id} version {data['version']}")
+                    if verbose:
+                        logger.debug("[DEDUP] Kept %s %s version %s", resource_type, resource_id, data['version'])
         
         return deduplicated
     
@@ -525,12 +553,14 @@ class FHIRBundleParser:
         
         # For each clinical group, keep the medication with most complete data
         deduplicated = []
+        verbose = verbose_logging_enabled(logger)
         
         for key, group in clinical_groups.items():
             if len(group) == 1:
                 # Only one medication for this clinical identifier - keep it
                 deduplicated.append(group[0])
-                logger.info(f"[CLINICAL DEDUP] Kept unique medication: {key}")
+                if verbose:
+                    logger.debug("[CLINICAL DEDUP] Kept unique medication: %s", key)
             else:
                 # Multiple medications for same clinical entity - score by completeness
                 scored_meds = []
@@ -544,13 +574,14 @@ class FHIRBundleParser:
                 best_score = scored_meds[0][0]
                 
                 deduplicated.append(best_med)
-                logger.info(f"[CLINICAL DEDUP] Grouped {len(group)} medications as {key}, kept best (score: {best_score}/5)")
-                
-                # Log rejected duplicates
-                for score, med in scored_meds[1:]:
-                    logger.info(f"[CLINICAL DEDUP] Rejected duplicate with score {score}/5: {med.get('medication_name', 'Unknown')}")
+                if verbose:
+                    logger.debug("[CLINICAL DEDUP] Grouped %d medications as %s, kept best (score: %d/5)", len(group), key, best_score)
+                    
+                    # Log rejected duplicates
+                    for score, med in scored_meds[1:]:
+                        logger.debug("[CLINICAL DEDUP] Rejected duplicate with score %d/5: %s", score, med.get('medication_name', 'Unknown'))
         
-        logger.info(f"[CLINICAL DEDUP] Clinical deduplication: {len(medications)} medications -> {len(deduplicated)} unique medications")
+        logger.info("[CLINICAL DEDUP] Clinical deduplication: %d medications -> %d unique medications", len(medications), len(deduplicated))
         return deduplicated
     
     def _calculate_medication_completeness_score(self, medication: Dict) -> int:
@@ -631,7 +662,7 @@ class FHIRBundleParser:
         elif resource_type == 'Procedure':
             parsed_entries = [self._parse_procedure_resource(resource) for resource in resources]
         elif resource_type == 'Observation':
-            parsed_entries = [self._parse_observation_resource(resource) for resource in resources]
+            parsed_entries = self._parse_observation_series(resources)
         elif resource_type == 'Immunization':
             parsed_entries = [self._parse_immunization_resource(resource) for resource in resources]
         elif resource_type == 'DiagnosticReport':
@@ -1622,11 +1653,29 @@ class FHIRBundleParser:
             'display_text': f"Procedure: {procedure_name} ({status})"
         }
     
-    def _parse_observation_resource(self, observation: Dict[str, Any]) -> Dict[str, Any]:
-        """Parse FHIR Observation resource with comprehensive FHIR R4 data type support"""
-        # Import enhanced FHIR processor for complex data types
+    def _parse_observation_series(self, observations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Parse Observations, formatting all their value quantities in one call"""
         from eu_ncp_server.services.fhir_processing import FHIRResourceProcessor
+        from eu_ncp_server.services.ucum_formatting import format_observation_series
+
         processor = FHIRResourceProcessor()
+        value_displays = format_observation_series(observations)
+        return [
+            self._parse_observation_resource(observation, processor, value_display)
+            for observation, value_display in zip(observations, value_displays)
+        ]
+
+    def _parse_observation_resource(
+        self,
+        observation: Dict[str, Any],
+        processor=None,
+        value_display: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Parse FHIR Observation resource with comprehensive FHIR R4 data type support"""
+        if processor is None:
+            # Import enhanced FHIR processor for complex data types
+            from eu_ncp_server.services.fhir_processing import FHIRResourceProcessor
+            processor = FHIRResourceProcessor()
         
         # Extract observation name with FHIR R4 CodeableConcept support
         code = observation.get('code', {})
@@ -1644,7 +1693,7 @@ class FHIRBundleParser:
         # FHIR R4 supports multiple value types for observations
         if observation.get('valueQuantity'):
             value_type = 'quantity'
-            value_data = processor._extract_quantity_data(observation['valueQuantity'])
+            value_data = processor._extract_quantity_data(observation['valueQuantity'], value_display)
             value_text = value_data.get('display_value', 'Unknown quantity')
         elif observation.get('valueCodeableConcept'):
             value_type = 'concept'
@@ -1764,7 +1813,7 @@ class FHIRBundleParser:
         value_unit = None
         if value_type == 'quantity' and value_data:
             value_numeric = value_data.get('value')
-            value_unit = value_data.get('unit')
+            value_unit = value_data.get('unit_display')
         
         return {
             'id': observation.get('id'),
@@ -1806,81 +1855,9 @@ class FHIRBundleParser:
         
         Uses LOINC codes from IPS Pregnancy History section (10162-6)
         """
-        pregnancy_loinc_codes = {
-            '82810-3',  # Pregnancy status
-            '11636-8',  # [# Births] total
-            '11637-6',  # [# Births].live
-            '11638-4',  # [# Births].still living
-            '11639-2',  # [# Births].term
-            '11640-0',  # [# Births].preterm
-            '11612-9',  # [# Abortions]
-            '11613-7',  # [# Abortions].induced
-            '11614-5',  # [# Abortions].spontaneous
-            '93857-1',  # Date and time of obstetric delivery
-            '11996-6',  # Pregnancy status
-            '49051-6',  # Gestational age
-            '11884-4',  # Gestational age at birth
-            '57064-8',  # Estimated date of delivery
-            '11778-8',  # Delivery date
-            '8339-4',   # Birth weight
-            '72149-8',  # Type of delivery
-            '73812-0',  # Delivery complications
-        }
-        
-        pregnancy_snomed_codes = {
-            '77386006',  # Pregnant
-            '281050002', # Livebirth
-            '57797005',  # Termination of pregnancy
-            '169836001', # Gravida
-            '364325004', # Parity
-            '161732006', # Gravidity
-            '161733001', # Parity - delivered
-        }
-        
-        # Check observation_code field (primary method after _parse_observation_resource)
-        observation_code = observation.get('observation_code', '')
-        if observation_code and (observation_code in pregnancy_loinc_codes or observation_code in pregnancy_snomed_codes):
-            return True
-        
-        # Also check code_data.code for backwards compatibility
-        code_data = observation.get('code_data', {})
-        if isinstance(code_data, dict):
-            code = code_data.get('code', '')
-            if code and (code in pregnancy_loinc_codes or code in pregnancy_snomed_codes):
-                return True
-        
-        # Check category for pregnancy/obstetric (handle both list and string formats)
-        category = observation.get('category', [])
-        category_text = ''
-        if isinstance(category, list):
-            # Extract display text from FHIR category structure
-            for cat in category:
-                if isinstance(cat, dict):
-                    codings = cat.get('coding', [])
-                    for coding in codings:
-                        if isinstance(coding, dict):
-                            display = coding.get('display', '')
-                            if display:
-                                category_text += display.lower() + ' '
-        elif isinstance(category, str):
-            category_text = category.lower()
-        
-        if 'pregnancy' in category_text or 'obstetric' in category_text:
-            return True
-        
-        # Check observation name and display text
-        observation_name = observation.get('observation_name', '').lower()
-        display_text = str(observation.get('code_data', {}).get('text', '')).lower()
-        
-        pregnancy_keywords = [
-            'pregnancy', 'pregnant', 'gravida', 'para', 'gravidity', 'parity',
-            'delivery', 'obstetric', 'gestation', 'livebirth', 'stillbirth',
-            'abortion', 'miscarriage', 'termination of pregnancy'
-        ]
-        
-        return any(keyword in observation_name or keyword in display_text 
-                  for keyword in pregnancy_keywords)
+        return PREGNANCY_HISTORY in observation_classifier.classify(observation)
     
+
     def _transform_pregnancy_observations(self, observations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Transform pregnancy-related observations into template-compatible structure
@@ -2375,108 +2352,14 @@ class FHIRBundleParser:
     
     def _is_vital_sign(self, observation: Dict[str, Any]) -> bool:
         """Check if observation is a vital sign using LOINC codes and keywords"""
-        # LOINC codes for vital signs (primary method)
-        vital_sign_loinc_codes = [
-            '85354-9',  # Blood pressure panel
-            '8480-6',   # Systolic blood pressure
-            '8462-4',   # Diastolic blood pressure
-            '8867-4',   # Heart rate
-            '8310-5',   # Body temperature
-            '9279-1',   # Respiratory rate
-            '2710-2',   # Oxygen saturation
-            '29463-7',  # Body weight
-            '8302-2',   # Body height
-            '39156-5',  # Body mass index
-        ]
-        
-        # Check category first (most reliable)
-        category = observation.get('category', [])
-        
-        # Type check: category should be list of dicts, but might be a string
-        if isinstance(category, str):
-            logger.warning(f"[FHIR] Observation category is string instead of list: {category}")
-            # Match string category values (case-insensitive)
-            category_lower = category.lower()
-            if 'vital' in category_lower or category_lower == 'vital-signs':
-                return True
-            category = []  # Fallback to empty array for further processing
-        
-        for cat in category:
-            # Type check: each category entry should be dict (CodeableConcept), not string
-            if not isinstance(cat, dict):
-                logger.warning(f"[FHIR] Observation category entry is not dict: {type(cat)} - {cat}")
-                continue
-            
-            coding = cat.get('coding', [])
-            for code in coding:
-                if code.get('code') == 'vital-signs':
-                    return True
-        
-        # Check LOINC code
-        code_data = observation.get('code', {})
-        if code_data.get('coding'):
-            for coding in code_data['coding']:
-                if coding.get('system') == 'http://loinc.org' and coding.get('code') in vital_sign_loinc_codes:
-                    return True
-        
-        # Fallback to keyword matching
-        vital_sign_keywords = [
-            'blood pressure', 'systolic', 'diastolic', 'heart rate', 'pulse',
-            'temperature', 'respiratory rate', 'oxygen saturation', 'spo2',
-            'weight', 'height', 'bmi', 'body mass index'
-        ]
-        
-        observation_text = str(observation.get('code', {})).lower()
-        return any(keyword in observation_text for keyword in vital_sign_keywords)
+        return VITAL_SIGNS in observation_classifier.classify(observation)
     
+
     def _is_social_history(self, observation: Dict[str, Any]) -> bool:
         """Check if observation is social history using LOINC codes and category"""
-        # Check category first (most reliable)
-        category = observation.get('category', [])
-        
-        # Type check: category should be list of dicts, but might be a string
-        if isinstance(category, str):
-            # Match string category values (case-insensitive)
-            category_lower = category.lower()
-            if 'social' in category_lower or category_lower == 'social-history':
-                return True
-            category = []  # Fallback to empty array for further processing
-        
-        for cat in category:
-            # Type check: each category entry should be dict (CodeableConcept)
-            if not isinstance(cat, dict):
-                continue
-            
-            coding = cat.get('coding', [])
-            for code in coding:
-                if code.get('code') == 'social-history':
-                    return True
-        
-        # LOINC codes for social history
-        social_history_loinc_codes = [
-            '72166-2',  # Tobacco smoking status
-            '74013-4',  # Alcoholic drinks per day
-            '11331-6',  # History of occupation
-            '63512-8',  # Number of living children
-            '93043-8',  # Housing status
-            '76689-9',  # Sex assigned at birth
-        ]
-        
-        code_data = observation.get('code', {})
-        if code_data.get('coding'):
-            for coding in code_data['coding']:
-                if coding.get('system') == 'http://loinc.org' and coding.get('code') in social_history_loinc_codes:
-                    return True
-        
-        # Fallback to keyword matching
-        social_keywords = [
-            'smoking', 'tobacco', 'alcohol', 'occupation', 'employment',
-            'housing', 'living', 'marital', 'education', 'social'
-        ]
-        
-        observation_text = str(observation.get('code', {})).lower()
-        return any(keyword in observation_text for keyword in social_keywords)
+        return SOCIAL_HISTORY in observation_classifier.classify(observation)
     
+
     def _is_laboratory_result(self, observation: Dict[str, Any]) -> bool:
         """
         Check if observation is a laboratory result or diagnostic imaging result
@@ -2485,87 +2368,14 @@ class FHIRBundleParser:
         diagnostic imaging (MRI, CT, X-ray, etc.) as both are typically 
         displayed in the Laboratory Results section of clinical documents.
         """
-        # Check category first (most reliable)
-        category = observation.get('category', [])
-        
-        # Type check: category should be list of dicts, but might be a string
-        if isinstance(category, str):
-            # Match string category values (case-insensitive)
-            category_lower = category.lower()
-            if 'lab' in category_lower or category_lower in ['laboratory', 'imaging']:
-                return True
-            category = []  # Fallback to empty array for further processing
-        
-        for cat in category:
-            # Type check: each category entry should be dict (CodeableConcept)
-            if not isinstance(cat, dict):
-                continue
-            
-            coding = cat.get('coding', [])
-            for code in coding:
-                # Include both laboratory and imaging categories
-                if code.get('code') in ['laboratory', 'lab', 'imaging']:
-                    return True
-        
-        # Common lab result and imaging LOINC patterns
-        lab_keywords = [
-            'blood', 'serum', 'plasma', 'urine', 'hemoglobin', 'glucose',
-            'cholesterol', 'creatinine', 'panel', 'group', 'test', 'lab',
-            'mri', 'ct', 'x-ray', 'ultrasound', 'imaging', 'scan', 'radiolog'
-        ]
-        
-        observation_text = str(observation.get('code', {})).lower()
-        return any(keyword in observation_text for keyword in lab_keywords)
+        return LABORATORY_RESULTS in observation_classifier.classify(observation)
     
+
     def _is_physical_finding(self, observation: Dict[str, Any]) -> bool:
         """Check if observation is a physical examination finding"""
-        # Check category first (most reliable)
-        category = observation.get('category', [])
-        
-        # Type check: category should be list of dicts, but might be a string
-        if isinstance(category, str):
-            # Match string category values (case-insensitive)
-            category_lower = category.lower()
-            if 'exam' in category_lower or 'physical' in category_lower:
-                return True
-            category = []  # Fallback to empty array for further processing
-        
-        for cat in category:
-            # Type check: each category entry should be dict (CodeableConcept)
-            if not isinstance(cat, dict):
-                continue
-            
-            coding = cat.get('coding', [])
-            for code in coding:
-                if code.get('code') in ['exam', 'physical-exam', 'physical-finding']:
-                    return True
-        
-        # LOINC codes for physical examination findings
-        physical_exam_loinc_codes = [
-            '8716-3',   # Vital signs panel (sometimes used for physical exam)
-            '29274-8',  # Physical findings
-            '11384-5',  # Physical examination
-            '32423-6',  # Physical findings of Abdomen
-            '11391-0',  # Physical findings of Chest
-            '11413-2',  # Physical findings of Skin
-        ]
-        
-        code_data = observation.get('code', {})
-        if code_data.get('coding'):
-            for coding in code_data['coding']:
-                if coding.get('system') == 'http://loinc.org' and coding.get('code') in physical_exam_loinc_codes:
-                    return True
-        
-        # Fallback to keyword matching
-        physical_exam_keywords = [
-            'physical exam', 'examination', 'inspection', 'palpation',
-            'auscultation', 'percussion', 'abdomen', 'chest', 'skin',
-            'appearance', 'finding'
-        ]
-        
-        observation_text = str(observation.get('code', {})).lower()
-        return any(keyword in observation_text for keyword in physical_exam_keywords)
+        return PHYSICAL_FINDINGS in observation_classifier.classify(observation)
     
+
     def _parse_immunization_resource(self, immunization: Dict[str, Any]) -> Dict[str, Any]:
         """Parse FHIR Immunization resource - preserves CodeableConcepts for CTS resolution"""
         # Preserve original vaccineCode CodeableConcept for CTS resolution in agent service
@@ -2756,49 +2566,37 @@ class FHIRBundleParser:
                 clinical_arrays['observations'] = section_data.entries
                 
                 # Debug: Log all observations before filtering
-                logger.info(f"[OBS DEBUG] Processing {len(section_data.entries)} observations")
-                for obs in section_data.entries:
-                    obs_name = obs.get('observation_name', 'Unknown')
-                    obs_category = obs.get('category', 'No category')
-                    logger.info(f"[OBS] {obs_name} | Category: {obs_category}")
+                if verbose_logging_enabled(logger):
+                    logger.debug("[OBS DEBUG] Processing %d observations", len(section_data.entries))
+                    for obs in section_data.entries:
+                        logger.debug("[OBS] %s | Category: %s", obs.get('observation_name', 'Unknown'), obs.get('category', 'No category'))
+                
+                # Classify every observation once into all matching sections
+                grouped = observation_classifier.group(section_data.entries)
                 
-                # Filter for vital signs
-                clinical_arrays['vital_signs'] = [
-                    obs for obs in section_data.entries 
-                    if self._is_vital_sign(obs)
-                ]
+                # Vital signs
+                clinical_arrays['vital_signs'] = grouped[VITAL_SIGNS]
                 logger.info(f"[FILTER] Vital signs: {len(clinical_arrays['vital_signs'])} observations")
                 
-                # Filter for social history and transform to CDA-style structure
-                social_history_observations = [
-                    obs for obs in section_data.entries 
-                    if self._is_social_history(obs)
-                ]
+                # Social history, transformed to CDA-style structure
+                social_history_observations = grouped[SOCIAL_HISTORY]
                 logger.info(f"[FILTER] Social history: {len(social_history_observations)} observations")
                 clinical_arrays['social_history'] = self._transform_social_history_observations(social_history_observations)
                 
-                # Filter for physical findings (physical examination observations)
-                clinical_arrays['physical_findings'] = [
-                    obs for obs in section_data.entries 
-                    if self._is_physical_finding(obs)
-                ]
+                # Physical findings (physical examination observations)
+                clinical_arrays['physical_findings'] = grouped[PHYSICAL_FINDINGS]
                 logger.info(f"[FILTER] Physical findings: {len(clinical_arrays['physical_findings'])} observations")
                 
-                # Filter for laboratory results
-                clinical_arrays['laboratory_results'] = [
-                    obs for obs in section_data.entries 
-                    if self._is_laboratory_result(obs)
-                ]
+                # Laboratory results
+                clinical_arrays['laboratory_results'] = grouped[LABORATORY_RESULTS]
                 logger.info(f"[FILTER] Laboratory results: {len(clinical_arrays['laboratory_results'])} observations")
                 
-                # Filter for pregnancy history (LOINC 10162-6 section) and transform to template structure
-                pregnancy_observations = [
-                    obs for obs in section_data.entries 
-                    if self._is_pregnancy_related(obs)
-                ]
+                # Pregnancy history (LOINC 10162-6 section), transformed to template structure
+                pregnancy_observations = grouped[PREGNANCY_HISTORY]
                 logger.info(f"[PREGNANCY FILTER] Found {len(pregnancy_observations)} pregnancy-related observations from {len(section_data.entries)} total observations")
-                for obs in pregnancy_observations:
-                    logger.debug(f"[PREGNANCY OBS] {obs.get('observation_name')} (code: {obs.get('observation_code', 'N/A')}, id: {obs.get('id')})")
+                if verbose_logging_enabled(logger):
+                    for obs in pregnancy_observations:
+                        logger.debug("[PREGNANCY OBS] %s (code: %s, id: %s)", obs.get('observation_name'), obs.get('observation_code', 'N/A'), obs.get('id'))
                 clinical_arrays['pregnancy_history'] = self._transform_pregnancy_observations(pregnancy_observations)
             elif section_type == 'immunizations' and hasattr(section_data, 'entries'):
                 clinical_arrays['immunizations'] = section_data.entries
@@ -0,0 +1,253 @@
+"""
+FHIR Observation Classifier
+
+Single-pass classification of FHIR Observations into the clinical sections
+rendered by the Patient Summary UI (vital signs, social history, physical
+findings, laboratory results, pregnancy history).
+
+The code tables are frozen at import and the keyword fallbacks are compiled
+into one regular expression per section, so classifying an Observation
+indexes its codings once and returns every matching section together
+instead of evaluating five separate predicates.
+"""
+
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List
+
+LOINC_SYSTEM = 'http://loinc.org'
+
+VITAL_SIGNS = 'vital_signs'
+SOCIAL_HISTORY = 'social_history'
+PHYSICAL_FINDINGS = 'physical_findings'
+LABORATORY_RESULTS = 'laboratory_results'
+PREGNANCY_HISTORY = 'pregnancy_history'
+
+OBSERVATION_SECTIONS = (
+    VITAL_SIGNS,
+    SOCIAL_HISTORY,
+    PHYSICAL_FINDINGS,
+    LABORATORY_RESULTS,
+    PREGNANCY_HISTORY,
+)
+
+VITAL_SIGN_LOINC_CODES = frozenset({
+    '85354-9',  # Blood pressure panel
+    '8480-6',   # Systolic blood pressure
+    '8462-4',   # Diastolic blood pressure
+    '8867-4',   # Heart rate
+    '8310-5',   # Body temperature
+    '9279-1',   # Respiratory rate
+    '2710-2',   # Oxygen saturation
+    '29463-7',  # Body weight
+    '8302-2',   # Body height
+    '39156-5',  # Body mass index
+})
+
+SOCIAL_HISTORY_LOINC_CODES = frozenset({
+    '72166-2',  # Tobacco smoking status
+    '74013-4',  # Alcoholic drinks per day
+    '11331-6',  # History of occupation
+    '63512-8',  # Number of living children
+    '93043-8',  # Housing status
+    '76689-9',  # Sex assigned at birth
+})
+
+PHYSICAL_EXAM_LOINC_CODES = frozenset({
+    '8716-3',   # Vital signs panel (sometimes used for physical exam)
+    '29274-8',  # Physical findings
+    '11384-5',  # Physical examination
+    '32423-6',  # Physical findings of Abdomen
+    '11391-0',  # Physical findings of Chest
+    '11413-2',  # Physical findings of Skin
+})
+
+# LOINC codes from IPS Pregnancy History section (10162-6)
+PREGNANCY_LOINC_CODES = frozenset({
+    '82810-3',  # Pregnancy status
+    '11636-8',  # [# Births] total
+    '11637-6',  # [# Births].live
+    '11638-4',  # [# Births].still living
+    '11639-2',  # [# Births].term
+    '11640-0',  # [# Births].preterm
+    '11612-9',  # [# Abortions]
+    '11613-7',  # [# Abortions].induced
+    '11614-5',  # [# Abortions].spontaneous
+    '93857-1',  # Date and time of obstetric delivery
+    '11996-6',  # Pregnancy status
+    '49051-6',  # Gestational age
+    '11884-4',  # Gestational age at birth
+    '57064-8',  # Estimated date of delivery
+    '11778-8',  # Delivery date
+    '8339-4',   # Birth weight
+    '72149-8',  # Type of delivery
+    '73812-0',  # Delivery complications
+})
+
+PREGNANCY_SNOMED_CODES = frozenset({
+    '77386006',  # Pregnant
+    '281050002', # Livebirth
+    '57797005',  # Termination of pregnancy
+    '169836001', # Gravida
+    '364325004', # Parity
+    '161732006', # Gravidity
+    '161733001', # Parity - delivered
+})
+
+PREGNANCY_CODES = PREGNANCY_LOINC_CODES | PREGNANCY_SNOMED_CODES
+
+# FHIR observation-category codes mapped to the sections they select
+CATEGORY_CODE_SECTIONS = {
+    'vital-signs': frozenset({VITAL_SIGNS}),
+    'social-history': frozenset({SOCIAL_HISTORY}),
+    'laboratory': frozenset({LABORATORY_RESULTS}),
+    'lab': frozenset({LABORATORY_RESULTS}),
+    'imaging': frozenset({LABORATORY_RESULTS}),
+    'exam': frozenset({PHYSICAL_FINDINGS}),
+    'physical-exam': frozenset({PHYSICAL_FINDINGS}),
+    'physical-finding': frozenset({PHYSICAL_FINDINGS}),
+}
+
+# LOINC code tables checked against Observation.code.coding
+LOINC_CODE_SECTIONS = {
+    VITAL_SIGNS: VITAL_SIGN_LOINC_CODES,
+    SOCIAL_HISTORY: SOCIAL_HISTORY_LOINC_CODES,
+    PHYSICAL_FINDINGS: PHYSICAL_EXAM_LOINC_CODES,
+}
+
+
+def _keyword_pattern(keywords: Iterable[str]) -> 're.Pattern[str]':
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+
+# Substrings matched against a category given as a plain string
+STRING_CATEGORY_PATTERNS = {
+    VITAL_SIGNS: _keyword_pattern(['vital']),
+    SOCIAL_HISTORY: _keyword_pattern(['social']),
+    LABORATORY_RESULTS: _keyword_pattern(['lab']),
+    PHYSICAL_FINDINGS: _keyword_pattern(['exam', 'physical']),
+    PREGNANCY_HISTORY: _keyword_pattern(['pregnancy', 'obstetric']),
+}
+
+# Keyword fallbacks matched against the Observation.code text
+CODE_KEYWORD_PATTERNS = {
+    VITAL_SIGNS: _keyword_pattern([
+        'blood pressure', 'systolic', 'diastolic', 'heart rate', 'pulse',
+        'temperature', 'respiratory rate', 'oxygen saturation', 'spo2',
+        'weight', 'height', 'bmi', 'body mass index'
+    ]),
+    SOCIAL_HISTORY: _keyword_pattern([
+        'smoking', 'tobacco', 'alcohol', 'occupation', 'employment',
+        'housing', 'living', 'marital', 'education', 'social'
+    ]),
+    LABORATORY_RESULTS: _keyword_pattern([
+        'blood', 'serum', 'plasma', 'urine', 'hemoglobin', 'glucose',
+        'cholesterol', 'creatinine', 'panel', 'group', 'test', 'lab',
+        'mri', 'ct', 'x-ray', 'ultrasound', 'imaging', 'scan', 'radiolog'
+    ]),
+    PHYSICAL_FINDINGS: _keyword_pattern([
+        'physical exam', 'examination', 'inspection', 'palpation',
+        'auscultation', 'percussion', 'abdomen', 'chest', 'skin',
+        'appearance', 'finding'
+    ]),
+}
+
+# Keyword fallback matched against the parsed observation name/text
+PREGNANCY_KEYWORD_PATTERN = _keyword_pattern([
+    'pregnancy', 'pregnant', 'gravida', 'para', 'gravidity', 'parity',
+    'delivery', 'obstetric', 'gestation', 'livebirth', 'stillbirth',
+    'abortion', 'miscarriage', 'termination of pregnancy'
+])
+
+PREGNANCY_CATEGORY_PATTERN = STRING_CATEGORY_PATTERNS[PREGNANCY_HISTORY]
+
+
+class FHIRObservationClassifier:
+    """
+    Classifies parsed or raw FHIR Observations into UI clinical sections
+
+    Matching rules are the same as the former per-section predicates of
+    FHIRBundleParser: category codes first, then LOINC/SNOMED code tables,
+    then keyword fallbacks. Every rule is evaluated from a single index of
+    the Observation's category and code codings.
+    """
+
+    def classify(self, observation: Dict[str, Any]) -> FrozenSet[str]:
+        """Return the set of sections the observation belongs to"""
+        sections = set()
+
+        # Category: either a list of CodeableConcepts or a plain string
+        category = observation.get('category', [])
+        category_display = []
+        if isinstance(category, str):
+            category_lower = category.lower()
+            for section, pattern in STRING_CATEGORY_PATTERNS.items():
+                if pattern.search(category_lower):
+                    sections.add(section)
+            if category_lower == 'imaging':
+                sections.add(LABORATORY_RESULTS)
+        elif isinstance(category, list):
+            for cat in category:
+                if not isinstance(cat, dict):
+                    continue
+                for coding in cat.get('coding', []):
+                    if not isinstance(coding, dict):
+                        continue
+                    sections.update(CATEGORY_CODE_SECTIONS.get(coding.get('code'), ()))
+                    display = coding.get('display', '')
+                    if display:
+                        category_display.append(display.lower())
+
+        if category_display and PREGNANCY_CATEGORY_PATTERN.search(' '.join(category_display)):
+            sections.add(PREGNANCY_HISTORY)
+
+        # Raw Observation.code: LOINC tables and keyword fallbacks
+        code = observation.get('code', {})
+        if isinstance(code, dict) and code:
+            code_text = [str(code.get('text', ''))]
+            for coding in code.get('coding') or []:
+                if not isinstance(coding, dict):
+                    continue
+                coding_code = coding.get('code')
+                if coding.get('system') == LOINC_SYSTEM:
+                    for section, codes in LOINC_CODE_SECTIONS.items():
+                        if coding_code in codes:
+                            sections.add(section)
+                code_text.append(str(coding_code or ''))
+                code_text.append(str(coding.get('display', '')))
+            code_text = ' '.join(code_text).lower()
+
+            for section, pattern in CODE_KEYWORD_PATTERNS.items():
+                if section not in sections and pattern.search(code_text):
+                    sections.add(section)
+
+        # Parsed observation fields: pregnancy code tables and keywords
+        if PREGNANCY_HISTORY not in sections:
+            code_data = observation.get('code_data', {})
+            if not isinstance(code_data, dict):
+                code_data = {}
+
+            if (
+                observation.get('observation_code', '') in PREGNANCY_CODES
+                or code_data.get('code', '') in PREGNANCY_CODES
+            ):
+                sections.add(PREGNANCY_HISTORY)
+            else:
+                pregnancy_text = '{} {}'.format(
+                    observation.get('observation_name', ''),
+                    code_data.get('text', ''),
+                ).lower()
+                if PREGNANCY_KEYWORD_PATTERN.search(pregnancy_text):
+                    sections.add(PREGNANCY_HISTORY)
+
+        return frozenset(sections)
+
+    def group(self, observations: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Classify each observation once and bucket it into every matching section"""
+        grouped = {section: [] for section in OBSERVATION_SECTIONS}
+        for observation in observations:
+            for section in self.classify(observation):
+                grouped[section].append(observation)
+        return grouped
+
+
+observation_classifier = FHIRObservationClassifier()
@@ -0,0 +1,324 @@
+"""
+Decode-once store for ORCD PDF attachments embedded in CDA documents
+
+The first request for a CDA document extracts its PDF attachments once and
+writes the decoded bytes to a local file, together with a manifest (index,
+hash, size, media type, byte offset) keyed by the hash of the CDA content.
+Later requests - including byte-range requests from PDF viewers - are served
+straight from that file with FileResponse, without parsing or decoding the
+CDA again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+
+from .clinical_pdf_service import ClinicalDocumentPDFService
+
+logger = logging.getLogger(__name__)
+
+# Defaults (overridable in settings)
+DEFAULT_CACHE_TTL_SECONDS = 60 * 60
+DEFAULT_MANIFEST_CACHE_SIZE = 64
+
+STREAM_BLOCK_SIZE = 64 * 1024
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class AttachmentNotFound(Exception):
+    """Raised when a requested attachment index does not exist"""
+
+
+class _RangeNotSatisfiable(Exception):
+    """A well-formed single byte range that lies outside the attachment"""
+
+
+class _ByteRangeReader:
+    """File-like reader limited to ``length`` bytes starting at ``offset``"""
+
+    def __init__(self, path: str, offset: int, length: int):
+        self._file = open(path, "rb")
+        self._file.seek(offset)
+        self._remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._file.close()
+
+
+class ORCDAttachmentStore:
+    """
+    File-backed cache of decoded ORCD PDF attachments
+
+    Manifests are kept in a small in-process LRU and on disk next to the
+    decoded bytes, so they survive across worker processes. Entries older
+    than ORCD_ATTACHMENT_CACHE_TTL seconds are removed when new documents
+    are stored.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or getattr(
+            settings,
+            "ORCD_ATTACHMENT_CACHE_DIR",
+            os.path.join(tempfile.gettempdir(), "ehealth_orcd_attachments"),
+        )
+        self.ttl = getattr(
+            settings, "ORCD_ATTACHMENT_CACHE_TTL", DEFAULT_CACHE_TTL_SECONDS
+        )
+        self.manifest_cache_size = getattr(
+            settings, "ORCD_MANIFEST_CACHE_SIZE", DEFAULT_MANIFEST_CACHE_SIZE
+        )
+        self._manifests: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.pdf_service = ClinicalDocumentPDFService()
+
+    # ------------------------------------------------------------------
+    # Manifest handling
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def content_hash(cda_content: str) -> str:
+        return hashlib.sha256(cda_content.encode("utf-8")).hexdigest()
+
+    def _paths(self, content_hash: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, content_hash)
+        return f"{base}.json", f"{base}.bin"
+
+    def get_manifest(self, cda_content: str) -> Dict:
+        """
+        Return the attachment manifest for a CDA document
+
+        Extracts and decodes the attachments only if no manifest exists for
+        this content yet.
+        """
+        content_hash = self.content_hash(cda_content)
+
+        with self._lock:
+            manifest = self._manifests.get(content_hash)
+            if manifest is not None:
+                self._manifests.move_to_end(content_hash)
+
+        if manifest is None or not os.path.exists(manifest["data_path"]):
+            manifest = self._load_manifest(content_hash)
+            if manifest is None:
+                manifest = self._build_manifest(content_hash, cda_content)
+            self._remember(content_hash, manifest)
+
+        return manifest
+
+    def get_attachments(self, cda_content: str) -> List[Dict]:
+        """Attachment metadata (without PDF bytes) for templates and listings"""
+        return self.get_manifest(cda_content)["attachments"]
+
+    def _remember(self, content_hash: str, manifest: Dict):
+        with self._lock:
+            self._manifests[content_hash] = manifest
+            self._manifests.move_to_end(content_hash)
+            while len(self._manifests) > self.manifest_cache_size:
+                self._manifests.popitem(last=False)
+
+    def _load_manifest(self, content_hash: str) -> Optional[Dict]:
+        manifest_path, data_path = self._paths(content_hash)
+        if not (os.path.exists(manifest_path) and os.path.exists(data_path)):
+            return None
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable ORCD manifest {content_hash}: {e}")
+            return None
+        manifest["data_path"] = data_path
+        return manifest
+
+    def _build_manifest(self, content_hash: str, cda_content: str) -> Dict:
+        pdf_attachments = self.pdf_service.extract_pdfs_from_xml(cda_content)
+
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        self._prune_expired()
+
+        manifest_path, data_path = self._paths(content_hash)
+        attachments = []
+        offset = 0
+
+        # Write to temporary files and rename, so concurrent readers never
+        # see a partially written store
+        fd, tmp_data_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".bin.tmp")
+        with os.fdopen(fd, "wb") as data_file:
+            for pdf_info in pdf_attachments:
+                pdf_data = pdf_info["data"]
+                data_file.write(pdf_data)
+                attachments.append(
+                    {
+                        "index": pdf_info["index"],
+                        "filename": pdf_info["filename"],
+                        "hash": hashlib.md5(pdf_data).hexdigest(),
+                        "size": pdf_info["size"],
+                        "media_type": pdf_info.get("media_type", "application/pdf"),
+                        "offset": offset,
+                    }
+                )
+                offset += len(pdf_data)
+        os.replace(tmp_data_path, data_path)
+
+        manifest = {"content_hash": content_hash, "attachments": attachments}
+        fd, tmp_manifest_path = tempfile.mkstemp(
+            dir=self.cache_dir, suffix=".json.tmp"
+        )
+        with os.fdopen(fd, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(tmp_manifest_path, manifest_path)
+
+        logger.info(
+            f"Stored {len(attachments)} ORCD attachment(s) ({offset} bytes) for CDA {content_hash[:12]}"
+        )
+        manifest["data_path"] = data_path
+        return manifest
+
+    def _prune_expired(self):
+        cutoff = time.time() - self.ttl
+        try:
+            entries = os.scandir(self.cache_dir)
+        except OSError:
+            return
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    continue
+
+    # ------------------------------------------------------------------
+    # HTTP responses
+    # ------------------------------------------------------------------
+
+    def get_attachment(self, manifest: Dict, attachment_index: int) -> Dict:
+        attachments = manifest["attachments"]
+        if attachment_index < 0 or attachment_index >= len(attachments):
+            raise AttachmentNotFound(attachment_index)
+        return attachments[attachment_index]
+
+    def read_attachment(self, manifest: Dict, attachment_index: int) -> bytes:
+        """Read the decoded bytes of one attachment"""
+        attachment = self.get_attachment(manifest, attachment_index)
+        reader = _ByteRangeReader(
+            manifest["data_path"], attachment["offset"], attachment["size"]
+        )
+        try:
+            return reader.read()
+        finally:
+            reader.close()
+
+    def serve(
+        self,
+        request,
+        manifest: Dict,
+        attachment_index: int,
+        filename: str,
+        disposition: str = "inline",
+    ) -> HttpResponse:
+        """
+        Stream one attachment with ETag validation and byte-range support
+
+        Raises:
+            AttachmentNotFound: If the manifest has no such attachment
+        """
+        attachment = self.get_attachment(manifest, attachment_index)
+        size = attachment["size"]
+        etag = f'"{attachment["hash"]}"'
+
+        if etag in _parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+            response = HttpResponse(status=304)
+            response["ETag"] = etag
+            return response
+
+        start, end = 0, size - 1
+        status = 200
+        range_header = request.META.get("HTTP_RANGE", "")
+        if_range = request.META.get("HTTP_IF_RANGE", "")
+        if range_header and (not if_range or if_range == etag):
+            try:
+                byte_range = _parse_range(range_header, size)
+            except _RangeNotSatisfiable:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{size}"
+                return response
+            # Malformed, multi-range and non-byte ranges are ignored
+            if byte_range is not None:
+                start, end = byte_range
+                status = 206
+
+        length = end - start + 1
+        response = FileResponse(
+            _ByteRangeReader(manifest["data_path"], attachment["offset"] + start, length),
+            status=status,
+            content_type=attachment["media_type"],
+            as_attachment=disposition == "attachment",
+            filename=filename,
+        )
+        response.block_size = STREAM_BLOCK_SIZE
+        response["Content-Length"] = str(length)
+        response["Accept-Ranges"] = "bytes"
+        response["ETag"] = etag
+        if status == 206:
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return response
+
+
+def _parse_etags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=start-end`` range
+
+    Returns None for a header that should be ignored: malformed, another
+    unit, or more than one range (RFC 9110 section 14.2).
+
+    Raises:
+        _RangeNotSatisfiable: If the range starts beyond the attachment
+    """
+    match = _RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start >= size:
+            raise _RangeNotSatisfiable()
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # Suffix range: the final N bytes
+        if int(last) == 0 or size == 0:
+            raise _RangeNotSatisfiable()
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        return None
+    return start, end
+
+
+orcd_attachment_store = ORCDAttachmentStore()
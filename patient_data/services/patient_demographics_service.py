@@ -72,6 +72,23 @@ class PatientDemographicsService:
                 logger.warning("No patientRole element found in CDA XML")
                 return self._create_empty_demographics()
             
+            return self.extract_from_patient_role(patient_role)
+            
+        except Exception as e:
+            logger.error(f"Error extracting patient demographics from CDA XML: {e}")
+            return self._create_empty_demographics()
+    
+    def extract_from_patient_role(self, patient_role: ET.Element) -> PatientDemographics:
+        """
+        Extract patient demographics from an already located CDA patientRole
+        
+        Args:
+            patient_role: recordTarget/patientRole element of a CDA document
+            
+        Returns:
+            PatientDemographics: Populated patient demographics object
+        """
+        try:
             # Extract patient identifiers
             identifiers = self._extract_cda_identifiers(patient_role)
             
@@ -5,11 +5,13 @@ Enhanced with FHIR integration for unified search across CDA and FHIR sources
 """
 
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable
 import logging
 import os
 import xml.etree.ElementTree as ET
 
+from .demographic_search import DemographicQuery, DemographicRecord
+
 logger = logging.getLogger(__name__)
 
 
@@ -454,11 +456,11 @@ class EUPatientSearchService:
                 
                 try:
                     # Import FHIR services (uses factory to get correct service)
-                    from eu_ncp_server.services.fhir_service_factory import get_fhir_service
+                    from eu_ncp_server.services.fhir_service_factory import get_fhir_service_singleton
                     from .fhir_bundle_parser import FHIRBundleParser
                     
                     # Get the configured FHIR service (Azure FHIR by default)
-                    fhir_service = get_fhir_service()
+                    fhir_service = get_fhir_service_singleton()
                     
                     # Search for patient documents (Compositions) - this is the key fix!
                     document_search_result = fhir_service.search_patient_documents(credentials.patient_id)
@@ -567,6 +569,20 @@ class EUPatientSearchService:
 
         return matches
 
+    def find_patients(
+        self, queries: Iterable[DemographicQuery]
+    ) -> List[List[DemographicRecord]]:
+        """
+        Resolve a batch of demographic queries against the local CDA index
+
+        Uses the normalized search keys built alongside the CDA index, so
+        no CDA files are read; returns the matching patients per query, in
+        query order.
+        """
+        from .cda_document_index import get_cda_indexer
+
+        return get_cda_indexer().get_search_index().search(queries)
+
     def get_patient_documents(
         self, patient_id: str, country_code: str
     ) -> List[Dict[str, Any]]:
@@ -11,6 +11,7 @@ Version: 1.0.0
 import logging
 from typing import Dict, List, Any
 from django.http import HttpRequest
+from .session_data_service import SessionDataService
 from .clinical_data_pipeline_manager import ClinicalSectionServiceInterface
 
 logger = logging.getLogger(__name__)
@@ -116,7 +117,7 @@ class PregnancyHistorySectionService(ClinicalSectionServiceInterface):
         session_key = f"patient_match_{session_id}"
         match_data = request.session.get(session_key, {})
         match_data['enhanced_pregnancy_history'] = enhanced_pregnancy
-        request.session[session_key] = match_data
+        SessionDataService.store_patient_match(request, session_id, match_data)
         request.session.modified = True
         
         logger.info(f"[PREGNANCY HISTORY SERVICE] Enhanced and stored {len(enhanced_pregnancy)} pregnancy records")
@@ -6,8 +6,8 @@ Dynamically renders CDA L3 sections as standardized healthcare tables
 import re
 import logging
 from typing import Dict, List, Any, Optional
-from bs4 import BeautifulSoup
 from translation_services.terminology_translator import TerminologyTranslatorCompat
+from ..utils.html_parsing import parse_html
 
 logger = logging.getLogger(__name__)
 
@@ -459,7 +459,7 @@ class PSTableRenderer:
 
             logger.info(f"Content HTML preview: {str(content_html)[:300]}")
 
-            soup = BeautifulSoup(content_html, "html.parser")
+            soup = parse_html(content_html)
 
             # Look for existing table structure in the section
             existing_tables = section.get("tables", [])
@@ -490,7 +490,7 @@ class PSTableRenderer:
             if isinstance(content_html, dict):
                 content_html = content_html.get("original", "")
 
-            soup = BeautifulSoup(content_html, "html.parser")
+            soup = parse_html(content_html)
 
             # Look for existing table structure in the section
             existing_tables = section.get("tables", [])
@@ -1302,7 +1302,7 @@ class PSTableRenderer:
             # Try to extract structure from content
             content_html = section.get("content", {}).get("original", "")
             if isinstance(content_html, str) and content_html.strip():
-                soup = BeautifulSoup(content_html, "html.parser")
+                soup = parse_html(content_html)
 
                 # Look for existing table in HTML
                 existing_table = soup.find("table")
@@ -1510,7 +1510,7 @@ class PSTableRenderer:
             logger.info(f"Parsing content HTML: {content_html[:500]}")
 
             if isinstance(content_html, str) and content_html.strip():
-                soup = BeautifulSoup(content_html, "html.parser")
+                soup = parse_html(content_html)
 
                 # Look for table elements in the content
                 tables = soup.find_all("table")
@@ -1612,7 +1612,7 @@ class PSTableRenderer:
             # Fallback: extract from HTML content or concatenated text
             content_html = section.get("content", {}).get("original", "")
             if isinstance(content_html, str):
-                soup = BeautifulSoup(content_html, "html.parser")
+                soup = parse_html(content_html)
                 rows = soup.find_all("tr")
 
                 if len(rows) > 1:  # Has header row
@@ -1807,8 +1807,7 @@ class PSTableRenderer:
 
         try:
             # Parse XML content to extract medication paragraphs
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(text, 'html.parser')
+            soup = parse_html(text)
             
             # Find all paragraph elements with medication data
             paragraphs = soup.find_all('paragraph') or soup.find_all('ns0:paragraph')
@@ -2597,9 +2596,7 @@ class PSTableRenderer:
             return str(cell_content) if cell_content else ""
 
         # Clean HTML tags for analysis (but preserve them in output)
-        from bs4 import BeautifulSoup
-
-        clean_text = BeautifulSoup(str(cell_content), "html.parser").get_text().strip()
+        clean_text = parse_html(str(cell_content)).get_text().strip()
 
         if not clean_text:
             return str(cell_content)
@@ -2678,7 +2675,7 @@ class PSTableRenderer:
             return problems
 
         try:
-            soup = BeautifulSoup(content_html, "html.parser")
+            soup = parse_html(content_html)
 
             # Look for table rows
             rows = soup.find_all("tr")
@@ -0,0 +1,122 @@
+"""
+Batched session cleanup
+
+Cleanup helpers used by the session management commands. Every helper
+selects rows with an indexed expiry predicate (Session.expire_date,
+PatientSession.expires_at, PatientDataCache.expires_at) and works through
+them in fixed-size batches, so memory use is bounded by the batch size and
+not by the number of sessions. All helpers stop early once an optional
+deadline has passed.
+"""
+
+import time
+from typing import Dict, Iterator, List, Optional
+
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+
+from patient_data.models import PatientDataCache, PatientSession
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Deadline:
+    """Wall-clock budget for a cleanup run; no limit if max_runtime is None"""
+
+    def __init__(self, max_runtime: Optional[float] = None):
+        self.expires = time.monotonic() + max_runtime if max_runtime else None
+
+    def reached(self) -> bool:
+        return self.expires is not None and time.monotonic() >= self.expires
+
+
+def iter_batches(queryset, batch_size: int, deadline: Optional[Deadline] = None) -> Iterator[List]:
+    """
+    Yield the rows of a queryset in primary key order, batch_size at a time
+
+    Uses keyset pagination (pk greater than the last row seen), so rows in
+    a batch can be deleted or modified before the next batch is fetched.
+    """
+    queryset = queryset.order_by("pk")
+    last_pk = None
+    while not (deadline and deadline.reached()):
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        last_pk = batch[-1].pk
+
+
+def _delete_in_batches(queryset, batch_size: int, deadline: Optional[Deadline]) -> int:
+    deleted = 0
+    model = queryset.model
+    while not (deadline and deadline.reached()):
+        pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            break
+        model.objects.filter(pk__in=pks).delete()
+        deleted += len(pks)
+    return deleted
+
+
+def delete_expired_sessions(
+    batch_size: int = DEFAULT_BATCH_SIZE, deadline: Optional[Deadline] = None
+) -> int:
+    """Delete expired Django sessions; returns the number deleted"""
+    return _delete_in_batches(
+        Session.objects.filter(expire_date__lt=timezone.now()), batch_size, deadline
+    )
+
+
+def expire_patient_sessions(
+    batch_size: int = DEFAULT_BATCH_SIZE, deadline: Optional[Deadline] = None
+) -> int:
+    """Mark active PatientSession rows past expires_at as expired"""
+    expired = 0
+    pending = PatientSession.objects.filter(
+        expires_at__lt=timezone.now(), is_active=True
+    )
+    while not (deadline and deadline.reached()):
+        pks = list(pending.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            break
+        PatientSession.objects.filter(pk__in=pks).update(
+            is_active=False, status="expired"
+        )
+        expired += len(pks)
+    return expired
+
+
+def delete_expired_cache_entries(
+    batch_size: int = DEFAULT_BATCH_SIZE, deadline: Optional[Deadline] = None
+) -> int:
+    """Delete PatientDataCache rows past expires_at"""
+    return _delete_in_batches(
+        PatientDataCache.objects.filter(expires_at__lt=timezone.now()),
+        batch_size,
+        deadline,
+    )
+
+
+def count_expired_records() -> Dict[str, int]:
+    """What cleanup_expired_records would change, without changing it"""
+    now = timezone.now()
+    return {
+        "patient_sessions": PatientSession.objects.filter(
+            expires_at__lt=now, is_active=True
+        ).count(),
+        "cache_entries": PatientDataCache.objects.filter(expires_at__lt=now).count(),
+    }
+
+
+def cleanup_expired_records(
+    batch_size: int = DEFAULT_BATCH_SIZE, deadline: Optional[Deadline] = None
+) -> Dict[str, int]:
+    """Expire patient sessions and purge expired cache entries"""
+    return {
+        "patient_sessions": expire_patient_sessions(batch_size, deadline),
+        "cache_entries": delete_expired_cache_entries(batch_size, deadline),
+    }
@@ -10,9 +10,16 @@ import logging
 from typing import Any, Dict, Optional, Tuple
 
 from django.contrib.sessions.models import Session
+from django.utils import timezone
+
+from patient_data.models import PatientMatchSessionIndex
+from patient_data.utils.request_profiling import span
 
 logger = logging.getLogger(__name__)
 
+# Session entry recording the match IDs indexed under the current session key
+INDEXED_MATCHES_KEY = "_patient_match_index"
+
 
 class SessionDataService:
     """
@@ -23,6 +30,7 @@ class SessionDataService:
     """
 
     @staticmethod
+    @span("session.lookup")
     def get_patient_data(
         request, session_id: str
     ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
@@ -76,37 +84,103 @@ class SessionDataService:
         except Session.DoesNotExist:
             debug_steps.append("✗ No database session with direct key found")
 
-        # Step 3: Search all database sessions for patient_match_{session_id}
+        # Step 3: Indexed lookup of the session holding patient_match_{session_id}
         debug_steps.append(
-            f"Step 3: Searching all database sessions for key '{session_key}'"
+            f"Step 3: Looking up indexed database session for key '{session_key}'"
         )
-        all_sessions = Session.objects.all()
-        sessions_checked = 0
-        sessions_with_errors = 0
-
-        for db_session in all_sessions:
-            try:
-                sessions_checked += 1
-                db_session_data = db_session.get_decoded()
-                if session_key in db_session_data:
-                    match_data = db_session_data[session_key]
-                    debug_steps.append(
-                        f"✓ Found patient data in database session after checking {sessions_checked} sessions"
-                    )
-                    return match_data, "\n".join(debug_steps)
-
-            except Exception as e:
-                sessions_with_errors += 1
-                # Skip corrupted sessions silently but track them
-                continue
+        match_data = SessionDataService.find_indexed_match_data(session_id)
 
-        debug_steps.append(
-            f"✗ Searched {sessions_checked} database sessions, {sessions_with_errors} had errors"
-        )
+        if match_data:
+            debug_steps.append(f"✓ Found patient data in indexed database session")
+            return match_data, "\n".join(debug_steps)
+
+        debug_steps.append("✗ No indexed database session holds this patient data")
         debug_steps.append("❌ No patient data found in any session")
 
         return None, "\n".join(debug_steps)
 
+    @staticmethod
+    def store_patient_match(request, session_id: str, match_data: Dict[str, Any]):
+        """
+        Store patient match data in the request session and index it.
+
+        Args:
+            request: Django request object with session
+            session_id: Patient session ID used in the patient_match_ key
+            match_data: Patient match data to store
+        """
+        request.session[f"patient_match_{session_id}"] = match_data
+        SessionDataService.index_patient_match(request.session, session_id)
+
+    @staticmethod
+    def index_patient_match(session, session_id: str):
+        """
+        Record which Django session holds patient_match_{session_id}.
+
+        New sessions are saved first so they have a session key to index.
+        The session remembers which matches it has indexed under its current
+        key, so storing the same match again costs no query until the key
+        changes. Indexing failures are logged and never block storing the
+        data.
+        """
+        try:
+            if not session.session_key:
+                session.save()
+
+            indexed = session.get(INDEXED_MATCHES_KEY, {})
+            if indexed.get(session_id) == session.session_key:
+                return
+
+            PatientMatchSessionIndex.objects.update_or_create(
+                match_id=session_id, defaults={"session_id": session.session_key}
+            )
+            session[INDEXED_MATCHES_KEY] = {**indexed, session_id: session.session_key}
+        except Exception as e:
+            logger.warning(f"Could not index patient match session {session_id}: {e}")
+
+    @staticmethod
+    def reindex_patient_matches(session):
+        """
+        Index every patient match held by a session under its current key.
+
+        Called after the session key rotates (cycle_key() on login): index
+        rows are deleted with the old session row while the data moves to
+        the new key.
+        """
+        for key in list(session.keys()):
+            if key.startswith("patient_match_"):
+                SessionDataService.index_patient_match(session, key[len("patient_match_"):])
+
+    @staticmethod
+    def find_indexed_match_data(session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve patient match data via the session index.
+
+        Performs a single indexed query for the owning, unexpired session and
+        decodes only that session.
+
+        Args:
+            session_id: Patient session ID to look up
+
+        Returns:
+            Patient data dictionary if found, None otherwise
+        """
+        entry = (
+            PatientMatchSessionIndex.objects.select_related("session")
+            .filter(match_id=session_id, session__expire_date__gt=timezone.now())
+            .first()
+        )
+        if entry is None:
+            return None
+
+        try:
+            session_data = entry.session.get_decoded()
+        except Exception as e:
+            logger.warning(f"Could not decode indexed session for {session_id}: {e}")
+            return None
+
+        return session_data.get(f"patient_match_{session_id}")
+
     @staticmethod
     def get_cda_content(
         match_data: Dict[str, Any], preferred_type: str = "L3"
@@ -0,0 +1,71 @@
+"""
+Process-wide tooltip registry
+
+All active tooltips are loaded with a single query and kept in memory, so
+tooltip template tags never query the database per tag, and unknown keys
+are answered from the same snapshot. The snapshot is tagged with the
+tooltip generation (see eu_ncp_server.services.cache_generation); saving or
+deleting a Tooltip bumps it (see signals.py), and every process sharing the
+cache reloads on its next lookup. With a process-local cache the bump only
+reaches the worker that made it, so other workers also reload once their
+snapshot is older than TOOLTIP_REGISTRY_LOCAL_CACHE_TIMEOUT seconds
+(default 60).
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from eu_ncp_server.services.cache_generation import CacheGeneration
+
+tooltip_generation = CacheGeneration(
+    "tooltip_registry:version", "TOOLTIP_REGISTRY_LOCAL_CACHE_TIMEOUT"
+)
+
+
+def invalidate_tooltips():
+    """Make every process sharing the cache reload its tooltip snapshot"""
+    tooltip_generation.bump()
+
+
+class TooltipRegistry:
+    """In-memory snapshot of active tooltips keyed by Tooltip.key"""
+
+    def __init__(self):
+        self._tooltips: Dict[str, Dict[str, str]] = {}
+        self._version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """Return {"content", "placement", "title"} for an active tooltip, or None"""
+        tooltip = self._snapshot().get(key)
+        return dict(tooltip) if tooltip is not None else None
+
+    def _is_current(self, version: int) -> bool:
+        if version != self._version:
+            return False
+        max_age = tooltip_generation.max_age()
+        return max_age is None or time.monotonic() - self._loaded_at < max_age
+
+    def _snapshot(self) -> Dict[str, Dict[str, str]]:
+        version = tooltip_generation.current()
+        if self._is_current(version):
+            return self._tooltips
+
+        with self._lock:
+            if not self._is_current(version):
+                from ..models import Tooltip
+
+                self._tooltips = {
+                    key: {"content": content, "placement": placement, "title": title}
+                    for key, content, placement, title in Tooltip.objects.filter(
+                        is_active=True
+                    ).values_list("key", "content", "placement", "title")
+                }
+                self._version = version
+                self._loaded_at = time.monotonic()
+            return self._tooltips
+
+
+tooltip_registry = TooltipRegistry()
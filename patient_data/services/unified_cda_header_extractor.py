@@ -0,0 +1,508 @@
+"""
+Unified CDA Header Extractor
+
+Single-pass extraction of the CDA header: patient demographics, author,
+custodian, legal authenticator, guardians and participant contacts.
+
+The header elements are direct children of ClinicalDocument, so they are
+located with one walk over those children (the structured body under
+<component> is never entered). Every field is then read from the located
+header subtrees, instead of each extractor re-parsing the document and
+running its own whole-document searches.
+
+CDAHeaderExtractor, CDAAdministrativeExtractor and the administrative
+strategies of EnhancedCDAXMLParser are adapters over this module.
+"""
+
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    from lxml import etree
+
+    LXML_AVAILABLE = True
+except ImportError:
+    # Fallback to ElementTree if lxml not available
+    import xml.etree.ElementTree as etree
+
+    LXML_AVAILABLE = False
+
+try:
+    from patient_data.services.patient_demographics_service import (
+        PatientDemographicsService,
+    )
+except ImportError:
+    PatientDemographicsService = None
+
+logger = logging.getLogger(__name__)
+
+HL7_NAMESPACE = "urn:hl7-org:v3"
+_HL7 = f"{{{HL7_NAMESPACE}}}"
+
+# Header children collected as lists (may repeat) or single elements
+_REPEATING_HEADER_ELEMENTS = {
+    "recordTarget": "record_targets",
+    "author": "authors",
+    "custodian": "custodians",
+    "legalAuthenticator": "legal_authenticators",
+    "participant": "participants",
+    "informant": "informants",
+    "documentationOf": "documentation_of",
+}
+_SINGLE_HEADER_ELEMENTS = {
+    "id": "document_id",
+    "setId": "set_id",
+    "versionNumber": "version_number",
+    "effectiveTime": "effective_time",
+    "title": "title",
+    "code": "code",
+}
+
+
+@dataclass
+class ContactInfo:
+    """Contact information structure"""
+    telecoms: List[Dict[str, str]]
+    addresses: List[Dict[str, str]]
+
+
+@dataclass
+class Person:
+    """Person information structure"""
+    given_name: str
+    family_name: str
+    full_name: str
+    title: str = ""
+    role: str = ""
+
+
+@dataclass
+class Organization:
+    """Organization information structure"""
+    name: str
+    contact_info: ContactInfo
+    identifiers: List[Dict[str, str]]
+
+
+@dataclass
+class AuthorInfo:
+    """Author information structure"""
+    person: Person
+    organization: Organization
+    contact_info: ContactInfo
+    timestamp: str = ""
+    service_event_signing_time: str = ""  # documentationOf/serviceEvent/effectiveTime/high
+
+
+@dataclass
+class CDAHeaderElements:
+    """Header elements of one CDA document, located in a single pass"""
+    root: Any
+    language_code: str = ""
+    document_id: Any = None
+    set_id: Any = None
+    version_number: Any = None
+    effective_time: Any = None
+    title: Any = None
+    code: Any = None
+    record_targets: List[Any] = field(default_factory=list)
+    authors: List[Any] = field(default_factory=list)
+    custodians: List[Any] = field(default_factory=list)
+    legal_authenticators: List[Any] = field(default_factory=list)
+    participants: List[Any] = field(default_factory=list)
+    informants: List[Any] = field(default_factory=list)
+    documentation_of: List[Any] = field(default_factory=list)
+    visited_elements: int = 0
+
+    @property
+    def patient_role(self):
+        for record_target in self.record_targets:
+            patient_role = record_target.find(f"{_HL7}patientRole")
+            if patient_role is not None:
+                return patient_role
+        return None
+
+    @property
+    def custodian_organization(self):
+        for custodian in self.custodians:
+            organization = custodian.find(f".//{_HL7}representedCustodianOrganization")
+            if organization is not None:
+                return organization
+        return None
+
+
+@dataclass
+class CDAHeaderData:
+    """Typed result of one header extraction"""
+    elements: CDAHeaderElements
+    demographics: Any = None  # PatientDemographics
+    patient_contact_info: Optional[ContactInfo] = None
+    author_hcp: Optional[AuthorInfo] = None
+    custodian_organization: Optional[Organization] = None
+    legal_authenticator: Optional[AuthorInfo] = None
+    guardians: List[Dict[str, Any]] = field(default_factory=list)
+    participants: List[Dict[str, Any]] = field(default_factory=list)
+    document_creation_date: str = ""
+    document_id: str = ""
+    document_title: str = ""
+
+
+def parse_cda(cda_xml: Union[str, bytes]):
+    """Parse CDA XML once, with lxml when available"""
+    if isinstance(cda_xml, str):
+        cda_xml = cda_xml.encode("utf-8")
+    if LXML_AVAILABLE:
+        # Large embedded attachments (L1 PDFs) exceed lxml's default limits
+        parser = etree.XMLParser(huge_tree=True)
+        return etree.fromstring(cda_xml, parser)
+    return etree.fromstring(cda_xml)
+
+
+def locate_header_elements(root) -> CDAHeaderElements:
+    """
+    Collect the CDA header elements with one walk over ClinicalDocument's
+    direct children. Works on both lxml and ElementTree trees.
+    """
+    document = root
+    if root.tag != f"{_HL7}ClinicalDocument":
+        # CDA wrapped in another document (e.g. a transport envelope)
+        document = next(root.iter(f"{_HL7}ClinicalDocument"), root)
+
+    elements = CDAHeaderElements(
+        root=document, language_code=document.get("languageCode", "")
+    )
+    for child in document:
+        elements.visited_elements += 1
+        tag = child.tag
+        if not isinstance(tag, str) or not tag.startswith(_HL7):
+            continue  # comments, processing instructions, extensions
+        local_name = tag[len(_HL7):]
+
+        if local_name == "component":
+            continue  # structured body - not part of the header
+
+        attribute = _REPEATING_HEADER_ELEMENTS.get(local_name)
+        if attribute:
+            getattr(elements, attribute).append(child)
+            continue
+
+        attribute = _SINGLE_HEADER_ELEMENTS.get(local_name)
+        if attribute and getattr(elements, attribute) is None:
+            setattr(elements, attribute, child)
+
+    return elements
+
+
+class UnifiedCDAHeaderExtractor:
+    """
+    Extracts every header field of a CDA document from one parsed tree
+
+    Accepts either XML content or an already parsed root element, so callers
+    that have parsed the document for other reasons never parse it twice.
+    """
+
+    def __init__(self):
+        self.demographics_service = (
+            PatientDemographicsService() if PatientDemographicsService else None
+        )
+
+    def extract(self, source) -> CDAHeaderData:
+        """
+        Extract the CDA header
+
+        Args:
+            source: CDA XML content (str/bytes) or a parsed root element
+
+        Returns:
+            CDAHeaderData with demographics, healthcare team and contacts
+        """
+        root = parse_cda(source) if isinstance(source, (str, bytes)) else source
+        elements = locate_header_elements(root)
+
+        header = CDAHeaderData(elements=elements)
+        header.demographics = self._extract_demographics(elements)
+        header.patient_contact_info = self._extract_patient_contact_info(elements)
+        header.author_hcp = self._extract_author(elements)
+        header.custodian_organization = self._extract_custodian(elements)
+        header.legal_authenticator = self._extract_legal_authenticator(elements)
+        header.guardians = self._extract_guardians(elements)
+        header.participants = self._extract_participants(elements)
+
+        if elements.effective_time is not None:
+            header.document_creation_date = elements.effective_time.get("value", "")
+        if elements.document_id is not None:
+            header.document_id = elements.document_id.get("extension", "")
+        if elements.title is not None and elements.title.text:
+            header.document_title = elements.title.text
+
+        return header
+
+    # ------------------------------------------------------------------
+    # Patient
+    # ------------------------------------------------------------------
+
+    def _extract_demographics(self, elements: CDAHeaderElements):
+        if not self.demographics_service:
+            return None
+        patient_role = elements.patient_role
+        if patient_role is None:
+            logger.warning("No patientRole element found in CDA header")
+            return None
+        return self.demographics_service.extract_from_patient_role(patient_role)
+
+    def _extract_patient_contact_info(
+        self, elements: CDAHeaderElements
+    ) -> Optional[ContactInfo]:
+        """
+        Extract the patient's own contact information from patientRole
+
+        Only direct children of patientRole are read, not nested guardian
+        contact information.
+        """
+        patient_role = elements.patient_role
+        if patient_role is None:
+            logger.info("[CDA HEADER] No patientRole found for patient contact extraction")
+            return None
+
+        telecoms = []
+        for telecom in patient_role.findall(f"{_HL7}telecom"):
+            value = telecom.get("value", "")
+            if value:
+                telecoms.append({"value": value, "use": telecom.get("use", "")})
+
+        addresses = []
+        for addr in patient_role.findall(f"{_HL7}addr"):
+            address_info = {}
+            for key, part in (
+                ("street", "streetAddressLine"),
+                ("city", "city"),
+                ("postal_code", "postalCode"),
+                ("country", "country"),
+            ):
+                part_elem = addr.find(f"{_HL7}{part}")
+                if part_elem is not None and part_elem.text:
+                    address_info[key] = part_elem.text
+            if address_info:
+                addresses.append(address_info)
+
+        logger.debug(
+            f"[CDA HEADER] Extracted patient contact info: {len(addresses)} addresses, {len(telecoms)} telecoms"
+        )
+        if telecoms or addresses:
+            return ContactInfo(telecoms=telecoms, addresses=addresses)
+        return None
+
+    # ------------------------------------------------------------------
+    # Healthcare team
+    # ------------------------------------------------------------------
+
+    def _extract_author(self, elements: CDAHeaderElements) -> Optional[AuthorInfo]:
+        """Extract the first author of the document"""
+        if not elements.authors:
+            return None
+        try:
+            return self._extract_assigned_person(elements.authors[0], role="Author")
+        except Exception as e:
+            logger.error(f"Error extracting author: {e}")
+            return None
+
+    def _extract_legal_authenticator(
+        self, elements: CDAHeaderElements
+    ) -> Optional[AuthorInfo]:
+        """Extract the legal authenticator and the service event signing time"""
+        if not elements.legal_authenticators:
+            return None
+        try:
+            authenticator = self._extract_assigned_person(
+                elements.legal_authenticators[0], role="Legal Authenticator"
+            )
+        except Exception as e:
+            logger.error(f"Error extracting legal authenticator: {e}")
+            return None
+
+        if authenticator:
+            authenticator.service_event_signing_time = (
+                self._extract_service_event_signing_time(elements)
+            )
+        return authenticator
+
+    def _extract_assigned_person(self, participation, role: str) -> Optional[AuthorInfo]:
+        """Shared reading of author/legalAuthenticator participations"""
+        person = participation.find(f".//{_HL7}assignedPerson")
+        if person is None:
+            return None
+
+        given_name, family_name = self._extract_person_name(person)
+        contact_info = self._extract_contact_info(participation)
+
+        organization = None
+        org = participation.find(f".//{_HL7}representedOrganization")
+        if org is not None:
+            org_contact = self._extract_contact_info(org)
+            # Contact details are often recorded on the assigned author/entity
+            # rather than on the organization itself
+            if not org_contact.telecoms and not org_contact.addresses:
+                org_contact = contact_info
+            organization = Organization(
+                name=self._first_text(org, "name"),
+                contact_info=org_contact,
+                identifiers=self._extract_identifiers(org),
+            )
+
+        time_elem = participation.find(f".//{_HL7}time")
+        timestamp = time_elem.get("value", "") if time_elem is not None else ""
+
+        return AuthorInfo(
+            person=Person(
+                given_name=given_name,
+                family_name=family_name,
+                full_name=f"{given_name} {family_name}".strip(),
+                title="",
+                role=role,
+            ),
+            organization=organization,
+            contact_info=contact_info,
+            timestamp=timestamp,
+        )
+
+    def _extract_custodian(self, elements: CDAHeaderElements) -> Optional[Organization]:
+        """Extract the custodian organization"""
+        custodian = elements.custodian_organization
+        if custodian is None:
+            return None
+        return Organization(
+            name=self._first_text(custodian, "name"),
+            contact_info=self._extract_contact_info(custodian),
+            identifiers=self._extract_identifiers(custodian),
+        )
+
+    def _extract_service_event_signing_time(self, elements: CDAHeaderElements) -> str:
+        """documentationOf/serviceEvent/effectiveTime/high/@value"""
+        for documentation_of in elements.documentation_of:
+            high = documentation_of.find(
+                f"{_HL7}serviceEvent/{_HL7}effectiveTime/{_HL7}high"
+            )
+            if high is not None and high.get("value"):
+                return high.get("value")
+        return ""
+
+    # ------------------------------------------------------------------
+    # Guardians and contacts
+    # ------------------------------------------------------------------
+
+    def _extract_guardians(self, elements: CDAHeaderElements) -> List[Dict[str, Any]]:
+        """Guardians under the patient and RESP participants with a GUAR entity"""
+        guardians = []
+
+        for record_target in elements.record_targets:
+            for patient in record_target.iter(f"{_HL7}patient"):
+                for guardian in patient.iter(f"{_HL7}guardian"):
+                    guardian_info = self._extract_related_person(
+                        guardian, guardian.find(f".//{_HL7}guardianPerson"), "Guardian"
+                    )
+                    if guardian_info:
+                        guardians.append(guardian_info)
+
+        for participant in elements.participants:
+            if participant.get("typeCode", "") != "RESP":
+                continue
+            for entity in participant.iter(f"{_HL7}associatedEntity"):
+                if entity.get("classCode", "") == "GUAR":
+                    guardian_info = self._extract_related_person(
+                        entity, entity.find(f".//{_HL7}associatedPerson"), "Guardian"
+                    )
+                    if guardian_info:
+                        guardians.append(guardian_info)
+
+        return guardians
+
+    def _extract_participants(self, elements: CDAHeaderElements) -> List[Dict[str, Any]]:
+        """Header participants (emergency contacts, next of kin), excluding guardians"""
+        participants = []
+
+        for participant in elements.participants:
+            entity = participant.find(f".//{_HL7}associatedEntity")
+            class_code = entity.get("classCode", "") if entity is not None else ""
+            if participant.get("typeCode", "") == "RESP" and class_code == "GUAR":
+                continue  # Guardian, extracted separately
+
+            role = ""
+            if entity is not None:
+                code_elem = entity.find(f".//{_HL7}code")
+                if code_elem is not None:
+                    role = code_elem.get("code", "")
+
+            participant_info = self._extract_related_person(
+                participant, participant.find(f".//{_HL7}associatedPerson"), role
+            )
+            if participant_info:
+                participants.append(participant_info)
+
+        return participants
+
+    def _extract_related_person(self, element, person, role: str) -> Optional[Dict[str, Any]]:
+        """Template-ready dict for a guardian or participant person"""
+        if person is None:
+            return None
+        given_name, family_name = self._extract_person_name(person)
+        return {
+            "given_name": given_name,
+            "family_name": family_name,
+            "full_name": f"{given_name} {family_name}".strip(),
+            "role": role,
+            "relationship_code": role,  # Template compatibility
+            "contact_info": asdict(self._extract_contact_info(element)),
+        }
+
+    # ------------------------------------------------------------------
+    # Element helpers
+    # ------------------------------------------------------------------
+
+    def _first_text(self, element, local_name: str) -> str:
+        found = element.find(f".//{_HL7}{local_name}")
+        return (found.text or "") if found is not None else ""
+
+    def _extract_person_name(self, person) -> tuple:
+        """Given and family name from a person element"""
+        name = person.find(f".//{_HL7}name")
+        if name is None:
+            return "", ""
+        return self._first_text(name, "given"), self._first_text(name, "family")
+
+    def _extract_contact_info(self, element) -> ContactInfo:
+        """Addresses and telecoms anywhere below an element"""
+        telecoms = []
+        for telecom in element.iter(f"{_HL7}telecom"):
+            value = telecom.get("value", "")
+            if value:
+                telecoms.append({"value": value, "use": telecom.get("use", "")})
+
+        addresses = []
+        for addr in element.iter(f"{_HL7}addr"):
+            address_info = {}
+            for key, part in (
+                ("street", "streetAddressLine"),
+                ("city", "city"),
+                ("postal_code", "postalCode"),
+                ("country", "country"),
+            ):
+                part_elem = addr.find(f".//{_HL7}{part}")
+                if part_elem is not None:
+                    address_info[key] = part_elem.text or ""
+            if address_info:
+                addresses.append(address_info)
+
+        return ContactInfo(telecoms=telecoms, addresses=addresses)
+
+    def _extract_identifiers(self, element) -> List[Dict[str, str]]:
+        identifiers = []
+        for id_elem in element.iter(f"{_HL7}id"):
+            root = id_elem.get("root", "")
+            extension = id_elem.get("extension", "")
+            if root or extension:
+                identifiers.append({"root": root, "extension": extension})
+        return identifiers
+
+
+unified_header_extractor = UnifiedCDAHeaderExtractor()
@@ -0,0 +1,120 @@
+"""
+Compiled XML Schema and XSLT Artefacts
+
+Compiling an XSD or an XSLT stylesheet costs far more than applying it, so
+compiled artefacts are cached per file and file mtime and reused across
+documents and requests. The file is resolved from the country and document
+type (a country subdirectory overrides the shared file), so a shared file
+compiles once for every country that uses it.
+
+lxml XMLSchema and XSLT objects keep per-call state (their error_log) and
+must not be applied by two threads at once, so each cached artefact is a
+small pool of compiled copies: a thread checks one out, applies it and
+returns it. A copy is only compiled when every existing copy is in use,
+and a changed file is recompiled on its next checkout.
+"""
+
+import logging
+import os
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Defaults (overridable in settings)
+# Idle compiled copies kept per artefact
+DEFAULT_POOL_SIZE = 4
+
+
+def compile_schema(path: str) -> etree.XMLSchema:
+    # Parsed from the file path so relative xs:include/xs:import resolve
+    return etree.XMLSchema(etree.parse(path, etree.XMLParser(no_network=True)))
+
+
+def compile_xslt(path: str) -> etree.XSLT:
+    return etree.XSLT(
+        etree.parse(path, etree.XMLParser(no_network=True)),
+        access_control=etree.XSLTAccessControl.DENY_ALL,
+    )
+
+
+def parse_document(content) -> etree._Element:
+    """Parse an XML document without entity expansion or network access"""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    parser = etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)
+    return etree.fromstring(content, parser)
+
+
+class _ArtefactPool:
+    """Compiled copies of one artefact file at one mtime"""
+
+    __slots__ = ("path", "mtime_ns", "compile", "idle", "lock")
+
+    def __init__(self, path: str, mtime_ns: int, compile: Callable):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.compile = compile
+        self.idle: List = []
+        self.lock = Lock()
+
+
+class XMLArtefactCache:
+    """Process-wide cache of compiled XML Schemas and XSLT stylesheets"""
+
+    COMPILERS = {"schema": compile_schema, "xslt": compile_xslt}
+
+    def __init__(self):
+        self._pools: Dict[Tuple[str, str], _ArtefactPool] = {}
+        self._lock = Lock()
+        # Number of compilations performed, for monitoring and benchmarks
+        self.compilations = 0
+
+    @property
+    def pool_size(self) -> int:
+        return getattr(settings, "EADC_ARTEFACT_POOL_SIZE", DEFAULT_POOL_SIZE)
+
+    @contextmanager
+    def checkout(self, kind: str, path: str) -> Iterator[Optional[object]]:
+        """
+        Check out the compiled artefact ("schema" or "xslt") for a file
+
+        Yields None when the file does not exist.
+        """
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            yield None
+            return
+
+        with self._lock:
+            pool = self._pools.get((kind, path))
+            if pool is None or pool.mtime_ns != mtime_ns:
+                pool = _ArtefactPool(path, mtime_ns, self.COMPILERS[kind])
+                self._pools[(kind, path)] = pool
+
+        with pool.lock:
+            compiled = pool.idle.pop() if pool.idle else None
+        if compiled is None:
+            compiled = pool.compile(path)
+            with self._lock:
+                self.compilations += 1
+            logger.debug(f"Compiled {kind} {path}")
+
+        try:
+            yield compiled
+        finally:
+            with pool.lock:
+                if len(pool.idle) < self.pool_size:
+                    pool.idle.append(compiled)
+
+    def clear(self):
+        with self._lock:
+            self._pools.clear()
+
+
+xml_artefacts = XMLArtefactCache()
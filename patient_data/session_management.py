@@ -93,7 +93,10 @@ class DevelopmentSessionManager:
             "has_l3": True,
         }
 
+        from patient_data.services.session_data_service import SessionDataService
+
         session[f"patient_match_{patient_id}"] = patient_data
+        SessionDataService.index_patient_match(session, patient_id)
         session.save()
 
         return session.session_key
@@ -125,9 +128,15 @@ class DevelopmentSessionManager:
 
         from django.contrib.sessions.models import Session
 
+        from .services.session_cleanup import iter_batches
+
         sessions = {}
 
-        for session_obj in Session.objects.all():
+        for session_obj in (
+            session_obj
+            for batch in iter_batches(Session.objects.all(), 1000)
+            for session_obj in batch
+        ):
             try:
                 session_data = session_obj.get_decoded()
                 patient_keys = [
@@ -0,0 +1,59 @@
+"""
+Patient data model signal handlers
+
+Saving or deleting a Tooltip invalidates the in-memory tooltip registry
+once the change is committed, so no worker reloads the old rows under the
+new generation.
+Medication display models are memoized per request and dropped when a
+request starts or finishes. Logging in rotates the session key, so the
+patient match index is re-pointed at the new session.
+"""
+
+from django.contrib.auth.signals import user_logged_in
+from django.core.signals import request_finished, request_started
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .models import Tooltip
+from .services.medication_display import clear_medication_displays
+from .services.session_data_service import SessionDataService
+from .services.tooltip_registry import invalidate_tooltips
+
+
+def invalidate_tooltip_registry(sender, **kwargs):
+    transaction.on_commit(invalidate_tooltips, using=kwargs.get("using"))
+
+
+post_save.connect(
+    invalidate_tooltip_registry,
+    sender=Tooltip,
+    dispatch_uid="tooltip_registry_save",
+)
+post_delete.connect(
+    invalidate_tooltip_registry,
+    sender=Tooltip,
+    dispatch_uid="tooltip_registry_delete",
+)
+
+
+def reset_medication_displays(sender, **kwargs):
+    clear_medication_displays()
+
+
+request_started.connect(
+    reset_medication_displays, dispatch_uid="medication_display_request_started"
+)
+request_finished.connect(
+    reset_medication_displays, dispatch_uid="medication_display_request_finished"
+)
+
+
+def reindex_patient_match_session(sender, request, **kwargs):
+    session = getattr(request, "session", None)
+    if session is not None:
+        SessionDataService.reindex_patient_matches(session)
+
+
+user_logged_in.connect(
+    reindex_patient_match_session, dispatch_uid="patient_match_index_login"
+)
@@ -7,6 +7,8 @@ import re
 
 from django import template
 
+from patient_data.utils.date_engine import format_date
+
 register = template.Library()
 
 
@@ -103,15 +105,9 @@ def clean_date_format(date_value):
     if re.match(r"^\d{1,2}/\d{1,2}/\d{4}$", date_str):
         return date_str
 
-    # If it's in ISO format, convert it
-    if re.match(r"^\d{4}-\d{2}-\d{2}", date_str):
-        try:
-            from datetime import datetime
-
-            parsed_date = datetime.strptime(date_str[:10], "%Y-%m-%d")
-            return parsed_date.strftime("%d/%m/%Y")
-        except:
-            pass
+    formatted = format_date(date_str, "dmy")
+    if formatted:
+        return formatted
 
     # If it's in another format, try to extract just the date part
     date_match = re.search(r"(\d{1,2}[/-]\d{1,2}[/-]\d{4})", date_str)
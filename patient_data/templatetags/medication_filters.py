@@ -8,9 +8,36 @@ import logging
 from django import template
 from django.utils.safestring import mark_safe
 
+from ..services.medication_display import friendly_route_name, medication_display
+
 logger = logging.getLogger(__name__)
 register = template.Library()
 
+# Map dose unit codes to readable units
+DOSE_UNIT_NAMES = {
+    '1': 'unit(s)',
+    'tablet': 'tablet(s)',
+    'capsule': 'capsule(s)',
+    'ml': 'mL',
+    'mg': 'mg',
+    'mcg': 'mcg',
+    'iu': 'IU'
+}
+
+SMART_SCHEDULE_PATTERNS = (
+    (re.compile(r"(\d+)\s*per\s*day"), lambda m: f"{m.group(1)} per day"),
+    (re.compile(r"every\s*(\d+)\s*(hour|hours|h)"), lambda m: f"Every {m.group(1)} {m.group(2)}"),
+    (re.compile(r"(\d+)\s*times?\s*daily"), lambda m: f"{m.group(1)} times daily"),
+    (re.compile(r"once\s*daily"), lambda m: "Once daily"),
+    (re.compile(r"twice\s*daily"), lambda m: "Twice daily"),
+)
+
+# Translation artifacts removed by clean_medication_text
+TRANSLATION_ARTIFACT = re.compile(r'\s*Translation\s*:\s*')
+CAS_ARTIFACT = re.compile(r'\s*\{CAS:\s*[^}]+\}\s*')
+INGREDIENT_NAME_ARTIFACT = re.compile(r'\s*\(Ingredient name\s*:\s*([^)]+)\)')
+WHITESPACE = re.compile(r'\s+')
+
 
 @register.filter
 def count_valid_medications(medications):
@@ -77,57 +104,13 @@ def filter_valid_medications(medications):
 @register.filter
 def extract_strength(medication_name):
     """Extract strength information from medication name"""
-    if not medication_name:
-        return ""
-    
-    # Patterns to match strength information
-    strength_patterns = [
-        r"(\d+\.?\d*)\s*(mg|mcg|µg|g|IU|units?|ml|mL)(?:/\s*(ml|mL|unit))?",
-        r"(\d+\.?\d*)\s*\[?(IU|units?)\]?",
-        r"(\d+\.?\d*)\s*(microgram|milligram|gram)",
-    ]
-    
-    for pattern in strength_patterns:
-        match = re.search(pattern, medication_name, re.IGNORECASE)
-        if match:
-            value = match.group(1)
-            unit = match.group(2)
-            per_unit = match.group(3) if len(match.groups()) > 2 and match.group(3) else ""
-            
-            if per_unit:
-                return f"{value} {unit}/{per_unit}"
-            else:
-                return f"{value} {unit}"
-    
-    return ""
+    return medication_display(medication_name).strength
 
 
 @register.filter
 def extract_brand_name(medication_name):
     """Extract brand name from medication name"""
-    if not medication_name:
-        return ""
-    
-    # For simple medication names, return the name as the brand
-    medication_name = medication_name.strip()
-    
-    # Extract brand name from medication name using patterns only
-    # No hardcoded brand mappings - use actual data from CDA
-    name_lower = medication_name.lower()
-    
-    # Pattern to extract brand name before colon or first word if all caps
-    brand_patterns = [
-        r"^([A-Z][a-zA-Z]+)\s*:",  # "Eutirox :"
-        r"^([A-Z][A-Z]+)(?:\s|$)",  # "VIREAD"
-        r"^([A-Z][a-zA-Z]+)(?=\s+[a-z])",  # "Lantus insulin"
-    ]
-    
-    for pattern in brand_patterns:
-        match = re.search(pattern, medication_name.strip())
-        if match:
-            return match.group(1)
-    
-    return ""
+    return medication_display(medication_name).brand_name
 
 
 @register.filter  
@@ -135,143 +118,7 @@ def extract_active_ingredient(medication):
     """Extract active ingredient from medication name or object using multiple strategies"""
     if not medication:
         return ""
-    
-    # Extract medication name from various possible sources
-    medication_name = ""
-    if isinstance(medication, dict):
-        # Try common medication name fields from ComprehensiveClinicalDataService
-        for key in ['medication_name', 'substance_name', 'substance_display_name', 'title', 'name', 'drug_name']:
-            if medication.get(key):
-                medication_name = str(medication[key])
-                break
-        
-        # NEW: Check nested data structure if no direct name found
-        if not medication_name and 'data' in medication and 'original_fields' in medication['data']:
-            original_fields = medication['data']['original_fields']
-            for key in ['medication_name', 'substance_name', 'substance_display_name', 'title', 'name', 'drug_name']:
-                if original_fields.get(key):
-                    medication_name = str(original_fields[key])
-                    break
-        
-        # NEW: FALLBACK for Mario's session - extract from CDA table data we know exists
-        if not medication_name and 'data' in medication:
-            route_display = medication['data'].get('route_display', '')
-            # We know from the CDA logs that there are 2 medications with "Oral use" route:
-            # "ASPIRIN 75mg Enteric-coated (EC) tablet, Oral use"  
-            # "CLARITHROMYCIN 250mg Tablet, Oral use"
-            if route_display == 'Oral use':
-                # For now, alternate between the two known medications
-                # This is a temporary solution until we fix the CDA parsing
-                import hashlib
-                med_hash = hashlib.md5(str(medication).encode()).hexdigest()
-                if int(med_hash, 16) % 2 == 0:
-                    medication_name = "ASPIRIN 75mg Enteric-coated tablet"
-                else:
-                    medication_name = "CLARITHROMYCIN 250mg Tablet"
-                    
-    elif hasattr(medication, 'name'):
-        name_attr = getattr(medication, 'name', '')
-        if callable(name_attr):
-            try:
-                medication_name = str(name_attr()) or ''
-            except:
-                medication_name = ''
-        else:
-            medication_name = str(name_attr) or ''
-    elif hasattr(medication, 'title'):
-        title_attr = getattr(medication, 'title', '')
-        if callable(title_attr):
-            try:
-                medication_name = str(title_attr()) or ''
-            except:
-                medication_name = ''
-        else:
-            medication_name = str(title_attr) or ''
-    elif isinstance(medication, str):
-        medication_name = medication
-    else:
-        # Try to get name from object attributes
-        for attr in ['name', 'title', 'medication_name', 'drug_name']:
-            if hasattr(medication, attr):
-                val = getattr(medication, attr, '')
-                if callable(val):
-                    try:
-                        val = val()
-                    except:
-                        continue
-                if val:
-                    medication_name = str(val)
-                    break
-    
-    if not medication_name:
-        return ""
-    
-    # Strategy 1: Try to get active ingredient from medication data structure first
-    if isinstance(medication, dict):
-        # Check for extracted active ingredient data
-        if medication.get('data', {}).get('ingredient_display'):
-            return medication['data']['ingredient_display']
-        
-        if medication.get('active_ingredient', {}).get('display_name'):
-            return medication['active_ingredient']['display_name']
-        
-        if medication.get('ingredient_display'):
-            return medication['ingredient_display']
-    
-    # Strategy 2: Check object attributes for extracted data
-    if hasattr(medication, 'active_ingredient'):
-        if hasattr(medication.active_ingredient, 'display_name'):
-            return medication.active_ingredient.display_name
-    
-    if hasattr(medication, 'ingredient_display'):
-        return medication.ingredient_display
-    
-    # Ensure medication_name is a string before proceeding
-    if not isinstance(medication_name, str):
-        if callable(medication_name):
-            try:
-                medication_name = str(medication_name())
-            except:
-                return ""
-        else:
-            medication_name = str(medication_name)
-    
-    name_lower = medication_name.lower().strip()
-    
-    # Strategy 3: Extract active ingredient from medication name using patterns
-    # Note: This should only be used as a last resort when CDA parsing fails
-    import re
-    
-    # Clean up the medication name to extract the active ingredient
-    cleaned_name = medication_name
-    
-    # Remove dosage information (e.g., "75mg", "250mg")
-    cleaned_name = re.sub(r'\b\d+(\.\d+)?\s*(mg|g|ml|mcg|µg|iu|units?)\b', '', cleaned_name, flags=re.IGNORECASE)
-    
-    # Remove form information (tablet, capsule, etc.)
-    cleaned_name = re.sub(r'\b(tablet|capsule|cap|tab|syrup|solution|injection|cream|ointment|gel)\b', '', cleaned_name, flags=re.IGNORECASE)
-    
-    # Remove route information
-    cleaned_name = re.sub(r'\b(oral use|topical|intravenous|intramuscular|subcutaneous)\b', '', cleaned_name, flags=re.IGNORECASE)
-    
-    # Remove extra text like "Enteric-coated (EC)"
-    cleaned_name = re.sub(r'\b(enteric-coated|ec|sr|xl|mr|modified-release|sustained-release)\b', '', cleaned_name, flags=re.IGNORECASE)
-    
-    # Clean up extra spaces and punctuation
-    cleaned_name = re.sub(r'[(),\-]+', ' ', cleaned_name)
-    cleaned_name = re.sub(r'\s+', ' ', cleaned_name).strip()
-    
-    # Strategy 3: If there's a colon, everything after it is usually the active ingredient
-    if ":" in medication_name:
-        parts = medication_name.split(":", 1)
-        if len(parts) > 1:
-            ingredient = parts[1].strip()
-            # Remove strength information from ingredient
-            ingredient = re.sub(r"\d+\.?\d*\s*(mg|mcg|µg|g|IU|units?|ml|mL).*$", "", ingredient, flags=re.IGNORECASE)
-            return ingredient.strip()
-    
-    # Return cleaned name if we have something, otherwise empty string
-    return cleaned_name if cleaned_name else ""
+    return medication_display(medication).active_ingredient
 
 
 @register.filter
@@ -279,135 +126,11 @@ def smart_dose_form(medication, route=None):
     """Intelligently determine dose form from medication data"""
     if not medication:
         return "Form not specified"
-    
-    # Extract medication name from various possible attributes
-    medication_name = ""
-    if isinstance(medication, dict):
-        # Try common medication name fields from ComprehensiveClinicalDataService
-        for key in ['medication_name', 'substance_name', 'substance_display_name', 'title', 'name', 'drug_name']:
-            if medication.get(key):
-                medication_name = str(medication[key])
-                break
-        
-        # NEW: Check nested data structure if no direct name found
-        if not medication_name and 'data' in medication and 'original_fields' in medication['data']:
-            original_fields = medication['data']['original_fields']
-            for key in ['medication_name', 'substance_name', 'substance_display_name', 'title', 'name', 'drug_name']:
-                if original_fields.get(key):
-                    medication_name = str(original_fields[key])
-                    break
-        
-        # NEW: FALLBACK for Mario's session - extract from CDA table data we know exists
-        if not medication_name and 'data' in medication:
-            route_display = medication['data'].get('route_display', '')
-            # We know from the CDA logs that there are 2 medications with "Oral use" route:
-            # "ASPIRIN 75mg Enteric-coated (EC) tablet, Oral use"  
-            # "CLARITHROMYCIN 250mg Tablet, Oral use"
-            if route_display == 'Oral use':
-                # For now, alternate between the two known medications
-                # This is a temporary solution until we fix the CDA parsing
-                import hashlib
-                med_hash = hashlib.md5(str(medication).encode()).hexdigest()
-                if int(med_hash, 16) % 2 == 0:
-                    medication_name = "ASPIRIN 75mg Enteric-coated tablet"
-                else:
-                    medication_name = "CLARITHROMYCIN 250mg Tablet"
-                    
-    elif hasattr(medication, 'name'):
-        medication_name = getattr(medication, 'name', '') or ''
-    elif hasattr(medication, 'title'):
-        medication_name = getattr(medication, 'title', '') or ''
-    elif isinstance(medication, str):
-        medication_name = medication
-    else:
-        # Try to get name from object attributes
-        for attr in ['name', 'title', 'medication_name', 'drug_name']:
-            if hasattr(medication, attr):
-                val = getattr(medication, attr, '')
-                if val:
-                    medication_name = str(val)
-                    break
-    
-    if not medication_name:
-        return "Form not specified"
-    
+
     route_name = ""
-    
     if route and hasattr(route, 'displayName'):
         route_name = route.displayName or ''
-    
-    # Check medication name for dose form clues
-    name_lower = medication_name.lower()
-    
-    # First try to get dose form from extracted medication data
-    if isinstance(medication, dict):
-        # Check for extracted pharmaceutical form data
-        if medication.get('data', {}).get('pharmaceutical_form'):
-            return medication['data']['pharmaceutical_form']
-        
-        if medication.get('pharmaceutical_form', {}).get('displayName'):
-            return medication['pharmaceutical_form']['displayName']
-        
-        if medication.get('form', {}).get('displayName'):
-            return medication['form']['displayName']
-        
-        if medication.get('dose_form'):
-            return medication['dose_form']
-    
-    # Check object attributes for extracted data
-    if hasattr(medication, 'pharmaceutical_form'):
-        if hasattr(medication.pharmaceutical_form, 'displayName'):
-            return medication.pharmaceutical_form.displayName
-    
-    if hasattr(medication, 'form'):
-        if hasattr(medication.form, 'displayName'):
-            return medication.form.displayName
-    
-    # If no extracted data available, try to infer from medication name patterns
-    # Note: This should only be used as a last resort when CDA parsing fails
-    
-    # Check medication name for dose form clues
-    if any(word in name_lower for word in ['pen', 'injection', 'injectable']):
-        if 'pen' in name_lower or 'pre-filled' in name_lower:
-            return "Pre-filled pen"
-        else:
-            return "Solution for injection"
-    
-    # Tablet forms
-    if any(word in name_lower for word in ['tablet', 'tab']):
-        if 'enteric-coated' in name_lower or 'enteric coated' in name_lower:
-            return "Enteric-coated tablet"
-        elif 'film-coated' in name_lower or 'coated' in name_lower:
-            return "Film-coated tablet"
-        elif 'prolonged-release' in name_lower or 'extended-release' in name_lower:
-            return "Prolonged-release tablet"
-        elif 'modified-release' in name_lower:
-            return "Modified-release tablet"
-        else:
-            return "Tablet"
-    
-    # Capsule forms
-    if 'capsule' in name_lower:
-        return "Capsule"
-    
-    # Solution forms
-    if any(word in name_lower for word in ['solution', 'liquid', 'syrup']):
-        if 'nebuliser' in name_lower or 'nebulizer' in name_lower:
-            return "Nebuliser solution"
-        else:
-            return "Oral solution"
-    
-    # Check route for additional clues
-    if route_name:
-        route_lower = route_name.lower()
-        if 'subcutaneous' in route_lower or 'injection' in route_lower:
-            return "Solution for injection"
-        elif 'oral' in route_lower:
-            return "Tablet"  # Default for oral use
-        elif 'inhalation' in route_lower:
-            return "Inhalation solution"
-    
-    return "Form not specified"
+    return medication_display(medication).dose_form_for_route(route_name)
 
 
 @register.filter
@@ -462,18 +185,7 @@ def smart_dose_quantity(dose, medication=""):
         # Clean up common unit variations
         unit_clean = dose_unit.replace('[', '').replace(']', '')
         
-        # Map unit codes to readable units
-        unit_mapping = {
-            '1': 'unit(s)',
-            'tablet': 'tablet(s)',
-            'capsule': 'capsule(s)',
-            'ml': 'mL',
-            'mg': 'mg',
-            'mcg': 'mcg',
-            'iu': 'IU'
-        }
-        
-        readable_unit = unit_mapping.get(unit_clean.lower(), unit_clean)
+        readable_unit = DOSE_UNIT_NAMES.get(unit_clean.lower(), unit_clean)
         return f"{dose_value} {readable_unit}"
     
     # Fallback
@@ -521,122 +233,7 @@ def extract_dosage_schedule(medication):
     """
     if not medication:
         return "Schedule not specified"
-    
-    # Strategy 1: Check for direct frequency display fields
-    if isinstance(medication, dict):
-        # Check data structure first
-        if medication.get('data', {}).get('frequency_display'):
-            return medication['data']['frequency_display']
-        
-        # Check for enhanced period information first
-        if medication.get('data', {}).get('period_info'):
-            period_info = medication['data']['period_info']
-            if isinstance(period_info, dict):
-                return period_info.get('period_display', '')
-        
-        if medication.get('data', {}).get('period'):
-            return medication['data']['period']
-        
-        # Check direct fields
-        if medication.get('frequency_display'):
-            return medication['frequency_display']
-        
-        # Check for enhanced period_info at top level
-        if medication.get('period_info'):
-            period_info = medication['period_info']
-            if isinstance(period_info, dict):
-                return period_info.get('period_display', '')
-        
-        if medication.get('period'):
-            return medication['period']
-        
-        if medication.get('frequency'):
-            return medication['frequency']
-    
-    # Strategy 2: Check object attributes
-    if hasattr(medication, 'data'):
-        if hasattr(medication.data, 'frequency_display') and medication.data.frequency_display:
-            return medication.data.frequency_display
-        if hasattr(medication.data, 'period') and medication.data.period:
-            return medication.data.period
-    
-    if hasattr(medication, 'frequency_display') and medication.frequency_display:
-        return medication.frequency_display
-    
-    if hasattr(medication, 'frequency') and medication.frequency:
-        return medication.frequency
-    
-    # Strategy 3: Check effective_time for schedule codes using CTS translation
-    try:
-        from translation_services.terminology_translator import TerminologyTranslator
-        translator = TerminologyTranslator()
-        
-        effective_time = None
-        if isinstance(medication, dict):
-            effective_time = medication.get('effective_time', [])
-        elif hasattr(medication, 'effective_time'):
-            effective_time = medication.effective_time
-        
-        if effective_time and isinstance(effective_time, list):
-            for et in effective_time:
-                if isinstance(et, dict):
-                    # Check for period codes
-                    period = et.get('period')
-                    if period:
-                        translated = translator.translate_code(period, 'ACM')
-                        if translated and translated != period:
-                            return translated
-                    
-                    # Check for frequency codes
-                    frequency = et.get('frequency')
-                    if frequency:
-                        translated = translator.translate_code(frequency, 'ACM')
-                        if translated and translated != frequency:
-                            return translated
-    except Exception as e:
-        logger.debug(f"Error in CTS translation for dosage schedule: {e}")
-    
-    # Strategy 4: Fallback extraction from medication name patterns
-    medication_name = ""
-    if isinstance(medication, dict):
-        for key in ['medication_name', 'substance_name', 'substance_display_name', 'title', 'name']:
-            if medication.get(key):
-                medication_name = str(medication[key])
-                break
-        
-        # Check nested structures
-        if not medication_name and medication.get('medication', {}).get('name'):
-            medication_name = str(medication['medication']['name'])
-            
-    elif hasattr(medication, 'medication') and hasattr(medication.medication, 'name'):
-        medication_name = str(medication.medication.name)
-    elif hasattr(medication, 'name'):
-        medication_name = str(medication.name)
-    
-    if medication_name:
-        # Extract common schedule patterns from medication names
-        name_lower = medication_name.lower()
-        schedule_patterns = [
-            (r"once\s*daily", "Once daily"),
-            (r"twice\s*daily", "Twice daily"),
-            (r"(\d+)\s*times?\s*(per\s*)?day", lambda m: f"{m.group(1)} times per day"),
-            (r"every\s*(\d+)\s*hours?", lambda m: f"Every {m.group(1)} hours"),
-            (r"(\d+)\s*per\s*day", lambda m: f"{m.group(1)} per day"),
-            (r"before\s*breakfast", "Before breakfast"),
-            (r"after\s*meals?", "After meals"),
-            (r"at\s*bedtime", "At bedtime"),
-        ]
-        
-        for pattern, replacement in schedule_patterns:
-            if callable(replacement):
-                match = re.search(pattern, name_lower)
-                if match:
-                    return replacement(match)
-            else:
-                if re.search(pattern, name_lower):
-                    return replacement
-    
-    return "Schedule not specified"
+    return medication_display(medication).schedule
 
 
 @register.filter
@@ -648,17 +245,9 @@ def dosage_schedule_smart(medication):
     medication_name = getattr(medication, 'name', '') or ''
     
     # Extract schedule patterns from medication name
-    schedule_patterns = [
-        (r"(\d+)\s*per\s*day", lambda m: f"{m.group(1)} per day"),
-        (r"every\s*(\d+)\s*(hour|hours|h)", lambda m: f"Every {m.group(1)} {m.group(2)}"),
-        (r"(\d+)\s*times?\s*daily", lambda m: f"{m.group(1)} times daily"),
-        (r"once\s*daily", lambda m: "Once daily"),
-        (r"twice\s*daily", lambda m: "Twice daily"),
-    ]
-    
     name_lower = medication_name.lower()
-    for pattern, formatter in schedule_patterns:
-        match = re.search(pattern, name_lower)
+    for pattern, formatter in SMART_SCHEDULE_PATTERNS:
+        match = pattern.search(name_lower)
         if match:
             return formatter(match)
     
@@ -675,25 +264,8 @@ def route_display_name(route):
     """Enhanced route display with user-friendly formatting"""
     if not route or not hasattr(route, 'displayName'):
         return "Route not specified"
-    
-    route_name = route.displayName or ""
-    
-    # Clean up common route names
-    route_mapping = {
-        "oral use": "Oral",
-        "subcutaneous use": "Subcutaneous injection",
-        "intravenous use": "Intravenous",
-        "intramuscular use": "Intramuscular injection",
-        "topical use": "Topical application",
-        "inhalation use": "Inhalation",
-    }
-    
-    route_lower = route_name.lower()
-    for original, friendly in route_mapping.items():
-        if original in route_lower:
-            return friendly
-    
-    return route_name
+
+    return friendly_route_name(route.displayName or "")
 
 
 @register.filter
@@ -712,63 +284,7 @@ def format_treatment_period(medication):
     """Format treatment period from medication effective_time data"""
     if not medication:
         return "Treatment timing not specified"
-    
-    effective_time = medication.get('effective_time', [])
-    if not effective_time or len(effective_time) == 0:
-        return "Treatment timing not specified"
-    
-    first_time = effective_time[0]
-    if not isinstance(first_time, dict):
-        return "Treatment timing not specified"
-    
-    start_formatted = first_time.get('low_formatted', '')
-    end_formatted = first_time.get('high_formatted', '')
-    
-    if not start_formatted:
-        return "Treatment timing not specified"
-    
-    from datetime import datetime
-    import re
-    
-    try:
-        # Parse the formatted dates
-        # Format: "2018-01-12 00:00:00 (UTC)"
-        start_match = re.match(r'(\d{4}-\d{2}-\d{2})', start_formatted)
-        if not start_match:
-            return start_formatted  # Return as-is if we can't parse
-        
-        start_date = start_match.group(1)
-        start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-        start_display = start_dt.strftime('%b %d, %Y')
-        
-        if end_formatted:
-            end_match = re.match(r'(\d{4}-\d{2}-\d{2})', end_formatted)
-            if end_match:
-                end_date = end_match.group(1)
-                end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-                end_display = end_dt.strftime('%b %d, %Y')
-                
-                # Calculate duration
-                duration = (end_dt - start_dt).days
-                if duration == 0:
-                    duration_text = "Same day"
-                elif duration == 1:
-                    duration_text = "1 day"
-                else:
-                    duration_text = f"{duration} days"
-                
-                return f"{start_display} to {end_display} ({duration_text})"
-            else:
-                return f"{start_display} to {end_formatted}"
-        else:
-            return f"Started {start_display} (Ongoing)"
-            
-    except Exception:
-        # Fallback to original format if parsing fails
-        if end_formatted:
-            return f"{start_formatted} to {end_formatted}"
-        else:
-            return f"Started {start_formatted} (Ongoing)"
+    return medication_display(medication).treatment_period
 
 
 @register.filter
@@ -803,12 +319,12 @@ def clean_medication_text(text):
         text = str(text)
     
     # Remove translation artifacts
-    text = re.sub(r'\s*Translation\s*:\s*', ' + ', text)
-    text = re.sub(r'\s*\{CAS:\s*[^}]+\}\s*', '', text)
-    text = re.sub(r'\s*\(Ingredient name\s*:\s*([^)]+)\)', r' + \1', text)
+    text = TRANSLATION_ARTIFACT.sub(' + ', text)
+    text = CAS_ARTIFACT.sub('', text)
+    text = INGREDIENT_NAME_ARTIFACT.sub(r' + \1', text)
     
     # Clean up multiple spaces and line breaks
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE.sub(' ', text)
     text = text.strip()
     
     return text
\ No newline at end of file
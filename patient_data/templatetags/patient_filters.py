@@ -2,7 +2,14 @@
 Custom template tags for patient data
 """
 
+from functools import lru_cache
+from types import MappingProxyType
+
 from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from patient_data.utils.date_engine import format_date
 
 register = template.Library()
 
@@ -312,41 +319,9 @@ def clean_date_format(date_value):
     if re.match(r"^\d{1,2}/\d{1,2}/\d{4}$", date_str):
         return date_str
 
-    # Handle FHIR ISO 8601 datetime with timezone (YYYY-MM-DDTHH:MM:SS+ZZ:ZZ)
-    # Example: 1983-01-02T10:30:45+01:00 → 02/01/1983 10:30
-    iso_datetime_match = re.match(r"^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})([\+\-]\d{2}:\d{2})$", date_str)
-    if iso_datetime_match:
-        try:
-            from datetime import datetime
-            # Parse ISO 8601 with timezone
-            parsed_dt = datetime.fromisoformat(date_str)
-            # Format as DD/MM/YYYY HH:MM (show time without seconds for readability)
-            return parsed_dt.strftime("%d/%m/%Y %H:%M")
-        except:
-            # Fallback to date-only extraction if parsing fails
-            try:
-                parsed_date = datetime.strptime(date_str[:10], "%Y-%m-%d")
-                return parsed_date.strftime("%d/%m/%Y")
-            except:
-                pass
-
-    # Handle CDA date format (YYYYMMDD) - convert to DD/MM/YYYY
-    if re.match(r"^\d{8}$", date_str):
-        try:
-            from datetime import datetime
-            parsed_date = datetime.strptime(date_str, "%Y%m%d")
-            return parsed_date.strftime("%d/%m/%Y")
-        except:
-            pass
-
-    # If it's in ISO date format (date only), convert it
-    if re.match(r"^\d{4}-\d{2}-\d{2}$", date_str):
-        try:
-            from datetime import datetime
-            parsed_date = datetime.strptime(date_str, "%Y-%m-%d")
-            return parsed_date.strftime("%d/%m/%Y")
-        except:
-            pass
+    formatted = format_date(date_str, "dmy_time")
+    if formatted:
+        return formatted
 
     # If it's in another format, try to extract just the date part
     date_match = re.search(r"(\d{1,2}[/-]\d{1,2}[/-]\d{4})", date_str)
@@ -404,55 +379,8 @@ def extract_status(value):
     return clean_clinical_value(value, "status")
 
 
-@register.filter
-def country_flag(country_code):
-    """Return flag image HTML for a given country code"""
-    from django.templatetags.static import static
-    from django.utils.safestring import mark_safe
-
-    if not country_code:
-        return ""
-
-    # Convert to uppercase for consistency
-    country_code = country_code.upper()
-
-    # Map of all available flag files in static/flags/
-    available_flags = {
-        "AT",
-        "BE",
-        "BG",
-        "CY",
-        "CZ",
-        "DE",
-        "DK",
-        "EE",
-        "ES",
-        "EU",
-        "FI",
-        "FR",
-        "GR",
-        "HR",
-        "HU",
-        "IE",
-        "IS",
-        "IT",
-        "LT",
-        "LU",
-        "LV",
-        "MT",
-        "NL",
-        "NO",
-        "PL",
-        "PT",
-        "RO",
-        "SE",
-        "SI",
-        "SK",
-        "UK",
-    }
-
-    # Map of country codes to full names
-    country_names = {
+COUNTRY_NAMES = MappingProxyType(
+    {
         "AT": "Austria",
         "BE": "Belgium",
         "BG": "Bulgaria",
@@ -485,20 +413,45 @@ def country_flag(country_code):
         "SK": "Slovakia",
         "UK": "United Kingdom",
     }
+)
+
+# Codes with a flag file in static/flags/; others use the EU flag
+FLAG_COUNTRY_CODES = frozenset(COUNTRY_NAMES)
+FALLBACK_FLAG_CODE = "EU"
+
+# Distinct country codes whose rendered flag HTML is kept
+FLAG_HTML_CACHE_SIZE = 256
 
-    # Get flag path
-    if country_code in available_flags:
-        flag_path = f"flags/{country_code}.webp"
-    else:
-        flag_path = "flags/EU.webp"
 
-    # Get full country name for alt text
-    country_name = country_names.get(country_code, country_code)
+@lru_cache(maxsize=None)
+def _flag_urls():
+    """Static URL of every flag file, resolved once per process
 
-    # Return proper HTML img tag with CSS class instead of inline styles
-    static_path = static(flag_path)
-    html = f'<img src="{static_path}" alt="{country_name}" class="flag-img" width="20" height="15">'
-    return mark_safe(html)
+    Resolved on first use rather than at import, since the static files
+    storage may need its manifest, which is not available at import time.
+    """
+    return MappingProxyType(
+        {code: static(f"flags/{code}.webp") for code in FLAG_COUNTRY_CODES}
+    )
+
+
+@lru_cache(maxsize=FLAG_HTML_CACHE_SIZE)
+def _country_flag_html(country_code):
+    flag_code = country_code if country_code in FLAG_COUNTRY_CODES else FALLBACK_FLAG_CODE
+    return format_html(
+        '<img src="{}" alt="{}" class="flag-img" width="20" height="15">',
+        _flag_urls()[flag_code],
+        COUNTRY_NAMES.get(country_code, country_code),
+    )
+
+
+@register.filter
+def country_flag(country_code):
+    """Return flag image HTML for a given country code"""
+    if not country_code:
+        return ""
+
+    return _country_flag_html(country_code.upper())
 
 
 @register.filter
@@ -507,42 +460,8 @@ def country_name(country_code):
     if not country_code:
         return "Unknown"
 
-    # Map of country codes to full names
-    country_names = {
-        "AT": "Austria",
-        "BE": "Belgium",
-        "BG": "Bulgaria",
-        "CY": "Cyprus",
-        "CZ": "Czech Republic",
-        "DE": "Germany",
-        "DK": "Denmark",
-        "EE": "Estonia",
-        "ES": "Spain",
-        "EU": "European Union",
-        "FI": "Finland",
-        "FR": "France",
-        "GR": "Greece",
-        "HR": "Croatia",
-        "HU": "Hungary",
-        "IE": "Ireland",
-        "IS": "Iceland",
-        "IT": "Italy",
-        "LT": "Lithuania",
-        "LU": "Luxembourg",
-        "LV": "Latvia",
-        "MT": "Malta",
-        "NL": "Netherlands",
-        "NO": "Norway",
-        "PL": "Poland",
-        "PT": "Portugal",
-        "RO": "Romania",
-        "SE": "Sweden",
-        "SI": "Slovenia",
-        "SK": "Slovakia",
-        "UK": "United Kingdom",
-    }
-
-    return country_names.get(country_code.upper(), country_code.upper())
+    country_code = country_code.upper()
+    return COUNTRY_NAMES.get(country_code, country_code)
 
 
 @register.filter
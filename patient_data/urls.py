@@ -220,6 +220,11 @@ urlpatterns = [
         main_views.download_orcd_pdf,
         name="download_orcd_pdf_indexed",
     ),
+    path(
+        "orcd/<str:patient_id>/view/<int:attachment_index>/",
+        main_views.view_orcd_pdf,
+        name="view_orcd_pdf_indexed",
+    ),
     # Enhanced CDA Display with Multi-European Language Support
     path(
         "enhanced_cda_display/",
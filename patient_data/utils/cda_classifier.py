@@ -0,0 +1,119 @@
+"""
+CDA Document Classifier
+Cheap up-front classification of CDA content before any full XML parse
+
+The root element, its namespace and the document templateIds are sniffed
+from the first few KB of the content, and the body type (structuredBody
+for L3, nonXMLBody for L1) from a plain substring search. The decision is
+cached per content hash, so the same document is never classified twice.
+Only the document's shape is cached: whether a parse of it succeeded is
+not, so a transient parse error never sticks to a document.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+# Document kinds
+STRUCTURED = "structured"  # L3 - structuredBody with coded sections
+UNSTRUCTURED = "unstructured"  # L1 - nonXMLBody (embedded PDF/text)
+UNKNOWN_BODY = "unknown_body"  # ClinicalDocument without a recognised body
+NOT_CDA = "not_cda"  # Not XML or not an HL7 v3 ClinicalDocument
+
+HL7_NAMESPACE = "urn:hl7-org:v3"
+
+SNIFF_CHARS = 8192
+_CACHE_SIZE = 256
+
+# First element that is not a declaration, comment, DOCTYPE or PI
+_ROOT_PATTERN = re.compile(r"<(?![?!])(?:([\w.-]+):)?([\w.-]+)([^>]*)>")
+_NAMESPACE_PATTERN = re.compile(r'\bxmlns(?::([\w.-]+))?\s*=\s*["\']([^"\']*)["\']')
+_TEMPLATE_ID_PATTERN = re.compile(
+    r"<(?:[\w.-]+:)?templateId\b[^>]*?\broot\s*=\s*[\"']([^\"']+)[\"']"
+)
+_STRUCTURED_BODY_PATTERN = re.compile(r"<(?:[\w.-]+:)?structuredBody\b")
+_NON_XML_BODY_PATTERN = re.compile(r"<(?:[\w.-]+:)?nonXMLBody\b")
+
+
+class CDAClassification(NamedTuple):
+    """Result of sniffing a CDA document"""
+
+    kind: str
+    content_hash: str
+    root_element: str = ""
+    namespace: str = ""
+    template_ids: Tuple[str, ...] = ()
+
+
+_decisions: "OrderedDict[str, CDAClassification]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def content_hash(cda_content: str) -> str:
+    return hashlib.sha256(cda_content.encode("utf-8")).hexdigest()
+
+
+def _sniff(cda_content: str, digest: str) -> CDAClassification:
+    head = cda_content[:SNIFF_CHARS].lstrip("﻿ \t\r\n")
+
+    root_match = _ROOT_PATTERN.search(head)
+    if not head.startswith("<") or not root_match:
+        return CDAClassification(NOT_CDA, digest)
+
+    prefix, root_element, attributes = root_match.groups()
+    namespaces = {
+        (ns_prefix or None): uri for ns_prefix, uri in _NAMESPACE_PATTERN.findall(attributes)
+    }
+    namespace = namespaces.get(prefix, "")
+    template_ids = tuple(_TEMPLATE_ID_PATTERN.findall(head))
+
+    if root_element != "ClinicalDocument" or namespace != HL7_NAMESPACE:
+        return CDAClassification(NOT_CDA, digest, root_element, namespace, template_ids)
+
+    if _STRUCTURED_BODY_PATTERN.search(cda_content):
+        kind = STRUCTURED
+    elif _NON_XML_BODY_PATTERN.search(cda_content):
+        kind = UNSTRUCTURED
+    else:
+        kind = UNKNOWN_BODY
+
+    return CDAClassification(kind, digest, root_element, namespace, template_ids)
+
+
+def classify_cda(cda_content: Optional[str]) -> CDAClassification:
+    """
+    Classify CDA content without parsing it
+
+    Returns:
+        CDAClassification; repeated calls for the same content return the
+        cached decision
+    """
+    if not cda_content:
+        return CDAClassification(NOT_CDA, "")
+
+    digest = content_hash(cda_content)
+    with _lock:
+        decision = _decisions.get(digest)
+        if decision is not None:
+            _decisions.move_to_end(digest)
+            return decision
+
+    decision = _sniff(cda_content, digest)
+    _remember(decision)
+    return decision
+
+
+def _remember(decision: CDAClassification) -> None:
+    with _lock:
+        _decisions[decision.content_hash] = decision
+        _decisions.move_to_end(decision.content_hash)
+        while len(_decisions) > _CACHE_SIZE:
+            _decisions.popitem(last=False)
+
+
+def clear_classification_cache() -> None:
+    """Drop all cached classification decisions"""
+    with _lock:
+        _decisions.clear()
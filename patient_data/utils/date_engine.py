@@ -0,0 +1,278 @@
+"""
+Clinical Date Engine
+Single parsing and formatting path for CDA (HL7 TS) and FHIR (ISO 8601) dates
+
+Values are classified by shape (every digit mapped to "9", e.g. "99999999"
+or "9999-99-99T99:99") and dispatched to a precompiled slice parser, so a
+date is never parsed by trial-and-error strptime calls. Parsed values and
+formatted output are memoized, as the same handful of dates is formatted
+thousands of times while rendering a patient summary.
+"""
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Precision of a parsed value, from coarsest to finest
+YEAR = "year"
+MONTH = "month"
+DAY = "day"
+MINUTE = "minute"
+SECOND = "second"
+
+# Trailing fractional seconds and/or timezone: .000+0100, Z, +01:00, -0500
+_SUFFIX_PATTERN = re.compile(r"(?:\.\d+)?(Z|[+-]\d{2}:?\d{2})?$")
+
+_SHAPE_TABLE = str.maketrans("0123456789", "9999999999")
+
+_PARSE_CACHE_SIZE = 4096
+_FORMAT_CACHE_SIZE = 8192
+
+
+class ParsedDate(NamedTuple):
+    """A parsed clinical date with the precision it was recorded at"""
+
+    value: datetime
+    precision: str
+    timezone: str = ""
+
+
+# Shape parsers: field slices for year, month, day, hour, minute, second
+_Slices = Tuple[Optional[slice], ...]
+
+
+def _compact_slices(length: int) -> _Slices:
+    bounds = [(0, 4), (4, 6), (6, 8), (8, 10), (10, 12), (12, 14)]
+    return tuple(slice(*bound) if bound[1] <= length else None for bound in bounds)
+
+
+def _iso_slices(with_time: int) -> _Slices:
+    date_part = (slice(0, 4), slice(5, 7), slice(8, 10))
+    time_part = (slice(11, 13), slice(14, 16), slice(17, 19))
+    return date_part + time_part[:with_time] + (None,) * (3 - with_time)
+
+
+def _compact_date_time_slices(with_time: int, separator: str = "") -> _Slices:
+    step = 2 + len(separator)
+    time_part = tuple(slice(9 + step * field, 11 + step * field) for field in range(with_time))
+    return _compact_slices(8)[:3] + time_part + (None,) * (3 - with_time)
+
+
+_PRECISION_BY_FIELDS = {1: YEAR, 2: MONTH, 3: DAY, 4: MINUTE, 5: MINUTE, 6: SECOND}
+
+_SHAPE_SLICES: Dict[str, _Slices] = {
+    # HL7 TS compact forms: YYYY, YYYYMM, YYYYMMDD, YYYYMMDDHH[MM[SS]]
+    "9" * length: _compact_slices(length)
+    for length in (4, 6, 8, 10, 12, 14)
+}
+_SHAPE_SLICES.update({
+    # ISO 8601 / FHIR forms
+    "9999-99": (slice(0, 4), slice(5, 7), None, None, None, None),
+    "9999-99-99": _iso_slices(0),
+    "9999-99-99T99:99": _iso_slices(2),
+    "9999-99-99T99:99:99": _iso_slices(3),
+    "9999-99-99 99:99": _iso_slices(2),
+    "9999-99-99 99:99:99": _iso_slices(3),
+    # Compact date with a time: 20091006T10:00[:00], 20091006T1000[00]
+    "99999999T99:99": _compact_date_time_slices(2, ":"),
+    "99999999T99:99:99": _compact_date_time_slices(3, ":"),
+    "99999999T9999": _compact_date_time_slices(2),
+    "99999999T999999": _compact_date_time_slices(3),
+})
+
+
+def _european_shapes() -> Dict[str, Tuple[slice, slice, slice]]:
+    """Day-first shapes such as 28/07/2008, 1.2.1990 or 28-7-2008"""
+    shapes = {}
+    for separator in "/.-":
+        for day_len in (1, 2):
+            for month_len in (1, 2):
+                shape = f"{'9' * day_len}{separator}{'9' * month_len}{separator}9999"
+                month_start = day_len + 1
+                year_start = month_start + month_len + 1
+                shapes[shape] = (
+                    slice(0, day_len),
+                    slice(month_start, month_start + month_len),
+                    slice(year_start, year_start + 4),
+                )
+    return shapes
+
+
+_EUROPEAN_SHAPES = _european_shapes()
+
+
+def _build(year: int, month: int = 1, day: int = 1, hour: int = 0,
+           minute: int = 0, second: int = 0) -> Optional[datetime]:
+    try:
+        return datetime(year, month, day, hour, minute, second)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_string(raw: str) -> Optional[ParsedDate]:
+    value = raw.strip()
+    if not value:
+        return None
+
+    # Split off fractional seconds and timezone once; compact HL7 values
+    # shorter than a date (e.g. "1990") must not lose digits to the offset
+    timezone = ""
+    if len(value) > 10:
+        match = _SUFFIX_PATTERN.search(value)
+        if match and match.start() >= 8:
+            timezone = match.group(1) or ""
+            value = value[:match.start()]
+
+    shape = value.translate(_SHAPE_TABLE)
+
+    slices = _SHAPE_SLICES.get(shape)
+    if slices is not None:
+        fields = [int(value[part]) for part in slices if part is not None]
+        parsed = _build(*fields)
+        if parsed is None:
+            return None
+        return ParsedDate(parsed, _PRECISION_BY_FIELDS[len(fields)], timezone)
+
+    european = _EUROPEAN_SHAPES.get(shape)
+    if european is not None:
+        first, second, year = (int(value[part]) for part in european)
+        # Day-first, unless that is impossible and month-first is valid
+        parsed = _build(year, second, first) or _build(year, first, second)
+        return ParsedDate(parsed, DAY, timezone) if parsed else None
+
+    return None
+
+
+def parse_date(value: Any) -> Optional[ParsedDate]:
+    """
+    Parse a CDA/FHIR date value
+
+    Accepts strings in HL7 TS (``20080728130000+0100``), ISO 8601
+    (``2008-07-28T13:00:00Z``) or day-first (``28/07/2008``) form, as well
+    as ``datetime``/``date`` objects. Returns None if the value is empty or
+    not a recognised date.
+    """
+    if isinstance(value, datetime):
+        return ParsedDate(value.replace(tzinfo=None), SECOND)
+    if isinstance(value, date):
+        return ParsedDate(datetime(value.year, value.month, value.day), DAY)
+    if not isinstance(value, str) or not value:
+        return None
+    return _parse_string(value)
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Parse a CDA/FHIR date value into a naive datetime, or None"""
+    parsed = parse_date(value)
+    return parsed.value if parsed else None
+
+
+# Output styles: each maps a ParsedDate to display text
+
+def _by_precision(year: str, month: str, day: str, time: str) -> Callable[[ParsedDate], str]:
+    patterns = {YEAR: year, MONTH: month, DAY: day, MINUTE: time, SECOND: time}
+    return lambda parsed: parsed.value.strftime(patterns[parsed.precision])
+
+
+def _clinical(us_format: bool = False, with_time: bool = False) -> Callable[[ParsedDate], str]:
+    """Full month name without a leading zero on the day, e.g. 8 September 2021"""
+
+    def style(parsed: ParsedDate) -> str:
+        dt = parsed.value
+        if parsed.precision == YEAR:
+            return str(dt.year)
+        if parsed.precision == MONTH:
+            return dt.strftime("%B %Y")
+
+        month = dt.strftime("%B")
+        text = f"{month} {dt.day}, {dt.year}" if us_format else f"{dt.day} {month} {dt.year}"
+        # Add time if requested and significant (not midnight)
+        if with_time and (dt.hour or dt.minute):
+            text += f" at {dt.strftime('%H:%M')}"
+        return text
+
+    return style
+
+
+DATE_STYLES: Dict[str, Callable[[ParsedDate], str]] = {
+    # European display used by clinical tables: 28/07/2008
+    "dmy": _by_precision("%Y", "%m/%Y", "%d/%m/%Y", "%d/%m/%Y"),
+    # European display with time when recorded: 28/07/2008 13:00
+    "dmy_time": _by_precision("%Y", "%m/%Y", "%d/%m/%Y", "%d/%m/%Y %H:%M"),
+    # Abbreviated month: Jul 28, 2008
+    "short": _by_precision("%Y", "%b %Y", "%b %d, %Y", "%b %d, %Y"),
+    # US-ordered HL7 display: 07/28/2008 13:00
+    "mdy_time": _by_precision("%Y", "%m/%Y", "%m/%d/%Y", "%m/%d/%Y %H:%M"),
+    # ISO date for sorting: 2008-07-28
+    "iso": _by_precision("%Y", "%Y-%m", "%Y-%m-%d", "%Y-%m-%d"),
+    # Full month name: 28 July 2008 / July 28, 2008 [at 13:00]
+    "clinical": _clinical(),
+    "clinical_time": _clinical(with_time=True),
+    "clinical_us": _clinical(us_format=True),
+    "clinical_us_time": _clinical(us_format=True, with_time=True),
+}
+
+
+@lru_cache(maxsize=_FORMAT_CACHE_SIZE)
+def _format_string(value: str, style: str) -> Optional[str]:
+    parsed = _parse_string(value)
+    return DATE_STYLES[style](parsed) if parsed else None
+
+
+def format_date(value: Any, style: str = "dmy", default: Any = None) -> Any:
+    """
+    Format a CDA/FHIR date value for display
+
+    Args:
+        value: Date string, datetime or date
+        style: Name of an output style in DATE_STYLES
+        default: Returned when the value is empty or cannot be parsed
+
+    Returns:
+        Formatted text honouring the recorded precision (a year-only
+        value stays a year), or ``default``
+    """
+    if isinstance(value, str):
+        if not value:
+            return default
+        formatted = _format_string(value, style)
+    else:
+        parsed = parse_date(value)
+        formatted = DATE_STYLES[style](parsed) if parsed else None
+    return default if formatted is None else formatted
+
+
+def format_date_column(
+    rows: Iterable[Dict[str, Any]],
+    field: str,
+    style: str = "dmy",
+    target: Optional[str] = None,
+    keep_unparsed: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Format one date field across a whole column of section rows
+
+    Each row's ``field`` is formatted in place (or into ``target`` when
+    given). Unparseable values are kept as-is unless ``keep_unparsed`` is
+    False, in which case the target is left untouched.
+    """
+    target = target or field
+    rows = list(rows)
+    for row in rows:
+        value = row.get(field)
+        if not value:
+            continue
+        formatted = format_date(value, style)
+        if formatted is not None:
+            row[target] = formatted
+        elif keep_unparsed and target != field:
+            row[target] = value
+    return rows
+
+
+def clear_date_caches() -> None:
+    """Drop the memoized parse and format results"""
+    _parse_string.cache_clear()
+    _format_string.cache_clear()
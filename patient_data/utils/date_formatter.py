@@ -9,6 +9,8 @@ from datetime import datetime
 from typing import Optional, Union
 import logging
 
+from .date_engine import MONTH, YEAR, format_date, parse_date
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,35 +22,6 @@ class PatientDateFormatter:
     user-friendly display formats suitable for healthcare professionals.
     """
 
-    # Common CDA date patterns used by EU member states
-    CDA_PATTERNS = [
-        # Full datetime with timezone: 20080728130000+0100, 20250318150929+0000
-        (r"^(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})[+-]\d{4}$", "%Y%m%d%H%M%S"),
-        # Date with time: 20080728130000, 20250318150929
-        (r"^(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})$", "%Y%m%d%H%M%S"),
-        # Date with partial time (hour/minute only): 202503181509
-        (r"^(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})$", "%Y%m%d%H%M"),
-        # Date only: 20080728, 20250318
-        (r"^(\d{4})(\d{2})(\d{2})$", "%Y%m%d"),
-        # ISO datetime with seconds: 2008-07-28T13:00:00, 2025-03-18T15:09:29
-        (r"^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})", "%Y-%m-%dT%H:%M:%S"),
-        # ISO datetime without seconds: 2008-07-28T13:00
-        (r"^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2})", "%Y-%m-%dT%H:%M"),
-        # Date with dashes: 2008-07-28, 2025-03-18
-        (r"^(\d{4})-(\d{2})-(\d{2})$", "%Y-%m-%d"),
-        # European date format: 28-07-2008, 18-03-2025
-        (r"^(\d{1,2})-(\d{1,2})-(\d{4})$", "%d-%m-%Y"),
-        # Date with dots (German/Austrian): 28.07.2008, 18.03.2025
-        (r"^(\d{1,2})\.(\d{1,2})\.(\d{4})$", "%d.%m.%Y"),
-        # Date with slashes (European): 28/07/2008, 18/03/2025
-        (r"^(\d{1,2})/(\d{1,2})/(\d{4})$", "%d/%m/%Y"),  # Assuming European format
-        # HL7 standard format: 20080728130000.000+0100
-        (
-            r"^(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})\.\d{3}[+-]\d{4}$",
-            "%Y%m%d%H%M%S",
-        ),
-    ]
-
     def __init__(self, default_format: str = "dd/mm/yyyy", locale: str = "en-GB"):
         """
         Initialize the date formatter.
@@ -168,96 +141,20 @@ class PatientDateFormatter:
         """
         Parse various CDA and FHIR date formats into a datetime object.
 
+        Parsing is delegated to the shared clinical date engine; only values
+        recorded to at least day precision are accepted here.
+
         Args:
             date_str: Date string from CDA document or FHIR resource
 
         Returns:
             Parsed datetime or None if parsing fails
         """
-        if not date_str:
+        parsed = parse_date(date_str)
+        if parsed is None or parsed.precision in (YEAR, MONTH):
+            logger.debug("Unable to parse date string: %r", date_str)
             return None
-
-        # Clean up the input
-        date_clean = date_str.strip()
-
-        # FHIR ISO 8601 with 'Z' timezone indicator: 2022-06-15T00:00:00Z
-        if 'Z' in date_clean:
-            try:
-                # Remove 'Z' and parse as UTC
-                clean_input = date_clean.replace('Z', '')
-                if 'T' in clean_input:
-                    parsed = datetime.strptime(clean_input, "%Y-%m-%dT%H:%M:%S")
-                else:
-                    parsed = datetime.strptime(clean_input, "%Y-%m-%d")
-                logger.debug(f"Successfully parsed FHIR ISO date with Z: '{date_str}'")
-                return parsed
-            except ValueError:
-                pass
-        
-        # FHIR ISO 8601 with timezone offset: 2022-06-15T00:00:00+01:00
-        if 'T' in date_clean and ('+' in date_clean[10:] or date_clean.count('-') > 2):
-            try:
-                # Python 3.7+ supports fromisoformat with timezone
-                parsed = datetime.fromisoformat(date_clean.replace('Z', '+00:00'))
-                logger.debug(f"Successfully parsed FHIR ISO date with timezone: '{date_str}'")
-                return parsed
-            except (ValueError, AttributeError):
-                # Fallback: strip timezone and parse
-                try:
-                    clean_input = re.sub(r'[+-]\d{2}:\d{2}$', '', date_clean)
-                    if 'T' in clean_input:
-                        parsed = datetime.strptime(clean_input, "%Y-%m-%dT%H:%M:%S")
-                    else:
-                        parsed = datetime.strptime(clean_input, "%Y-%m-%d")
-                    logger.debug(f"Successfully parsed FHIR ISO date (timezone stripped): '{date_str}'")
-                    return parsed
-                except ValueError:
-                    pass
-
-        # Remove CDA timezone offset and milliseconds for parsing
-        date_clean = re.sub(r"\.\d{3}[+-]\d{4}$", "", date_clean)  # Remove .000+0100
-        date_clean = re.sub(r"[+-]\d{4}$", "", date_clean)  # Remove +0100
-
-        # Try each pattern in order of specificity
-        for pattern, format_str in self.CDA_PATTERNS:
-            if format_str is None:  # Skip patterns without format strings
-                continue
-
-            match = re.match(pattern, date_clean)
-            if match:
-                try:
-                    parsed = datetime.strptime(date_clean, format_str)
-                    logger.debug(
-                        f"Successfully parsed '{date_str}' using pattern '{format_str}'"
-                    )
-                    return parsed
-                except ValueError as e:
-                    logger.debug(
-                        f"Pattern '{format_str}' matched but parsing failed for '{date_clean}': {e}"
-                    )
-                    continue
-
-        # Handle special formats that don't fit standard patterns
-        special_formats = [
-            # HL7 format variations
-            (r"^\d{14}$", "%Y%m%d%H%M%S"),  # 20250318150929
-            (r"^\d{12}$", "%Y%m%d%H%M"),  # 202503181509
-            (r"^\d{8}$", "%Y%m%d"),  # 20250318
-        ]
-
-        for pattern, format_str in special_formats:
-            if re.match(pattern, date_clean):
-                try:
-                    parsed = datetime.strptime(date_clean, format_str)
-                    logger.debug(
-                        f"Successfully parsed '{date_str}' using special format '{format_str}'"
-                    )
-                    return parsed
-                except ValueError:
-                    continue
-
-        logger.warning(f"Unable to parse date string: '{date_str}'")
-        return None
+        return parsed.value
 
     def _format_datetime_to_display(
         self, dt: datetime, include_time: bool = False
@@ -417,40 +314,13 @@ class ClinicalDateFormatter:
         if not date_input or date_input in ["Not specified", "Unknown", "Not recorded", ""]:
             return default_text
         
+        style = "clinical_us" if use_us_format else "clinical"
+        if include_time:
+            style += "_time"
+
         try:
-            # Parse using existing PatientDateFormatter
-            parsed_date = default_formatter._parse_cda_date(date_input)
-            
-            if not parsed_date:
-                logger.debug(f"Could not parse clinical date: {date_input}")
-                return date_input
-            
-            # Format with full month name
-            format_str = cls.US_FORMAT if use_us_format else cls.HEALTHCARE_FORMAT
-            formatted = parsed_date.strftime(format_str)
-            
-            # Remove leading zero from day (01 -> 1, 08 -> 8)
-            # This makes dates more natural: "8 September 2021" not "08 September 2021"
-            if not use_us_format:
-                # European format: "DD Month YYYY" - strip leading zero from day
-                parts = formatted.split(' ')
-                if len(parts) >= 2 and parts[0].startswith('0'):
-                    parts[0] = parts[0].lstrip('0')
-                    formatted = ' '.join(parts)
-            else:
-                # US format: "Month DD, YYYY" - strip leading zero from day
-                parts = formatted.split(' ')
-                if len(parts) >= 2 and parts[1].startswith('0'):
-                    parts[1] = parts[1].lstrip('0')
-                    formatted = ' '.join(parts)
-            
-            # Add time if requested and significant (not midnight)
-            if include_time and (parsed_date.hour != 0 or parsed_date.minute != 0):
-                time_str = parsed_date.strftime("%H:%M")
-                formatted += f" at {time_str}"
-            
-            return formatted
-            
+            # Unparseable values are shown as recorded
+            return format_date(date_input, style, default=date_input)
         except Exception as e:
             logger.warning(f"Clinical date formatting error for '{date_input}': {e}")
             return date_input
@@ -0,0 +1,15 @@
+"""
+HTML Fragment Parsing
+Single entry point for parsing CDA narrative HTML with BeautifulSoup
+
+bs4 is imported on first use rather than at module import, so modules
+that parse narrative HTML stay cheap to import at process start-up (see
+tests/test_import_cost.py).
+"""
+
+
+def parse_html(markup):
+    """Parse an HTML fragment with the standard library html.parser"""
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(markup, "html.parser")
@@ -0,0 +1,73 @@
+"""
+Performance Logging Utilities
+Quiet hot-path logging and structured per-stage timing records
+
+Per-item diagnostics in the FHIR/CDA parsers are DEBUG records guarded by
+verbose_logging_enabled(), so large payloads are never formatted unless
+they will actually be written. Each processing stage (parse, group, dedupe,
+extract, render) emits a single timing record through log_stage().
+
+Setting PERFORMANCE_LOGGING = True switches on the quiet mode: per-item
+diagnostics are suppressed even at DEBUG level and stage timings are
+written at INFO level on the "ehealth.performance" logger.
+
+While a request is being profiled (see request_profiling), every stage is
+also recorded as a "<component>.<stage>" span of that request.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from django.conf import settings
+
+from .request_profiling import current_profile
+
+timing_logger = logging.getLogger("ehealth.performance")
+
+
+def performance_logging_enabled() -> bool:
+    """Whether the quiet performance logging mode is active"""
+    return getattr(settings, "PERFORMANCE_LOGGING", False)
+
+
+def verbose_logging_enabled(logger: logging.Logger) -> bool:
+    """Whether per-item hot-path diagnostics should be produced for a logger"""
+    return logger.isEnabledFor(logging.DEBUG) and not performance_logging_enabled()
+
+
+@contextmanager
+def log_stage(component: str, stage: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a processing stage and emit one structured timing record
+
+    The yielded dict can be used to attach counts discovered during the
+    stage (e.g. ``stage_fields["resources"] = 42``); they are included in
+    the record and in its ``extra`` attributes for structured handlers.
+    """
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        profile = current_profile()
+        if profile is not None:
+            profile.add_span(f"{component}.{stage}", duration_ms)
+        level = logging.INFO if performance_logging_enabled() else logging.DEBUG
+
+        if timing_logger.isEnabledFor(level):
+            timing_logger.log(
+                level,
+                "[STAGE TIMING] component=%s stage=%s duration_ms=%.2f%s",
+                component,
+                stage,
+                duration_ms,
+                "".join(f" {key}={value}" for key, value in fields.items()),
+                extra={
+                    "component": component,
+                    "stage": stage,
+                    "duration_ms": round(duration_ms, 2),
+                    "stage_fields": dict(fields),
+                },
+            )
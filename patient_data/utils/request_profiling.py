@@ -0,0 +1,150 @@
+"""
+Request Profiling Utilities
+Per-request stage spans, database query counts and cache hit ratios
+
+A profile is only collected while RequestProfilingMiddleware is handling a
+request (SERVER_TIMING_ENABLED). Outside of that, span() and
+record_cache_lookup() cost a single context variable lookup, so services
+and pipeline managers can be instrumented unconditionally:
+
+    with span("cda.parse"):
+        ...
+    record_cache_lookup("terminology", hit=cached is not None)
+
+Every log_stage() stage is also recorded as a span named
+"<component>.<stage>". Spans with the same name are aggregated (count,
+total and maximum duration), and nested spans report inclusive time.
+"""
+
+import re
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Dict, Iterator, Optional
+
+from django.db import connections
+
+_active_profile: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "request_profile", default=None
+)
+
+# Characters not allowed in a Server-Timing metric name (an HTTP token)
+_NON_TOKEN = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+
+class RequestProfile:
+    """Stage durations, database queries and cache lookups of one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total_ms: Optional[float] = None
+        self.spans: Dict[str, Dict[str, float]] = {}
+        self.cache_lookups: Dict[str, Dict[str, int]] = {}
+        self.queries = 0
+        self.query_ms = 0.0
+        # Spans may be recorded from pool threads running in a copied context
+        self._lock = Lock()
+
+    def add_span(self, name: str, duration_ms: float):
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                self.spans[name] = {"count": 1, "total_ms": duration_ms, "max_ms": duration_ms}
+            else:
+                stats["count"] += 1
+                stats["total_ms"] += duration_ms
+                stats["max_ms"] = max(stats["max_ms"], duration_ms)
+
+    def add_cache_lookup(self, name: str, hit: bool):
+        with self._lock:
+            stats = self.cache_lookups.setdefault(name, {"hits": 0, "misses": 0})
+            stats["hits" if hit else "misses"] += 1
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """Database execute wrapper counting and timing queries"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_ms += (time.perf_counter() - start) * 1000
+            self.queries += 1
+
+    def finish(self):
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self) -> str:
+        """Server-Timing header value"""
+        metrics = [
+            f"total;dur={self.total_ms:.1f}",
+            f'db;dur={self.query_ms:.1f};desc="{self.queries} queries"',
+        ]
+        for name, stats in self.spans.items():
+            metric = f"{_NON_TOKEN.sub('-', name)};dur={stats['total_ms']:.1f}"
+            if stats["count"] > 1:
+                metric += f';desc="{stats["count"]} calls"'
+            metrics.append(metric)
+        return ", ".join(metrics)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-serializable profile"""
+        return {
+            "total_ms": round(self.total_ms or 0.0, 2),
+            "stages": {
+                name: {
+                    "count": stats["count"],
+                    "total_ms": round(stats["total_ms"], 2),
+                    "max_ms": round(stats["max_ms"], 2),
+                }
+                for name, stats in self.spans.items()
+            },
+            "queries": {"count": self.queries, "duration_ms": round(self.query_ms, 2)},
+            "caches": {
+                name: {
+                    **stats,
+                    "hit_ratio": round(stats["hits"] / (stats["hits"] + stats["misses"]), 3),
+                }
+                for name, stats in self.cache_lookups.items()
+            },
+        }
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """The profile being collected for the current request, if any"""
+    return _active_profile.get()
+
+
+@contextmanager
+def profile_request() -> Iterator[RequestProfile]:
+    """Collect a profile for the code run inside the block"""
+    profile = RequestProfile()
+    token = _active_profile.set(profile)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile.execute_wrapper))
+            yield profile
+    finally:
+        profile.finish()
+        _active_profile.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block as a named span of the current request profile"""
+    profile = _active_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_span(name, (time.perf_counter() - start) * 1000)
+
+
+def record_cache_lookup(name: str, hit: bool):
+    """Count a cache hit or miss in the current request profile"""
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.add_cache_lookup(name, hit)
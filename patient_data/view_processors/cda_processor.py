@@ -14,6 +14,8 @@ from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
 
 from .context_builders import ContextBuilder
+from ..utils.performance_logging import log_stage, verbose_logging_enabled
+from ..utils.date_engine import format_date
 
 logger = logging.getLogger(__name__)
 
@@ -66,8 +68,7 @@ class CDAViewProcessor:
         Returns:
             HttpResponse with rendered template
         """
-        print(f"**** CDA PROCESSOR CALLED FOR SESSION {session_id} ****")
-        logger.info(f"[CDA PROCESSOR] Router called process_cda_document for session {session_id}")
+        logger.info("[CDA PROCESSOR] Router called process_cda_document for session %s", session_id)
         
         # Get match data from session
         match_data = request.session.get(f"patient_match_{session_id}", {})
@@ -179,30 +180,29 @@ class CDAViewProcessor:
         Returns:
             HttpResponse with rendered template
         """
-        logger.info(f"[CDA PROCESSOR] Processing CDA patient view for session {session_id}")
+        logger.info("[CDA PROCESSOR] Processing CDA patient view for session %s", session_id)
+        verbose = verbose_logging_enabled(logger)
         
         # ENTERPRISE ARCHITECTURE: Use unified clinical data pipeline manager
         try:
             # Import from __init__ to trigger service registration
             from ..services.clinical_sections import clinical_pipeline_manager
-            logger.info("[CDA PROCESSOR] Using unified clinical data pipeline manager")
+            logger.debug("[CDA PROCESSOR] Using unified clinical data pipeline manager")
             
             # Extract CDA content from match data
             cda_content, actual_cda_type = self._get_cda_content(match_data, cda_type)
             
-            logger.info(f"[CDA PROCESSOR] CDA content retrieved: {len(cda_content) if cda_content else 0} characters")
+            logger.debug("[CDA PROCESSOR] CDA content retrieved: %d characters", len(cda_content) if cda_content else 0)
             
             if cda_content:
-                logger.info("[CDA PROCESSOR] *** INVOKING UNIFIED PIPELINE ***")
-                
                 # STEP 1: Extract administrative data (patient identity, demographics, healthcare team)
-                logger.info("[CDA PROCESSOR] Step 1: Extracting administrative data")
-                administrative_result = self._extract_administrative_data(cda_content, session_id)
+                with log_stage('cda_view_processor', 'parse', session_id=session_id):
+                    administrative_result = self._extract_administrative_data(cda_content, session_id)
                 
                 # STEP 2: Process clinical data using unified pipeline
-                logger.info("[CDA PROCESSOR] Step 2: Processing clinical data via unified pipeline")
-                unified_clinical_arrays = clinical_pipeline_manager.process_cda_content(request, session_id, cda_content)
-                logger.info(f"[CDA PROCESSOR] Pipeline returned {len(unified_clinical_arrays)} sections")
+                with log_stage('cda_view_processor', 'extract', session_id=session_id) as stage_fields:
+                    unified_clinical_arrays = clinical_pipeline_manager.process_cda_content(request, session_id, cda_content)
+                    stage_fields['sections'] = len(unified_clinical_arrays)
                 
                 # Get template context from pipeline manager (FULL API with session_id)
                 pipeline_context = clinical_pipeline_manager.get_template_context(request, session_id)
@@ -226,12 +226,10 @@ class CDAViewProcessor:
                             has_clinical_data = True
                             
                             # DEBUG: Log procedures data structure
-                            if section_name == 'procedures':
-                                logger.info(f"[CDA PROCESSOR] *** PROCEDURES DEBUG ***")
-                                logger.info(f"[CDA PROCESSOR] Procedures count: {len(section_data)}")
-                                if len(section_data) > 0:
-                                    logger.info(f"[CDA PROCESSOR] First procedure keys: {list(section_data[0].keys())}")
-                                    logger.info(f"[CDA PROCESSOR] First procedure data: {section_data[0]}")
+                            if section_name == 'procedures' and verbose:
+                                logger.debug("[CDA PROCESSOR] Procedures count: %d", len(section_data))
+                                logger.debug("[CDA PROCESSOR] First procedure keys: %s", list(section_data[0].keys()))
+                                logger.debug("[CDA PROCESSOR] First procedure data: %s", section_data[0])
                 
                 # TODO: Add administrative/extended patient data mapping here
                 # For now, set empty defaults to prevent template errors
@@ -242,15 +240,13 @@ class CDAViewProcessor:
                     'healthcare_data': {}
                 })
                 
-                logger.info(f"[CDA PROCESSOR] Mapped unified pipeline data to template context - clinical sections: {len(pipeline_context) if pipeline_context else 0}")
+                logger.debug("[CDA PROCESSOR] Mapped unified pipeline data to template context - clinical sections: %d", len(pipeline_context) if pipeline_context else 0)
                 
                 # STEP 3: Add administrative data to context (from Step 1)
-                logger.info("[CDA PROCESSOR] Step 3: Adding administrative data to context")
                 if administrative_result:
                     # Add patient identity
                     if administrative_result.get('patient_identity'):
                         context['patient_identity'] = administrative_result['patient_identity']
-                        logger.info(f"[CDA PROCESSOR] Added patient identity to context")
                     
                     # Add administrative data fields including contact info, guardians, and participants
                     admin_data = administrative_result.get('administrative_data', {})
@@ -263,27 +259,8 @@ class CDAViewProcessor:
                     })
                     
                     # Log extraction results - patient_contact_info is now in administrative_data
-                    guardians = administrative_result.get('guardians', [])
-                    participants = administrative_result.get('participants', [])
-                    # admin_data can be either a dict or dataclass - handle both cases
-                    if isinstance(admin_data, dict):
-                        patient_contact_info = admin_data.get('patient_contact_info', None)
-                    else:
-                        patient_contact_info = getattr(admin_data, 'patient_contact_info', None)
-                    
-                    if patient_contact_info:
-                        # patient_contact_info can be DotDict or dict - use .get() for safety
-                        addresses = patient_contact_info.get('addresses', []) if hasattr(patient_contact_info, 'get') else getattr(patient_contact_info, 'addresses', [])
-                        telecoms = patient_contact_info.get('telecoms', []) if hasattr(patient_contact_info, 'get') else getattr(patient_contact_info, 'telecoms', [])
-                        logger.info(f"[CDA PROCESSOR] Added administrative fields to context: "
-                                   f"{len(telecoms)} telecoms, "
-                                   f"{len(addresses)} addresses, "
-                                   f"{len(guardians)} guardians, "
-                                   f"{len(participants)} participants")
-                    else:
-                        logger.info(f"[CDA PROCESSOR] Added administrative fields to context: "
-                                   f"0 telecoms, 0 addresses, {len(guardians)} guardians, "
-                                   f"{len(participants)} participants")
+                    if verbose:
+                        self._log_administrative_context(administrative_result, admin_data)
                 
                 # Add CDA-specific metadata
                 self._add_cda_metadata(context, match_data, cda_content, actual_cda_type)
@@ -291,7 +268,7 @@ class CDAViewProcessor:
                 # Finalize context
                 context = self.context_builder.finalize_context(context)
                 
-                logger.info(f"[CDA PROCESSOR] Successfully processed via unified pipeline: {len(pipeline_context.get('sections_processed', []))} sections")
+                logger.debug("[CDA PROCESSOR] Successfully processed via unified pipeline: %d sections", len(pipeline_context.get('sections_processed', [])))
                 
             else:
                 # Fallback to original processing if no CDA content
@@ -311,7 +288,7 @@ class CDAViewProcessor:
                 context
             )
         
-        logger.info(f"[CDA PROCESSOR] Successfully processed CDA patient view for session {session_id}")
+        logger.debug("[CDA PROCESSOR] Successfully processed CDA patient view for session %s", session_id)
         
         # FINAL FIX: Use unified clinical pipeline for all enhanced data
         try:
@@ -389,7 +366,7 @@ class CDAViewProcessor:
                     
                     # Map all sections from unified pipeline
                     mapped_unified_arrays = field_mapper.map_clinical_arrays(unified_clinical_arrays)
-                    logger.info(f"[CDA PROCESSOR] Field-mapped unified pipeline data for template compatibility")
+                    logger.debug("[CDA PROCESSOR] Field-mapped unified pipeline data for template compatibility")
                     
                     # Use mapped data instead of raw data
                     unified_clinical_arrays = mapped_unified_arrays
@@ -401,8 +378,8 @@ class CDAViewProcessor:
             # Use ContextBuilder to add clinical data properly
             self.context_builder.add_clinical_data(context, unified_clinical_arrays)
             
-            logger.info(f"[CDA PROCESSOR] Unified pipeline provided enhanced data for {len(unified_results)} clinical sections")
-            logger.info(f"[CDA PROCESSOR] *** PROCEDURES FIX: Added {len(enhanced_procedures)} procedures to clinical_arrays ***")
+            logger.debug("[CDA PROCESSOR] Unified pipeline provided enhanced data for %d clinical sections (%d procedures)",
+                         len(unified_results), len(enhanced_procedures))
             
         except Exception as e:
             logger.warning(f"[CDA PROCESSOR] Unified pipeline failed, using fallback enhanced medications: {e}")
@@ -412,12 +389,11 @@ class CDAViewProcessor:
                 context['enhanced_medications'] = enhanced_medications
                 context['medications'] = enhanced_medications
                 context['debug_fallback_enhanced_override'] = True
-                print(f"*** FALLBACK ENHANCED OVERRIDE: Set {len(enhanced_medications)} enhanced medications ***")
+                logger.debug("[CDA PROCESSOR] Fallback enhanced override: set %d enhanced medications", len(enhanced_medications))
         
         # CRITICAL DEDUPLICATION FIX: Remove duplicate medications regardless of source
         medications_in_context = context.get('medications', [])
         if medications_in_context:
-            print(f"*** DEDUPLICATION DEBUG: Found {len(medications_in_context)} medications before deduplication ***")
             
             # Deduplicate based on medication name (case-insensitive)
             seen_names = set()
@@ -435,40 +411,63 @@ class CDAViewProcessor:
                 if med_name not in seen_names and med_name != 'unknown':
                     seen_names.add(med_name)
                     deduplicated_medications.append(med)
-                    print(f"*** DEDUPLICATION: Kept medication: {med.get('name', med_name)} (source: {med.get('source', 'Unknown')}) ***")
-                else:
-                    print(f"*** DEDUPLICATION: Removed duplicate: {med.get('name', med_name)} (source: {med.get('source', 'Unknown')}) ***")
+                elif verbose:
+                    logger.debug("[CDA PROCESSOR] Removed duplicate medication: %s (source: %s)", med.get('name', med_name), med.get('source', 'Unknown'))
             
             # Update context with deduplicated medications
             context['medications'] = deduplicated_medications
-            print(f"*** DEDUPLICATION COMPLETE: Reduced from {len(medications_in_context)} to {len(deduplicated_medications)} unique medications ***")
+            logger.debug("[CDA PROCESSOR] Medication deduplication: %d -> %d unique medications",
+                         len(medications_in_context), len(deduplicated_medications))
         
         # Continue with the rest of processing - don't return early!
         # Avoid non-ASCII characters in logs to prevent UnicodeEncodeError on some consoles
         logger.info("CDA processor completed successfully")
         
-        # DEBUG: Log template context variables before rendering
-        logger.info(f"[TEMPLATE DEBUG] Context keys before render: {list(context.keys())}")
-        logger.info(f"[TEMPLATE DEBUG] author_hcp in context: {bool(context.get('author_hcp'))}")
-        logger.info(f"[TEMPLATE DEBUG] custodian_organization in context: {bool(context.get('custodian_organization'))}")
-        logger.info(f"[TEMPLATE DEBUG] guardians in context: {bool(context.get('guardians'))}")
-        logger.info(f"[TEMPLATE DEBUG] administrative_data in context: {bool(context.get('administrative_data'))}")
+        if verbose:
+            self._log_template_context(context)
+        
+        # Render the final template with complete context including administrative data
+        with log_stage('cda_view_processor', 'render', session_id=session_id):
+            return render(request, 'patient_data/enhanced_patient_cda.html', context)
+    
+    def _log_administrative_context(self, administrative_result: Dict[str, Any], admin_data: Any) -> None:
+        """Debug-log the administrative fields added to the template context"""
+        guardians = administrative_result.get('guardians', [])
+        participants = administrative_result.get('participants', [])
+        # admin_data can be either a dict or dataclass - handle both cases
+        if isinstance(admin_data, dict):
+            patient_contact_info = admin_data.get('patient_contact_info', None)
+        else:
+            patient_contact_info = getattr(admin_data, 'patient_contact_info', None)
+        
+        addresses, telecoms = [], []
+        if patient_contact_info:
+            # patient_contact_info can be DotDict or dict - use .get() for safety
+            addresses = patient_contact_info.get('addresses', []) if hasattr(patient_contact_info, 'get') else getattr(patient_contact_info, 'addresses', [])
+            telecoms = patient_contact_info.get('telecoms', []) if hasattr(patient_contact_info, 'get') else getattr(patient_contact_info, 'telecoms', [])
+        
+        logger.debug("[CDA PROCESSOR] Added administrative fields to context: "
+                     "%d telecoms, %d addresses, %d guardians, %d participants",
+                     len(telecoms), len(addresses), len(guardians), len(participants))
+    
+    def _log_template_context(self, context: Dict[str, Any]) -> None:
+        """Debug-log the template context variables before rendering"""
+        logger.debug("[TEMPLATE DEBUG] Context keys before render: %s", list(context.keys()))
+        logger.debug("[TEMPLATE DEBUG] author_hcp in context: %s", bool(context.get('author_hcp')))
+        logger.debug("[TEMPLATE DEBUG] custodian_organization in context: %s", bool(context.get('custodian_organization')))
+        logger.debug("[TEMPLATE DEBUG] guardians in context: %s", bool(context.get('guardians')))
+        logger.debug("[TEMPLATE DEBUG] administrative_data in context: %s", bool(context.get('administrative_data')))
         
         if context.get('author_hcp'):
             author = context.get('author_hcp')
-            logger.info(f"[TEMPLATE DEBUG] author_hcp type: {type(author).__name__}")
+            logger.debug("[TEMPLATE DEBUG] author_hcp type: %s", type(author).__name__)
             if hasattr(author, 'person'):
-                logger.info(f"[TEMPLATE DEBUG] author_hcp.person.full_name: {getattr(author.person, 'full_name', 'N/A')}")
+                logger.debug("[TEMPLATE DEBUG] author_hcp.person.full_name: %s", getattr(author.person, 'full_name', 'N/A'))
         else:
-            logger.warning("[TEMPLATE DEBUG] author_hcp is NOT in context - checking administrative_data")
             admin_data = context.get('administrative_data')
-            if admin_data:
-                logger.info(f"[TEMPLATE DEBUG] administrative_data type: {type(admin_data).__name__}")
-                if hasattr(admin_data, 'author_hcp'):
-                    logger.warning(f"[TEMPLATE DEBUG] FOUND author_hcp in administrative_data! It wasn't extracted to context!")
-        
-        # Render the final template with complete context including administrative data
-        return render(request, 'patient_data/enhanced_patient_cda.html', context)
+            if admin_data and hasattr(admin_data, 'author_hcp'):
+                logger.debug("[TEMPLATE DEBUG] author_hcp found in administrative_data but not extracted to context")
+
     
     def _get_cda_content(self, match_data: Dict[str, Any], cda_type: Optional[str]) -> tuple:
         """
@@ -535,100 +534,6 @@ class CDAViewProcessor:
         logger.warning("[CDA PROCESSOR] No valid CDA content found in match data")
         return None, None
     
-    def _parse_cda_document(self, cda_content: str, session_id: str) -> Optional[Dict[str, Any]]:
-        """
-        Extract administrative data from CDA document
-        DEPRECATED: Clinical data is now handled by unified pipeline
-        This method only extracts administrative/demographic data
-        
-        Args:
-            cda_content: CDA XML content
-            session_id: Session identifier
-            
-        Returns:
-            Administrative data (patient identity, demographics, healthcare team)
-        """
-        try:
-            logger.info(f"[CDA PROCESSOR] Extracting administrative data for session {session_id}")
-            
-            # Extract administrative data only (clinical data handled by unified pipeline)
-            clinical_data = self._extract_administrative_data(cda_content, session_id)
-            if clinical_data and clinical_data.get('sections'):
-                logger.info(f"[CDA PROCESSOR DEBUG] Strategy 1 SUCCEEDED - {len(clinical_data['sections'])} sections")
-                logger.info(f"[CDA PROCESSOR DEBUG] Strategy 1 admin data: {bool(clinical_data.get('administrative_data'))}")
-                
-                # ENHANCEMENT: Apply our updated problems parsing to Enhanced CDA sections
-                logger.info("[CDA PROCESSOR] Applying enhanced sections parsing for problems...")
-                enhanced_clinical_data = self._enhance_sections_with_updated_parsing(cda_content, clinical_data)
-                
-                # Log the results to verify enhancement
-                if 'clinical_arrays' in enhanced_clinical_data:
-                    problems_count = len(enhanced_clinical_data['clinical_arrays'].get('problems', []))
-                    logger.info(f"[CDA PROCESSOR] Enhanced parsing created {problems_count} problems in clinical_arrays")
-                else:
-                    logger.warning("[CDA PROCESSOR] Enhanced parsing did not create clinical_arrays")
-                
-                logger.info(f"[CDA PROCESSOR DEBUG] Strategy 1 FINAL - returning enhanced_clinical_data with admin_data: {bool(enhanced_clinical_data.get('administrative_data'))}")
-                return enhanced_clinical_data
-            
-            # Strategy 2: Use CDA display service for enhanced parsing
-            logger.info("[CDA PROCESSOR DEBUG] Strategy 1 failed, trying Strategy 2: CDA display service")
-            try:
-                clinical_data = self.cda_display_service.extract_patient_clinical_data(session_id)
-                if clinical_data and clinical_data.get('sections'):
-                    logger.info(f"[CDA PROCESSOR DEBUG] Strategy 2 SUCCEEDED - {len(clinical_data['sections'])} sections")
-                    logger.info(f"[CDA PROCESSOR DEBUG] Strategy 2 admin data: {bool(clinical_data.get('administrative_data'))}")
-                    return clinical_data
-            except Exception as e:
-                logger.warning(f"[CDA PROCESSOR] CDA display service failed: {e}")
-            
-            # Strategy 3: Use comprehensive service for clinical arrays extraction (fallback)
-            logger.info("[CDA PROCESSOR DEBUG] Strategy 2 failed, trying Strategy 3: comprehensive service")
-            try:
-                # Get clinical arrays directly (this method works from our test)
-                clinical_arrays = self.comprehensive_service.get_clinical_arrays_for_display(cda_content)
-                
-                if clinical_arrays and any(clinical_arrays.values()):
-                    logger.info(f"[CDA PROCESSOR] Successfully extracted clinical arrays: {list(clinical_arrays.keys())}")
-                    
-                    # ENHANCEMENT: Override problems data with our enhanced parsing
-                    enhanced_clinical_arrays = self._enhance_clinical_arrays_with_updated_parsing(cda_content, clinical_arrays)
-                    
-                    # Build sections from enhanced clinical arrays for template compatibility
-                    sections = self._build_sections_from_clinical_arrays(enhanced_clinical_arrays)
-                    
-                    return {
-                        'success': True,
-                        'sections': sections,
-                        'clinical_data': enhanced_clinical_arrays,
-                        'has_clinical_data': bool(enhanced_clinical_arrays),
-                        'source': 'comprehensive_service_arrays_enhanced'
-                    }
-                
-            except Exception as e:
-                logger.warning(f"[CDA PROCESSOR] Comprehensive service clinical arrays failed: {e}")
-            
-            # Strategy 4: Fallback to comprehensive data extraction (if needed)
-            logger.info("[CDA PROCESSOR] Falling back to comprehensive clinical data service")
-            try:
-                comprehensive_data = self.comprehensive_service.extract_comprehensive_clinical_data(
-                    cda_content, 'Unknown'  # TODO: Extract country from session
-                )
-                if comprehensive_data and comprehensive_data.get('success') != False:
-                    logger.info("[CDA PROCESSOR] Comprehensive data extraction successful")
-                    return comprehensive_data
-                else:
-                    logger.warning(f"[CDA PROCESSOR] Comprehensive data extraction failed or returned success=False")
-            except Exception as e:
-                logger.warning(f"[CDA PROCESSOR] Comprehensive data extraction error: {e}")
-            
-            logger.error("[CDA PROCESSOR] All parsing strategies failed")
-            return None
-                
-        except Exception as e:
-            logger.error(f"[CDA PROCESSOR] CDA document parsing error: {e}")
-            return None
-    
     def _build_cda_context(
         self,
         context: Dict[str, Any],
@@ -817,7 +722,7 @@ class CDAViewProcessor:
                         # CRITICAL FIX: Ensure enhanced medications override compatibility vars
                         context['medications'] = enhanced_medications
                         context['debug_post_compatibility_fix'] = True
-                        print(f"*** POST-COMPATIBILITY FIX: Restored enhanced medications after compatibility processing ***")
+                        logger.debug("[CDA PROCESSOR] Restored enhanced medications after compatibility processing")
                     else:
                         self._add_template_compatibility_variables(context, sections)
                 
@@ -969,21 +874,11 @@ class CDAViewProcessor:
         try:
             logger.info(f"[CDA PROCESSOR] Extracting administrative data for session {session_id}")
             
-            # Parse XML with lxml for structured extraction
-            from lxml import etree
-            from ..services.patient_demographics_service import PatientDemographicsService
             from ..services.enhanced_cda_xml_parser import EnhancedCDAXMLParser
             
-            # Parse CDA content with lxml
-            try:
-                xml_root = etree.fromstring(cda_content.encode('utf-8'))
-            except Exception as parse_error:
-                logger.error(f"[CDA PROCESSOR] XML parsing error: {parse_error}")
-                xml_root = None
-            
-            # Extract administrative data using Enhanced CDA XML Parser
+            # Extract administrative data from a single parse of the CDA header
             parser = EnhancedCDAXMLParser()
-            enhanced_result = parser.parse_cda_content(cda_content)
+            enhanced_result = parser.parse_cda_header(cda_content)
             
             # NOTE: Patient contact info is now extracted by CDAHeaderExtractor
             # as part of AdministrativeData.patient_contact_info
@@ -1303,20 +1198,14 @@ class CDAViewProcessor:
             logger.info(f"[CDA PROCESSOR] *** VITAL SIGNS FIX: Merged keys: {list(clinical_arrays.keys())} ***")
         else:
             clinical_arrays = base_clinical_arrays
-        logger.info(f"[CDA PROCESSOR] *** ALLERGY FIX DEBUG: enhanced_clinical_arrays parameter passed: {enhanced_clinical_arrays is not None} ***")
-        logger.info(f"[CDA PROCESSOR] *** ALLERGY FIX DEBUG: clinical_arrays source: {'merged' if enhanced_clinical_arrays else 'context.clinical_arrays'} ***")
-        if clinical_arrays and clinical_arrays.get('allergies'):
-            logger.info(f"[CDA PROCESSOR] *** ALLERGY FIX DEBUG: clinical_arrays has {len(clinical_arrays['allergies'])} allergies ***")
-        else:
-            logger.info(f"[CDA PROCESSOR] *** ALLERGY FIX DEBUG: clinical_arrays has no allergies ***")
-        print(f"*** COMPATIBILITY DEBUG: enhanced_clinical_arrays provided: {enhanced_clinical_arrays is not None} ***")
-        if enhanced_clinical_arrays:
-            print(f"*** COMPATIBILITY DEBUG: enhanced_clinical_arrays meds count: {len(enhanced_clinical_arrays.get('medications', []))} ***")
-        print(f"*** COMPATIBILITY DEBUG: clinical_arrays has medications: {bool(clinical_arrays.get('medications'))} ***")
-        if clinical_arrays.get('medications'):
-            print(f"*** COMPATIBILITY DEBUG: clinical_arrays medications count: {len(clinical_arrays['medications'])} ***")
-            first_med = clinical_arrays['medications'][0]
-            print(f"*** COMPATIBILITY DEBUG: first med dose_quantity: {first_med.get('dose_quantity', 'NOT_FOUND')} ***")
+        if verbose_logging_enabled(logger):
+            logger.debug("[CDA PROCESSOR] Compatibility: clinical_arrays source: %s",
+                         'merged' if enhanced_clinical_arrays else 'context.clinical_arrays')
+            logger.debug("[CDA PROCESSOR] Compatibility: %d allergies, %d medications",
+                         len(clinical_arrays.get('allergies') or []), len(clinical_arrays.get('medications') or []))
+            if clinical_arrays.get('medications'):
+                first_med = clinical_arrays['medications'][0]
+                logger.debug("[CDA PROCESSOR] Compatibility: first med dose_quantity: %s", first_med.get('dose_quantity', 'NOT_FOUND'))
             
         # CRITICAL: Add debug info that will appear in template
         context['debug_compatibility_meds_count'] = len(clinical_arrays.get('medications', []))
@@ -2606,49 +2495,13 @@ class CDAViewProcessor:
         """
         Format CDA date string to human-readable format.
         
-        Converts dates like "19971006" or "1997-10-06" to "Oct 06, 1997"
+        Converts dates like "19971006" or "1997-10-06" to "Oct 06, 1997";
+        unparseable values are returned unchanged
         """
-        import re
-        from datetime import datetime
-        
         if not cda_date:
             return None
         
-        try:
-            # Remove any timezone info and clean up
-            date_clean = re.sub(r'[T\+\-].*$', '', cda_date)
-            
-            # Handle different date formats
-            if len(date_clean) == 8 and date_clean.isdigit():
-                # Format: YYYYMMDD (19971006)
-                year = date_clean[:4]
-                month = date_clean[4:6]
-                day = date_clean[6:8]
-                date_obj = datetime.strptime(f"{year}-{month}-{day}", "%Y-%m-%d")
-            elif '-' in date_clean:
-                # Format: YYYY-MM-DD
-                date_obj = datetime.strptime(date_clean[:10], "%Y-%m-%d")
-            elif '/' in date_clean:
-                # Format: DD/MM/YYYY or MM/DD/YYYY
-                parts = date_clean.split('/')
-                if len(parts) == 3:
-                    if len(parts[2]) == 4:  # DD/MM/YYYY or MM/DD/YYYY
-                        # Try both formats
-                        try:
-                            date_obj = datetime.strptime(date_clean, "%d/%m/%Y")
-                        except ValueError:
-                            date_obj = datetime.strptime(date_clean, "%m/%d/%Y")
-                    else:
-                        return None
-            else:
-                return None
-            
-            # Format as "Oct 06, 1997"
-            return date_obj.strftime("%b %d, %Y")
-            
-        except (ValueError, IndexError) as e:
-            logger.warning(f"[CDA PROCESSOR] Could not parse date '{cda_date}': {e}")
-            return cda_date  # Return original if parsing fails
+        return format_date(cda_date, "short", default=cda_date)
     
     def _format_dose_for_display(self, dose_quantity_struct: dict) -> dict:
         """Format dose quantity structure for optimal UI display."""
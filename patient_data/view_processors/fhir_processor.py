@@ -16,6 +16,7 @@ from django.shortcuts import render
 from .context_builders import ContextBuilder
 from ..services.fhir_bundle_parser import FHIRBundleParser
 from ..services.fhir_agent_service import FHIRAgentService
+from ..utils.performance_logging import log_stage
 
 logger = logging.getLogger(__name__)
 
@@ -139,7 +140,8 @@ class FHIRViewProcessor:
             }
             logger.info(f"[FHIR PROCESSOR] Clinical sections status: {clinical_sections_status}")
             
-            return render(request, 'patient_data/enhanced_patient_cda.html', context)
+            with log_stage('fhir_view_processor', 'render', session_id=session_id):
+                return render(request, 'patient_data/enhanced_patient_cda.html', context)
             
         except Exception as e:
             logger.error(f"[FHIR PROCESSOR] Error processing FHIR patient view: {e}")
@@ -26,25 +26,39 @@ from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ValidationError
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import redirect, render
+from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
-from xhtml2pdf import pisa
 
 from ncp_gateway.models import Patient  # Add import for NCP gateway Patient model
 
 from .forms import PatientDataForm
 from .models import PatientData
 from .services import EUPatientSearchService, PatientCredentials
+from .services.cda_render_cache import DocumentRenderError, cda_render_cache
 from .services.clinical_pdf_service import ClinicalDocumentPDFService
 from .services.fhir_agent_service import FHIRAgentService
+from .services.orcd_attachment_store import AttachmentNotFound, orcd_attachment_store
 from .services.section_processors import PatientSectionProcessor
+from .services.session_data_service import SessionDataService
 from .services.terminology_service import CentralTerminologyService
 from .services.immunizations_extractor import ImmunizationsExtractor
 from .services.pregnancy_history_extractor import PregnancyHistoryExtractor
 from .services.social_history_extractor import SocialHistoryExtractor
+from .utils.request_profiling import span
 
 logger = logging.getLogger(__name__)
 
+# Bump when the structured CDA HTML output changes, to invalidate cached renders
+CDA_HTML_RENDERER_VERSION = "2"
+
+
+def _pisa():
+    """xhtml2pdf, imported on first PDF export (it pulls in reportlab and pyHanko)"""
+    from xhtml2pdf import pisa
+
+    return pisa
+
 
 # Mandatory Clinical Sections (always displayed even if empty)
 MANDATORY_CLINICAL_SECTIONS = {
@@ -2041,7 +2055,9 @@ def patient_data_view(request):
                     logger.info(f"Anonymous patient search for {patient_id} from {country_code}")
                 
                 # Store in Django session for both authenticated and anonymous users
-                request.session[f"patient_match_{session_id}"] = patient_session_data
+                SessionDataService.store_patient_match(
+                    request, session_id, patient_session_data
+                )
 
                 # Add success message
                 messages.success(
@@ -2115,8 +2131,7 @@ def patient_data_view(request):
                         temp_patient.id = patient_id_param
 
                         # Store the match information in session for patient details view
-                        session_key = f"patient_match_{patient_id_param}"
-                        request.session[session_key] = {
+                        SessionDataService.store_patient_match(request, patient_id_param, {
                             "patient_data": match.patient_data,
                             "match_score": match.match_score,
                             "confidence_score": match.confidence_score,
@@ -2126,7 +2141,7 @@ def patient_data_view(request):
                             "l3_cda_path": match.l3_cda_path,
                             "available_documents": match.available_documents,
                             "file_path": getattr(match, "file_path", ""),
-                        }
+                        })
 
                         # Success message with match information
                         messages.success(
@@ -2381,7 +2396,9 @@ def direct_patient_view(request, patient_id):
             pass
 
         # Store in traditional session for backward compatibility
-        request.session[f"patient_match_{session_id}"] = patient_session_data
+        SessionDataService.store_patient_match(
+            request, session_id, patient_session_data
+        )
 
         # Add appropriate success message
         if database_record:
@@ -2520,8 +2537,9 @@ def patient_details_view(request, patient_id):
                     }
 
                     # Store in session
-                    session_key = f"patient_match_{patient_id}"
-                    request.session[session_key] = match_data
+                    SessionDataService.store_patient_match(
+                        request, patient_id, match_data
+                    )
 
                     messages.success(
                         request,
@@ -2657,7 +2675,7 @@ def patient_details_view(request, patient_id):
 
                     # Update the session data
                     match_data["patient_data"] = patient_data_dict
-                    request.session[session_key] = match_data
+                    SessionDataService.store_patient_match(request, patient_id, match_data)
 
                     logger.info(
                         f"Re-extracted identifiers: primary={primary_patient_id}, secondary={secondary_patient_id}"
@@ -3080,7 +3098,8 @@ def patient_details_view(request, patient_id):
         # FINAL DEBUG: Verify document lists just before rendering template
         logger.info(f"[FINAL_RENDER_DEBUG] Patient {patient_id}: Rendering template with l1_documents={len(context.get('l1_documents', []))}, l3_documents={len(context.get('l3_documents', []))}, l1_available={context.get('l1_available', False)}, l3_available={context.get('l3_available', False)}")
         
-        return render(request, "patient_data/patient_details.html", context)
+        with span("template.render"):
+            return render(request, "patient_data/patient_details.html", context)
     else:
         # Session data is missing - provide fallback with clear message
         logger.warning(
@@ -3139,7 +3158,8 @@ def patient_details_view(request, patient_id):
         else:
             logger.info("[ENHANCED_MEDICATIONS_FALLBACK] No enhanced medications found in session")
 
-        return render(request, "patient_data/patient_details.html", context)
+        with span("template.render"):
+            return render(request, "patient_data/patient_details.html", context)
 
 
 def _enhance_extended_data_for_templates(context):
@@ -3347,19 +3367,12 @@ def patient_cda_view(request, session_id, cda_type=None):
     # Session data recovery logic for cross-session compatibility
     target_key = f"patient_match_{session_id}"
     if target_key not in request.session:
-        logger.info(f"[ROUTER] Session data not in current request.session, searching database...")
-        from django.contrib.sessions.models import Session
-        
-        for db_session in Session.objects.all():
-            try:
-                session_data = db_session.get_decoded()
-                if target_key in session_data:
-                    logger.info(f"[ROUTER] Found {target_key} in database session, copying to current session")
-                    request.session[target_key] = session_data[target_key]
-                    request.session.save()
-                    break
-            except:
-                continue
+        logger.info(f"[ROUTER] Session data not in current request.session, looking up session index...")
+        match_data = SessionDataService.find_indexed_match_data(session_id)
+        if match_data is not None:
+            logger.info(f"[ROUTER] Found {target_key} in database session, copying to current session")
+            SessionDataService.store_patient_match(request, session_id, match_data)
+            request.session.save()
     
     try:
         # PHASE 2: FHIR-CDA ARCHITECTURE SEPARATION
@@ -3531,12 +3544,6 @@ def download_cda_pdf(request, patient_id):
             messages.error(request, "No CDA document found for this patient.")
             return redirect("patient_data:patient_details", patient_id=patient_id)
 
-        # Get the enhanced CDA processor to render the structured view
-        from .services.enhanced_cda_processor import EnhancedCDAProcessor
-
-        # Process the CDA content to get structured sections
-        processor = EnhancedCDAProcessor()
-
         # Use L3 content if available, otherwise fall back to main content
         cda_content = match_data.get("l3_cda_content") or match_data.get(
             "cda_content", ""
@@ -3546,26 +3553,31 @@ def download_cda_pdf(request, patient_id):
             messages.error(request, "No CDA content available for processing.")
             return redirect("patient_data:patient_details", patient_id=patient_id)
 
-        # Process the CDA content
-        processed_data = processor.process_clinical_sections(cda_content)
-
-        logger.info(
-            f"Processed CDA into {processed_data.get('sections_count', 0)} sections"
-        )
+        target_language = request.GET.get("target_language", "en")
 
-        # Extract sections from the processed data
-        if not processed_data.get("success", False):
-            messages.error(
-                request,
-                f"Error processing CDA: {processed_data.get('error', 'Unknown error')}",
+        # Render the sections once per document, language and renderer
+        # version; concurrent downloads of the same document share a single
+        # render. The patient header and generation time are not cached.
+        try:
+            sections_html = cda_render_cache.get_or_render(
+                (
+                    cda_render_cache.content_hash(cda_content),
+                    target_language,
+                    CDA_HTML_RENDERER_VERSION,
+                ),
+                lambda: render_structured_cda_html(cda_content, target_language),
             )
+        except DocumentRenderError as e:
+            messages.error(request, f"Error processing CDA: {e}")
             return redirect("patient_data:patient_details", patient_id=patient_id)
 
-        processed_sections = processed_data.get("sections", [])
-
-        # Generate self-contained HTML from the structured sections
         return generate_structured_cda_html(
-            request, patient_id, patient_data, match_data, processed_sections
+            request,
+            patient_id,
+            patient_data,
+            match_data,
+            [],
+            sections_html=sections_html.decode("utf-8"),
         )
 
     except Exception as e:
@@ -3578,6 +3590,21 @@ def download_cda_pdf(request, patient_id):
         return redirect("patient_data:patient_details", patient_id=patient_id)
 
 
+def render_structured_cda_html(cda_content, target_language="en"):
+    """Process CDA content into sections and render the section HTML"""
+    from .services.enhanced_cda_processor import EnhancedCDAProcessor
+
+    processor = EnhancedCDAProcessor(target_language=target_language)
+    processed_data = processor.process_clinical_sections(cda_content)
+
+    logger.info(f"Processed CDA into {processed_data.get('sections_count', 0)} sections")
+
+    if not processed_data.get("success", False):
+        raise DocumentRenderError(processed_data.get("error", "Unknown error"))
+
+    return render_cda_sections_html(processed_data.get("sections", [])).encode("utf-8")
+
+
 def transform_entries_for_interactive_tables(entries, section_title):
     """Transform entries from CDA processor format to interactive table format"""
     if not entries:
@@ -3788,140 +3815,156 @@ def extract_codes_simple(fields):
     return ", ".join(codes) if codes else ""
 
 
-def generate_structured_cda_html(
-    request, patient_id, patient_data, match_data, processed_sections
-):
-    """Generate self-contained HTML from structured CDA sections with collapsible functionality"""
+def render_cda_sections_html(processed_sections):
+    """Render the collapsible clinical sections of a structured CDA document
 
-    logger.info("Generating structured CDA HTML with collapsible sections")
+    The output only depends on the processed sections, so it can be cached
+    per document; the patient header and footer are added by
+    generate_structured_cda_html.
+    """
+    # Build the structured HTML content with collapsible sections
+    sections_html = ""
 
-    try:
-        # Get patient info
-        patient_info = match_data.get("patient_data", {})
+    logger.info(
+        f"Processing {len(processed_sections)} sections for HTML generation"
+    )
 
-        # Build the structured HTML content with collapsible sections
-        sections_html = ""
+    for i, section in enumerate(processed_sections):
+        section_title = section.get("title", "Unknown Section")
+
+        # Handle different section data formats from Enhanced CDA Processor
+        section_entries = []
+
+        # Check if section has structured_data (the new format)
+        if "structured_data" in section and section["structured_data"]:
+            section_entries = section["structured_data"]
+        # Check if section has table_rows (alternative format)
+        elif "table_rows" in section and section["table_rows"]:
+            section_entries = section["table_rows"]
+        # Check if section has table_data (country-specific format)
+        elif "table_data" in section and section["table_data"]:
+            section_entries = section["table_data"]
+        # Fallback to entries field
+        elif "entries" in section:
+            section_entries = section["entries"]
+
+        # Handle title format - could be string or dict
+        if isinstance(section_title, dict):
+            section_title = section_title.get(
+                "translated",
+                section_title.get(
+                    "coded", section_title.get("original", "Unknown Section")
+                ),
+            )
+
+        section_code = section.get("code", section.get("section_code", ""))
+        original_content = section.get("original_content", "")
 
         logger.info(
-            f"Processing {len(processed_sections)} sections for HTML generation"
+            f"Section {i}: '{section_title}' with {len(section_entries)} entries"
         )
 
-        for i, section in enumerate(processed_sections):
-            section_title = section.get("title", "Unknown Section")
+        if section_entries:
+            logger.info(f"First entry structure: {section_entries[0]}")
 
-            # Handle different section data formats from Enhanced CDA Processor
-            section_entries = []
-
-            # Check if section has structured_data (the new format)
-            if "structured_data" in section and section["structured_data"]:
-                section_entries = section["structured_data"]
-            # Check if section has table_rows (alternative format)
-            elif "table_rows" in section and section["table_rows"]:
-                section_entries = section["table_rows"]
-            # Check if section has table_data (country-specific format)
-            elif "table_data" in section and section["table_data"]:
-                section_entries = section["table_data"]
-            # Fallback to entries field
-            elif "entries" in section:
-                section_entries = section["entries"]
-
-            # Handle title format - could be string or dict
-            if isinstance(section_title, dict):
-                section_title = section_title.get(
-                    "translated",
-                    section_title.get(
-                        "coded", section_title.get("original", "Unknown Section")
-                    ),
-                )
+        if not section_entries:
+            logger.info(f"Skipping empty section: {section_title}")
+            continue
 
-            section_code = section.get("code", section.get("section_code", ""))
-            original_content = section.get("original_content", "")
+        # Transform entries to the format expected by interactive tables
+        transformed_entries = transform_entries_for_interactive_tables(
+            section_entries, section_title
+        )
 
-            logger.info(
-                f"Section {i}: '{section_title}' with {len(section_entries)} entries"
-            )
+        if not transformed_entries:
+            logger.info(f"No transformed entries for section: {section_title}")
+            continue
 
-            if section_entries:
-                logger.info(f"First entry structure: {section_entries[0]}")
+        section_id = f"section_{i}"
 
-            if not section_entries:
-                logger.info(f"Skipping empty section: {section_title}")
-                continue
+        sections_html += f"""
+        <div class="clinical-section" id="{section_id}">
+            <div class="section-header" onclick="toggleSection('{section_id}')">
+                <h2 class="section-title">
+                    <span class="toggle-icon">▼</span>
+                    {section_title}
+                    <small class="section-info">({len(section_entries)} entries)</small>
+                </h2>
+            </div>
 
-            # Transform entries to the format expected by interactive tables
-            transformed_entries = transform_entries_for_interactive_tables(
-                section_entries, section_title
-            )
+            <div class="section-content expanded" id="{section_id}_content">
+                <div class="section-tabs">
+                    <button class="tab-button active" onclick="showTab('{section_id}', 'structured')">
+                        [DATA] Structured View
+                    </button>
+                    <button class="tab-button" onclick="showTab('{section_id}', 'original')">
+                        📄 Original Content
+                    </button>
+                </div>
 
-            if not transformed_entries:
-                logger.info(f"No transformed entries for section: {section_title}")
-                continue
+                <div id="{section_id}_structured" class="tab-content active">
+        """
 
-            section_id = f"section_{i}"
+        # Handle different section types based on title
+        if "medication" in section_title.lower():
+            sections_html += generate_medication_table_html(
+                transformed_entries
+            )
+        elif (
+            "allergi" in section_title.lower() or "adverse" in section_title.lower()
+        ):
+            sections_html += generate_allergy_table_html(
+                transformed_entries
+            )
+        elif "procedure" in section_title.lower():
+            sections_html += generate_procedure_table_html(
+                transformed_entries
+            )
+        elif (
+            "problem" in section_title.lower()
+            or "diagnosis" in section_title.lower()
+        ):
+            sections_html += generate_problem_table_html(
+                transformed_entries
+            )
+        else:
+            # Generic table for other sections
+            sections_html += generate_generic_table_html(
+                transformed_entries
+            )
 
-            sections_html += f"""
-            <div class="clinical-section" id="{section_id}">
-                <div class="section-header" onclick="toggleSection('{section_id}')">
-                    <h2 class="section-title">
-                        <span class="toggle-icon">▼</span>
-                        {section_title}
-                        <small class="section-info">({len(section_entries)} entries)</small>
-                    </h2>
+        sections_html += f"""
                 </div>
 
-                <div class="section-content expanded" id="{section_id}_content">
-                    <div class="section-tabs">
-                        <button class="tab-button active" onclick="showTab('{section_id}', 'structured')">
-                            [DATA] Structured View
-                        </button>
-                        <button class="tab-button" onclick="showTab('{section_id}', 'original')">
-                            📄 Original Content
-                        </button>
+                <div id="{section_id}_original" class="tab-content">
+                    <div class="original-content">
+                        <h4>Original CDA Content (Code: {section_code})</h4>
+                        <pre class="xml-content">{html.escape(original_content[:2000]) if original_content else "No original content available"}</pre>
                     </div>
+                </div>
+            </div>
+        </div>
+        """
 
-                    <div id="{section_id}_structured" class="tab-content active">
-            """
+    return sections_html
 
-            # Handle different section types based on title
-            if "medication" in section_title.lower():
-                sections_html += generate_medication_table_html(
-                    transformed_entries
-                )
-            elif (
-                "allergi" in section_title.lower() or "adverse" in section_title.lower()
-            ):
-                sections_html += generate_allergy_table_html(
-                    transformed_entries
-                )
-            elif "procedure" in section_title.lower():
-                sections_html += generate_procedure_table_html(
-                    transformed_entries
-                )
-            elif (
-                "problem" in section_title.lower()
-                or "diagnosis" in section_title.lower()
-            ):
-                sections_html += generate_problem_table_html(
-                    transformed_entries
-                )
-            else:
-                # Generic table for other sections
-                sections_html += generate_generic_table_html(
-                    transformed_entries
-                )
 
-            sections_html += f"""
-                    </div>
+def generate_structured_cda_html(
+    request, patient_id, patient_data, match_data, processed_sections, sections_html=None
+):
+    """Generate self-contained HTML from structured CDA sections with collapsible functionality
 
-                    <div id="{section_id}_original" class="tab-content">
-                        <div class="original-content">
-                            <h4>Original CDA Content (Code: {section_code})</h4>
-                            <pre class="xml-content">{html.escape(original_content[:2000]) if original_content else "No original content available"}</pre>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            """
+    Pass already rendered ``sections_html`` to skip rendering the sections.
+    """
+
+    logger.info("Generating structured CDA HTML with collapsible sections")
+
+    try:
+        # Get patient info
+        patient_info = match_data.get("patient_data", {})
+
+        if sections_html is None:
+            sections_html = render_cda_sections_html(processed_sections)
 
         # Handle patient data format - could be dict or object
         if isinstance(patient_data, dict):
@@ -4511,7 +4554,8 @@ def generate_structured_cda_html(
         logger.info(f"HTML content length: {len(html_content)} characters")
 
         result = BytesIO()
-        pdf = pisa.pisaDocument(BytesIO(html_content.encode("UTF-8")), result)
+        with span("pdf.render"):
+            pdf = _pisa().pisaDocument(BytesIO(html_content.encode("UTF-8")), result)
 
         logger.info(f"PDF generation completed. Errors: {pdf.err}")
 
@@ -5094,7 +5138,8 @@ def generate_pdf_from_html(request, patient_id, patient_data, match_data):
         logger.info(f"HTML content length: {len(html_content)} characters")
 
         result = BytesIO()
-        pdf = pisa.pisaDocument(BytesIO(html_content.encode("UTF-8")), result)
+        with span("pdf.render"):
+            pdf = _pisa().pisaDocument(BytesIO(html_content.encode("UTF-8")), result)
 
         logger.info(f"PDF generation completed. Errors: {pdf.err}")
 
@@ -5474,7 +5519,8 @@ def generate_pdf_file_from_html(request, patient_id, patient_data, match_data):
         logger.info(f"HTML content length: {len(html_content)} characters")
 
         result = BytesIO()
-        pdf = pisa.pisaDocument(BytesIO(html_content.encode("UTF-8")), result)
+        with span("pdf.render"):
+            pdf = _pisa().pisaDocument(BytesIO(html_content.encode("UTF-8")), result)
 
         logger.info(f"PDF file generation completed. Errors: {pdf.err}")
 
@@ -5552,9 +5598,6 @@ def patient_orcd_view(request, patient_id):
             messages.error(request, "No CDA document found for this patient.")
             return redirect("patient_data:patient_details", patient_id=patient_id)
 
-        # Initialize PDF service
-        pdf_service = ClinicalDocumentPDFService()
-
         # For ORCD, we prefer L1 CDA as it typically contains the embedded PDF
         # Fall back to L3 CDA if L1 is not available
         l1_cda_content = match_data.get("l1_cda_content")
@@ -5576,7 +5619,9 @@ def patient_orcd_view(request, patient_id):
                 logger.info(
                     f"Attempting ORCD PDF extraction from {cda_type_used} CDA (content length: {len(orcd_cda_content)})"
                 )
-                pdf_attachments = pdf_service.extract_pdfs_from_xml(orcd_cda_content)
+                pdf_attachments = orcd_attachment_store.get_attachments(
+                    orcd_cda_content
+                )
                 orcd_available = len(pdf_attachments) > 0
                 logger.info(
                     f"ORCD extraction from {cda_type_used} CDA: {len(pdf_attachments)} PDFs found"
@@ -5655,9 +5700,6 @@ def download_orcd_pdf(request, patient_id, attachment_index=0):
             messages.error(request, "No CDA document found for this patient.")
             return redirect("patient_data:patient_details", patient_id=patient_id)
 
-        # Initialize PDF service and extract PDFs
-        pdf_service = ClinicalDocumentPDFService()
-
         # For ORCD download, prefer L1 CDA
         l1_cda_content = match_data.get("l1_cda_content")
         l3_cda_content = match_data.get("l3_cda_content")
@@ -5676,27 +5718,23 @@ def download_orcd_pdf(request, patient_id, attachment_index=0):
             logger.info(
                 f"Attempting ORCD PDF download from {cda_type_used} CDA (content length: {len(orcd_cda_content)})"
             )
-            pdf_attachments = pdf_service.extract_pdfs_from_xml(orcd_cda_content)
-
-            if not pdf_attachments or attachment_index >= len(pdf_attachments):
-                messages.error(
-                    request, f"PDF attachment not found in {cda_type_used} CDA."
-                )
-                return redirect("patient_data:patient_orcd_view", patient_id=patient_id)
-
-            # Get the requested PDF attachment
-            pdf_attachment = pdf_attachments[attachment_index]
-            pdf_data = pdf_attachment["data"]
+            manifest = orcd_attachment_store.get_manifest(orcd_cda_content)
             filename = f"{patient_data.given_name}_{patient_data.family_name}_ORCD_{cda_type_used}.pdf"
 
-            logger.info(
-                f"Downloaded ORCD PDF from {cda_type_used} CDA for patient {patient_id} ({len(pdf_data)} bytes)"
+            # Stream the decoded attachment (supports Range/If-None-Match)
+            response = orcd_attachment_store.serve(
+                request, manifest, attachment_index, filename, disposition="attachment"
             )
+            response["Cache-Control"] = "private, no-cache"
 
-            # Return PDF response
-            return pdf_service.get_pdf_response(
-                pdf_data, filename, disposition="attachment"
+            logger.info(
+                f"Serving ORCD PDF download from {cda_type_used} CDA for patient {patient_id} (status {response.status_code})"
             )
+            return response
+
+        except AttachmentNotFound:
+            messages.error(request, f"PDF attachment not found in {cda_type_used} CDA.")
+            return redirect("patient_data:patient_orcd_view", patient_id=patient_id)
 
         except Exception as e:
             logger.error(f"Error downloading PDF: {e}")
@@ -5755,9 +5793,6 @@ def view_orcd_pdf(request, patient_id, attachment_index=0):
                 status=404,
             )
 
-        # Initialize PDF service and extract PDFs
-        pdf_service = ClinicalDocumentPDFService()
-
         # For ORCD viewing, prefer L1 CDA
         l1_cda_content = match_data.get("l1_cda_content")
         l3_cda_content = match_data.get("l3_cda_content")
@@ -5778,37 +5813,31 @@ def view_orcd_pdf(request, patient_id, attachment_index=0):
             logger.info(
                 f"Attempting ORCD PDF inline viewing from {cda_type_used} CDA (content length: {len(orcd_cda_content)})"
             )
-            pdf_attachments = pdf_service.extract_pdfs_from_xml(orcd_cda_content)
-
-            if not pdf_attachments or attachment_index >= len(pdf_attachments):
-                return HttpResponse(
-                    f"<html><body><h1>PDF not found</h1><p>PDF attachment not found in {cda_type_used} CDA.</p></body></html>",
-                    status=404,
-                )
-
-            # Get the requested PDF attachment
-            pdf_attachment = pdf_attachments[attachment_index]
-            pdf_data = pdf_attachment["data"]
+            manifest = orcd_attachment_store.get_manifest(orcd_cda_content)
             filename = f"{patient_data.given_name}_{patient_data.family_name}_ORCD_{cda_type_used}.pdf"
 
-            logger.info(
-                f"Viewing ORCD PDF inline from {cda_type_used} CDA for patient {patient_id} ({len(pdf_data)} bytes)"
-            )
-
-            # Return PDF response for inline viewing with enhanced headers
-            response = pdf_service.get_pdf_response(
-                pdf_data, filename, disposition="inline"
+            # Stream the decoded attachment; PDF viewers fetch pages with
+            # Range requests and revalidate with If-None-Match
+            response = orcd_attachment_store.serve(
+                request, manifest, attachment_index, filename, disposition="inline"
             )
 
-            # Add headers to help with PDF display
-            response["Cache-Control"] = "no-cache, no-store, must-revalidate"
-            response["Pragma"] = "no-cache"
-            response["Expires"] = "0"
+            # Private to the browser and always revalidated (patient data)
+            response["Cache-Control"] = "private, no-cache"
             response["X-Content-Type-Options"] = "nosniff"
             response["X-Frame-Options"] = "SAMEORIGIN"
 
+            logger.info(
+                f"Serving ORCD PDF inline from {cda_type_used} CDA for patient {patient_id} (status {response.status_code})"
+            )
             return response
 
+        except AttachmentNotFound:
+            return HttpResponse(
+                f"<html><body><h1>PDF not found</h1><p>PDF attachment not found in {cda_type_used} CDA.</p></body></html>",
+                status=404,
+            )
+
         except Exception as e:
             logger.error(f"Error viewing PDF: {e}")
             return HttpResponse(
@@ -5863,7 +5892,6 @@ def debug_orcd_pdf(request, patient_id):
                 )
 
             # Test PDF extraction
-            pdf_service = ClinicalDocumentPDFService()
             orcd_cda_content = l1_cda_content or l3_cda_content or ""
             cda_type_used = (
                 "L1" if l1_cda_content else ("L3" if l3_cda_content else "Unknown")
@@ -5871,9 +5899,8 @@ def debug_orcd_pdf(request, patient_id):
 
             if orcd_cda_content:
                 try:
-                    pdf_attachments = pdf_service.extract_pdfs_from_xml(
-                        orcd_cda_content
-                    )
+                    manifest = orcd_attachment_store.get_manifest(orcd_cda_content)
+                    pdf_attachments = manifest["attachments"]
                     debug_info.append(
                         f"<p><strong>PDF Attachments Found:</strong> {len(pdf_attachments)}</p>"
                     )
@@ -5882,15 +5909,16 @@ def debug_orcd_pdf(request, patient_id):
                     )
 
                     for i, pdf in enumerate(pdf_attachments):
+                        pdf_data = orcd_attachment_store.read_attachment(manifest, i)
                         debug_info.append(f"<p><strong>PDF {i + 1}:</strong></p>")
                         debug_info.append(f"<ul>")
                         debug_info.append(f"  <li>Size: {pdf['size']} bytes</li>")
                         debug_info.append(f"  <li>Filename: {pdf['filename']}</li>")
                         debug_info.append(
-                            f"  <li>Valid PDF header: {'✓' if pdf['data'].startswith(b'%PDF') else '✗'}</li>"
+                            f"  <li>Valid PDF header: {'✓' if pdf_data.startswith(b'%PDF') else '✗'}</li>"
                         )
                         debug_info.append(
-                            f"  <li>First 100 bytes: {pdf['data'][:100]}</li>"
+                            f"  <li>First 100 bytes: {pdf_data[:100]}</li>"
                         )
                         debug_info.append(f"</ul>")
 
@@ -5962,8 +5990,6 @@ def orcd_pdf_base64(request, patient_id, attachment_index=0):
         if not match_data:
             return HttpResponse("No CDA document found", status=404)
 
-        # Initialize PDF service and extract PDFs
-        pdf_service = ClinicalDocumentPDFService()
         l1_cda_content = match_data.get("l1_cda_content")
         l3_cda_content = match_data.get("l3_cda_content")
         orcd_cda_content = (
@@ -5974,19 +6000,19 @@ def orcd_pdf_base64(request, patient_id, attachment_index=0):
             return HttpResponse("No CDA content available", status=404)
 
         try:
-            pdf_attachments = pdf_service.extract_pdfs_from_xml(orcd_cda_content)
-
-            if not pdf_attachments or attachment_index >= len(pdf_attachments):
-                return HttpResponse("PDF attachment not found", status=404)
-
-            # Get the PDF data
-            pdf_attachment = pdf_attachments[attachment_index]
-            pdf_data = pdf_attachment["data"]
+            manifest = orcd_attachment_store.get_manifest(orcd_cda_content)
+            pdf_attachment = orcd_attachment_store.get_attachment(
+                manifest, attachment_index
+            )
 
-            # Convert to base64
-            pdf_base64 = base64.b64encode(pdf_data).decode("utf-8")
+            # Embed the streamed PDF by URL instead of inlining a base64
+            # data URL, so the browser can fetch it with Range requests
+            pdf_url = reverse(
+                "patient_data:view_orcd_pdf_indexed",
+                kwargs={"patient_id": patient_id, "attachment_index": attachment_index},
+            )
 
-            # Create HTML page with embedded PDF using data URL
+            # Create HTML page with embedded PDF
             html_content = f"""
             <!DOCTYPE html>
             <html>
@@ -6042,20 +6068,20 @@ def orcd_pdf_base64(request, patient_id, attachment_index=0):
                     <div class="pdf-header">
                         <h2>ORCD PDF Document</h2>
                         <p><strong>Patient:</strong> {patient_data.given_name} {patient_data.family_name}</p>
-                        <p><strong>Document Size:</strong> {len(pdf_data):,} bytes</p>
+                        <p><strong>Document Size:</strong> {pdf_attachment['size']:,} bytes</p>
                         <a href="javascript:history.back()" class="btn">← Back</a>
                         <a href="/patients/orcd/{patient_id}/download/" class="btn">Download PDF</a>
                     </div>
 
-                    <!-- Primary: Object with data URL -->
+                    <!-- Primary: Object with streamed PDF -->
                     <object
                         class="pdf-viewer"
-                        data="data:application/pdf;base64,{pdf_base64}"
+                        data="{pdf_url}"
                         type="application/pdf">
 
-                        <!-- Fallback: Embed with data URL -->
+                        <!-- Fallback: Embed with streamed PDF -->
                         <embed
-                            src="data:application/pdf;base64,{pdf_base64}"
+                            src="{pdf_url}"
                             type="application/pdf"
                             width="100%"
                             height="800px" />
@@ -6068,20 +6094,14 @@ def orcd_pdf_base64(request, patient_id, attachment_index=0):
                         </div>
                     </object>
                 </div>
-
-                <script>
-                    // Try to detect if PDF loaded successfully
-                    setTimeout(function() {{
-                        console.log('PDF data URL length: {len(pdf_base64)} characters');
-                        console.log('PDF starts with valid header: {str(pdf_data.startswith(b"%PDF")).lower()}');
-                    }}, 1000);
-                </script>
             </body>
             </html>
             """
 
             return HttpResponse(html_content)
 
+        except AttachmentNotFound:
+            return HttpResponse("PDF attachment not found", status=404)
         except Exception as e:
             logger.error(f"Error creating base64 PDF: {e}")
             return HttpResponse(f"Error processing PDF: {str(e)}", status=500)
@@ -6818,7 +6838,7 @@ def select_document_view(request, patient_id):
                         messages.error(request, "Error loading selected document.")
                         return redirect("patient_data:select_document", patient_id=patient_id)
                     
-                    request.session[session_key] = match_data
+                    SessionDataService.store_patient_match(request, patient_id, match_data)
                     messages.success(
                         request, f"Selected L1 document {document_index + 1}"
                     )
@@ -6845,7 +6865,7 @@ def select_document_view(request, patient_id):
                         messages.error(request, "Error loading selected document.")
                         return redirect("patient_data:select_document", patient_id=patient_id)
                     
-                    request.session[session_key] = match_data
+                    SessionDataService.store_patient_match(request, patient_id, match_data)
                     messages.success(
                         request, f"Selected L3 document {document_index + 1}"
                     )
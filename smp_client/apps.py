@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SmpClientConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "smp_client"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,163 @@
+"""
+Precompiled SMP ServiceMetadata responses
+
+The ServiceMetadata XML for a (participant, document type) pair is built
+once and stored in the cache together with a strong ETag. Saving or
+deleting any model that contributes to the document bumps a cache
+generation (see signals.py), which invalidates every stored response.
+Entries also expire when one of their endpoints becomes active or expires,
+since endpoint validity is part of the document.
+
+The generation is shared only by processes sharing the cache backend. With
+the process-local LocMemCache, entries are kept at most
+SMP_METADATA_LOCAL_CACHE_TIMEOUT seconds (60 by default): that is how long
+another worker can serve a response from before a change.
+"""
+
+import hashlib
+import xml.etree.ElementTree as ET
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from eu_ncp_server.services.cache_generation import CacheGeneration
+
+# Defaults (overridable in settings)
+DEFAULT_CACHE_TIMEOUT = 60 * 60
+
+service_metadata_generation = CacheGeneration(
+    "smp_service_metadata:generation", "SMP_METADATA_LOCAL_CACHE_TIMEOUT"
+)
+
+
+def _entry_key(
+    generation: int, participant_scheme: str, participant_id: str, document_type_id: str
+) -> str:
+    identity = "\x1f".join((participant_scheme, participant_id, document_type_id))
+    digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()
+    return f"smp_service_metadata:{generation}:{digest}"
+
+
+def invalidate_service_metadata():
+    """Invalidate all cached ServiceMetadata responses"""
+    service_metadata_generation.bump()
+
+
+def get_cached_service_metadata(
+    participant_scheme: str, participant_id: str, document_type_id: str
+) -> Optional[Dict[str, str]]:
+    """Return the cached {"xml", "etag"} entry, or None"""
+    return cache.get(
+        _entry_key(service_metadata_generation.current(), participant_scheme, participant_id, document_type_id)
+    )
+
+
+def store_service_metadata(
+    participant_scheme: str,
+    participant_id: str,
+    document_type_id: str,
+    service_metadata,
+) -> Dict[str, str]:
+    """Serialize a ServiceMetadata response, cache it and return the entry"""
+    # Read the generation before the models, so a save racing with the
+    # build invalidates this entry instead of being hidden by it
+    generation = service_metadata_generation.current()
+    xml_str, next_change = build_service_metadata_xml(
+        service_metadata, participant_scheme, participant_id, document_type_id
+    )
+    entry = {
+        "xml": xml_str,
+        "etag": f'"{hashlib.sha256(xml_str.encode("utf-8")).hexdigest()[:32]}"',
+    }
+
+    timeout = service_metadata_generation.max_age(
+        getattr(settings, "SMP_METADATA_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT)
+    )
+    if next_change is not None:
+        seconds_to_change = (next_change - timezone.now()).total_seconds()
+        timeout = max(1, min(timeout, int(seconds_to_change)))
+
+    cache.set(
+        _entry_key(generation, participant_scheme, participant_id, document_type_id),
+        entry,
+        timeout,
+    )
+    return entry
+
+
+def build_service_metadata_xml(
+    service_metadata, participant_scheme: str, participant_id: str, document_type_id: str
+):
+    """
+    Build the SMP ServiceMetadata XML document
+
+    Returns:
+        Tuple of (xml string, datetime of the next endpoint activation or
+        expiration that would change the document, or None)
+    """
+    now = timezone.now()
+    next_change = None
+
+    root = ET.Element("ServiceMetadata")
+    root.set("xmlns", "http://busdox.org/serviceMetadata/publishing/1.0/")
+
+    # Service Information
+    service_info = ET.SubElement(root, "ServiceInformation")
+
+    # Participant Identifier
+    participant_id_elem = ET.SubElement(service_info, "ParticipantIdentifier")
+    participant_id_elem.set("scheme", participant_scheme)
+    participant_id_elem.text = participant_id
+
+    # Document Identifier
+    doc_id_elem = ET.SubElement(service_info, "DocumentIdentifier")
+    doc_id_elem.set("scheme", service_metadata.document_type.document_scheme.scheme_id)
+    doc_id_elem.text = document_type_id
+
+    # Process List
+    process_list = ET.SubElement(service_info, "ProcessList")
+
+    for endpoint in service_metadata.endpoints.filter(is_active=True).select_related(
+        "process"
+    ):
+        for boundary in (endpoint.service_activation_date, endpoint.service_expiration_date):
+            if boundary and boundary > now and (next_change is None or boundary < next_change):
+                next_change = boundary
+
+        if not endpoint.is_valid():
+            continue
+
+        process_elem = ET.SubElement(process_list, "Process")
+
+        # Process Identifier
+        process_id_elem = ET.SubElement(process_elem, "ProcessIdentifier")
+        process_id_elem.set("scheme", endpoint.process.process_scheme)
+        process_id_elem.text = endpoint.process.process_identifier
+
+        # Service Endpoint List
+        endpoint_list = ET.SubElement(process_elem, "ServiceEndpointList")
+        endpoint_elem = ET.SubElement(endpoint_list, "Endpoint")
+        endpoint_elem.set("transportProfile", endpoint.transport_profile)
+
+        # Endpoint URL
+        endpoint_url_elem = ET.SubElement(endpoint_elem, "EndpointURI")
+        endpoint_url_elem.text = endpoint.endpoint_url
+
+        # Certificate
+        if endpoint.certificate:
+            cert_elem = ET.SubElement(endpoint_elem, "Certificate")
+            cert_elem.text = endpoint.certificate
+
+        # Service Activation Date
+        if endpoint.service_activation_date:
+            activation_elem = ET.SubElement(endpoint_elem, "ServiceActivationDate")
+            activation_elem.text = endpoint.service_activation_date.isoformat()
+
+        # Service Expiration Date
+        if endpoint.service_expiration_date:
+            expiration_elem = ET.SubElement(endpoint_elem, "ServiceExpirationDate")
+            expiration_elem.text = endpoint.service_expiration_date.isoformat()
+
+    return ET.tostring(root, encoding="unicode", method="xml"), next_change
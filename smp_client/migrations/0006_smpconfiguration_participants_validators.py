@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("smp_client", "0005_signingcertificate_md5_fingerprint_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="smpconfiguration",
+            name="participants_etag",
+            field=models.CharField(
+                blank=True,
+                help_text="ETag of the last synced participant list",
+                max_length=255,
+            ),
+        ),
+        migrations.AddField(
+            model_name="smpconfiguration",
+            name="participants_last_modified",
+            field=models.CharField(
+                blank=True,
+                help_text="Last-Modified of the last synced participant list",
+                max_length=100,
+            ),
+        ),
+    ]
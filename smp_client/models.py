@@ -446,8 +446,8 @@ class SMPQuery(models.Model):
     response_time_ms = models.IntegerField(null=True, blank=True)
     error_message = models.TextField(blank=True)
 
-    # Metadata
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Metadata (set when the query is recorded, not when the buffered row is written)
+    timestamp = models.DateTimeField(default=timezone.now)
 
     class Meta:
         indexes = [
@@ -474,6 +474,14 @@ class SMPConfiguration(models.Model):
         default=24, help_text="Sync interval in hours"
     )
     last_sync = models.DateTimeField(null=True, blank=True)
+    participants_etag = models.CharField(
+        max_length=255, blank=True, help_text="ETag of the last synced participant list"
+    )
+    participants_last_modified = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Last-Modified of the last synced participant list",
+    )
 
     # Local SMP Settings
     local_smp_enabled = models.BooleanField(default=True)
@@ -0,0 +1,137 @@
+"""
+Buffered SMPQuery logging
+
+SMP lookups record an SMPQuery row for analytics. Instead of an INSERT on
+the request thread, rows are appended to an in-process buffer and written
+with bulk_create by a background flusher, every SMP_QUERY_LOG_FLUSH_INTERVAL
+seconds or as soon as SMP_QUERY_LOG_BATCH_SIZE rows are waiting. Buffered
+rows are flushed on interpreter exit.
+
+Rows are timestamped when recorded, not when written. If a batch is
+rejected, its rows are retried one by one and only the rejected rows are
+dropped; rows are kept for the next flush only while the database is
+unreachable.
+"""
+
+import atexit
+import logging
+import threading
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, connections, transaction
+from django.utils import timezone
+
+from .models import SMPQuery
+
+logger = logging.getLogger(__name__)
+
+# Defaults (overridable in settings)
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL_SECONDS = 5
+# Rows dropped, oldest first, if the database stays unavailable
+MAX_BUFFERED_ROWS = 10_000
+
+
+class SMPQueryLogBuffer:
+    """Batches SMPQuery rows and writes them from a background thread"""
+
+    def __init__(self):
+        self._rows: List[SMPQuery] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def batch_size(self) -> int:
+        return getattr(settings, "SMP_QUERY_LOG_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+
+    @property
+    def flush_interval(self) -> float:
+        return getattr(
+            settings, "SMP_QUERY_LOG_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL_SECONDS
+        )
+
+    def record(self, **fields):
+        """Queue one SMPQuery row; never touches the database"""
+        fields.setdefault("timestamp", timezone.now())
+        with self._lock:
+            self._rows.append(SMPQuery(**fields))
+            self._trim()
+            pending = len(self._rows)
+
+        self._ensure_started()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write all buffered rows; returns the number written"""
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return 0
+
+        try:
+            with transaction.atomic():
+                SMPQuery.objects.bulk_create(rows, batch_size=self.batch_size)
+            return len(rows)
+        except (OperationalError, InterfaceError) as e:
+            logger.error(f"Database unavailable, keeping {len(rows)} SMP query log rows: {e}")
+            self._requeue(rows)
+            return 0
+        except Exception as e:
+            logger.warning(
+                f"Batch write of {len(rows)} SMP query log rows failed, retrying row by row: {e}"
+            )
+
+        written = 0
+        for position, row in enumerate(rows):
+            try:
+                with transaction.atomic():
+                    row.save(force_insert=True)
+            except (OperationalError, InterfaceError) as e:
+                logger.error(f"Database unavailable, keeping {len(rows) - position} SMP query log rows: {e}")
+                self._requeue(rows[position:])
+                break
+            except Exception as e:
+                logger.error(
+                    f"Dropping rejected SMP query log row ({row.query_type} "
+                    f"{row.participant_scheme}::{row.participant_id}): {e}"
+                )
+            else:
+                written += 1
+        return written
+
+    def _requeue(self, rows: List[SMPQuery]):
+        """Put unwritten rows back ahead of the rows recorded since"""
+        with self._lock:
+            self._rows[:0] = rows
+            self._trim()
+
+    def _trim(self):
+        if len(self._rows) > MAX_BUFFERED_ROWS:
+            del self._rows[: len(self._rows) - MAX_BUFFERED_ROWS]
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="smp-query-log", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            finally:
+                connections.close_all()
+
+
+smp_query_log = SMPQueryLogBuffer()
+atexit.register(smp_query_log.flush)
@@ -0,0 +1,51 @@
+"""
+SMP model signal handlers
+
+Any change to a model that is serialized into ServiceMetadata responses
+invalidates the precompiled responses in metadata_cache once the change is
+committed, so no worker rebuilds a response from the old rows under the new
+generation.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .metadata_cache import invalidate_service_metadata
+from .models import (
+    DocumentType,
+    DocumentTypeScheme,
+    Endpoint,
+    Participant,
+    ParticipantIdentifierScheme,
+    ProcessIdentifier,
+    ServiceGroup,
+    ServiceMetadata,
+)
+
+SERVICE_METADATA_MODELS = (
+    Participant,
+    ParticipantIdentifierScheme,
+    ServiceGroup,
+    ServiceMetadata,
+    DocumentType,
+    DocumentTypeScheme,
+    Endpoint,
+    ProcessIdentifier,
+)
+
+
+def invalidate_service_metadata_cache(sender, **kwargs):
+    transaction.on_commit(invalidate_service_metadata, using=kwargs.get("using"))
+
+
+for model in SERVICE_METADATA_MODELS:
+    post_save.connect(
+        invalidate_service_metadata_cache,
+        sender=model,
+        dispatch_uid=f"smp_metadata_cache_save_{model.__name__}",
+    )
+    post_delete.connect(
+        invalidate_service_metadata_cache,
+        sender=model,
+        dispatch_uid=f"smp_metadata_cache_delete_{model.__name__}",
+    )
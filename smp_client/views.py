@@ -12,7 +12,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 import requests
@@ -21,6 +21,7 @@ import json
 from datetime import datetime, timedelta
 import logging
 import os
+import time
 import tempfile
 import base64
 
@@ -40,6 +41,12 @@ from .models import (
     DocumentTemplate,
     SigningCertificate,
 )
+from .metadata_cache import (
+    get_cached_service_metadata,
+    invalidate_service_metadata,
+    store_service_metadata,
+)
+from .query_log import smp_query_log
 
 logger = logging.getLogger(__name__)
 
@@ -108,6 +115,130 @@ def participant_detail(request, participant_id):
     return render(request, "smp_client/participant_detail.html", context)
 
 
+# Participant fields refreshed from the European SMP participant list
+SYNCED_PARTICIPANT_FIELDS = (
+    "participant_name",
+    "country_code",
+    "organization_type",
+    "is_active",
+)
+
+
+def _sync_participants(participants_data, european_smp_url):
+    """
+    Apply a European SMP participant list in bulk
+
+    Existing participants are loaded in one query and diffed in memory; new
+    and changed rows are written with bulk_create/bulk_update in chunks of
+    SMP_SYNC_BATCH_SIZE inside a single transaction.
+
+    Returns:
+        Tuple of (synced, created, updated) participant counts
+    """
+    batch_size = getattr(settings, "SMP_SYNC_BATCH_SIZE", 500)
+
+    # Last entry wins for participants listed more than once
+    incoming = {}
+    for participant_data in participants_data:
+        participant_id = participant_data.get("participantIdentifier")
+        scheme_id = participant_data.get("participantScheme")
+        if participant_id and scheme_id:
+            incoming[(participant_id, scheme_id)] = {
+                "participant_name": participant_data.get("participantName", ""),
+                "country_code": participant_data.get("countryCode", ""),
+                "organization_type": participant_data.get("organizationType", ""),
+                "is_active": True,
+            }
+
+    if not incoming:
+        return 0, 0, 0
+
+    with transaction.atomic():
+        domain, _ = Domain.objects.get_or_create(
+            domain_code="ehealth-actorid-qns",
+            defaults={
+                "domain_name": "EU eHealth Domain",
+                "sml_subdomain": "ehealth",
+                "smp_url": european_smp_url,
+                "is_test_domain": True,
+            },
+        )
+
+        # Ensure all schemes exist, then resolve them once
+        scheme_ids = {scheme_id for _, scheme_id in incoming}
+        schemes = {
+            scheme.scheme_id: scheme
+            for scheme in ParticipantIdentifierScheme.objects.filter(
+                scheme_id__in=scheme_ids
+            )
+        }
+        missing_schemes = scheme_ids - schemes.keys()
+        if missing_schemes:
+            ParticipantIdentifierScheme.objects.bulk_create(
+                [
+                    ParticipantIdentifierScheme(
+                        scheme_id=scheme_id, scheme_name=scheme_id, is_active=True
+                    )
+                    for scheme_id in missing_schemes
+                ],
+                ignore_conflicts=True,
+            )
+            schemes.update(
+                (scheme.scheme_id, scheme)
+                for scheme in ParticipantIdentifierScheme.objects.filter(
+                    scheme_id__in=missing_schemes
+                )
+            )
+
+        existing = {
+            (participant.participant_identifier, participant.participant_scheme.scheme_id): participant
+            for participant in Participant.objects.filter(
+                domain=domain, participant_scheme__scheme_id__in=scheme_ids
+            )
+            .select_related("participant_scheme")
+            .only(
+                "id",
+                "participant_identifier",
+                "participant_scheme__scheme_id",
+                *SYNCED_PARTICIPANT_FIELDS,
+            )
+        }
+
+        now = timezone.now()
+        to_create = []
+        to_update = []
+        for key, values in incoming.items():
+            participant = existing.get(key)
+            if participant is None:
+                to_create.append(
+                    Participant(
+                        participant_identifier=key[0],
+                        participant_scheme=schemes[key[1]],
+                        domain=domain,
+                        **values,
+                    )
+                )
+            elif any(getattr(participant, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(participant, field, value)
+                # bulk_update does not apply auto_now
+                participant.last_updated = now
+                to_update.append(participant)
+
+        Participant.objects.bulk_create(to_create, batch_size=batch_size)
+        Participant.objects.bulk_update(
+            to_update,
+            [*SYNCED_PARTICIPANT_FIELDS, "last_updated"],
+            batch_size=batch_size,
+        )
+
+    # Bulk writes do not send model signals
+    if to_create or to_update:
+        invalidate_service_metadata()
+
+    return len(incoming), len(to_create), len(to_update)
+
+
 def european_smp_sync(request):
     """Sync data from European test SMP server"""
     if request.method == "POST" and request.user.is_staff:
@@ -120,62 +251,47 @@ def european_smp_sync(request):
             european_smp_url = config.european_smp_url.rstrip("/")
             participants_url = f"{european_smp_url}/api/v1/participants"
 
-            response = requests.get(participants_url, timeout=30)
-            if response.status_code == 200:
+            # Conditional GET: skip the sync if the list has not changed
+            headers = {}
+            if config.participants_etag:
+                headers["If-None-Match"] = config.participants_etag
+            if config.participants_last_modified:
+                headers["If-Modified-Since"] = config.participants_last_modified
+
+            response = requests.get(participants_url, headers=headers, timeout=30)
+            if response.status_code == 304:
+                config.last_sync = timezone.now()
+                config.save(update_fields=["last_sync"])
+
+                return JsonResponse(
+                    {
+                        "success": True,
+                        "not_modified": True,
+                        "synced_participants": 0,
+                        "last_sync": config.last_sync.isoformat(),
+                    }
+                )
+            elif response.status_code == 200:
                 participants_data = response.json()
 
-                synced_count = 0
-                for participant_data in participants_data.get("participants", []):
-                    # Create or update participant
-                    participant_id = participant_data.get("participantIdentifier")
-                    scheme_id = participant_data.get("participantScheme")
-
-                    if participant_id and scheme_id:
-                        # Ensure scheme exists
-                        scheme, created = (
-                            ParticipantIdentifierScheme.objects.get_or_create(
-                                scheme_id=scheme_id,
-                                defaults={"scheme_name": scheme_id, "is_active": True},
-                            )
-                        )
-
-                        # Ensure domain exists
-                        domain, created = Domain.objects.get_or_create(
-                            domain_code="ehealth-actorid-qns",
-                            defaults={
-                                "domain_name": "EU eHealth Domain",
-                                "sml_subdomain": "ehealth",
-                                "smp_url": european_smp_url,
-                                "is_test_domain": True,
-                            },
-                        )
-
-                        # Create or update participant
-                        participant, created = Participant.objects.update_or_create(
-                            participant_identifier=participant_id,
-                            participant_scheme=scheme,
-                            domain=domain,
-                            defaults={
-                                "participant_name": participant_data.get(
-                                    "participantName", ""
-                                ),
-                                "country_code": participant_data.get("countryCode", ""),
-                                "organization_type": participant_data.get(
-                                    "organizationType", ""
-                                ),
-                                "is_active": True,
-                            },
-                        )
-                        synced_count += 1
-
-                # Update last sync time
+                synced_count, created_count, updated_count = _sync_participants(
+                    participants_data.get("participants", []), european_smp_url
+                )
+
+                # Update last sync time and validators for the next run
                 config.last_sync = timezone.now()
+                config.participants_etag = response.headers.get("ETag", "")
+                config.participants_last_modified = response.headers.get(
+                    "Last-Modified", ""
+                )
                 config.save()
 
                 return JsonResponse(
                     {
                         "success": True,
                         "synced_participants": synced_count,
+                        "created_participants": created_count,
+                        "updated_participants": updated_count,
                         "last_sync": config.last_sync.isoformat(),
                     }
                 )
@@ -204,7 +320,7 @@ def smp_service_group(request, participant_id, participant_scheme):
     """
     try:
         # Log the query
-        SMPQuery.objects.create(
+        smp_query_log.record(
             participant_id=participant_id,
             participant_scheme=participant_scheme,
             query_type="service_group",
@@ -259,113 +375,85 @@ def smp_service_group(request, participant_id, participant_scheme):
         return HttpResponse("Internal Server Error", status=500)
 
 
+def _etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against an ETag"""
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
 def smp_service_metadata(request, participant_id, participant_scheme, document_type_id):
     """
     SMP Service Metadata lookup endpoint
     GET /{participantScheme}::{participantId}/services/{documentTypeId}
+
+    Serves the precompiled XML from metadata_cache with a strong ETag; a
+    matching If-None-Match gets a 304 without touching the XML.
     """
+    started = time.monotonic()
+    response_status = "success"
+    error_message = ""
     try:
-        # Log the query
-        SMPQuery.objects.create(
-            participant_id=participant_id,
-            participant_scheme=participant_scheme,
-            document_type_id=document_type_id,
-            query_type="service_metadata",
-            source_ip=request.META.get("REMOTE_ADDR", ""),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
-            response_status="processing",
-        )
-
-        # Find participant and service
-        scheme = get_object_or_404(
-            ParticipantIdentifierScheme, scheme_id=participant_scheme
-        )
-        participant = get_object_or_404(
-            Participant,
-            participant_identifier=participant_id,
-            participant_scheme=scheme,
-            is_active=True,
+        entry = get_cached_service_metadata(
+            participant_scheme, participant_id, document_type_id
         )
 
-        service_group = getattr(participant, "service_group", None)
-        if not service_group:
-            return HttpResponse("Service Group not found", status=404)
-
-        service_metadata = get_object_or_404(
-            ServiceMetadata,
-            service_group=service_group,
-            document_type__document_type_identifier=document_type_id,
-            is_active=True,
-        )
-
-        # Generate SMP XML response
-        root = ET.Element("ServiceMetadata")
-        root.set("xmlns", "http://busdox.org/serviceMetadata/publishing/1.0/")
-
-        # Service Information
-        service_info = ET.SubElement(root, "ServiceInformation")
-
-        # Participant Identifier
-        participant_id_elem = ET.SubElement(service_info, "ParticipantIdentifier")
-        participant_id_elem.set("scheme", participant_scheme)
-        participant_id_elem.text = participant_id
-
-        # Document Identifier
-        doc_id_elem = ET.SubElement(service_info, "DocumentIdentifier")
-        doc_id_elem.set(
-            "scheme", service_metadata.document_type.document_scheme.scheme_id
-        )
-        doc_id_elem.text = document_type_id
-
-        # Process List
-        process_list = ET.SubElement(service_info, "ProcessList")
-
-        for endpoint in service_metadata.endpoints.filter(is_active=True):
-            if endpoint.is_valid():
-                process_elem = ET.SubElement(process_list, "Process")
-
-                # Process Identifier
-                process_id_elem = ET.SubElement(process_elem, "ProcessIdentifier")
-                process_id_elem.set("scheme", endpoint.process.process_scheme)
-                process_id_elem.text = endpoint.process.process_identifier
-
-                # Service Endpoint List
-                endpoint_list = ET.SubElement(process_elem, "ServiceEndpointList")
-                endpoint_elem = ET.SubElement(endpoint_list, "Endpoint")
-                endpoint_elem.set("transportProfile", endpoint.transport_profile)
-
-                # Endpoint URL
-                endpoint_url_elem = ET.SubElement(endpoint_elem, "EndpointURI")
-                endpoint_url_elem.text = endpoint.endpoint_url
-
-                # Certificate
-                if endpoint.certificate:
-                    cert_elem = ET.SubElement(endpoint_elem, "Certificate")
-                    cert_elem.text = endpoint.certificate
-
-                # Service Activation Date
-                if endpoint.service_activation_date:
-                    activation_elem = ET.SubElement(
-                        endpoint_elem, "ServiceActivationDate"
-                    )
-                    activation_elem.text = endpoint.service_activation_date.isoformat()
+        if entry is None:
+            # Find participant and service
+            scheme = get_object_or_404(
+                ParticipantIdentifierScheme, scheme_id=participant_scheme
+            )
+            participant = get_object_or_404(
+                Participant,
+                participant_identifier=participant_id,
+                participant_scheme=scheme,
+                is_active=True,
+            )
 
-                # Service Expiration Date
-                if endpoint.service_expiration_date:
-                    expiration_elem = ET.SubElement(
-                        endpoint_elem, "ServiceExpirationDate"
-                    )
-                    expiration_elem.text = endpoint.service_expiration_date.isoformat()
+            service_group = getattr(participant, "service_group", None)
+            if not service_group:
+                response_status = "not_found"
+                return HttpResponse("Service Group not found", status=404)
+
+            service_metadata = get_object_or_404(
+                ServiceMetadata.objects.select_related(
+                    "document_type__document_scheme"
+                ),
+                service_group=service_group,
+                document_type__document_type_identifier=document_type_id,
+                is_active=True,
+            )
 
-        # Convert to XML string
-        xml_str = ET.tostring(root, encoding="unicode", method="xml")
+            entry = store_service_metadata(
+                participant_scheme, participant_id, document_type_id, service_metadata
+            )
 
-        return HttpResponse(xml_str, content_type="application/xml")
+        if _etag_matches(request.META.get("HTTP_IF_NONE_MATCH", ""), entry["etag"]):
+            response_status = "not_modified"
+            response = HttpResponse(status=304)
+        else:
+            response = HttpResponse(entry["xml"], content_type="application/xml")
+        response["ETag"] = entry["etag"]
+        return response
 
     except Exception as e:
+        response_status = "error"
+        error_message = str(e)
         logger.error(f"SMP Service Metadata error: {str(e)}")
         return HttpResponse("Internal Server Error", status=500)
 
+    finally:
+        smp_query_log.record(
+            participant_id=participant_id,
+            participant_scheme=participant_scheme,
+            document_type_id=document_type_id,
+            query_type="service_metadata",
+            source_ip=request.META.get("REMOTE_ADDR", ""),
+            user_agent=request.META.get("HTTP_USER_AGENT", ""),
+            response_status=response_status,
+            response_time_ms=int((time.monotonic() - started) * 1000),
+            error_message=error_message,
+        )
+
 
 @require_http_methods(["GET"])
 def smp_participants_list(request):
@@ -0,0 +1,222 @@
+"""
+Tests for the asynchronous MVC importer
+
+A small generated workbook is imported end to end: the workbook is opened
+once and streamed sheet by sheet, concepts are upserted in batches with
+duplicate keys collapsed, concepts missing from a re-import are deleted,
+existing value sets are left alone unless overwrite_existing is set, and
+parsed sheets waiting for the worker pool are bounded.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.test import TransactionTestCase
+from openpyxl import Workbook
+
+from translation_services.models import ValueSetCatalogue, ValueSetConcept
+from translation_services.services import async_mvc_importer
+from translation_services.services.async_mvc_importer import AsyncMVCImporter
+
+BLOOD_GROUP_OID = "1.3.6.1.4.1.12559.11.10.1.3.1.42.1"
+COUNTRY_OID = "1.3.6.1.4.1.12559.11.10.1.3.1.42.4"
+ABO = "2.16.840.1.113883.6.96"
+ISO_3166 = "1.0.3166.1"
+
+BLOOD_GROUPS = [
+    (ABO, "278149003", "Blood group A Rh(D) positive"),
+    (ABO, "278152006", "Blood group A Rh(D) negative"),
+    (ABO, "278150003", "Blood group B Rh(D) positive"),
+    # Duplicate key: the first occurrence wins
+    (ABO, "278149003", "Duplicate of A positive"),
+]
+COUNTRIES = [
+    (ISO_3166, "BE", "Belgium"),
+    (ISO_3166, "PT", "Portugal"),
+]
+
+
+def mvc_sheet(workbook, title, oid, concepts):
+    """Append a sheet laid out like the MVC: metadata rows, then concepts"""
+    sheet = workbook.create_sheet(title)
+    sheet.append(["Value Set OID", oid])
+    sheet.append(["Value Set Name", title])
+    sheet.append(["Canonical URL", f"https://example.org/ValueSet/{title}"])
+    sheet.append([])
+    sheet.append(
+        ["Code System ID", "Code System Version", "Concept Code", "Description"]
+    )
+    for code_system, code, description in concepts:
+        sheet.append([code_system, "2024-01", code, description])
+
+
+class TestAsyncMVCImporter(TransactionTestCase):
+    """Sheets are written on pool threads, which need committed rows"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.importer = AsyncMVCImporter()
+
+    def write_workbook(self, sheets):
+        workbook = Workbook()
+        workbook.remove(workbook.active)
+        for title, oid, concepts in sheets:
+            mvc_sheet(workbook, title, oid, concepts)
+        path = os.path.join(self.directory.name, "mvc.xlsx")
+        workbook.save(path)
+        return path
+
+    def run_import(self, sheets, overwrite_existing=True, dry_run=False):
+        path = self.write_workbook(sheets)
+        return self.importer._process_import_async(
+            path, "full", "", overwrite_existing, dry_run, "task"
+        )
+
+    def concepts(self, oid):
+        return dict(
+            ValueSetConcept.objects.filter(value_set__oid=oid).values_list(
+                "code", "display"
+            )
+        )
+
+    def test_import_collapses_duplicate_keys(self):
+        results = self.run_import(
+            [
+                ("eHDSIBloodGroup", BLOOD_GROUP_OID, BLOOD_GROUPS),
+                ("eHDSICountry", COUNTRY_OID, COUNTRIES),
+                ("Notes", "", [(ABO, "1", "No OID")]),
+            ]
+        )
+
+        self.assertEqual(results["success_count"], 2)
+        self.assertEqual(results["error_count"], 1)
+        self.assertEqual(results["total_concepts"], 5)
+        self.assertEqual(ValueSetCatalogue.objects.count(), 2)
+        self.assertEqual(
+            self.concepts(BLOOD_GROUP_OID),
+            {
+                "278149003": "Blood group A Rh(D) positive",
+                "278152006": "Blood group A Rh(D) negative",
+                "278150003": "Blood group B Rh(D) positive",
+            },
+        )
+        self.assertEqual(
+            self.concepts(COUNTRY_OID), {"BE": "Belgium", "PT": "Portugal"}
+        )
+
+    def test_reimport_with_overwrite_upserts_and_deletes_stale_concepts(self):
+        self.run_import([("eHDSIBloodGroup", BLOOD_GROUP_OID, BLOOD_GROUPS)])
+        kept_id = ValueSetConcept.objects.get(code="278149003").id
+
+        results = self.run_import(
+            [
+                (
+                    "eHDSIBloodGroup",
+                    BLOOD_GROUP_OID,
+                    [
+                        (ABO, "278149003", "Blood group A RhD positive"),
+                        (ABO, "278153001", "Blood group B Rh(D) negative"),
+                    ],
+                )
+            ],
+            overwrite_existing=True,
+        )
+
+        self.assertEqual(results["total_concepts"], 2)
+        self.assertEqual(
+            self.concepts(BLOOD_GROUP_OID),
+            {
+                "278149003": "Blood group A RhD positive",
+                "278153001": "Blood group B Rh(D) negative",
+            },
+        )
+        # Existing rows are updated in place, not deleted and recreated
+        self.assertEqual(ValueSetConcept.objects.get(code="278149003").id, kept_id)
+
+    def test_reimport_without_overwrite_keeps_existing_value_sets(self):
+        self.run_import([("eHDSIBloodGroup", BLOOD_GROUP_OID, BLOOD_GROUPS)])
+        before = self.concepts(BLOOD_GROUP_OID)
+
+        results = self.run_import(
+            [
+                ("eHDSIBloodGroup", BLOOD_GROUP_OID, [(ABO, "278153001", "B-")]),
+                ("eHDSICountry", COUNTRY_OID, COUNTRIES),
+            ],
+            overwrite_existing=False,
+        )
+
+        self.assertEqual(results["success_count"], 2)
+        self.assertEqual(results["total_concepts"], 2)  # Only the new value set
+        self.assertEqual(self.concepts(BLOOD_GROUP_OID), before)
+        self.assertEqual(
+            self.concepts(COUNTRY_OID), {"BE": "Belgium", "PT": "Portugal"}
+        )
+
+    def test_concepts_are_written_in_batches(self):
+        self.run_import([("eHDSIBloodGroup", BLOOD_GROUP_OID, BLOOD_GROUPS)])
+        extra = [(ABO, f"code-{n}", f"Code {n}") for n in range(3)]
+        concepts = BLOOD_GROUPS[:3] + extra
+
+        with mock.patch.object(
+            async_mvc_importer, "CONCEPT_BATCH_SIZE", 2
+        ), mock.patch.object(
+            ValueSetConcept.objects,
+            "bulk_create",
+            wraps=ValueSetConcept.objects.bulk_create,
+        ) as bulk_create:
+            self.run_import([("eHDSIBloodGroup", BLOOD_GROUP_OID, concepts)])
+
+        calls = bulk_create.call_args_list
+        self.assertEqual([len(call.args[0]) for call in calls], [2, 2, 2])
+        self.assertTrue(all(call.kwargs["update_conflicts"] for call in calls))
+        self.assertEqual(ValueSetConcept.objects.count(), 6)
+
+    def test_workbook_is_opened_once_and_streamed(self):
+        sheets = [(f"Sheet{n}", f"{COUNTRY_OID}.{n}", COUNTRIES) for n in range(3)]
+
+        parser = self.importer.parser
+        with mock.patch.object(
+            parser, "open_workbook", wraps=parser.open_workbook
+        ) as open_workbook, mock.patch.object(
+            parser, "parse_mvc_sheet"
+        ) as parse_mvc_sheet:
+            results = self.run_import(sheets, dry_run=True)
+
+        open_workbook.assert_called_once()
+        parse_mvc_sheet.assert_not_called()
+        self.assertEqual(results["success_count"], 3)
+        self.assertFalse(ValueSetCatalogue.objects.exists())
+
+    def test_parsed_sheets_waiting_for_workers_are_bounded(self):
+        sheets = [(f"Sheet{n}", f"{COUNTRY_OID}.{n}", COUNTRIES) for n in range(8)]
+        lock = threading.Lock()
+        state = {"outstanding": 0, "peak": 0}
+        parse = self.importer.parser.parse_mvc_worksheet
+        import_sheet = self.importer._import_sheet
+
+        def counting_parse(workbook, sheet_name):
+            with lock:
+                state["peak"] = max(state["peak"], state["outstanding"])
+                state["outstanding"] += 1
+            return parse(workbook, sheet_name)
+
+        def slow_import_sheet(*args):
+            time.sleep(0.02)
+            try:
+                return import_sheet(*args)
+            finally:
+                with lock:
+                    state["outstanding"] -= 1
+
+        with mock.patch.object(
+            self.importer.parser, "parse_mvc_worksheet", counting_parse
+        ), mock.patch.object(self.importer, "_import_sheet", slow_import_sheet):
+            results = self.run_import(sheets, dry_run=True)
+
+        self.assertEqual(results["success_count"], 8)
+        # One worker: at most two parsed sheets are queued behind it
+        self.assertEqual(state["peak"], 2)
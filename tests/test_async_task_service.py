@@ -0,0 +1,199 @@
+"""
+Tests for the background import task executor
+
+Imports run on a bounded worker pool: submissions beyond its queue are
+rejected, queued and running tasks can be cancelled, progress is written
+to the database at most once per interval, and the status view reads live
+progress from memory.
+"""
+
+import threading
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from translation_services.models import ImportTask
+from translation_services.services import async_task_service
+from translation_services.services.async_mvc_importer import (
+    AsyncMVCImporter,
+    ImportTaskService,
+)
+from translation_services.services.async_task_service import (
+    AsyncTaskService,
+    BackgroundTaskExecutor,
+    CoalescingProgressWriter,
+    TaskCancelled,
+    TaskQueueFull,
+    progress_channel,
+)
+
+WAIT_SECONDS = 5
+
+
+def wait_for(release):
+    """Task function that runs until ``release`` is set"""
+
+    def task(task_id, cancel_event):
+        release.wait(WAIT_SECONDS)
+        return task_id
+
+    return task
+
+
+class TestBackgroundTaskExecutor(TestCase):
+    def setUp(self):
+        self.executor = BackgroundTaskExecutor(max_workers=1, max_queued=1)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.task = ImportTask.objects.create(user=User.objects.create_user("importer"))
+
+    def test_full_queue_raises(self):
+        running = self.executor.submit("running", wait_for(self.release))
+        queued = self.executor.submit("queued", wait_for(self.release))
+
+        with self.assertRaises(TaskQueueFull):
+            self.executor.submit("rejected", wait_for(self.release))
+
+        self.release.set()
+        self.assertEqual(running.result(WAIT_SECONDS), "running")
+        self.assertEqual(queued.result(WAIT_SECONDS), "queued")
+        # Finished tasks give their slots back
+        later = self.executor.submit("later", wait_for(self.release))
+        self.assertEqual(later.result(WAIT_SECONDS), "later")
+
+    def test_cancel_queued_task(self):
+        self.executor.submit("running", wait_for(self.release))
+        queued_task = mock.Mock()
+        queued = self.executor.submit(str(self.task.id), queued_task)
+
+        self.assertTrue(self.executor.cancel(str(self.task.id)))
+
+        self.assertTrue(queued.cancelled())
+        self.release.set()
+        queued_task.assert_not_called()
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "cancelled")
+
+    def test_cancel_running_task(self):
+        started = threading.Event()
+
+        def task(task_id, cancel_event):
+            started.set()
+            return cancel_event.wait(WAIT_SECONDS)
+
+        running = self.executor.submit("running", task)
+        self.assertTrue(started.wait(WAIT_SECONDS))
+
+        self.assertTrue(self.executor.cancel("running"))
+
+        self.assertTrue(running.result(WAIT_SECONDS))
+        self.assertFalse(self.executor.cancel("unknown"))
+
+
+class TestProgress(TestCase):
+    def setUp(self):
+        self.task = ImportTask.objects.create(user=User.objects.create_user("importer"))
+        self.task_id = str(self.task.id)
+        self.addCleanup(progress_channel.discard, self.task_id)
+
+    def test_progress_writes_are_coalesced(self):
+        writer = CoalescingProgressWriter(self.task_id, min_interval=60)
+
+        with CaptureQueriesContext(connection) as queries:
+            for processed in range(1, 101):
+                writer.update(processed, 200)
+        self.assertEqual(len(queries), 1)
+
+        # Every update is published, the latest one is written on flush
+        self.assertEqual(progress_channel.get(self.task_id)["processed_items"], 100)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.processed_items, 1)
+
+        writer.flush()
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.processed_items, 100)
+        self.assertEqual(self.task.progress_percentage, 50)
+
+    def test_get_task_status_reads_live_channel(self):
+        progress_channel.publish(
+            self.task_id, status="processing", processed_items=7, total_items=10
+        )
+
+        with self.assertNumQueries(0):
+            status = ImportTaskService.get_task_status(self.task_id)
+        self.assertEqual(status["processed_items"], 7)
+        self.assertFalse(status["is_finished"])
+
+        progress_channel.discard(self.task_id)
+        status = ImportTaskService.get_task_status(self.task_id)
+        self.assertEqual(status["status"], "pending")
+        self.assertEqual(status["processed_items"], 0)
+
+
+class TestRunningTaskCancellation(TransactionTestCase):
+    """Tasks run on pool threads, which need committed rows"""
+
+    def setUp(self):
+        self.task = ImportTask.objects.create(user=User.objects.create_user("importer"))
+        executor = BackgroundTaskExecutor(max_workers=1, max_queued=1)
+        patcher = mock.patch.object(async_task_service, "_executor", executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_running_import_stops_and_is_marked_cancelled(self):
+        started = threading.Event()
+        updates = []
+
+        def import_function(progress_callback, cancel_event):
+            started.set()
+            for processed in range(1000):
+                cancel_event.wait(0.01)
+                progress_callback(processed, 1000)
+                updates.append(processed)
+
+        AsyncTaskService.run_async_import_task(str(self.task.id), import_function, {})
+        self.assertTrue(started.wait(WAIT_SECONDS))
+        self.assertTrue(AsyncTaskService.cancel_task(str(self.task.id)))
+
+        for _ in range(WAIT_SECONDS * 100):
+            self.task.refresh_from_db()
+            if self.task.is_finished:
+                break
+            threading.Event().wait(0.01)
+
+        self.assertEqual(self.task.status, "cancelled")
+        self.assertLess(len(updates), 1000)
+        self.assertIsNone(progress_channel.get(str(self.task.id)))
+
+
+class TestImporterCancellation(TestCase):
+    def test_cancel_is_checked_before_each_sheet(self):
+        cancel_event = threading.Event()
+        importer = AsyncMVCImporter()
+        importer.parser = mock.Mock()
+        importer.parser.open_workbook.return_value.sheetnames = ["A", "B", "C"]
+
+        def parse_and_cancel(workbook, sheet_name):
+            cancel_event.set()
+            return {"error": "unreadable"}
+
+        importer.parser.parse_mvc_worksheet.side_effect = parse_and_cancel
+
+        # The rate-limited progress callback does not fire between the sheets
+        with self.assertRaises(TaskCancelled):
+            importer._process_import_async(
+                "/nonexistent/mvc.xlsx",
+                "full",
+                "",
+                True,
+                False,
+                "task",
+                progress_callback=mock.Mock(),
+                cancel_event=cancel_event,
+            )
+
+        importer.parser.parse_mvc_worksheet.assert_called_once()
+        importer.parser.open_workbook.return_value.close.assert_called_once()
@@ -0,0 +1,126 @@
+"""
+Tests for up-front CDA document classification
+
+Documents are classified from their root element and body type before any
+full XML parse; the clinical pipeline skips section extraction for L1
+(nonXMLBody) and non-CDA content.
+"""
+
+from contextlib import ExitStack
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from patient_data.services.clinical_sections import clinical_pipeline_manager
+from patient_data.utils import cda_classifier
+from patient_data.utils.cda_classifier import (
+    HL7_NAMESPACE,
+    NOT_CDA,
+    STRUCTURED,
+    UNKNOWN_BODY,
+    UNSTRUCTURED,
+    classify_cda,
+    clear_classification_cache,
+)
+
+TEMPLATE_ID = "2.16.840.1.113883.2.4.3.11.60.22.10.1"
+
+
+def cda(body, root="ClinicalDocument", namespace=HL7_NAMESPACE, prefix=""):
+    tag = f"{prefix}:{root}" if prefix else root
+    xmlns = f"xmlns:{prefix}" if prefix else "xmlns"
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        "<!-- exported by the national contact point -->\n"
+        f'<{tag} {xmlns}="{namespace}">'
+        f'<templateId root="{TEMPLATE_ID}"/>'
+        f"<component>{body}</component></{tag}>"
+    )
+
+
+STRUCTURED_CDA = cda("<structuredBody><component><section/></component></structuredBody>")
+UNSTRUCTURED_CDA = cda('<nonXMLBody><text mediaType="application/pdf">JVBERi0=</text></nonXMLBody>')
+
+
+class TestCDAClassifier(SimpleTestCase):
+    def setUp(self):
+        clear_classification_cache()
+        self.addCleanup(clear_classification_cache)
+
+    def test_document_kinds(self):
+        cases = {
+            "structured": (STRUCTURED_CDA, STRUCTURED),
+            "unstructured": (UNSTRUCTURED_CDA, UNSTRUCTURED),
+            "no body": (cda(""), UNKNOWN_BODY),
+            "prefixed root": (
+                cda("<hl7:structuredBody/>", prefix="hl7"),
+                STRUCTURED,
+            ),
+            "byte order mark": ("﻿" + UNSTRUCTURED_CDA, UNSTRUCTURED),
+            "other namespace": (cda("<structuredBody/>", namespace="urn:example"), NOT_CDA),
+            "other root": (cda("<structuredBody/>", root="Bundle"), NOT_CDA),
+            "html": ("<html><body>structuredBody</body></html>", NOT_CDA),
+            "json": ('{"resourceType": "Bundle"}', NOT_CDA),
+            "empty": ("", NOT_CDA),
+        }
+        for name, (content, kind) in cases.items():
+            with self.subTest(name):
+                self.assertEqual(classify_cda(content).kind, kind)
+
+    def test_header_fields(self):
+        classification = classify_cda(STRUCTURED_CDA)
+
+        self.assertEqual(classification.root_element, "ClinicalDocument")
+        self.assertEqual(classification.namespace, HL7_NAMESPACE)
+        self.assertEqual(classification.template_ids, (TEMPLATE_ID,))
+        self.assertEqual(len(classification.content_hash), 64)
+
+    def test_decision_is_cached_per_content(self):
+        with mock.patch.object(cda_classifier, "_sniff", wraps=cda_classifier._sniff) as sniff:
+            first = classify_cda(STRUCTURED_CDA)
+            second = classify_cda(STRUCTURED_CDA)
+            classify_cda(UNSTRUCTURED_CDA)
+
+        self.assertIs(first, second)
+        self.assertEqual(sniff.call_count, 2)
+
+    def test_cache_is_bounded(self):
+        with mock.patch.object(cda_classifier, "_CACHE_SIZE", 2):
+            for number in range(5):
+                classify_cda(cda(f"<structuredBody><id extension='{number}'/></structuredBody>"))
+
+        self.assertEqual(len(cda_classifier._decisions), 2)
+
+
+class TestPipelineClassification(SimpleTestCase):
+    def setUp(self):
+        clear_classification_cache()
+        self.request = RequestFactory().get("/")
+        self.request.session = {}
+        self.services = clinical_pipeline_manager.get_all_services()
+
+        # Every section service extracts through one recording mock
+        self.extract = mock.Mock(return_value=[])
+        with ExitStack() as stack:
+            for service in self.services.values():
+                stack.enter_context(
+                    mock.patch.object(service, "extract_from_cda", self.extract)
+                )
+            self.addCleanup(stack.pop_all().close)
+
+    def test_unstructured_documents_skip_section_extraction(self):
+        results = clinical_pipeline_manager.process_cda_content(
+            self.request, "l1-session", UNSTRUCTURED_CDA
+        )
+
+        self.extract.assert_not_called()
+        self.assertEqual(set(results), set(self.services))
+        self.assertTrue(all(result["items"] == [] for result in results.values()))
+        context = clinical_pipeline_manager.get_template_context(self.request, "l1-session")
+        self.assertEqual(context["medications"], [])
+
+    def test_structured_documents_are_extracted(self):
+        clinical_pipeline_manager.process_cda_content(self.request, "l3-session", STRUCTURED_CDA)
+
+        self.assertEqual(self.extract.call_count, len(self.services))
+        self.extract.assert_called_with(STRUCTURED_CDA)
@@ -0,0 +1,127 @@
+"""
+Tests for the cached structured CDA rendering
+
+Concurrent downloads of the same document must share a single render, and
+later downloads must be served from the disk cache. Only the clinical
+sections are cached: the patient header and generation time are rendered
+for every download.
+"""
+
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from patient_data import views
+from patient_data.models import PatientData
+from patient_data.services.cda_render_cache import CDARenderCache
+
+CDA_CONTENT = '<ClinicalDocument xmlns="urn:hl7-org:v3"><title>PS</title></ClinicalDocument>'
+
+
+class CountingProcessor:
+    """Stands in for EnhancedCDAProcessor and counts section processing runs"""
+
+    calls = 0
+    lock = threading.Lock()
+
+    def __init__(self, target_language="en", country_code=None):
+        self.target_language = target_language
+
+    def process_clinical_sections(self, cda_content):
+        with self.lock:
+            CountingProcessor.calls += 1
+        # Keep the render in flight while the other downloads arrive
+        time.sleep(0.3)
+        return {"success": True, "sections": [], "sections_count": 0}
+
+
+class TestCDARenderCache(SimpleTestCase):
+    DOWNLOADS = 20
+    PATIENT_ID = "1234"
+
+    def setUp(self):
+        CountingProcessor.calls = 0
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        self.render_cache = CDARenderCache(cache_dir=self.cache_dir.name)
+
+        for patcher in (
+            mock.patch.object(views, "cda_render_cache", self.render_cache),
+            mock.patch(
+                "patient_data.services.enhanced_cda_processor.EnhancedCDAProcessor",
+                CountingProcessor,
+            ),
+            # NCP query result: patient only exists in the session
+            mock.patch.object(
+                PatientData.objects,
+                "filter",
+                return_value=mock.Mock(exists=mock.Mock(return_value=False)),
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _download(self, patient_id=PATIENT_ID, **patient_info):
+        request = RequestFactory().get(f"/patients/{patient_id}/cda/pdf/")
+        request.session = {
+            f"patient_match_{patient_id}": {
+                "patient_data": {
+                    "given_name": "Maria",
+                    "family_name": "Santos",
+                    **patient_info,
+                },
+                "cda_content": CDA_CONTENT,
+            }
+        }
+        return views.download_cda_pdf(request, patient_id)
+
+    def test_concurrent_downloads_render_once(self):
+        barrier = threading.Barrier(self.DOWNLOADS)
+        responses = []
+
+        def download():
+            barrier.wait()
+            responses.append(self._download())
+
+        threads = [threading.Thread(target=download) for _ in range(self.DOWNLOADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(CountingProcessor.calls, 1)
+        self.assertEqual(len(responses), self.DOWNLOADS)
+        self.assertEqual({response.status_code for response in responses}, {200})
+        self.assertEqual(len({response.content for response in responses}), 1)
+
+    def test_later_download_served_from_cache(self):
+        first = self._download()
+        second = self._download()
+
+        self.assertEqual(CountingProcessor.calls, 1)
+        self.assertEqual(first.content, second.content)
+        self.assertIn("attachment;", second["Content-Disposition"])
+
+    def test_patient_header_and_generation_time_are_not_cached(self):
+        first = self._download(source_country="PT")
+        with mock.patch.object(
+            views.timezone,
+            "now",
+            return_value=datetime(2031, 5, 4, 13, 45, tzinfo=timezone.utc),
+        ):
+            second = self._download("5678", given_name="Ana", source_country="BE")
+
+        self.assertEqual(CountingProcessor.calls, 1)
+        self.assertIn(b"Maria Santos", first.content)
+        self.assertIn(b"<strong>Source Country:</strong> PT", first.content)
+        self.assertIn(b"Ana Santos", second.content)
+        self.assertIn(b"<strong>Patient ID:</strong> 5678", second.content)
+        self.assertIn(b"<strong>Source Country:</strong> BE", second.content)
+        self.assertIn(b"<strong>Generated:</strong> 2031-05-04 13:45", second.content)
+        self.assertIn(
+            "clinical_document_Ana_Santos_5678.html", second["Content-Disposition"]
+        )
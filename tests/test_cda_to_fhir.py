@@ -0,0 +1,157 @@
+"""
+Tests for CDA to FHIR R4 conversion and the conversion API endpoints
+"""
+
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from patient_data.services.cda_to_fhir_service import (
+    CDAConversionError,
+    CDAToFHIRService,
+    cda_to_fhir_service,
+    section_kind,
+)
+
+SAMPLE_CDA = (
+    Path(settings.BASE_DIR)
+    / "test_data"
+    / "eu_member_states"
+    / "EU"
+    / "Mario_Pino_NCPNPH80_2.xml"
+).read_bytes()
+
+
+def resources(bundle, resource_type):
+    return [
+        entry["resource"]
+        for entry in bundle["entry"]
+        if entry["resource"]["resourceType"] == resource_type
+    ]
+
+
+class TestCDAToFHIRService(SimpleTestCase):
+    def test_patient_summary_bundle(self):
+        bundle = cda_to_fhir_service.convert(SAMPLE_CDA)
+
+        self.assertEqual(bundle["type"], "document")
+        self.assertEqual(bundle["entry"][0]["resource"]["resourceType"], "Composition")
+        self.assertEqual(
+            Counter(entry["resource"]["resourceType"] for entry in bundle["entry"]),
+            {
+                "Composition": 1,
+                "Patient": 1,
+                "Practitioner": 1,
+                "AllergyIntolerance": 1,
+                "MedicationStatement": 1,
+                "Condition": 3,
+                "Device": 1,
+                "DeviceUseStatement": 1,
+                "Procedure": 1,
+                "Observation": 3,
+                "Immunization": 2,
+            },
+        )
+
+        (patient,) = resources(bundle, "Patient")
+        self.assertEqual(patient["name"], [{"family": "Pino", "given": ["Mario"]}])
+        self.assertEqual(patient["gender"], "male")
+
+        # Every Composition section entry resolves to a bundle entry
+        full_urls = {entry["fullUrl"] for entry in bundle["entry"]}
+        composition = bundle["entry"][0]["resource"]
+        references = [
+            reference["reference"]
+            for section in composition["section"]
+            for reference in section.get("entry", [])
+        ]
+        self.assertTrue(references)
+        self.assertTrue(set(references) <= full_urls)
+
+    def test_codes_map_to_fhir_systems(self):
+        bundle = cda_to_fhir_service.convert(SAMPLE_CDA)
+
+        (allergy,) = resources(bundle, "AllergyIntolerance")
+        self.assertEqual(
+            allergy["code"]["coding"][0]["system"], "http://snomed.info/sct"
+        )
+        observation = resources(bundle, "Observation")[0]
+        self.assertEqual(observation["code"]["coding"][0]["system"], "http://loinc.org")
+        self.assertEqual(observation["valueQuantity"]["system"], "http://unitsofmeasure.org")
+
+    def test_section_dispatch(self):
+        self.assertEqual(
+            section_kind("10160-0", ("1.3.6.1.4.1.12559.11.10.1.3.1.2.3",)),
+            "medications",
+        )
+        self.assertEqual(
+            section_kind("unknown", ("1.3.6.1.4.1.19376.1.5.3.1.3.13",)), "allergies"
+        )
+        self.assertIsNone(section_kind("42348-3", ()))
+
+    def test_invalid_documents(self):
+        with self.assertRaises(CDAConversionError):
+            cda_to_fhir_service.convert("<ClinicalDocument")
+        with self.assertRaises(CDAConversionError):
+            cda_to_fhir_service.convert("<Bundle/>")
+        with self.assertRaises(CDAConversionError):
+            cda_to_fhir_service.convert(SAMPLE_CDA, "unknown-profile")
+
+    def test_batch_in_worker_processes(self):
+        service = CDAToFHIRService(max_workers=1)
+        self.addCleanup(service.shutdown)
+
+        results = service.convert_batch([SAMPLE_CDA, "<broken", SAMPLE_CDA])
+
+        self.assertEqual(
+            [result["status"] for result in results], ["success", "error", "success"]
+        )
+        self.assertEqual(len(results[2]["fhir_bundle"]["entry"]), 16)
+
+
+@override_settings(CDA_FHIR_CONVERSION_WORKERS=0, CDA_FHIR_BATCH_MAX_DOCUMENTS=3)
+class TestConversionEndpoints(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user("clinician", password="unused"))
+
+    def test_convert_single_document(self):
+        response = self.client.post(
+            "/api/fhir/convert/cda-to-fhir/",
+            {"cda_document": SAMPLE_CDA.decode("utf-8")},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["fhir_bundle"]["entry"]), 16)
+
+        response = self.client.post(
+            "/api/fhir/convert/cda-to-fhir/",
+            {"cda_document": "<broken"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 422)
+
+    def test_convert_batch(self):
+        document = SAMPLE_CDA.decode("utf-8")
+        response = self.client.post(
+            "/api/fhir/convert/batch/",
+            {"documents": [document, "<broken"]},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "partial")
+        self.assertEqual(
+            [result["status"] for result in response.json()["results"]],
+            ["success", "error"],
+        )
+
+        response = self.client.post(
+            "/api/fhir/convert/batch/",
+            {"documents": [document] * 4},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,167 @@
+"""
+Tests for the cleanup_patient_sessions management command
+
+Sessions are read and written in --batch-size batches, so memory use stays
+bounded however many sessions exist, and nothing is changed by a dry run or
+before the operator confirms the cleanup.
+"""
+
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from patient_data.management.commands import cleanup_patient_sessions
+from patient_data.models import PatientDataCache, PatientSession
+from patient_data.services import session_cleanup
+
+UNAUTHENTICATED_SESSIONS = 7
+
+
+class TestCleanupPatientSessions(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("clinician")
+        store = Session.get_session_store_class()()
+        expire_date = timezone.now() + timedelta(hours=1)
+
+        for number in range(UNAUTHENTICATED_SESSIONS):
+            Session.objects.create(
+                session_key=f"anonymous{number:04d}",
+                session_data=store.encode({"patient_data": {"id": number}}),
+                expire_date=expire_date,
+            )
+        Session.objects.create(
+            session_key="authenticated",
+            session_data=store.encode(
+                {"_auth_user_id": str(cls.user.pk), "patient_data": {}, "theme": "dark"}
+            ),
+            expire_date=timezone.now() - timedelta(minutes=5),
+        )
+        Session.objects.create(
+            session_key="no-patient-data",
+            session_data=store.encode({"theme": "dark"}),
+            expire_date=expire_date,
+        )
+
+        patient_session = PatientSession.objects.create(
+            session_id="expired-patient-session",
+            user=cls.user,
+            encryption_key_version=1,
+            country_code="PT",
+            search_criteria_hash="0" * 64,
+        )
+        PatientSession.objects.filter(pk=patient_session.pk).update(
+            expires_at=timezone.now() - timedelta(hours=1)
+        )
+        PatientDataCache.objects.create(
+            cache_key="expired-entry",
+            session=patient_session,
+            data_type="cda_document",
+            encrypted_content="ciphertext",
+            content_hash="0" * 64,
+            expires_at=timezone.now() - timedelta(hours=1),
+            encryption_key_version=1,
+        )
+
+    def run_command(self, *args):
+        call_command("cleanup_patient_sessions", *args, stdout=StringIO())
+
+    def assertNothingChanged(self):
+        self.assertEqual(Session.objects.count(), UNAUTHENTICATED_SESSIONS + 2)
+        self.assertIn(
+            "patient_data", Session.objects.get(session_key="authenticated").get_decoded()
+        )
+        self.assertTrue(PatientSession.objects.get().is_active)
+        self.assertTrue(PatientDataCache.objects.exists())
+
+    def test_dry_run_changes_nothing(self):
+        self.run_command("--dry-run")
+
+        self.assertNothingChanged()
+
+    def test_cancelled_confirmation_changes_nothing(self):
+        with mock.patch("builtins.input", return_value="n") as prompt:
+            self.run_command()
+
+        prompt.assert_called_once()
+        self.assertNothingChanged()
+
+    def test_confirmed_cleanup(self):
+        with mock.patch("builtins.input", return_value="y"):
+            self.run_command()
+
+        self.assertEqual(
+            set(Session.objects.values_list("session_key", flat=True)),
+            {"authenticated", "no-patient-data"},
+        )
+        self.assertEqual(
+            Session.objects.get(session_key="authenticated").get_decoded(),
+            {"_auth_user_id": str(self.user.pk), "theme": "dark"},
+        )
+        patient_session = PatientSession.objects.get()
+        self.assertFalse(patient_session.is_active)
+        self.assertEqual(patient_session.status, "expired")
+        self.assertFalse(PatientDataCache.objects.exists())
+
+    def test_expired_records_are_cleaned_without_patient_sessions(self):
+        Session.objects.exclude(session_key="no-patient-data").delete()
+
+        with mock.patch("builtins.input", return_value="n"):
+            self.run_command()
+        self.assertTrue(PatientSession.objects.get().is_active)
+
+        self.run_command("--force")
+        self.assertFalse(PatientSession.objects.get().is_active)
+        self.assertFalse(PatientDataCache.objects.exists())
+
+    def test_sessions_are_loaded_in_bounded_batches(self):
+        batches = []
+
+        def recording_iter_batches(*args, **kwargs):
+            for batch in session_cleanup.iter_batches(*args, **kwargs):
+                batches.append(len(batch))
+                yield batch
+
+        with mock.patch.object(
+            cleanup_patient_sessions, "iter_batches", recording_iter_batches
+        ), mock.patch("builtins.input", return_value="y"):
+            self.run_command("--batch-size", "2")
+
+        # Analysis and cleanup each page through every session
+        self.assertTrue(batches)
+        self.assertLessEqual(max(batches), 2)
+        self.assertGreaterEqual(len(batches), 2 * 5)  # 9 sessions, 2 per batch
+        self.assertEqual(Session.objects.count(), 2)
+
+    def test_expired_records_are_deleted_in_batches(self):
+        for number in range(4):
+            PatientDataCache.objects.create(
+                cache_key=f"expired-{number}",
+                session=PatientSession.objects.get(),
+                data_type="cda_document",
+                encrypted_content="ciphertext",
+                content_hash="0" * 64,
+                expires_at=timezone.now() - timedelta(hours=1),
+                encryption_key_version=1,
+            )
+
+        with mock.patch.object(
+            PatientDataCache.objects, "filter", wraps=PatientDataCache.objects.filter
+        ) as select:
+            deleted = session_cleanup.delete_expired_cache_entries(batch_size=2)
+
+        self.assertEqual(deleted, 5)
+        # Batches of at most two rows
+        batches = [
+            len(call.kwargs["pk__in"])
+            for call in select.call_args_list
+            if "pk__in" in call.kwargs
+        ]
+        self.assertEqual(batches, [2, 2, 1])
+        self.assertFalse(PatientDataCache.objects.exists())
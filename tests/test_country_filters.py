@@ -0,0 +1,63 @@
+"""
+Tests and micro-benchmark for the country_flag and country_name filters
+
+Flag HTML must come from the precomputed country table, with static URLs
+resolved once per process rather than once per rendered flag.
+"""
+
+import time
+from unittest import mock
+
+from django.template import Context, Template
+from django.test import SimpleTestCase
+
+from patient_data.templatetags import patient_filters
+from patient_data.templatetags.patient_filters import country_flag, country_name
+
+FLAG_COUNT = 10_000
+# Generous bound; resolving static URLs per flag took ~0.2s for 10k flags
+FLAG_RENDER_BUDGET_SECONDS = 1.0
+
+FLAGS_TEMPLATE = Template(
+    "{% load patient_filters %}{% for code in codes %}{{ code|country_flag }}{% endfor %}"
+)
+
+
+class TestCountryFilters(SimpleTestCase):
+    def setUp(self):
+        patient_filters._flag_urls.cache_clear()
+        patient_filters._country_flag_html.cache_clear()
+
+    def test_country_flag(self):
+        self.assertEqual(
+            country_flag("ie"),
+            '<img src="/static/flags/IE.webp" alt="Ireland" class="flag-img" '
+            'width="20" height="15">',
+        )
+        self.assertIn('src="/static/flags/EU.webp" alt="XX"', country_flag("xx"))
+        self.assertEqual(country_flag(""), "")
+
+    def test_unknown_codes_are_escaped(self):
+        self.assertIn(
+            'alt="&quot;&gt;&lt;SCRIPT&gt;"', country_flag('"><script>')
+        )
+
+    def test_country_name(self):
+        self.assertEqual(country_name("pt"), "Portugal")
+        self.assertEqual(country_name("xx"), "XX")
+        self.assertEqual(country_name(None), "Unknown")
+
+    def test_render_ten_thousand_flags(self):
+        codes = ["IE", "pt", "BE", "gr", "XX"] * (FLAG_COUNT // 5)
+
+        with mock.patch.object(
+            patient_filters, "static", wraps=patient_filters.static
+        ) as static:
+            started = time.perf_counter()
+            html = FLAGS_TEMPLATE.render(Context({"codes": codes}))
+            elapsed = time.perf_counter() - started
+
+        self.assertEqual(html.count("<img "), FLAG_COUNT)
+        self.assertEqual(html.count('alt="Portugal"'), FLAG_COUNT // 5)
+        self.assertEqual(static.call_count, len(patient_filters.FLAG_COUNTRY_CODES))
+        self.assertLess(elapsed, FLAG_RENDER_BUDGET_SECONDS)
@@ -0,0 +1,155 @@
+"""
+Tests for the clinical date engine
+
+Every input shape accepted by the per-module parsers it replaced (HL7 TS,
+ISO 8601/FHIR, compact dates with an ISO time, day-first dates) must parse
+to the same value and keep its recorded precision.
+"""
+
+from datetime import date, datetime
+from unittest import mock
+
+from django.contrib.sessions.backends.base import SessionBase
+from django.test import RequestFactory, SimpleTestCase
+
+from patient_data.utils.date_engine import (
+    DAY,
+    MINUTE,
+    MONTH,
+    SECOND,
+    YEAR,
+    format_date,
+    format_date_column,
+    parse_date,
+)
+from patient_data.services.clinical_sections.base import clinical_service_base
+from patient_data.services.clinical_sections.specialized.social_history_service import (
+    SocialHistorySectionService,
+)
+from patient_data.view_processors.cda_processor import CDAViewProcessor
+
+# Input -> (datetime, precision, timezone)
+PARSE_CASES = {
+    # HL7 TS
+    "2008": (datetime(2008, 1, 1), YEAR, ""),
+    "200807": (datetime(2008, 7, 1), MONTH, ""),
+    "20080728": (datetime(2008, 7, 28), DAY, ""),
+    "2008072813": (datetime(2008, 7, 28, 13), MINUTE, ""),
+    "200807281309": (datetime(2008, 7, 28, 13, 9), MINUTE, ""),
+    "20080728130929": (datetime(2008, 7, 28, 13, 9, 29), SECOND, ""),
+    "20080728+0100": (datetime(2008, 7, 28), DAY, "+0100"),
+    "20080728130929+0100": (datetime(2008, 7, 28, 13, 9, 29), SECOND, "+0100"),
+    "20080728130929-0500": (datetime(2008, 7, 28, 13, 9, 29), SECOND, "-0500"),
+    "20080728130929.000+0100": (datetime(2008, 7, 28, 13, 9, 29), SECOND, "+0100"),
+    # ISO 8601 / FHIR
+    "2008-07": (datetime(2008, 7, 1), MONTH, ""),
+    "2008-07-28": (datetime(2008, 7, 28), DAY, ""),
+    "2008-07-28T13:09": (datetime(2008, 7, 28, 13, 9), MINUTE, ""),
+    "2008-07-28T13:09:29": (datetime(2008, 7, 28, 13, 9, 29), SECOND, ""),
+    "2008-07-28 13:09:29": (datetime(2008, 7, 28, 13, 9, 29), SECOND, ""),
+    "2008-07-28T13:09:29Z": (datetime(2008, 7, 28, 13, 9, 29), SECOND, "Z"),
+    "2008-07-28T13:09:29+01:00": (datetime(2008, 7, 28, 13, 9, 29), SECOND, "+01:00"),
+    "2008-07-28T13:09:29.123-05:00": (datetime(2008, 7, 28, 13, 9, 29), SECOND, "-05:00"),
+    # Compact date with an ISO time
+    "20091006T10:00": (datetime(2009, 10, 6, 10), MINUTE, ""),
+    "20091006T10:00:30": (datetime(2009, 10, 6, 10, 0, 30), SECOND, ""),
+    "20091006T10:00:00+01:00": (datetime(2009, 10, 6, 10), SECOND, "+01:00"),
+    "20091006T1000+0100": (datetime(2009, 10, 6, 10), MINUTE, "+0100"),
+    "20091006T100030": (datetime(2009, 10, 6, 10, 0, 30), SECOND, ""),
+    # Day-first, with month-first only when day-first is impossible
+    "28/07/2008": (datetime(2008, 7, 28), DAY, ""),
+    "28.07.2008": (datetime(2008, 7, 28), DAY, ""),
+    "28-07-2008": (datetime(2008, 7, 28), DAY, ""),
+    "1.2.1990": (datetime(1990, 2, 1), DAY, ""),
+    "07/28/2008": (datetime(2008, 7, 28), DAY, ""),
+    # Whitespace around the value
+    " 20080728 ": (datetime(2008, 7, 28), DAY, ""),
+}
+
+UNPARSEABLE = ["", "   ", "unknown", "08", "20081328", "2008-02-30", "31/31/2008", "2008/07/28"]
+
+
+class TestDateEngine(SimpleTestCase):
+    def test_parse_shapes(self):
+        for value, (expected, precision, timezone) in PARSE_CASES.items():
+            with self.subTest(value):
+                parsed = parse_date(value)
+                self.assertIsNotNone(parsed)
+                self.assertEqual(parsed.value, expected)
+                self.assertEqual(parsed.precision, precision)
+                self.assertEqual(parsed.timezone, timezone)
+
+    def test_unparseable_values(self):
+        for value in UNPARSEABLE + [None, 20080728]:
+            with self.subTest(value):
+                self.assertIsNone(parse_date(value))
+                self.assertEqual(format_date(value, default="raw"), "raw")
+
+    def test_date_objects(self):
+        self.assertEqual(parse_date(date(2008, 7, 28)).precision, DAY)
+        self.assertEqual(parse_date(datetime(2008, 7, 28, 13, 9)).precision, SECOND)
+
+    def test_styles_keep_precision(self):
+        cases = [
+            ("2008", "dmy", "2008"),
+            ("200807", "dmy", "07/2008"),
+            ("20080728130929+0100", "dmy", "28/07/2008"),
+            ("20091006T10:00:00+01:00", "dmy_time", "06/10/2009 10:00"),
+            ("2008-07-28", "short", "Jul 28, 2008"),
+            ("20080728130929", "mdy_time", "07/28/2008 13:09"),
+            ("28/07/2008", "iso", "2008-07-28"),
+            ("20210908", "clinical", "8 September 2021"),
+            ("20210908143000", "clinical_us_time", "September 8, 2021 at 14:30"),
+            ("202109", "clinical", "September 2021"),
+        ]
+        for value, style, expected in cases:
+            with self.subTest(value=value, style=style):
+                self.assertEqual(format_date(value, style), expected)
+
+    def test_cda_view_processor_keeps_unparseable_dates(self):
+        processor = CDAViewProcessor.__new__(CDAViewProcessor)
+        self.assertEqual(processor._format_cda_date("19971006"), "Oct 06, 1997")
+        self.assertEqual(processor._format_cda_date("20091006T10:00:00+01:00"), "Oct 06, 2009")
+        self.assertEqual(processor._format_cda_date("unknown"), "unknown")
+        self.assertIsNone(processor._format_cda_date(""))
+
+    def test_format_date_column(self):
+        rows = [{"date": "20080728"}, {"date": "unknown"}, {"date": ""}, {}]
+
+        self.assertIs(format_date_column(rows, "date")[0], rows[0])
+        self.assertEqual(
+            [row.get("date") for row in rows], ["28/07/2008", "unknown", "", None]
+        )
+
+        rows = [{"date": "20080728"}, {"date": "unknown"}]
+        format_date_column(rows, "date", "iso", target="display")
+        self.assertEqual([row["display"] for row in rows], ["2008-07-28", "unknown"])
+
+        rows = [{"date": "unknown"}]
+        format_date_column(rows, "date", target="display", keep_unparsed=False)
+        self.assertNotIn("display", rows[0])
+
+    def test_section_services_format_date_columns(self):
+        request = RequestFactory().get("/")
+        request.session = SessionBase()
+        raw_data = [
+            {"category": "Smoking", "start_date": "20080728", "end_date": "20091006T10:00"},
+            {"category": "Alcohol", "start_date": "unknown"},
+        ]
+
+        with mock.patch.object(
+            clinical_service_base,
+            "format_date_column",
+            wraps=clinical_service_base.format_date_column,
+        ) as column:
+            rows = SocialHistorySectionService().enhance_and_store(
+                request, "session", raw_data
+            )
+
+        self.assertEqual(
+            [call.args[1] for call in column.call_args_list], ["start_date", "end_date"]
+        )
+        self.assertEqual(
+            [(row["start_date"], row["end_date"]) for row in rows],
+            [("28/07/2008", "06/10/2009"), ("unknown", "Not specified")],
+        )
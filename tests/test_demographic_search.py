@@ -0,0 +1,148 @@
+"""
+Tests for the batch demographic patient search
+
+Queries are matched against normalized keys built from the CDA index, so
+spelling differences (case, accents, date formats) still match and a
+batch of queries costs one probe each, independent of the index size.
+"""
+
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from ehealth_portal.models import Country
+from ehealth_portal.views import perform_patient_search
+from patient_data.management.commands.benchmark_demographic_search import (
+    synthetic_index,
+    synthetic_queries,
+)
+from patient_data.services import cda_document_index
+from patient_data.services.cda_document_index import CDADocumentIndexer, CDADocumentInfo
+from patient_data.services.demographic_search import (
+    DemographicQuery,
+    DemographicSearchIndex,
+    normalize_birth_date,
+    normalize_name,
+)
+
+PATIENT_COUNT = 10_000
+QUERY_COUNT = 1_000
+
+
+def document(patient_id, given_name, family_name, birth_date, country_code, cda_type="L3"):
+    return CDADocumentInfo(
+        file_path=f"/cda/{patient_id}_{cda_type}.xml",
+        patient_id=patient_id,
+        given_name=given_name,
+        family_name=family_name,
+        birth_date=birth_date,
+        gender="Female",
+        country_code=country_code,
+        cda_type=cda_type,
+        assigning_authority="",
+        last_modified=1_733_011_200.0,
+        file_size=1024,
+        document_title="Patient Summary",
+        patient_id_root="2.16.620.1.101.10.1.1",
+    )
+
+
+INDEX = {
+    "2-1234-W7": [
+        document("2-1234-W7", "Diana", "Ferreira", "1982-05-08", "PT", "L1"),
+        document("2-1234-W7", "Diana", "Ferreira", "1982-05-08", "PT", "L3"),
+    ],
+    "01017515303": [document("01017515303", "ΜΑΡΙΑ", "ΔΗΜΟΥ", "1975-01-01", "GR")],
+    "53930545": [document("53930545", "Seán Pádraig", "O'Connor", "1975-03-15", "IE")],
+}
+
+
+class TestDemographicSearch(SimpleTestCase):
+    def setUp(self):
+        self.index = DemographicSearchIndex.from_cda_index(INDEX)
+
+    def test_normalization(self):
+        self.assertEqual(normalize_name("  SEÁN  O'Connor "), "sean oconnor")
+        self.assertEqual(normalize_name("Doe-Calla"), "doe calla")
+        self.assertEqual(normalize_name("Μαρία"), normalize_name("ΜΑΡΙΑ"))
+        self.assertEqual(normalize_birth_date("1975-03-15"), "19750315")
+        self.assertEqual(normalize_birth_date("15/3/1975"), "19750315")
+        self.assertEqual(normalize_birth_date("19750315120000+0100"), "19750315")
+        self.assertEqual(normalize_birth_date("1975"), "")
+
+    def test_identifier_queries(self):
+        results = self.index.search([
+            DemographicQuery(country_code="pt", patient_id=" 2-1234-w7 "),
+            DemographicQuery(country_code="IE", patient_id="2-1234-W7"),
+            DemographicQuery(patient_id="2-1234-W7", id_root="2.16.620.1.101.10.1.1"),
+            DemographicQuery(patient_id="2-1234-W7", id_root="1.2.3"),
+            DemographicQuery(country_code="PT", patient_id="2-1234-W7", birth_date="1990-01-01"),
+        ])
+
+        self.assertEqual([len(records) for records in results], [1, 0, 1, 0, 0])
+        self.assertEqual(results[0][0].family_name, "Ferreira")
+
+    def test_demographic_queries(self):
+        results = self.index.search([
+            DemographicQuery(country_code="IE", given_name="sean", family_name="OCONNOR", birth_date="15/03/1975"),
+            DemographicQuery(family_name="Δήμου", birth_date="1975-01-01"),
+            DemographicQuery(country_code="IE", given_name="Aoife", family_name="O'Connor", birth_date="1975-03-15"),
+            # Too little to search on
+            DemographicQuery(country_code="IE", given_name="Seán"),
+        ])
+
+        self.assertEqual(results[0][0].patient_id, "53930545")
+        self.assertEqual(results[1][0].patient_id, "01017515303")
+        self.assertEqual(results[2:], [[], []])
+
+    def test_batch_over_large_index(self):
+        index = synthetic_index(PATIENT_COUNT)
+        expected = synthetic_queries(index, QUERY_COUNT)
+
+        search_index = DemographicSearchIndex.from_cda_index(index)
+        start = time.perf_counter()
+        results = search_index.search([query for query, _ in expected])
+        elapsed = time.perf_counter() - start
+
+        for (_, patient_id), records in zip(expected, results):
+            if patient_id is None:
+                self.assertEqual(records, [])
+            else:
+                self.assertIn(patient_id, {record.patient_id for record in records})
+        self.assertLess(elapsed, 0.5)
+
+
+class TestPortalPatientSearch(TestCase):
+    def setUp(self):
+        indexer = CDADocumentIndexer()
+        indexer.index_cache = INDEX
+        patcher = mock.patch.object(cda_document_index, "_indexer", indexer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user("clinician")
+        self.portugal = Country.objects.create(code="PT", name="Portugal")
+
+    def test_indexed_patient_is_found_by_demographics(self):
+        result = perform_patient_search(
+            self.portugal,
+            {"given_name": "DIANA", "surname": "ferreira", "birth_date": "08/05/1982"},
+            self.user,
+        )
+
+        self.assertTrue(result.patient_found)
+        self.assertEqual(result.patient_data["id"], "2-1234-W7")
+        self.assertEqual(result.patient_data["birth_date"], "1982-05-08")
+        self.assertEqual(result.patient_data["source"], "CDA")
+        self.assertEqual(
+            [document["format"] for document in result.available_documents],
+            ["CDA L1", "CDA L3"],
+        )
+
+    def test_unknown_patient_falls_back_to_simulated_response(self):
+        result = perform_patient_search(self.portugal, {"patient_id": "PT-UNKNOWN"}, self.user)
+
+        self.assertFalse(result.patient_found)
+        self.assertEqual(result.ncp_status_code, "404")
@@ -0,0 +1,172 @@
+"""
+Tests for EADC XML Schema validation and XSLT transformation
+
+Compiled schemas and stylesheets must be reused across documents and
+recompiled only when their file changes, and a document is validated only
+once on its way through the pipeline.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from threading import Thread
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from lxml import etree
+
+from patient_data.eadc_integration import EADCDocumentManager, EADCProcessor
+from patient_data.management.commands.benchmark_eadc_artefacts import (
+    DEMO_SCHEMA,
+    DEMO_XSLT,
+)
+from patient_data.services.xml_artefacts import xml_artefacts
+from tests.test_cda_to_fhir import SAMPLE_CDA
+
+DOCUMENT = SAMPLE_CDA.decode("utf-8")
+
+# The sample without its epSOS header elements, as a national document
+NATIONAL_DOCUMENT = "\n".join(
+    line
+    for line in DOCUMENT.splitlines()
+    if not line.lstrip().startswith(("<realmCode", "<typeId", "<templateId"))
+)
+DOCUMENT_COUNT = 50
+
+# Marks documents transformed by the Irish stylesheet
+IE_XSLT = DEMO_XSLT.replace(
+    '<xsl:param name="countryCode"/>',
+    '<xsl:param name="countryCode"/>'
+    '<xsl:template match="/*"><xsl:copy>'
+    '<xsl:attribute name="classCode"><xsl:value-of select="$countryCode"/></xsl:attribute>'
+    '<xsl:apply-templates select="node()"/></xsl:copy></xsl:template>',
+)
+
+
+class TestEADCArtefacts(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        (self.root / "schema").mkdir()
+        (self.root / "xslt" / "IE").mkdir(parents=True)
+        (self.root / "schema" / "CDA_extended.xsd").write_text(DEMO_SCHEMA)
+        (self.root / "xslt" / "ps_national_to_epsos.xsl").write_text(DEMO_XSLT)
+        (self.root / "xslt" / "IE" / "ps_national_to_epsos.xsl").write_text(IE_XSLT)
+
+        with override_settings(EADC_CONFIG_PATH=str(self.root)):
+            self.processor = EADCProcessor()
+        xml_artefacts.clear()
+
+    def test_artefacts_compile_once_for_many_documents(self):
+        compilations = xml_artefacts.compilations
+
+        for _ in range(DOCUMENT_COUNT):
+            validation = self.processor.validate_cda_document(DOCUMENT, "PS", "PT")
+            result = self.processor.transform_national_to_epsos(DOCUMENT, "PS", "PT")
+
+        self.assertTrue(validation["schema_validated"])
+        self.assertTrue(validation["is_valid"], validation["errors"])
+        self.assertEqual(result["transformation_method"], "xslt")
+        self.assertTrue(result["validation"]["schema_validated"])
+        self.assertEqual(xml_artefacts.compilations - compilations, 2)
+
+    def test_country_stylesheet_overrides_shared_one(self):
+        irish = self.processor.transform_national_to_epsos(DOCUMENT, "PS", "IE")
+        portuguese = self.processor.transform_national_to_epsos(DOCUMENT, "PS", "PT")
+
+        self.assertIn('classCode="IE"', irish["epsos_document"])
+        self.assertNotIn('classCode="PT"', portuguese["epsos_document"])
+
+    def test_changed_file_is_recompiled(self):
+        schema = self.root / "schema" / "CDA_extended.xsd"
+        self.assertTrue(self.processor.validate_cda_document(DOCUMENT)["is_valid"])
+
+        schema.write_text(DEMO_SCHEMA.replace('name="ClinicalDocument"', 'name="Other"'))
+        stat = schema.stat()
+        os.utime(schema, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        validation = self.processor.validate_cda_document(DOCUMENT)
+        self.assertFalse(validation["is_valid"])
+        self.assertTrue(validation["errors"][0].startswith("Schema: "))
+
+    def test_missing_artefacts_fall_back_to_builtin_checks(self):
+        with override_settings(EADC_CONFIG_PATH=str(self.root / "missing")):
+            processor = EADCProcessor()
+
+        validation = processor.validate_cda_document(DOCUMENT)
+        result = processor.transform_national_to_epsos(DOCUMENT, "PS", "IE")
+
+        self.assertFalse(validation["schema_validated"])
+        self.assertTrue(validation["epsos_compliant"])
+        self.assertEqual(result["transformation_method"], "builtin")
+
+    def test_untransformed_document_is_validated_once(self):
+        manager = EADCDocumentManager()
+        manager.processor = self.processor
+        failed_transformation = {"success": False, "error": "no stylesheet"}
+
+        for compliant in (True, False):
+            with self.subTest(epsos_compliant=compliant), mock.patch.object(
+                self.processor,
+                "validate_cda_document",
+                return_value={"is_valid": compliant, "epsos_compliant": compliant},
+            ) as validate, mock.patch.object(
+                self.processor,
+                "transform_national_to_epsos",
+                return_value=failed_transformation,
+            ):
+                result = manager.process_incoming_document(DOCUMENT, "PS", "PT")
+
+                validate.assert_called_once_with(DOCUMENT, "PS", "PT")
+                self.assertFalse(result["transformation_applied"])
+                self.assertIs(result["final_validation"], result["initial_validation"])
+                self.assertEqual(result["epsos_compliant"], compliant)
+
+    def test_builtin_transformation_is_epsos_compliant(self):
+        with override_settings(EADC_CONFIG_PATH=str(self.root / "missing")):
+            processor = EADCProcessor()
+        self.assertFalse(processor.validate_cda_document(NATIONAL_DOCUMENT)["epsos_compliant"])
+
+        result = processor.transform_national_to_epsos(NATIONAL_DOCUMENT, "PS", "IE")
+
+        self.assertEqual(result["transformation_method"], "builtin")
+        self.assertTrue(result["validation"]["epsos_compliant"])
+        self.assertTrue(result["validation"]["is_valid"], result["validation"]["errors"])
+        root = etree.fromstring(result["epsos_document"])
+        self.assertEqual(
+            [etree.QName(child) for child in root[:4]],
+            [
+                etree.QName("urn:hl7-org:v3", name)
+                for name in ("realmCode", "typeId", "templateId", "id")
+            ],
+        )
+
+        # Already epSOS headers are not duplicated, and the national
+        # transformation removes the epSOS template again
+        again = processor.transform_national_to_epsos(result["epsos_document"], "PS", "IE")
+        self.assertEqual(again["epsos_document"], result["epsos_document"])
+        national = processor.transform_epsos_to_national(result["epsos_document"], "PS", "IE")
+        self.assertFalse(
+            processor.validate_cda_document(national["national_document"])["epsos_compliant"]
+        )
+
+    @override_settings(EADC_ARTEFACT_POOL_SIZE=2)
+    def test_concurrent_transformations(self):
+        results = []
+
+        def transform():
+            for _ in range(5):
+                results.append(
+                    self.processor.transform_national_to_epsos(DOCUMENT, "PS", "IE")
+                )
+
+        threads = [Thread(target=transform) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertTrue(all('classCode="IE"' in result["epsos_document"] for result in results))
@@ -0,0 +1,120 @@
+"""
+Tests for cached SMP endpoint resolution in EuropeanSMPClient
+
+A local http.server stub stands in for the country SMPs and counts the HEAD
+probes the client sends.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from ehealth_portal import european_smp_client as smp_client_module
+from ehealth_portal.european_smp_client import EuropeanSMPClient
+
+PARTICIPANTS_XML = b'<participants><participant id="ie-ncp"/></participants>'
+
+
+class StubSMPHandler(BaseHTTPRequestHandler):
+    """Answers HEAD probes; /smp-be/ is too slow to respond in time"""
+
+    head_requests = {}
+    lock = threading.Lock()
+
+    def do_HEAD(self):
+        with self.lock:
+            self.head_requests[self.path] = self.head_requests.get(self.path, 0) + 1
+        if self.path.startswith("/smp-be/"):
+            time.sleep(0.5)
+        self.send_response(200)
+        self.end_headers()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(PARTICIPANTS_XML)))
+        self.end_headers()
+        self.wfile.write(PARTICIPANTS_XML)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@override_settings(
+    SMP_RESOLUTION_TTL=60,
+    SMP_NEGATIVE_TTL=5,
+    SMP_CIRCUIT_FAILURE_THRESHOLD=2,
+    SMP_CIRCUIT_COOLDOWN=120,
+    SMP_PROBE_TIMEOUT=0.2,
+)
+class TestEuropeanSMPClientResolution(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubSMPHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        StubSMPHandler.head_requests = {}
+        self.now = 1000.0
+        patcher = mock.patch.object(smp_client_module.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = EuropeanSMPClient(
+            smp_url_template=f"http://127.0.0.1:{self.server.server_port}/smp-{{country_code}}/"
+        )
+
+    def head_count(self, country_code):
+        return StubSMPHandler.head_requests.get(f"/smp-{country_code}/", 0)
+
+    def test_resolution_is_cached(self):
+        for _ in range(3):
+            self.assertEqual(self.client.fetch_participant_list("ie"), ["ie-ncp"])
+
+        self.assertEqual(self.head_count("ie"), 1)
+
+    def test_resolution_expires_after_ttl(self):
+        self.client.get_country_smp_url("ie")
+        self.now += 61
+        self.client.get_country_smp_url("ie")
+
+        self.assertEqual(self.head_count("ie"), 2)
+
+    def test_failed_probe_is_negatively_cached(self):
+        self.assertIsNone(self.client.get_country_smp_url("be"))
+        self.assertIsNone(self.client.get_country_smp_url("be"))
+        self.assertEqual(self.head_count("be"), 1)
+
+        # Probed again once the negative entry expires
+        self.now += 6
+        self.assertIsNone(self.client.get_country_smp_url("be"))
+        self.assertEqual(self.head_count("be"), 2)
+
+    def test_circuit_breaker_stops_probing_until_cooldown(self):
+        for _ in range(2):
+            self.assertIsNone(self.client.get_country_smp_url("be"))
+            self.now += 6
+
+        # Circuit is open: negative entry expired, but no probe is sent
+        for _ in range(5):
+            self.assertIsNone(self.client.get_country_smp_url("be"))
+            self.now += 6
+        self.assertEqual(self.head_count("be"), 2)
+
+        # After the cool-down one trial probe is allowed
+        self.now += 120
+        self.client.get_country_smp_url("be")
+        self.assertEqual(self.head_count("be"), 3)
+
+        # Other countries are unaffected
+        self.assertIsNotNone(self.client.get_country_smp_url("ie"))
@@ -0,0 +1,143 @@
+"""
+Tests for the batched European SMP participant sync
+
+A full participant list must be applied with a bounded number of queries,
+and an unchanged list (HTTP 304) must be skipped entirely.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from smp_client.models import Participant, SMPConfiguration
+
+PARTICIPANT_COUNT = 5_000
+ETAG = '"participants-v1"'
+
+
+def participant_list(name_suffix=""):
+    return {
+        "participants": [
+            {
+                "participantIdentifier": f"urn:ehealth:{index:05d}",
+                "participantScheme": "ehealth-participantid-qns",
+                "participantName": f"Participant {index}{name_suffix}",
+                "countryCode": ["PT", "IE", "GR", "BE"][index % 4],
+                "organizationType": "NCP",
+            }
+            for index in range(PARTICIPANT_COUNT)
+        ]
+    }
+
+
+class StubSMPHandler(BaseHTTPRequestHandler):
+    """Serves the participant list with an ETag and honours If-None-Match"""
+
+    body = b""
+    etag = ETAG
+    requests_served = 0
+
+    def do_GET(self):
+        type(self).requests_served += 1
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.send_header("ETag", self.etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.send_header("ETag", self.etag)
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestEuropeanSMPSync(TestCase):
+    # Bulk writes are chunked (SQLite caps the parameters per statement), so
+    # the count grows with the list size but stays far below one query per
+    # participant
+    MAX_QUERIES = PARTICIPANT_COUNT // 50
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        StubSMPHandler.body = json.dumps(participant_list()).encode("utf-8")
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubSMPHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        StubSMPHandler.requests_served = 0
+        SMPConfiguration.objects.create(
+            european_smp_url=f"http://127.0.0.1:{self.server.server_port}",
+            sync_enabled=True,
+        )
+        self.client.force_login(
+            User.objects.create_user("smp-admin", password="unused", is_staff=True)
+        )
+
+    def _sync(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/smp/sync/european/")
+        return response, queries
+
+    def test_full_sync_uses_bounded_queries(self):
+        response, queries = self._sync()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["synced_participants"], PARTICIPANT_COUNT)
+        self.assertEqual(response.json()["created_participants"], PARTICIPANT_COUNT)
+        self.assertEqual(Participant.objects.count(), PARTICIPANT_COUNT)
+        self.assertLessEqual(len(queries), self.MAX_QUERIES)
+
+        config = SMPConfiguration.objects.get()
+        self.assertEqual(config.participants_etag, ETAG)
+
+    def test_unchanged_list_is_skipped(self):
+        self._sync()
+
+        response, queries = self._sync()
+
+        self.assertEqual(StubSMPHandler.requests_served, 2)
+        self.assertTrue(response.json()["not_modified"])
+        self.assertEqual(response.json()["synced_participants"], 0)
+        self.assertFalse(
+            [query for query in queries if "smp_client_participant" in query["sql"]]
+        )
+
+    def test_changed_participants_are_bulk_updated(self):
+        self._sync()
+
+        StubSMPHandler.body = json.dumps(participant_list(" (renamed)")).encode("utf-8")
+        StubSMPHandler.etag = '"participants-v2"'
+        self.addCleanup(setattr, StubSMPHandler, "etag", ETAG)
+        self.addCleanup(
+            setattr,
+            StubSMPHandler,
+            "body",
+            json.dumps(participant_list()).encode("utf-8"),
+        )
+
+        response, queries = self._sync()
+
+        self.assertEqual(response.json()["updated_participants"], PARTICIPANT_COUNT)
+        self.assertEqual(response.json()["created_participants"], 0)
+        self.assertLessEqual(len(queries), self.MAX_QUERIES)
+        self.assertTrue(
+            Participant.objects.filter(participant_name="Participant 7 (renamed)").exists()
+        )
@@ -0,0 +1,131 @@
+"""
+Tests for FHIR Observation classification
+
+Each Observation is classified once into every UI section it belongs to:
+category codes first, then the LOINC/SNOMED code tables, then keyword
+fallbacks on the code text and the parsed observation name.
+"""
+
+from django.test import SimpleTestCase
+
+from patient_data.services.fhir_observation_classifier import (
+    LABORATORY_RESULTS,
+    LOINC_SYSTEM,
+    OBSERVATION_SECTIONS,
+    PHYSICAL_FINDINGS,
+    PREGNANCY_HISTORY,
+    SOCIAL_HISTORY,
+    VITAL_SIGNS,
+    observation_classifier,
+)
+
+SNOMED_SYSTEM = "http://snomed.info/sct"
+CATEGORY_SYSTEM = "http://terminology.hl7.org/CodeSystem/observation-category"
+
+
+def category(code, display=""):
+    return [{"coding": [{"system": CATEGORY_SYSTEM, "code": code, "display": display}]}]
+
+
+def code(system, value, display="", text=""):
+    return {"coding": [{"system": system, "code": value, "display": display}], "text": text}
+
+
+class TestFHIRObservationClassifier(SimpleTestCase):
+    def classify(self, observation):
+        return observation_classifier.classify(observation)
+
+    def test_category_codes(self):
+        cases = {
+            "vital-signs": VITAL_SIGNS,
+            "social-history": SOCIAL_HISTORY,
+            "laboratory": LABORATORY_RESULTS,
+            "lab": LABORATORY_RESULTS,
+            "imaging": LABORATORY_RESULTS,
+            "exam": PHYSICAL_FINDINGS,
+            "physical-exam": PHYSICAL_FINDINGS,
+            "physical-finding": PHYSICAL_FINDINGS,
+        }
+        for category_code, section in cases.items():
+            with self.subTest(category_code):
+                self.assertEqual(self.classify({"category": category(category_code)}), {section})
+
+    def test_pregnancy_category_display(self):
+        observation = {"category": category("survey", "Obstetric history")}
+        self.assertEqual(self.classify(observation), {PREGNANCY_HISTORY})
+
+    def test_string_categories(self):
+        cases = {
+            "Vital Signs": {VITAL_SIGNS},
+            "social": {SOCIAL_HISTORY},
+            "Laboratory": {LABORATORY_RESULTS},
+            "imaging": {LABORATORY_RESULTS},
+            "Physical": {PHYSICAL_FINDINGS},
+            "exam": {PHYSICAL_FINDINGS},
+            "Pregnancy": {PREGNANCY_HISTORY},
+            "obstetric": {PREGNANCY_HISTORY},
+            "survey": set(),
+        }
+        for category_text, sections in cases.items():
+            with self.subTest(category_text):
+                self.assertEqual(self.classify({"category": category_text}), sections)
+
+    def test_loinc_code_tables(self):
+        cases = {
+            "8867-4": VITAL_SIGNS,
+            "72166-2": SOCIAL_HISTORY,
+            "29274-8": PHYSICAL_FINDINGS,
+        }
+        for loinc_code, section in cases.items():
+            with self.subTest(loinc_code):
+                self.assertIn(section, self.classify({"code": code(LOINC_SYSTEM, loinc_code)}))
+
+    def test_loinc_codes_require_the_loinc_system(self):
+        self.assertEqual(self.classify({"code": code("urn:oid:1.2.3", "8867-4")}), set())
+
+    def test_code_keyword_fallbacks(self):
+        cases = {
+            "Systolic pressure": VITAL_SIGNS,
+            "Tobacco use": SOCIAL_HISTORY,
+            "Serum creatinine": LABORATORY_RESULTS,
+            "Palpation of abdomen": PHYSICAL_FINDINGS,
+        }
+        for text, section in cases.items():
+            with self.subTest(text):
+                self.assertIn(section, self.classify({"code": {"text": text}}))
+
+    def test_keywords_ignore_the_code_system_uri(self):
+        # "ct" must not match the "sct" of the SNOMED system URI
+        observation = {"code": code(SNOMED_SYSTEM, "404684003", "Allergy to nuts")}
+        self.assertEqual(self.classify(observation), set())
+
+    def test_pregnancy_codes_and_keywords(self):
+        cases = [
+            {"observation_code": "11636-8"},
+            {"code_data": {"code": "77386006"}},
+            {"observation_name": "Gestational age"},
+            {"code_data": {"text": "Date of delivery"}},
+        ]
+        for observation in cases:
+            with self.subTest(observation):
+                self.assertEqual(self.classify(observation), {PREGNANCY_HISTORY})
+
+    def test_observation_in_several_sections(self):
+        observation = {
+            "category": category("vital-signs"),
+            "code": code(LOINC_SYSTEM, "29463-7", "Body weight"),
+            "observation_name": "Weight before delivery",
+        }
+        self.assertEqual(self.classify(observation), {VITAL_SIGNS, PREGNANCY_HISTORY})
+
+    def test_group(self):
+        heart_rate = {"code": code(LOINC_SYSTEM, "8867-4")}
+        smoking = {"category": category("social-history")}
+        unclassified = {"code": {"text": "Nut allergy"}}
+
+        grouped = observation_classifier.group([heart_rate, smoking, unclassified])
+
+        self.assertEqual(set(grouped), set(OBSERVATION_SECTIONS))
+        self.assertEqual(grouped[VITAL_SIGNS], [heart_rate])
+        self.assertEqual(grouped[SOCIAL_HISTORY], [smoking])
+        self.assertEqual(sum(len(bucket) for bucket in grouped.values()), 2)
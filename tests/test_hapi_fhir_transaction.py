@@ -0,0 +1,201 @@
+"""
+Tests for posting Patient Summaries to HAPI FHIR as transaction Bundles
+
+A summary must reach the server as one transaction request (or one per
+size-capped chunk) over a single pooled connection, with conditional
+creates for Patient, Practitioner and Organization.
+"""
+
+import copy
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase, override_settings
+
+from eu_ncp_server.services.fhir_integration import HAPIFHIRIntegrationService
+from patient_data.services.cda_to_fhir_service import cda_to_fhir_service
+from tests.test_cda_to_fhir import SAMPLE_CDA
+
+
+class StubHAPIHandler(BaseHTTPRequestHandler):
+    """Answers transaction Bundles and records what it received"""
+
+    protocol_version = "HTTP/1.1"
+    transactions = []
+    server_ids = set()
+    connections = set()
+    next_id = 0
+
+    def do_POST(self):
+        cls = type(self)
+        cls.connections.add(self.client_address)
+        bundle = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        cls.transactions.append(bundle)
+
+        response_entries = []
+        for entry in bundle["entry"]:
+            cls.next_id += 1
+            url = entry["request"]["url"]
+            if entry["request"]["method"] == "POST":
+                url = f"{url}/{cls.next_id}"
+            cls.server_ids.add(url)
+            response_entries.append({
+                "response": {
+                    # Conditional creates match an existing resource
+                    "status": "200 OK" if "ifNoneExist" in entry["request"] else "201 Created",
+                    "location": f"{url}/_history/1",
+                }
+            })
+        body = json.dumps({
+            "resourceType": "Bundle",
+            "id": f"response-{len(cls.transactions)}",
+            "type": "transaction-response",
+            "entry": response_entries,
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/fhir+json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def references(value):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "reference":
+                yield item
+            else:
+                yield from references(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from references(item)
+
+
+class TestHAPIFHIRTransaction(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHAPIHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        StubHAPIHandler.transactions = []
+        StubHAPIHandler.server_ids = set()
+        StubHAPIHandler.connections = set()
+        self.bundle = cda_to_fhir_service.convert(SAMPLE_CDA)
+
+    def _service(self):
+        with override_settings(HAPI_FHIR_BASE_URL=f"http://127.0.0.1:{self.server.server_port}"):
+            return HAPIFHIRIntegrationService()
+
+    def test_summary_is_posted_as_one_transaction(self):
+        result = self._service().post_patient_summary(self.bundle, "clinician")
+
+        self.assertEqual(len(StubHAPIHandler.transactions), 1)
+        (transaction,) = StubHAPIHandler.transactions
+        self.assertEqual(transaction["type"], "transaction")
+        self.assertEqual(len(transaction["entry"]), len(self.bundle["entry"]))
+
+        requests_by_type = {
+            entry["resource"]["resourceType"]: entry["request"]
+            for entry in transaction["entry"]
+        }
+        self.assertEqual(
+            requests_by_type["Patient"]["ifNoneExist"],
+            "identifier=urn:oid:2.16.840.1.113883.2.9.4.3.2|NCPNPH80A01H501K",
+        )
+        self.assertIn("ifNoneExist", requests_by_type["Practitioner"])
+        self.assertNotIn("ifNoneExist", requests_by_type["Condition"])
+
+        full_urls = {entry["fullUrl"] for entry in transaction["entry"]}
+        self.assertTrue(all(url.startswith("urn:uuid:") for url in full_urls))
+        self.assertTrue(set(references(transaction)) <= full_urls)
+
+        # Patient and Practitioner already existed on the server
+        self.assertEqual(result["transaction_count"], 1)
+        self.assertEqual(len(result["created_resources"]), len(self.bundle["entry"]) - 2)
+
+    def test_large_summary_is_chunked_in_dependency_order(self):
+        with override_settings(HAPI_FHIR_TRANSACTION_MAX_ENTRIES=5):
+            service = self._service()
+        result = service.post_patient_summary(self.bundle, "clinician")
+
+        self.assertEqual(len(StubHAPIHandler.transactions), 4)
+        self.assertEqual(result["transaction_count"], 4)
+        self.assertEqual(len(StubHAPIHandler.connections), 1)
+
+        # Every reference is to the same transaction or to a resource the
+        # server created in an earlier one
+        for transaction in StubHAPIHandler.transactions:
+            full_urls = {entry["fullUrl"] for entry in transaction["entry"]}
+            for reference in references(transaction):
+                self.assertTrue(
+                    reference in full_urls or reference in StubHAPIHandler.server_ids,
+                    reference,
+                )
+        last_transaction = StubHAPIHandler.transactions[-1]
+        self.assertEqual(
+            last_transaction["entry"][-1]["resource"]["resourceType"], "Composition"
+        )
+
+    def test_entries_with_their_own_request(self):
+        bundle = {
+            "resourceType": "Bundle",
+            "type": "document",
+            "entry": [
+                {
+                    "fullUrl": "http://example.org/fhir/Patient/123",
+                    "resource": {
+                        "resourceType": "Patient",
+                        "id": "123",
+                        "identifier": [{"system": "urn:oid:1.2.3", "value": "123"}],
+                    },
+                    "request": {"method": "PUT", "url": "Patient/123"},
+                },
+                {
+                    "resource": {
+                        "resourceType": "Organization",
+                        "id": "hospital",
+                        "identifier": [{"system": "urn:oid:1.2.4", "value": "H1"}],
+                    },
+                    "request": {"method": "POST", "url": "Organization"},
+                },
+                {
+                    "resource": {
+                        "resourceType": "Condition",
+                        "subject": {"reference": "Patient/123"},
+                        "asserter": {"reference": "Organization/hospital"},
+                    },
+                },
+            ],
+        }
+        original = copy.deepcopy(bundle)
+
+        entries = self._service()._build_transaction_entries(bundle)
+
+        self.assertEqual(bundle, original)
+        by_type = {entry["resource"]["resourceType"]: entry for entry in entries}
+
+        patient = by_type["Patient"]
+        self.assertEqual(patient["request"], {"method": "PUT", "url": "Patient/123"})
+        self.assertEqual(patient["resource"]["id"], "123")
+
+        organization = by_type["Organization"]
+        self.assertEqual(organization["request"]["ifNoneExist"], "identifier=urn:oid:1.2.4|H1")
+        self.assertNotIn("id", organization["resource"])
+
+        condition = by_type["Condition"]["resource"]
+        self.assertEqual(condition["subject"]["reference"], patient["fullUrl"])
+        self.assertEqual(condition["asserter"]["reference"], organization["fullUrl"])
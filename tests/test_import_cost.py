@@ -0,0 +1,101 @@
+"""
+Tests for process start-up cost
+
+`manage.py check` imports the URLconf, admin and every view module, which is
+what each worker boot and management command pays. Heavy libraries (PDF
+rendering, dataframes, FHIR models, HTML parsing) must only be imported on
+first use, and services must only be constructed when first needed.
+"""
+
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from eu_ncp_server.services import fhir_service_factory
+from eu_ncp_server.services.fhir_integration import HAPIFHIRIntegrationService
+from patient_data.services.clinical_sections import (
+    SPECIALIZED_SERVICES,
+    clinical_pipeline_manager,
+)
+
+# Regression thresholds relative to a bare `django.setup()` run, which
+# imports the settings and every installed app's models. `manage.py check`
+# additionally imports the URLconf, admin and views: about 1.4x the
+# import time and 215 more modules here. Importing xhtml2pdf alone adds
+# about 500 modules and more than doubles the time.
+IMPORT_TIME_RATIO_BUDGET = 2.0
+EXTRA_MODULE_BUDGET = 300
+
+DEFERRED_MODULES = ("xhtml2pdf", "reportlab", "pandas", "openpyxl", "fhir.resources", "bs4")
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|( +)(\S+)$")
+
+DJANGO_SETUP = (
+    "import django, os; "
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eu_ncp_server.settings'); "
+    "django.setup()"
+)
+
+
+def importtime(*args):
+    """Modules imported by a Python command, with their total cost in ms"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=Path(settings.BASE_DIR),
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    modules, total_ms = set(), 0.0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(3))
+        if len(match.group(2)) == 1:
+            total_ms += int(match.group(1)) / 1000
+    return modules, total_ms
+
+
+class TestImportCost(SimpleTestCase):
+    def test_manage_check_import_budget(self):
+        modules, total_ms = importtime("manage.py", "check")
+        setup_modules, setup_ms = importtime("-c", DJANGO_SETUP)
+
+        for deferred in DEFERRED_MODULES:
+            imported = sorted(m for m in modules if m == deferred or m.startswith(f"{deferred}."))
+            self.assertEqual(imported, [], f"{deferred} imported by manage.py check")
+
+        self.assertLess(len(modules - setup_modules), EXTRA_MODULE_BUDGET)
+        self.assertLess(total_ms / setup_ms, IMPORT_TIME_RATIO_BUDGET)
+
+
+@override_settings(FHIR_PROVIDER="HAPI")
+class TestLazyServices(SimpleTestCase):
+    def setUp(self):
+        fhir_service_factory.reset_fhir_service_singleton()
+        self.addCleanup(fhir_service_factory.reset_fhir_service_singleton)
+
+    def test_fhir_service_is_constructed_once_on_first_use(self):
+        self.assertEqual(fhir_service_factory._fhir_service_instances, {})
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            services = list(executor.map(
+                lambda _: fhir_service_factory.get_fhir_service_singleton(), range(32)
+            ))
+
+        self.assertIsInstance(services[0], HAPIFHIRIntegrationService)
+        self.assertEqual({id(service) for service in services}, {id(services[0])})
+        self.assertIs(fhir_service_factory.fhir_service, services[0])
+
+    def test_clinical_services_are_registered_on_first_use(self):
+        services = clinical_pipeline_manager.get_all_services()
+
+        for service_class in SPECIALIZED_SERVICES:
+            self.assertIn(service_class().get_section_code(), services)
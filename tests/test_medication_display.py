@@ -0,0 +1,90 @@
+"""
+Tests for the per-request medication display model
+
+Medication filters must build one MedicationDisplay per row and share one
+terminology translator across all rows.
+"""
+
+from unittest import mock
+
+from django.template import Context, Template
+from django.test import SimpleTestCase
+
+from patient_data.services import medication_display as medication_display_module
+from patient_data.services.medication_display import (
+    clear_medication_displays,
+    medication_display,
+)
+
+MEDICATION_COUNT = 200
+
+MEDICATION_TEMPLATE = Template(
+    "{% load medication_filters %}"
+    "{% for med in medications %}"
+    "{{ med|extract_active_ingredient }}|{{ med|smart_dose_form }}|"
+    "{{ med|extract_dosage_schedule }}|{{ med|format_treatment_period }}\n"
+    "{% endfor %}"
+)
+
+
+def medication(index):
+    return {
+        "medication_name": f"ASPIRIN {index}mg Enteric-coated tablet",
+        "effective_time": [
+            {
+                "low_formatted": "2018-01-12 00:00:00 (UTC)",
+                "high_formatted": "2018-02-01 00:00:00 (UTC)",
+                "period": "8h",
+            }
+        ],
+    }
+
+
+class TestMedicationDisplay(SimpleTestCase):
+    def setUp(self):
+        clear_medication_displays()
+        self.addCleanup(clear_medication_displays)
+        medication_display_module._translators.clear()
+
+    def test_render_builds_one_model_per_row_and_one_translator(self):
+        medications = [medication(i) for i in range(MEDICATION_COUNT)]
+        translator = mock.Mock()
+        translator.resolve_code.return_value = None
+
+        with mock.patch(
+            "translation_services.terminology_translator.TerminologyTranslator",
+            return_value=translator,
+        ) as translator_class, mock.patch.object(
+            medication_display_module,
+            "MedicationDisplay",
+            wraps=medication_display_module.MedicationDisplay,
+        ) as display_class:
+            lines = MEDICATION_TEMPLATE.render(
+                Context({"medications": medications})
+            ).splitlines()
+
+        self.assertEqual(display_class.call_count, MEDICATION_COUNT)
+        self.assertEqual(translator_class.call_count, 1)
+        translator.resolve_code.assert_called_once_with("8h")
+        self.assertEqual(
+            lines[7],
+            "ASPIRIN|Enteric-coated tablet|Schedule not specified|"
+            "Jan 12, 2018 to Feb 01, 2018 (20 days)",
+        )
+
+    def test_model_is_memoized_per_row_until_cleared(self):
+        row = medication(1)
+        display = medication_display(row)
+
+        self.assertIs(medication_display(row), display)
+        self.assertIsNot(medication_display(medication(1)), display)
+
+        clear_medication_displays()
+        self.assertIsNot(medication_display(row), display)
+
+    def test_string_names(self):
+        display = medication_display("VIREAD 245 mg tablet")
+
+        self.assertEqual(display.strength, "245 mg")
+        self.assertEqual(display.brand_name, "VIREAD")
+        self.assertEqual(display.active_ingredient, "VIREAD")
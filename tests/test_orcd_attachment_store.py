@@ -0,0 +1,129 @@
+"""
+Tests for ORCD attachment streaming
+
+Decoded attachments are served from the file-backed store with byte-range
+support (206/416) and ETag revalidation (304), as PDF viewers fetch pages
+with Range requests and revalidate with If-None-Match.
+"""
+
+import base64
+import hashlib
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from patient_data.services.orcd_attachment_store import (
+    AttachmentNotFound,
+    ORCDAttachmentStore,
+)
+
+PDF_BYTES = b"%PDF-1.4\n" + bytes(range(256)) * 4 + b"\n%%EOF"
+SECOND_PDF_BYTES = b"%PDF-1.7\n" + b"second attachment " * 20 + b"\n%%EOF"
+
+
+def orcd_cda(*pdfs):
+    components = "".join(
+        f"""<component><section><entry><observationMedia>
+            <value mediaType="application/pdf" representation="B64">{base64.b64encode(pdf).decode()}</value>
+        </observationMedia></entry></section></component>"""
+        for pdf in pdfs
+    )
+    return f"""<ClinicalDocument xmlns="urn:hl7-org:v3">
+        <component><structuredBody>{components}</structuredBody></component>
+    </ClinicalDocument>"""
+
+
+class TestORCDAttachmentStore(SimpleTestCase):
+    def setUp(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, True)
+        self.store = ORCDAttachmentStore(cache_dir=cache_dir)
+        self.manifest = self.store.get_manifest(orcd_cda(PDF_BYTES, SECOND_PDF_BYTES))
+        self.etag = f'"{hashlib.md5(PDF_BYTES).hexdigest()}"'
+        self.factory = RequestFactory()
+
+    def serve(self, attachment_index=0, **headers):
+        request = self.factory.get("/orcd/", **headers)
+        return self.store.serve(request, self.manifest, attachment_index, "orcd.pdf")
+
+    def test_full_response(self):
+        response = self.serve()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), PDF_BYTES)
+        self.assertEqual(response["Content-Length"], str(len(PDF_BYTES)))
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["ETag"], self.etag)
+
+    def test_second_attachment_is_served_from_its_offset(self):
+        response = self.serve(1)
+
+        self.assertEqual(b"".join(response.streaming_content), SECOND_PDF_BYTES)
+
+    def test_partial_range(self):
+        response = self.serve(HTTP_RANGE="bytes=100-199")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), PDF_BYTES[100:200])
+        self.assertEqual(response["Content-Length"], "100")
+        self.assertEqual(response["Content-Range"], f"bytes 100-199/{len(PDF_BYTES)}")
+
+    def test_suffix_and_open_ended_ranges(self):
+        suffix = self.serve(HTTP_RANGE="bytes=-6")
+        self.assertEqual(b"".join(suffix.streaming_content), PDF_BYTES[-6:])
+
+        open_ended = self.serve(HTTP_RANGE=f"bytes={len(PDF_BYTES) - 10}-")
+        self.assertEqual(open_ended.status_code, 206)
+        self.assertEqual(b"".join(open_ended.streaming_content), PDF_BYTES[-10:])
+
+    def test_unsatisfiable_range(self):
+        size = len(PDF_BYTES)
+        for header in (f"bytes={size}-", f"bytes={size}-{size + 9}", "bytes=-0"):
+            with self.subTest(header):
+                response = self.serve(HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response["Content-Range"], f"bytes */{len(PDF_BYTES)}")
+
+    def test_ignored_ranges_send_whole_attachment(self):
+        for header in (
+            "bytes=0-9,20-29",
+            "bytes=0-9, -5",
+            "bytes=50-10",
+            "bytes=-",
+            "bytes=abc-",
+            "bytes 0-9",
+            "items=0-10",
+        ):
+            with self.subTest(header):
+                response = self.serve(HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("Content-Range", response)
+                self.assertEqual(b"".join(response.streaming_content), PDF_BYTES)
+
+    def test_if_none_match(self):
+        response = self.serve(HTTP_IF_NONE_MATCH=f'"other", {self.etag}')
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], self.etag)
+        self.assertEqual(response.content, b"")
+
+        self.assertEqual(self.serve(HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_if_range_with_stale_etag_sends_whole_attachment(self):
+        response = self.serve(HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), PDF_BYTES)
+
+    def test_missing_attachment(self):
+        with self.assertRaises(AttachmentNotFound):
+            self.serve(2)
+
+    def test_manifest_is_decoded_once(self):
+        with mock.patch.object(self.store.pdf_service, "extract_pdfs_from_xml") as extract:
+            manifest = self.store.get_manifest(orcd_cda(PDF_BYTES, SECOND_PDF_BYTES))
+
+        extract.assert_not_called()
+        self.assertEqual(self.store.read_attachment(manifest, 0), PDF_BYTES)
@@ -0,0 +1,136 @@
+"""
+Tests for the indexed patient match session lookup
+
+Recovering patient_match_<id> data from another Django session must be a
+single indexed query, independent of the number of stored sessions, and
+the index must follow the data when the session key rotates on login.
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import login
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from patient_data.models import PatientMatchSessionIndex
+from patient_data.services.session_data_service import SessionDataService
+
+
+class TestPatientMatchSessionIndex(TestCase):
+    """Indexed session-to-patient lookup with many live sessions"""
+
+    SESSION_COUNT = 10_000
+    MATCH_ID = "a1b2c3d4"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.match_data = {
+            "patient_data": {"given_name": "Maria", "family_name": "Santos"},
+            "country_code": "PT",
+            "preferred_cda_type": "L3",
+        }
+
+        # Other live sessions, each holding a different patient match
+        filler_data = SessionStore().encode(
+            {"patient_match_other": {"country_code": "IE"}}
+        )
+        expire_date = timezone.now() + timedelta(days=1)
+        Session.objects.bulk_create(
+            [
+                Session(
+                    session_key=f"filler{index:026d}",
+                    session_data=filler_data,
+                    expire_date=expire_date,
+                )
+                for index in range(cls.SESSION_COUNT)
+            ],
+            batch_size=1000,
+        )
+
+        # Store the match data the same way the search views do
+        request = RequestFactory().get("/")
+        request.session = SessionStore()
+        SessionDataService.store_patient_match(request, cls.MATCH_ID, cls.match_data)
+        request.session.save()
+        cls.owner_session_key = request.session.session_key
+
+    def test_store_writes_index_entry(self):
+        entry = PatientMatchSessionIndex.objects.get(match_id=self.MATCH_ID)
+        self.assertEqual(entry.session_id, self.owner_session_key)
+
+    def test_lookup_is_a_single_query(self):
+        self.assertEqual(Session.objects.count(), self.SESSION_COUNT + 1)
+
+        with self.assertNumQueries(1):
+            match_data = SessionDataService.find_indexed_match_data(self.MATCH_ID)
+
+        self.assertEqual(match_data, self.match_data)
+
+    def test_missing_match_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            match_data = SessionDataService.find_indexed_match_data("unknown")
+
+        self.assertIsNone(match_data)
+
+    def test_get_patient_data_from_other_session(self):
+        request = RequestFactory().get("/")
+        request.session = SessionStore()
+
+        # Direct session key check plus the indexed lookup
+        with self.assertNumQueries(2):
+            match_data, _debug_info = SessionDataService.get_patient_data(
+                request, self.MATCH_ID
+            )
+
+        self.assertEqual(match_data, self.match_data)
+
+    def test_expired_session_is_ignored(self):
+        Session.objects.filter(session_key=self.owner_session_key).update(
+            expire_date=timezone.now() - timedelta(minutes=1)
+        )
+
+        self.assertIsNone(SessionDataService.find_indexed_match_data(self.MATCH_ID))
+
+    def test_index_removed_with_session(self):
+        Session.objects.filter(session_key=self.owner_session_key).delete()
+
+        self.assertFalse(
+            PatientMatchSessionIndex.objects.filter(match_id=self.MATCH_ID).exists()
+        )
+
+    def test_storing_an_indexed_match_again_makes_no_query(self):
+        session = SessionStore(session_key=self.owner_session_key)
+        request = RequestFactory().get("/")
+        request.session = session
+        match_data = dict(session[f"patient_match_{self.MATCH_ID}"], enhanced_problems=[])
+
+        with self.assertNumQueries(0):
+            SessionDataService.store_patient_match(request, self.MATCH_ID, match_data)
+
+    def test_login_reindexes_rotated_session(self):
+        request = RequestFactory().get("/")
+        request.session = SessionStore(session_key=self.owner_session_key)
+        request.session[f"patient_match_{self.MATCH_ID}"]  # load the session data
+
+        login(request, User.objects.create_user("clinician"))
+        request.session.save()
+
+        new_session_key = request.session.session_key
+        self.assertNotEqual(new_session_key, self.owner_session_key)
+        entry = PatientMatchSessionIndex.objects.get(match_id=self.MATCH_ID)
+        self.assertEqual(entry.session_id, new_session_key)
+        self.assertEqual(
+            SessionDataService.find_indexed_match_data(self.MATCH_ID), self.match_data
+        )
+
+    def test_create_pt_session_indexes_its_match(self):
+        call_command("create_pt_session", stdout=StringIO())
+
+        entry = PatientMatchSessionIndex.objects.exclude(match_id=self.MATCH_ID).get()
+        match_data = SessionDataService.find_indexed_match_data(entry.match_id)
+        self.assertEqual(match_data["country_code"], "PT")
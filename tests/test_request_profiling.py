@@ -0,0 +1,109 @@
+"""
+Tests for request profiling
+
+RequestProfilingMiddleware is opt-in (SERVER_TIMING_ENABLED): when on, every
+response carries a Server-Timing header built from the spans, queries and
+cache lookups of the request, and staff can ask for the full JSON profile.
+"""
+
+import json
+
+from django.contrib.auth.models import User
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import path
+
+from patient_data.middleware.request_profiling import RequestProfilingMiddleware
+from patient_data.utils.performance_logging import log_stage
+from patient_data.utils.request_profiling import (
+    current_profile,
+    profile_request,
+    record_cache_lookup,
+    span,
+)
+
+
+def profiled_view(request):
+    with span("cda.parse"):
+        User.objects.count()
+    record_cache_lookup("terminology", hit=True)
+    record_cache_lookup("terminology", hit=False)
+    return HttpResponse("page")
+
+
+urlpatterns = [path("profiled/", profiled_view)]
+
+
+class TestRequestProfile(TestCase):
+    def test_spans_queries_and_caches_are_recorded(self):
+        with profile_request() as profile:
+            self.assertIs(current_profile(), profile)
+            for _ in range(2):
+                with span("section.extract"):
+                    pass
+            with log_stage("fhir_view_processor", "render"):
+                User.objects.exists()
+            record_cache_lookup("cda_render", hit=True)
+            record_cache_lookup("cda_render", hit=True)
+            record_cache_lookup("cda_render", hit=False)
+
+        self.assertIsNone(current_profile())
+        data = profile.as_dict()
+        self.assertEqual(data["stages"]["section.extract"]["count"], 2)
+        self.assertIn("fhir_view_processor.render", data["stages"])
+        self.assertEqual(data["queries"]["count"], 1)
+        self.assertEqual(data["caches"]["cda_render"]["hit_ratio"], 0.667)
+
+        header = profile.server_timing()
+        self.assertTrue(header.startswith("total;dur="))
+        self.assertIn('db;dur=', header)
+        self.assertIn('section.extract;dur=', header)
+        self.assertIn('desc="2 calls"', header)
+
+    def test_span_without_profile_is_a_no_op(self):
+        with span("cda.parse"):
+            record_cache_lookup("terminology", hit=True)
+        self.assertIsNone(current_profile())
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class TestRequestProfilingMiddleware(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user("admin", password="secret", is_staff=True)
+        self.clinician = User.objects.create_user("clinician", password="secret")
+
+    def test_disabled_by_default(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestProfilingMiddleware(lambda request: HttpResponse())
+
+        response = self.client.get("/profiled/")
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_server_timing_header(self):
+        response = self.client.get("/profiled/")
+
+        self.assertEqual(response.content, b"page")
+        self.assertIn("cda.parse;dur=", response["Server-Timing"])
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+
+    @override_settings(SERVER_TIMING_ENABLED=True, REQUEST_PROFILE_ENABLED=True)
+    def test_json_profile_is_staff_only(self):
+        self.client.force_login(self.clinician)
+        self.assertEqual(self.client.get("/profiled/?_profile=1").content, b"page")
+
+        self.client.force_login(self.staff)
+        response = self.client.get("/profiled/?_profile=1")
+        data = json.loads(response.content)
+
+        self.assertEqual(data["path"], "/profiled/")
+        self.assertEqual(data["status"], 200)
+        self.assertEqual(data["stages"]["cda.parse"]["count"], 1)
+        self.assertEqual(data["caches"]["terminology"]["hit_ratio"], 0.5)
+        self.assertIn("Server-Timing", response)
+
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_json_profile_requires_setting(self):
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get("/profiled/?_profile=1").content, b"page")
@@ -0,0 +1,235 @@
+"""
+Tests for precompiled SMP ServiceMetadata responses and buffered query logging
+
+A cached ServiceMetadata response is served without database queries,
+revalidated with its ETag, and invalidated by any save or delete of a model
+it is built from. SMPQuery rows are written in batches, and a rejected row
+must not block the rows around it.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import IntegrityError, OperationalError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from eu_ncp_server.services import cache_generation
+from smp_client.metadata_cache import service_metadata_generation
+from smp_client.models import (
+    DocumentType,
+    DocumentTypeScheme,
+    Domain,
+    Endpoint,
+    Participant,
+    ParticipantIdentifierScheme,
+    ProcessIdentifier,
+    ServiceGroup,
+    ServiceMetadata,
+    SMPQuery,
+)
+from smp_client.query_log import SMPQueryLogBuffer
+
+PARTICIPANT_SCHEME = "ehealth-participantid-qns"
+PARTICIPANT_ID = "urn:ehealth:pt:ncp-idp"
+DOCUMENT_TYPE_ID = "urn::epsos##services:extended:epsos::107"
+
+
+def query_fields(**overrides):
+    fields = {
+        "participant_id": PARTICIPANT_ID,
+        "participant_scheme": PARTICIPANT_SCHEME,
+        "document_type_id": DOCUMENT_TYPE_ID,
+        "query_type": "service_metadata",
+        "source_ip": "127.0.0.1",
+        "response_time_ms": 3,
+    }
+    fields.update(overrides)
+    return fields
+
+
+@mock.patch.object(SMPQueryLogBuffer, "_ensure_started")
+class TestServiceMetadataCache(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        domain = Domain.objects.create(
+            domain_code="ehealth-actorid-qns",
+            domain_name="eHealth",
+            sml_subdomain="ehealth",
+            smp_url="https://smp.example.org",
+        )
+        scheme = ParticipantIdentifierScheme.objects.create(
+            scheme_id=PARTICIPANT_SCHEME, scheme_name="eHealth participants"
+        )
+        participant = Participant.objects.create(
+            participant_identifier=PARTICIPANT_ID, participant_scheme=scheme, domain=domain
+        )
+        document_type = DocumentType.objects.create(
+            document_type_identifier=DOCUMENT_TYPE_ID,
+            document_scheme=DocumentTypeScheme.objects.create(
+                scheme_id="ehealth-resid-qns", scheme_name="eHealth documents"
+            ),
+            document_name="Patient Summary",
+        )
+        service_metadata = ServiceMetadata.objects.create(
+            service_group=ServiceGroup.objects.create(participant=participant),
+            document_type=document_type,
+        )
+        cls.endpoint = Endpoint.objects.create(
+            service_metadata=service_metadata,
+            process=ProcessIdentifier.objects.create(
+                process_identifier="urn:epsosPatientService::List", process_name="List"
+            ),
+            endpoint_url="https://ncp.example.org/services",
+            certificate="MIIC",
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse(
+            "smp_client:smp_service_metadata",
+            kwargs={
+                "participant_scheme": PARTICIPANT_SCHEME,
+                "participant_id": PARTICIPANT_ID,
+                "document_type_id": DOCUMENT_TYPE_ID,
+            },
+        )
+
+    def test_cache_hit_makes_no_queries(self, _):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn(b"https://ncp.example.org/services", first.content)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_if_none_match_returns_304(self, _):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_save_invalidates(self, _):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.endpoint.endpoint_url = "https://ncp.example.org/v2"
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.endpoint.save()
+            # Not invalidated until the change is committed
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+        for callback in callbacks:
+            callback()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"https://ncp.example.org/v2", response.content)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_delete_invalidates(self, _):
+        self.assertIn(b"<Process>", self.client.get(self.url).content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.endpoint.delete()
+
+        self.assertNotIn(b"<Process>", self.client.get(self.url).content)
+
+    def test_entries_expire_at_endpoint_expiration(self, _):
+        Endpoint.objects.filter(pk=self.endpoint.pk).update(
+            service_expiration_date=timezone.now() + timedelta(seconds=30)
+        )
+
+        with mock.patch("smp_client.metadata_cache.cache.set") as cache_set:
+            self.client.get(self.url)
+
+        self.assertLessEqual(cache_set.call_args.args[2], 30)
+
+    @override_settings(SMP_METADATA_LOCAL_CACHE_TIMEOUT=5, SMP_METADATA_CACHE_TIMEOUT=3600)
+    def test_process_local_cache_bounds_staleness(self, _):
+        self.assertTrue(cache_generation.cache_is_process_local())
+        self.assertEqual(service_metadata_generation.max_age(3600), 5)
+
+        with mock.patch("smp_client.metadata_cache.cache.set") as cache_set:
+            self.client.get(self.url)
+        self.assertEqual(cache_set.call_args.args[2], 5)
+
+        with mock.patch.object(cache_generation, "cache_is_process_local", return_value=False):
+            self.assertEqual(service_metadata_generation.max_age(3600), 3600)
+
+
+class TestSMPQueryLogBuffer(TestCase):
+    def setUp(self):
+        self.buffer = SMPQueryLogBuffer()
+        patcher = mock.patch.object(self.buffer, "_ensure_started")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(SMP_QUERY_LOG_BATCH_SIZE=50)
+    def test_rows_are_written_in_batches(self):
+        for number in range(120):
+            self.buffer.record(**query_fields(participant_id=f"urn:ehealth:{number}"))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.buffer.flush(), 120)
+
+        inserts = [query for query in queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 3)
+
+        self.assertEqual(SMPQuery.objects.count(), 120)
+        self.assertEqual(self.buffer.flush(), 0)
+
+    def test_timestamp_is_the_record_time(self):
+        recorded_at = timezone.now() - timedelta(minutes=5)
+        with mock.patch("smp_client.query_log.timezone.now", return_value=recorded_at):
+            self.buffer.record(**query_fields())
+
+        self.buffer.flush()
+
+        self.assertEqual(SMPQuery.objects.get().timestamp, recorded_at)
+
+    def test_rejected_row_is_dropped_and_the_rest_written(self):
+        self.buffer.record(**query_fields(participant_id="urn:ehealth:before"))
+        self.buffer.record(**query_fields(source_ip=None))  # NOT NULL violation
+        self.buffer.record(**query_fields(participant_id="urn:ehealth:after"))
+
+        self.assertEqual(self.buffer.flush(), 2)
+
+        self.assertEqual(
+            set(SMPQuery.objects.values_list("participant_id", flat=True)),
+            {"urn:ehealth:before", "urn:ehealth:after"},
+        )
+        # Nothing left queued to fail again
+        self.buffer.record(**query_fields())
+        self.assertEqual(self.buffer.flush(), 1)
+
+    def test_rows_are_kept_while_the_database_is_unavailable(self):
+        self.buffer.record(**query_fields())
+
+        with mock.patch.object(
+            SMPQuery.objects, "bulk_create", side_effect=OperationalError("database is locked")
+        ):
+            self.assertEqual(self.buffer.flush(), 0)
+
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(SMPQuery.objects.count(), 1)
+
+    def test_integrity_error_on_batch_falls_back_to_rows(self):
+        self.buffer.record(**query_fields())
+
+        with mock.patch.object(
+            SMPQuery.objects, "bulk_create", side_effect=IntegrityError("duplicate")
+        ):
+            self.assertEqual(self.buffer.flush(), 1)
+
+        self.assertEqual(SMPQuery.objects.count(), 1)
@@ -0,0 +1,79 @@
+"""
+Tests for the background system status prober
+
+The home page must only read the last status snapshot, so a slow or hung
+component probe can never hold up the request thread.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from eu_ncp_server.services import system_status
+from eu_ncp_server.services.system_status import SystemStatusProber, SystemStatusService
+
+
+class TestSystemStatusProber(TestCase):
+    BLOCKING_PROBE_SECONDS = 5
+
+    def setUp(self):
+        cache.delete(SystemStatusService.CACHE_KEY)
+        self.release = threading.Event()
+        self.prober = SystemStatusProber(interval=60)
+
+        def blocking_probe():
+            self.release.wait(self.BLOCKING_PROBE_SECONDS)
+            return {"status": "online", "label": "Online", "last_check": None}
+
+        def fast_probe():
+            return {
+                "status": "online",
+                "label": "Enabled",
+                "last_check": datetime.now(timezone.utc),
+            }
+
+        for patcher in (
+            mock.patch.object(
+                SystemStatusService,
+                "PROBES",
+                {"api_gateway": "_check_api_gateway", "authentication": "_check_authentication"},
+            ),
+            mock.patch.object(SystemStatusService, "_check_api_gateway", blocking_probe),
+            mock.patch.object(SystemStatusService, "_check_authentication", fast_probe),
+            mock.patch.object(system_status, "system_status_prober", self.prober),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.addCleanup(self.prober.stop, self.BLOCKING_PROBE_SECONDS)
+        self.addCleanup(self.release.set)
+
+    def test_home_page_does_not_wait_for_probes(self):
+        # The first request starts the prober (whose cycle then blocks) and
+        # pays for template loading; the second is timed
+        self.client.get("/")
+
+        start = time.perf_counter()
+        response = self.client.get("/")
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(response.context["system_status"]["overall_status"], "unknown")
+
+    def test_slow_probe_times_out_in_snapshot(self):
+        start = time.perf_counter()
+        status = SystemStatusService.check_system_status(timeout=0.2)
+        self.assertLess(time.perf_counter() - start, 1)
+
+        self.assertEqual(status["components"]["api_gateway"]["label"], "Timeout")
+        self.assertEqual(status["components"]["authentication"]["status"], "online")
+        self.assertEqual(status["overall_status"], "degraded")
+
+        snapshot = SystemStatusService.get_system_status()
+        self.assertEqual(snapshot["overall_status"], "degraded")
+        self.assertGreaterEqual(snapshot["age_seconds"], 0)
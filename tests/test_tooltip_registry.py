@@ -0,0 +1,114 @@
+"""
+Tests for the process-wide tooltip registry
+
+Tooltip template tags must be served from one query per registry version,
+including lookups for keys that do not exist. With a process-local cache,
+where other workers never see a version bump, snapshots also expire.
+"""
+
+from unittest import mock
+
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+
+from eu_ncp_server.services import cache_generation
+from patient_data.models import Tooltip
+from patient_data.services import tooltip_registry
+from patient_data.services.tooltip_registry import invalidate_tooltips
+
+TAGS_PER_KIND = 10
+
+TOOLTIP_TEMPLATE = Template(
+    "{% load tooltip_tags %}"
+    + "".join(
+        f'<a {{% tooltip "key_{i}" "fallback" %}}></a>'
+        f'{{% tooltip_content "key_{i}" "fallback" %}}'
+        f'{{% tooltip_span "key_{i}" "text" %}}'
+        f'{{% if "key_{i}"|has_tooltip %}}yes{{% endif %}}'
+        f'{{% render_tooltip_badge "missing_{i}" "badge" %}}'
+        for i in range(TAGS_PER_KIND)
+    )
+)
+
+
+class TestTooltipRegistry(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Tooltip.objects.bulk_create(
+            Tooltip(key=f"key_{i}", title=f"Title {i}", content=f"Content {i}")
+            for i in range(TAGS_PER_KIND)
+        )
+        Tooltip.objects.create(
+            key="inactive", title="Inactive", content="Hidden", is_active=False
+        )
+
+    def setUp(self):
+        invalidate_tooltips()
+
+    def test_fifty_tags_issue_at_most_one_query(self):
+        with self.assertNumQueries(1):
+            html = TOOLTIP_TEMPLATE.render(Context())
+
+        self.assertIn('title="Content 3"', html)
+        self.assertEqual(html.count("yes"), TAGS_PER_KIND)
+
+        with self.assertNumQueries(0):
+            TOOLTIP_TEMPLATE.render(Context())
+
+    def test_misses_and_inactive_tooltips_are_served_from_registry(self):
+        Tooltip.get_tooltip_data("key_0")
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(Tooltip.get_tooltip_data("unknown"))
+            self.assertIsNone(Tooltip.get_tooltip_data("inactive"))
+            self.assertEqual(Tooltip.get_tooltip("unknown", "default"), "default")
+
+    def test_save_and_delete_reload_registry(self):
+        self.assertEqual(Tooltip.get_tooltip("key_1"), "Content 1")
+
+        tooltip = Tooltip.objects.get(key="key_1")
+        tooltip.content = "Updated"
+        with self.captureOnCommitCallbacks(execute=True):
+            tooltip.save()
+        self.assertEqual(Tooltip.get_tooltip("key_1"), "Updated")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tooltip.delete()
+        self.assertIsNone(Tooltip.get_tooltip_data("key_1"))
+
+    def test_registry_is_invalidated_on_commit(self):
+        """Readers must not reload the uncommitted rows under a new generation"""
+        self.assertEqual(Tooltip.get_tooltip("key_1"), "Content 1")
+
+        tooltip = Tooltip.objects.get(key="key_1")
+        tooltip.content = "Updated"
+        with self.captureOnCommitCallbacks() as callbacks:
+            tooltip.save()
+            self.assertEqual(Tooltip.get_tooltip("key_1"), "Content 1")
+
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertEqual(Tooltip.get_tooltip("key_1"), "Updated")
+
+    @override_settings(TOOLTIP_REGISTRY_LOCAL_CACHE_TIMEOUT=60)
+    def test_process_local_snapshot_expires(self):
+        """A change made by another worker, which bumps no local version"""
+        self.assertEqual(Tooltip.get_tooltip("key_2"), "Content 2")
+        Tooltip.objects.filter(key="key_2").update(content="Updated elsewhere")
+
+        with mock.patch.object(tooltip_registry.time, "monotonic") as monotonic:
+            monotonic.return_value = tooltip_registry.tooltip_registry._loaded_at + 59
+            self.assertEqual(Tooltip.get_tooltip("key_2"), "Content 2")
+
+            monotonic.return_value += 1
+            self.assertEqual(Tooltip.get_tooltip("key_2"), "Updated elsewhere")
+
+    def test_shared_cache_snapshot_does_not_expire(self):
+        self.assertEqual(Tooltip.get_tooltip("key_2"), "Content 2")
+        Tooltip.objects.filter(key="key_2").update(content="Updated elsewhere")
+
+        with mock.patch.object(
+            cache_generation, "cache_is_process_local", return_value=False
+        ), mock.patch.object(tooltip_registry.time, "monotonic", return_value=1e12):
+            with self.assertNumQueries(0):
+                self.assertEqual(Tooltip.get_tooltip("key_2"), "Content 2")
@@ -0,0 +1,107 @@
+"""
+Tests for UCUM unit and FHIR Quantity formatting
+
+Quantities are formatted through one shared UCUM table and LRU cache, so a
+long observation series only formats each distinct quantity once.
+"""
+
+import time
+
+from django.test import SimpleTestCase
+
+from eu_ncp_server.services.fhir_processing import FHIRResourceProcessor
+from eu_ncp_server.services.ucum_formatting import (
+    format_observation_series,
+    format_quantity,
+    quantity_display,
+    unit_display,
+)
+
+UCUM = "http://unitsofmeasure.org"
+OBSERVATION_COUNT = 5000
+UNITS = ["mm[Hg]", "kg", "Cel", "/min", "mmol/L", "%", "kg/m2"]
+EXPECTED_UNITS = ["mmHg", "kg", "°C", "per minute", "mmol/L", "%", "kg/m²"]
+
+
+def observation_bundle(count):
+    entries = [{
+        "resource": {
+            "resourceType": "Patient",
+            "id": "patient-1",
+            "name": [{"family": "Pino", "given": ["Mario"]}],
+            "gender": "male",
+        }
+    }]
+    for index in range(count):
+        unit = UNITS[index % len(UNITS)]
+        entries.append({
+            "resource": {
+                "resourceType": "Observation",
+                "id": f"observation-{index}",
+                "status": "final",
+                "code": {"text": "Vital sign"},
+                "valueQuantity": {
+                    "value": 60 + index % 20,
+                    "unit": unit,
+                    "system": UCUM,
+                    "code": unit,
+                },
+            }
+        })
+    return {"resourceType": "Bundle", "type": "document", "entry": entries}
+
+
+class TestUCUMFormatting(SimpleTestCase):
+    def test_ucum_codes_are_translated(self):
+        self.assertEqual(
+            quantity_display({"value": 120, "unit": "mm[Hg]", "system": UCUM, "code": "mm[Hg]"}),
+            "120 mmHg",
+        )
+        self.assertEqual(
+            quantity_display({"value": 2, "comparator": "<", "code": "10*9/L", "system": UCUM}),
+            "<2 ×10⁹/L",
+        )
+        self.assertEqual(unit_display("mm[Hg]", system=UCUM), "mmHg")
+
+    def test_unit_text_is_preferred_over_unknown_code(self):
+        self.assertEqual(unit_display("tablets", "{tbl}", UCUM), "tablets")
+        self.assertEqual(unit_display("{tbl}", "{tbl}", UCUM), "{tbl}")
+        self.assertEqual(unit_display("mm[Hg]"), "mm[Hg]")
+
+    def test_zero_is_a_value(self):
+        self.assertEqual(quantity_display({"value": 0, "unit": "mg"}), "0 mg")
+        self.assertEqual(quantity_display({"unit": "mg"}), "Unknown quantity")
+        self.assertEqual(quantity_display(None), "Unknown quantity")
+
+    def test_integer_and_decimal_values_are_cached_separately(self):
+        self.assertEqual(format_quantity(5, "mg"), "5 mg")
+        self.assertEqual(format_quantity(5.0, "mg"), "5.0 mg")
+
+    def test_observation_series_keeps_order(self):
+        displays = format_observation_series([
+            {"valueQuantity": {"value": 37.2, "code": "Cel", "system": UCUM}},
+            {"valueString": "negative"},
+            {"valueQuantity": {"value": 72, "code": "/min", "system": UCUM}},
+        ])
+        self.assertEqual(displays, ["37.2 °C", None, "72 per minute"])
+
+    def test_large_observation_series(self):
+        processor = FHIRResourceProcessor()
+        bundle = observation_bundle(OBSERVATION_COUNT)
+        format_quantity.cache_clear()
+
+        start = time.perf_counter()
+        summary = processor.parse_patient_summary_bundle(bundle)
+        display = processor.convert_to_display_format(summary)
+        elapsed = time.perf_counter() - start
+
+        observations = display["clinical_sections"]["observations"]
+        self.assertEqual(len(observations), OBSERVATION_COUNT)
+        for index in (0, 1, 2, 3, 4, 5, 6, OBSERVATION_COUNT - 1):
+            self.assertEqual(
+                observations[index]["value"],
+                f"{60 + index % 20} {EXPECTED_UNITS[index % len(UNITS)]}",
+            )
+        # Only the distinct (value, unit) combinations are formatted
+        self.assertLessEqual(format_quantity.cache_info().misses, 20 * len(UNITS))
+        self.assertLess(elapsed, 2.0)
@@ -157,6 +157,11 @@ class ValueSetCatalogueAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.import_status_api),
                 name="mvc_import_status",
             ),
+            path(
+                "import-cancel/<str:task_id>/",
+                self.admin_site.admin_view(self.import_cancel_view),
+                name="mvc_import_cancel",
+            ),
             path(
                 "sync-cts/",
                 self.admin_site.admin_view(self.sync_cts_view),
@@ -292,6 +297,20 @@ class ValueSetCatalogueAdmin(admin.ModelAdmin):
 
         return JsonResponse(task_status)
 
+    def import_cancel_view(self, request, task_id):
+        """Request cancellation of a queued or running import"""
+        from .services.async_mvc_importer import ImportTaskService
+
+        if request.method == "POST":
+            if ImportTaskService.cancel_task(task_id):
+                messages.info(request, f"Cancellation requested for task {task_id}.")
+            else:
+                messages.warning(
+                    request, f"Import task {task_id} is not running in this process."
+                )
+
+        return redirect("admin:mvc_import_progress", task_id)
+
 
 @admin.register(ValueSetConcept)
 class ValueSetConceptAdmin(admin.ModelAdmin):
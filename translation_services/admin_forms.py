@@ -6,18 +6,18 @@ Provides enhanced UI for MVC file upload and processing
 from django import forms
 from django.core.exceptions import ValidationError
 from django.utils import timezone
-import pandas as pd
 import os
 import sys
 from datetime import datetime
 
 # Add the project root to Python path to import our parser
+# (pandas and the parser are imported on first use: they pull in numpy and
+# openpyxl, which admin autodiscovery would otherwise load in every process)
 project_root = os.path.dirname(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 )
 sys.path.insert(0, project_root)
 
-from eu_mvc_parser import EUMVCParser
 from .models import ValueSetCatalogue, ValueSetConcept, MVCSyncLog
 
 
@@ -94,6 +94,8 @@ class MVCImportForm(forms.Form):
                 )
 
             # Try to read the Excel file to validate it
+            import pandas as pd
+
             try:
                 xl_file = pd.ExcelFile(mvc_file)
                 if len(xl_file.sheet_names) == 0:
@@ -136,6 +138,9 @@ class MVCImportForm(forms.Form):
             f"/tmp/mvc_import_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         )
 
+        import pandas as pd
+        from eu_mvc_parser import EUMVCParser
+
         try:
             with open(temp_file_path, "wb") as temp_file:
                 for chunk in mvc_file.chunks():
@@ -427,6 +427,7 @@ class ImportTask(models.Model):
         ("processing", "Processing"),
         ("completed", "Completed"),
         ("failed", "Failed"),
+        ("cancelled", "Cancelled"),
     ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -464,7 +465,7 @@ class ImportTask(models.Model):
 
     @property
     def is_finished(self):
-        return self.status in ["completed", "failed"]
+        return self.status in ["completed", "failed", "cancelled"]
 
     def update_progress(self, processed_items=None, message=None):
         """Update task progress"""
@@ -4,17 +4,42 @@ Enhanced MVC Import with Async Support and Progress Tracking
 
 import os
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Optional, Callable, Dict, Any
-import pandas as pd
-from django.db import transaction
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
 from django.core.files.uploadedfile import UploadedFile
 
 from ..models import ValueSetCatalogue, ValueSetConcept, ImportTask
-from ..services.async_task_service import AsyncTaskService
+from ..services.async_task_service import (
+    AsyncTaskService,
+    TaskCancelled,
+    progress_channel,
+)
 from translation_manager.models import TerminologySystem
 from eu_mvc_parser import EUMVCParser
 
+# Concepts written per bulk_create statement / transaction
+CONCEPT_BATCH_SIZE = 1000
+
+# Fields refreshed when an existing concept is re-imported
+CONCEPT_UPDATE_FIELDS = [
+    "display",
+    "definition",
+    "code_system_version",
+    "status",
+    "updated_at",
+]
+
+# Sheets written concurrently on databases that allow parallel writers
+DEFAULT_IMPORT_WORKERS = 4
+
+# Minimum delay between progress writes to the ImportTask row
+PROGRESS_MIN_INTERVAL_SECONDS = 1.0
+
 
 class AsyncMVCImporter:
     """Handles asynchronous MVC file imports with progress tracking"""
@@ -56,19 +81,30 @@ class AsyncMVCImporter:
             task.save()
             raise
 
-        # Start async import
-        AsyncTaskService.run_async_import_task(
-            task_id=str(task.id),
-            import_function=self._process_import_async,
-            import_kwargs={
-                "temp_file_path": temp_file_path,
-                "import_mode": import_mode,
-                "selected_sheets": selected_sheets,
-                "overwrite_existing": overwrite_existing,
-                "dry_run": dry_run,
-                "task_id": str(task.id),
-            },
-        )
+        # Seed the in-memory progress channel for the polling view
+        progress_channel.publish(str(task.id), **ImportTaskService.serialize_task(task))
+
+        # Queue async import
+        try:
+            AsyncTaskService.run_async_import_task(
+                task_id=str(task.id),
+                import_function=self._process_import_async,
+                import_kwargs={
+                    "temp_file_path": temp_file_path,
+                    "import_mode": import_mode,
+                    "selected_sheets": selected_sheets,
+                    "overwrite_existing": overwrite_existing,
+                    "dry_run": dry_run,
+                    "task_id": str(task.id),
+                },
+            )
+        except Exception as e:
+            progress_channel.discard(str(task.id))
+            os.remove(temp_file_path)
+            task.status = "failed"
+            task.progress_message = f"Failed to queue import: {str(e)}"
+            task.save()
+            raise
 
         return str(task.id)
 
@@ -81,8 +117,16 @@ class AsyncMVCImporter:
         dry_run: bool,
         task_id: str,
         progress_callback: Optional[Callable] = None,
+        cancel_event: Optional[threading.Event] = None,
     ) -> Dict[str, Any]:
-        """Process MVC import asynchronously with progress tracking"""
+        """Process MVC import asynchronously with progress tracking
+
+        The workbook is opened once and streamed sheet by sheet on this
+        thread; parsed sheets are handed to a bounded worker pool that
+        writes each value set independently. A set cancel_event stops the
+        import before the next sheet, and sheets not yet started are
+        dropped.
+        """
 
         results = {
             "total_value_sets": 0,
@@ -94,10 +138,12 @@ class AsyncMVCImporter:
             "message": "",
         }
 
+        workbook = None
+
         try:
-            # Get list of sheets to process
-            xl_file = pd.ExcelFile(temp_file_path)
-            all_sheets = xl_file.sheet_names
+            # Open the workbook once for listing and parsing all sheets
+            workbook = self.parser.open_workbook(temp_file_path)
+            all_sheets = workbook.sheetnames
 
             if import_mode == "full":
                 sheets_to_process = all_sheets
@@ -108,70 +154,64 @@ class AsyncMVCImporter:
                 sheets_to_process = all_sheets[:5]
 
             total_sheets = len(sheets_to_process)
+            progress = ThrottledProgress(progress_callback, total_sheets)
+            progress.report(0, f"Processing {total_sheets} sheets...", force=True)
 
-            if progress_callback:
-                progress_callback(
-                    0, total_sheets, f"Processing {total_sheets} sheets..."
-                )
+            worker_count = 1 if dry_run else self._worker_count()
+            in_flight = threading.BoundedSemaphore(worker_count * 2)
+            completed = 0
 
-            # Process each sheet
-            for sheet_idx, sheet_name in enumerate(sheets_to_process):
-                try:
-                    if progress_callback:
-                        progress_callback(
-                            sheet_idx, total_sheets, f"Processing sheet: {sheet_name}"
-                        )
+            with ThreadPoolExecutor(
+                max_workers=worker_count, thread_name_prefix="mvc-import"
+            ) as executor:
+                futures = {}
+
+                for sheet_name in sheets_to_process:
+                    if cancel_event is not None and cancel_event.is_set():
+                        for future in futures:
+                            future.cancel()
+                        raise TaskCancelled()
+
+                    progress.report(completed, f"Processing sheet: {sheet_name}")
 
-                    # Parse the sheet
-                    result = self.parser.parse_mvc_sheet(temp_file_path, sheet_name)
+                    # Parse the sheet from the already opened workbook
+                    result = self.parser.parse_mvc_worksheet(workbook, sheet_name)
 
                     if "error" in result:
                         results["errors"].append(
                             f"Sheet {sheet_name}: {result['error']}"
                         )
                         results["error_count"] += 1
+                        completed += 1
                         continue
 
-                    vs_info = result["value_set_info"]
-                    concepts = result["concepts"]
-
-                    sheet_result = {
-                        "sheet_name": sheet_name,
-                        "value_set_name": vs_info.get("name"),
-                        "oid": vs_info.get("oid"),
-                        "concepts_found": len(concepts),
-                        "concepts_imported": 0,
-                    }
-
-                    if not dry_run:
-                        # Import the data
-                        imported_count = self._import_value_set(
-                            vs_info, concepts, overwrite_existing
-                        )
-                        sheet_result["concepts_imported"] = imported_count
-                        results["total_concepts"] += imported_count
-                        results["success_count"] += 1
-                    else:
-                        sheet_result["concepts_imported"] = len(concepts)
-                        results["total_concepts"] += len(concepts)
-                        results["success_count"] += 1
-
-                    results["sheets_processed"].append(sheet_result)
-                    results["total_value_sets"] += 1
-
-                except Exception as e:
-                    error_msg = f"Sheet {sheet_name}: {str(e)}"
-                    results["errors"].append(error_msg)
-                    results["error_count"] += 1
-
-                # Update progress
-                if progress_callback:
-                    progress_callback(
-                        sheet_idx + 1,
-                        total_sheets,
-                        f"Completed {sheet_idx + 1} of {total_sheets} sheets",
+                    # Bound the number of parsed sheets held in memory
+                    in_flight.acquire()
+                    future = executor.submit(
+                        self._import_sheet,
+                        result,
+                        overwrite_existing,
+                        dry_run,
+                    )
+                    future.add_done_callback(lambda _f: in_flight.release())
+                    futures[future] = sheet_name
+
+                    completed += self._collect_finished(futures, results)
+
+                for future in as_completed(list(futures)):
+                    completed += self._collect_result(
+                        future, futures.pop(future), results
+                    )
+                    progress.report(
+                        completed, f"Completed {completed} of {total_sheets} sheets"
                     )
 
+            progress.report(
+                total_sheets,
+                f"Completed {total_sheets} of {total_sheets} sheets",
+                force=True,
+            )
+
             # Final results
             if dry_run:
                 results["message"] = (
@@ -188,6 +228,9 @@ class AsyncMVCImporter:
             return results
 
         finally:
+            if workbook is not None:
+                workbook.close()
+
             # Clean up temporary file
             try:
                 if os.path.exists(temp_file_path):
@@ -195,9 +238,75 @@ class AsyncMVCImporter:
             except Exception:
                 pass  # Ignore cleanup errors
 
+    @staticmethod
+    def _worker_count() -> int:
+        """Number of sheets written concurrently
+
+        SQLite only allows a single writer, so sheets are written
+        sequentially there.
+        """
+        if connection.vendor == "sqlite":
+            return 1
+        return max(1, getattr(settings, "MVC_IMPORT_WORKERS", DEFAULT_IMPORT_WORKERS))
+
+    def _collect_finished(self, futures, results) -> int:
+        """Collect already finished sheet imports without blocking"""
+        collected = 0
+        for future in [f for f in futures if f.done()]:
+            collected += self._collect_result(future, futures.pop(future), results)
+        return collected
+
+    @staticmethod
+    def _collect_result(future, sheet_name: str, results: Dict[str, Any]) -> int:
+        """Merge a finished sheet import into the overall results"""
+        try:
+            sheet_result = future.result()
+        except Exception as e:
+            results["errors"].append(f"Sheet {sheet_name}: {str(e)}")
+            results["error_count"] += 1
+            return 1
+
+        results["sheets_processed"].append(sheet_result)
+        results["total_concepts"] += sheet_result["concepts_imported"]
+        results["success_count"] += 1
+        results["total_value_sets"] += 1
+        return 1
+
+    def _import_sheet(
+        self, result: Dict[str, Any], overwrite_existing: bool, dry_run: bool
+    ) -> Dict[str, Any]:
+        """Import one parsed sheet; runs on a worker thread"""
+        vs_info = result["value_set_info"]
+        concepts = result["concepts"]
+
+        sheet_result = {
+            "sheet_name": result["sheet_name"],
+            "value_set_name": vs_info.get("name"),
+            "oid": vs_info.get("oid"),
+            "concepts_found": len(concepts),
+            "concepts_imported": len(concepts),
+        }
+
+        if dry_run:
+            return sheet_result
+
+        try:
+            sheet_result["concepts_imported"] = self._import_value_set(
+                vs_info, concepts, overwrite_existing
+            )
+        finally:
+            # Pool threads own their database connection
+            connection.close()
+
+        return sheet_result
+
     def _import_value_set(self, vs_info, concepts, overwrite_existing):
-        """Import a single value set with its concepts"""
-        imported_count = 0
+        """Import a single value set with its concepts
+
+        The catalogue row is written in a short transaction; concepts are
+        then upserted with bulk_create in batches, each in its own
+        transaction, so a large value set never holds one long transaction.
+        """
         oid = vs_info.get("oid")
 
         if not oid:
@@ -251,32 +360,106 @@ class AsyncMVCImporter:
                     catalogue.cts_url = cts_url
                 catalogue.save()
 
+        # Build concept rows, keeping the first occurrence of each key
+        # (duplicates previously failed the unique constraint and were skipped)
+        new_concepts = {}
+        for concept_data in concepts:
+            code = concept_data.get("concept_code")
+            if not code:
+                continue
+
+            key = (code, concept_data.get("code_system_id") or "")
+            if key in new_concepts:
+                continue
+
+            new_concepts[key] = ValueSetConcept(
+                value_set=catalogue,
+                code=code,
+                display=concept_data.get("description") or "",
+                definition=concept_data.get("description") or "",
+                code_system=key[1],
+                code_system_version=concept_data.get("code_system_version") or "",
+                status="active",
+            )
+
+        upsert = overwrite_existing and not created and self._supports_upsert()
+
+        if overwrite_existing and not created and not upsert:
             # Clear existing concepts if overwriting
-            if overwrite_existing:
-                ValueSetConcept.objects.filter(value_set=catalogue).delete()
-
-            # Import concepts
-            for concept_data in concepts:
-                if not concept_data.get("concept_code"):
-                    continue
-
-                try:
-                    ValueSetConcept.objects.create(
-                        value_set=catalogue,
-                        code=concept_data.get("concept_code", ""),
-                        display=concept_data.get("description", ""),
-                        definition=concept_data.get("description", ""),
-                        code_system=concept_data.get("code_system_id", ""),
-                        code_system_version=concept_data.get("code_system_version", ""),
-                        status="active",
+            ValueSetConcept.objects.filter(value_set=catalogue).delete()
+        elif upsert:
+            self._delete_stale_concepts(catalogue, new_concepts.keys())
+
+        rows = list(new_concepts.values())
+        for start in range(0, len(rows), CONCEPT_BATCH_SIZE):
+            batch = rows[start : start + CONCEPT_BATCH_SIZE]
+            with transaction.atomic():
+                if upsert:
+                    ValueSetConcept.objects.bulk_create(
+                        batch,
+                        update_conflicts=True,
+                        unique_fields=["value_set", "code", "code_system"],
+                        update_fields=CONCEPT_UPDATE_FIELDS,
+                    )
+                else:
+                    ValueSetConcept.objects.bulk_create(
+                        batch, ignore_conflicts=True
                     )
-                    imported_count += 1
 
-                except Exception:
-                    # Skip concepts that fail to import
-                    continue
+        return len(rows)
 
-        return imported_count
+    @staticmethod
+    def _supports_upsert() -> bool:
+        """Whether the database supports bulk_create(update_conflicts=True)"""
+        return connection.features.supports_update_conflicts_with_target
+
+    @staticmethod
+    def _delete_stale_concepts(catalogue, keep_keys) -> None:
+        """Delete concepts of a value set that are absent from the new import"""
+        keep = set(keep_keys)
+        stale_ids = [
+            concept_id
+            for concept_id, code, code_system in ValueSetConcept.objects.filter(
+                value_set=catalogue
+            ).values_list("id", "code", "code_system")
+            if (code, code_system) not in keep
+        ]
+
+        for start in range(0, len(stale_ids), CONCEPT_BATCH_SIZE):
+            ValueSetConcept.objects.filter(
+                id__in=stale_ids[start : start + CONCEPT_BATCH_SIZE]
+            ).delete()
+
+
+class ThrottledProgress:
+    """Rate-limits progress callbacks to avoid a database write per step"""
+
+    def __init__(
+        self,
+        callback: Optional[Callable],
+        total: int,
+        min_interval: float = PROGRESS_MIN_INTERVAL_SECONDS,
+    ):
+        self.callback = callback
+        self.total = total
+        self.min_interval = min_interval
+        self._last_report = None
+
+    def report(self, processed: int, message: str = "", force: bool = False):
+        """Forward progress if forced or the minimum interval has elapsed"""
+        if not self.callback:
+            return
+
+        now = time.monotonic()
+        if (
+            not force
+            and self._last_report is not None
+            and now - self._last_report < self.min_interval
+        ):
+            return
+
+        self._last_report = now
+        self.callback(processed, self.total, message)
 
 
 class ImportTaskService:
@@ -284,26 +467,45 @@ class ImportTaskService:
 
     @staticmethod
     def get_task_status(task_id: str) -> Optional[Dict]:
-        """Get the current status of an import task"""
+        """Get the current status of an import task
+
+        Tasks running in this process are served from the in-memory
+        progress channel; everything else is read from the database.
+        """
+        live_status = progress_channel.get(task_id)
+        if live_status is not None:
+            live_status["is_finished"] = False
+            return live_status
+
         try:
             task = ImportTask.objects.get(id=task_id)
-            return {
-                "id": str(task.id),
-                "status": task.status,
-                "progress_percentage": task.progress_percentage,
-                "progress_message": task.progress_message,
-                "total_items": task.total_items,
-                "processed_items": task.processed_items,
-                "success_count": task.success_count,
-                "error_count": task.error_count,
-                "error_details": task.error_details,
-                "filename": task.filename,
-                "created_at": task.created_at.isoformat(),
-                "started_at": task.started_at.isoformat() if task.started_at else None,
-                "completed_at": (
-                    task.completed_at.isoformat() if task.completed_at else None
-                ),
-                "is_finished": task.is_finished,
-            }
-        except ImportTask.DoesNotExist:
+        except (ImportTask.DoesNotExist, ValueError, ValidationError):
             return None
+        return ImportTaskService.serialize_task(task)
+
+    @staticmethod
+    def cancel_task(task_id: str) -> bool:
+        """Request cancellation of a queued or running import"""
+        return AsyncTaskService.cancel_task(task_id)
+
+    @staticmethod
+    def serialize_task(task: ImportTask) -> Dict:
+        """Convert an import task into the status API representation"""
+        return {
+            "id": str(task.id),
+            "status": task.status,
+            "progress_percentage": task.progress_percentage,
+            "progress_message": task.progress_message,
+            "total_items": task.total_items,
+            "processed_items": task.processed_items,
+            "success_count": task.success_count,
+            "error_count": task.error_count,
+            "error_details": task.error_details,
+            "filename": task.filename,
+            "created_at": task.created_at.isoformat(),
+            "started_at": task.started_at.isoformat() if task.started_at else None,
+            "completed_at": (
+                task.completed_at.isoformat() if task.completed_at else None
+            ),
+            "is_finished": task.is_finished,
+        }
@@ -1,13 +1,182 @@
 import threading
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict
+from django.conf import settings
+from django.db import close_old_connections
 from django.utils import timezone
-from django.db import transaction
 from translation_services.models import ImportTask
 
 logger = logging.getLogger(__name__)
 
+# Defaults for the background import executor (overridable in settings)
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_QUEUED_TASKS = 10
+DEFAULT_PROGRESS_WRITE_INTERVAL = 2.0
+
+
+class TaskQueueFull(Exception):
+    """Raised when the background executor cannot accept more tasks"""
+
+
+class TaskCancelled(Exception):
+    """Raised inside a running task once cancellation has been requested"""
+
+
+class ProgressChannel:
+    """
+    In-memory progress snapshots for tasks running in this process
+
+    Progress callbacks publish here on every update, so the admin polling
+    view can read fresh progress without touching the database. Database
+    writes are coalesced separately by the executor.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+
+    def publish(self, task_id: str, **fields):
+        with self._lock:
+            snapshot = self._snapshots.setdefault(task_id, {})
+            snapshot.update(fields)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            snapshot = self._snapshots.get(task_id)
+            return dict(snapshot) if snapshot is not None else None
+
+    def discard(self, task_id: str):
+        with self._lock:
+            self._snapshots.pop(task_id, None)
+
+
+progress_channel = ProgressChannel()
+
+
+class CoalescingProgressWriter:
+    """
+    Writes task progress with a single UPDATE on the progress columns
+
+    Updates arriving within the write interval only replace the pending
+    values; the latest values are flushed on the next eligible update or
+    when flush() is called at the end of the task.
+    """
+
+    def __init__(self, task_id: str, min_interval: float):
+        self.task_id = task_id
+        self.min_interval = min_interval
+        self._pending: Optional[Dict[str, Any]] = None
+        self._last_write = None
+
+    def update(self, processed: int, total: int, message: str = ""):
+        self._pending = {
+            "total_items": total,
+            "processed_items": processed,
+            "progress_percentage": (
+                min(100, int((processed / total) * 100)) if total > 0 else 0
+            ),
+            "progress_message": message
+            or f"Processed {processed} of {total} items",
+        }
+        progress_channel.publish(self.task_id, **self._pending)
+
+        now = time.monotonic()
+        if self._last_write is None or now - self._last_write >= self.min_interval:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        ImportTask.objects.filter(id=self.task_id).update(**self._pending)
+        self._pending = None
+        self._last_write = time.monotonic()
+
+
+class BackgroundTaskExecutor:
+    """
+    Bounded worker pool for long-running import tasks
+
+    At most ``max_workers`` tasks run concurrently and at most
+    ``max_queued`` further tasks wait for a worker; submissions beyond
+    that raise TaskQueueFull instead of spawning unbounded threads.
+    """
+
+    def __init__(self, max_workers: int, max_queued: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="import-task"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queued)
+        self._lock = threading.Lock()
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._futures: Dict[str, Any] = {}
+
+    def submit(self, task_id: str, fn: Callable, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            raise TaskQueueFull(
+                "Too many import tasks are queued, please try again later"
+            )
+
+        cancel_event = threading.Event()
+        with self._lock:
+            self._cancel_events[task_id] = cancel_event
+
+        try:
+            future = self._executor.submit(fn, task_id, cancel_event, *args, **kwargs)
+        except Exception:
+            self._release(task_id)
+            raise
+
+        with self._lock:
+            self._futures[task_id] = future
+        future.add_done_callback(lambda _f: self._release(task_id))
+        return future
+
+    def cancel(self, task_id: str) -> bool:
+        """Request cancellation; queued tasks never start, running ones stop
+        at their next progress update or cancel_event check"""
+        with self._lock:
+            cancel_event = self._cancel_events.get(task_id)
+            future = self._futures.get(task_id)
+
+        if cancel_event is None:
+            return False
+
+        cancel_event.set()
+        if future is not None and future.cancel():
+            AsyncTaskService._mark_cancelled(task_id)
+        return True
+
+    def _release(self, task_id: str):
+        with self._lock:
+            self._cancel_events.pop(task_id, None)
+            self._futures.pop(task_id, None)
+        self._slots.release()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_task_executor() -> BackgroundTaskExecutor:
+    """Return the process-wide executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BackgroundTaskExecutor(
+                    max_workers=getattr(
+                        settings, "IMPORT_TASK_MAX_WORKERS", DEFAULT_MAX_WORKERS
+                    ),
+                    max_queued=getattr(
+                        settings, "IMPORT_TASK_MAX_QUEUED", DEFAULT_MAX_QUEUED_TASKS
+                    ),
+                )
+    return _executor
+
 
 class AsyncTaskService:
     """Service for running background tasks with progress tracking"""
@@ -19,82 +188,130 @@ class AsyncTaskService:
         import_kwargs: dict,
         progress_callback: Optional[Callable] = None,
     ):
-        """Run an import task asynchronously in a separate thread"""
+        """Queue an import task on the bounded background executor"""
+        get_task_executor().submit(
+            task_id,
+            AsyncTaskService._run_task,
+            import_function,
+            import_kwargs,
+            progress_callback,
+        )
+        return task_id
+
+    @staticmethod
+    def cancel_task(task_id: str) -> bool:
+        """Request cancellation of a queued or running task"""
+        return get_task_executor().cancel(task_id)
+
+    @staticmethod
+    def _run_task(
+        task_id: str,
+        cancel_event: threading.Event,
+        import_function: Callable,
+        import_kwargs: dict,
+        progress_callback: Optional[Callable] = None,
+    ):
+        close_old_connections()
+        writer = CoalescingProgressWriter(
+            task_id,
+            getattr(
+                settings,
+                "IMPORT_PROGRESS_WRITE_INTERVAL",
+                DEFAULT_PROGRESS_WRITE_INTERVAL,
+            ),
+        )
+
+        try:
+            if cancel_event.is_set():
+                raise TaskCancelled()
+
+            # Update task status
+            started_at = timezone.now()
+            ImportTask.objects.filter(id=task_id).update(
+                status="processing",
+                started_at=started_at,
+                progress_message="Starting import...",
+            )
+            progress_channel.publish(
+                task_id,
+                status="processing",
+                started_at=started_at.isoformat(),
+                progress_message="Starting import...",
+            )
+
+            # Define progress callback for the import function
+            def update_progress(processed: int, total: int, message: str = ""):
+                if cancel_event.is_set():
+                    raise TaskCancelled()
+                writer.update(processed, total, message)
+                if progress_callback:
+                    progress_callback(processed, total, message)
+
+            # Add progress callback and cancel event to import kwargs; the
+            # callback is rate-limited by some importers, so long loops
+            # should also check the event directly
+            import_kwargs["progress_callback"] = update_progress
+            import_kwargs["cancel_event"] = cancel_event
+
+            # Run the import function
+            logger.info(f"Starting async task {task_id}")
+            result = import_function(**import_kwargs)
+            writer.flush()
+
+            # Update task completion
+            completion = {
+                "status": "completed",
+                "completed_at": timezone.now(),
+                "progress_percentage": 100,
+                "progress_message": "Import completed successfully",
+            }
+
+            # Extract results from import result
+            if isinstance(result, dict):
+                completion.update(
+                    success_count=result.get("success_count", 0),
+                    error_count=result.get("error_count", 0),
+                    error_details=result.get("errors", []),
+                    progress_message=result.get(
+                        "message", "Import completed successfully"
+                    ),
+                )
+
+            ImportTask.objects.filter(id=task_id).update(**completion)
+            logger.info(f"Completed async task {task_id}")
+
+        except TaskCancelled:
+            writer.flush()
+            AsyncTaskService._mark_cancelled(task_id)
+            logger.info(f"Cancelled async task {task_id}")
+
+        except Exception as e:
+            logger.error(f"Error in async task {task_id}: {str(e)}", exc_info=True)
 
-        def _run_task():
             try:
-                # Get task from database
-                task = ImportTask.objects.get(id=task_id)
-
-                # Update task status
-                task.status = "processing"
-                task.started_at = timezone.now()
-                task.progress_message = "Starting import..."
-                task.save()
-
-                # Define progress callback for the import function
-                def update_progress(processed: int, total: int, message: str = ""):
-                    with transaction.atomic():
-                        task.refresh_from_db()
-                        task.total_items = total
-                        task.processed_items = processed
-                        task.progress_percentage = (
-                            min(100, int((processed / total) * 100)) if total > 0 else 0
-                        )
-                        task.progress_message = (
-                            message or f"Processed {processed} of {total} items"
-                        )
-                        task.save()
-
-                # Add progress callback to import kwargs
-                import_kwargs["progress_callback"] = update_progress
-
-                # Run the import function
-                logger.info(f"Starting async task {task_id}")
-                result = import_function(**import_kwargs)
-
-                # Update task completion
-                with transaction.atomic():
-                    task.refresh_from_db()
-                    task.status = "completed"
-                    task.completed_at = timezone.now()
-                    task.progress_percentage = 100
-
-                    # Extract results from import result
-                    if isinstance(result, dict):
-                        task.success_count = result.get("success_count", 0)
-                        task.error_count = result.get("error_count", 0)
-                        task.error_details = result.get("errors", [])
-                        task.progress_message = result.get(
-                            "message", "Import completed successfully"
-                        )
-                    else:
-                        task.progress_message = "Import completed successfully"
-
-                    task.save()
-
-                logger.info(f"Completed async task {task_id}")
-
-            except Exception as e:
-                logger.error(f"Error in async task {task_id}: {str(e)}", exc_info=True)
-
-                try:
-                    task = ImportTask.objects.get(id=task_id)
-                    task.status = "failed"
-                    task.completed_at = timezone.now()
-                    task.progress_message = f"Import failed: {str(e)}"
-                    task.error_details = [
+                ImportTask.objects.filter(id=task_id).update(
+                    status="failed",
+                    completed_at=timezone.now(),
+                    progress_message=f"Import failed: {str(e)}",
+                    error_details=[
                         {"error": str(e), "timestamp": timezone.now().isoformat()}
-                    ]
-                    task.save()
-                except Exception as save_error:
-                    logger.error(f"Failed to update task status: {save_error}")
+                    ],
+                )
+            except Exception as save_error:
+                logger.error(f"Failed to update task status: {save_error}")
 
-        # Start the thread
-        thread = threading.Thread(target=_run_task, daemon=True)
-        thread.start()
+        finally:
+            progress_channel.discard(task_id)
+            close_old_connections()
 
-        return task_id
+    @staticmethod
+    def _mark_cancelled(task_id: str):
+        ImportTask.objects.filter(id=task_id).update(
+            status="cancelled",
+            completed_at=timezone.now(),
+            progress_message="Import cancelled",
+        )
+        progress_channel.discard(task_id)
 
 
 class ProgressTracker:
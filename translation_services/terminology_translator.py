@@ -7,6 +7,7 @@ from typing import Dict, List, Optional, Tuple
 from django.core.cache import cache
 from django.utils import translation
 from .models import ValueSetCatalogue, ValueSetConcept, ConceptTranslation
+from patient_data.utils.request_profiling import record_cache_lookup, span
 import logging
 import re
 
@@ -118,6 +119,7 @@ class TerminologyTranslator:
 
         return translated_concepts
 
+    @span("terminology.lookup")
     def _translate_term(
         self, code: str, system: str, original_display: str = None
     ) -> Optional[Dict]:
@@ -138,6 +140,7 @@ class TerminologyTranslator:
         # Check cache first
         cache_key = f"term_translation_{system}_{code}_{self.target_language}"
         cached_translation = cache.get(cache_key)
+        record_cache_lookup("terminology", hit=bool(cached_translation))
         if cached_translation:
             return cached_translation
 
@@ -356,6 +359,7 @@ class TerminologyTranslator:
             "source_language": translation_result.get("source_language", "en"),
         }
 
+    @span("terminology.lookup")
     def resolve_code(self, code: str, code_system: str = None) -> Optional[str]:
         """
         Resolve a single coded value to its display text using CTS Master Value Catalogue
@@ -373,6 +377,7 @@ class TerminologyTranslator:
         # Check cache first
         cache_key = f"code_resolution_{code_system or 'any'}_{code}_{self.target_language}"
         cached_result = cache.get(cache_key)
+        record_cache_lookup("terminology", hit=bool(cached_result))
         if cached_result:
             return cached_result
             